@@ -1,15 +1,92 @@
+import copy
 import json
 import os
 import pickle
 from datetime import date, datetime
-from typing import Any
+from functools import lru_cache, partial
+from typing import Any, Callable, Sequence, TypeVar
 
-from pydantic import ValidationError
+from pydantic import TypeAdapter, ValidationError
+from pydantic_core import SchemaValidator, core_schema
 from sqlmodel import SQLModel
 
+from backend.core.columnar import ColumnarFile, write_columnar
+
+T = TypeVar("T", bound="BaseObject")
+
+
+@lru_cache(maxsize=None)
+def _list_adapter(cls: type) -> TypeAdapter:
+    """Returns the adapter serializing lists of `cls`, built once per class."""
+    return TypeAdapter(list[cls])  # type: ignore[valid-type]
+
+
+@lru_cache(maxsize=None)
+def _defaults(cls: type) -> dict[str, Callable[[], Any]]:
+    """Returns a function giving the default value of every field of `cls`, in field order."""
+    defaults: dict[str, Callable[[], Any]] = {}
+    for name, field in cls.model_fields.items():
+        if field.default_factory is not None:
+            defaults[name] = field.default_factory  # type: ignore[assignment]
+        elif field.is_required():
+            defaults[name] = partial(_missing, cls, name)
+        else:
+            defaults[name] = partial(copy.copy, field.default)
+    return defaults
+
+
+@lru_cache(maxsize=None)
+def _field_names(cls: type) -> frozenset[str]:
+    """Returns the names of the fields of `cls`, built once per class."""
+    return frozenset(cls.model_fields)
+
+
+def _missing(cls: type, name: str) -> Any:
+    raise TypeError(f"{cls.__name__}.trusted() missing required field {name}")
+
+
+def _construct_models(schema: Any) -> Any:
+    """Replaces every model in a core schema by its fields followed by `model_construct`.
+
+    SQLModel's `__init__` re-validates its input in Python mode, where strict models reject the ISO strings json
+    encodes dates with. Validating the fields in json mode and constructing the validated values keeps the checks of
+    the models without going through `__init__`.
+    """
+    if isinstance(schema, list):
+        return [_construct_models(item) for item in schema]
+    if not isinstance(schema, dict):
+        return schema
+    schema = {key: _construct_models(value) for key, value in schema.items()}
+    if schema.get("type") != "model":
+        return schema
+    model = schema["cls"]
+
+    def construct(values: tuple[dict, Any, set[str]]) -> Any:
+        fields, _, fields_set = values
+        return model.model_construct(_fields_set=fields_set, **fields)
+
+    constructed = core_schema.no_info_after_validator_function(construct, schema["schema"])
+    if "ref" in schema:
+        constructed["ref"] = schema["ref"]
+    return constructed
+
+
+@lru_cache(maxsize=None)
+def _json_validator(cls: type, many: bool = False) -> SchemaValidator:
+    """Returns the validator parsing json objects, or arrays of them when `many`, of `cls`, built once per class."""
+    schema = _construct_models(cls.__pydantic_core_schema__)
+    if many:
+        schema = core_schema.list_schema(schema)
+    return SchemaValidator(schema, cls.__pydantic_core_schema__.get("config"))
+
 
 class BaseObject(SQLModel):
-    """This class is the base class for all SQLModels objects."""
+    """This class is the base class for all SQLModels objects.
+
+    Its configuration is strict: inputs are never coerced, assignments are validated and instances are validated again
+    whenever they are passed to another model or returned as a response. This is what request models need. Models only
+    built by the server from trusted values should derive from `TrustedObject` and be built with `trusted`.
+    """
 
     class __Encoder(json.JSONEncoder):
         """This class is used to encode the Episode object to json or any other object that has a __dict__ attribute."""
@@ -46,23 +123,102 @@ class BaseObject(SQLModel):
         validation_error_cause = True
         str_strip_whitespace = True
 
-    def convert_to_json(self) -> str:
-        """Converts an episode to a json string."""
+    @classmethod
+    def trusted(cls: type[T], **values: Any) -> T:
+        """Builds an object from values the server produced itself, e.g. database rows, without validating them.
+
+        The values must already have the types of the fields: they are neither checked nor converted. Never use it
+        with values coming from a request. The names are checked though: an unknown field or a missing required one
+        raises here rather than when the object is serialized.
+
+        The object is built as `model_construct` would, by writing its `__dict__` and the pydantic-private attributes
+        (`__pydantic_fields_set__`, `__pydantic_extra__` and `__pydantic_private__`) directly, so it must be kept in
+        line with the pydantic version.
+
+        Args:
+            **values: The values of the fields. Fields left out take their default.
+
+        Returns:
+            object: The object.
+
+        Raises:
+            TypeError: If a value is given for an unknown field, or a field without default is left out.
+        """
+        # Same result as `model_construct`, which is slower than a validated construction as it walks every field.
+        fields_set = set(values)
+        names = _field_names(cls)
+        if fields_set != names:
+            unknown = fields_set - names
+            if unknown:
+                raise TypeError(f"{cls.__name__}.trusted() got unexpected fields {', '.join(sorted(unknown))}")
+            values = {name: values[name] if name in values else default() for name, default in _defaults(cls).items()}
+        obj = object.__new__(cls)
+        object.__setattr__(obj, "__dict__", values)
+        object.__setattr__(obj, "__pydantic_fields_set__", fields_set)
+        object.__setattr__(obj, "__pydantic_extra__", None)
+        object.__setattr__(obj, "__pydantic_private__", None)
+        return obj
+
+    def convert_to_json(self, compact: bool = False) -> str:
+        """Converts an episode to a json string.
+
+        Args:
+            compact (bool, optional): Whether to serialize with pydantic-core, without indentation. It is several
+                times faster and the output is smaller. Defaults to False, the indented output.
+        """
+        if compact:
+            return self.model_dump_json()
         return json.dumps(self, indent=4, cls=self.__Encoder)
 
-    def save_to_json_file(self, file_path: str) -> None:
+    def convert_to_json_bytes(self) -> bytes:
+        """Converts an object to compact json bytes with pydantic-core, e.g. to write to a file or a response."""
+        return self.__pydantic_serializer__.to_json(self)
+
+    def save_to_json_file(self, file_path: str, compact: bool = False) -> None:
         """Saves an episode to a json file.
 
         Args:
             file_path (str): The path to the file.
+            compact (bool, optional): Whether to write compact json. Defaults to False.
         """
         _, extension = os.path.splitext(file_path)
         if extension != ".json":
             raise ValueError(f"File extension must be .json, not {extension}")
 
+        if compact:
+            with open(file_path, "wb") as binary_file:
+                binary_file.write(self.convert_to_json_bytes())
+            return
         with open(file_path, "w") as file:
             file.write(self.convert_to_json())
 
+    @classmethod
+    def convert_list_to_json(cls, objects: Sequence["BaseObject"]) -> bytes:
+        """Converts a list of objects of this class to a compact json array in a single pydantic-core call.
+
+        Args:
+            objects (Sequence[BaseObject]): The objects, instances of this class.
+
+        Returns:
+            bytes: The json array.
+        """
+        return _list_adapter(cls).dump_json(list(objects))
+
+    @classmethod
+    def save_list_to_json_file(cls, objects: Sequence["BaseObject"], file_path: str) -> None:
+        """Saves a list of objects of this class to a compact json file.
+
+        Args:
+            objects (Sequence[BaseObject]): The objects, instances of this class.
+            file_path (str): The path to the file.
+        """
+        _, extension = os.path.splitext(file_path)
+        if extension != ".json":
+            raise ValueError(f"File extension must be .json, not {extension}")
+
+        with open(file_path, "wb") as file:
+            file.write(cls.convert_list_to_json(objects))
+
     def save_to_pickle_file(self, file_path: str) -> None:
         """Saves an object to a pickle file.
 
@@ -72,6 +228,32 @@ class BaseObject(SQLModel):
         with open(file_path, "wb") as file:
             pickle.dump(self, file)
 
+    @classmethod
+    def save_list_to_columnar_file(cls, objects: Sequence["BaseObject"], file_path: str) -> None:
+        """Saves a list of objects of this class to a columnar, memory-mappable file.
+
+        Args:
+            objects (Sequence[BaseObject]): The objects, instances of this class with bool, int, float, str, date or
+                datetime fields.
+            file_path (str): The path to the file.
+        """
+        write_columnar(file_path, cls, objects)
+
+    @classmethod
+    def load_columnar_file(cls: type[T], file_path: str) -> ColumnarFile[T]:
+        """Memory-maps a columnar file written by `save_list_to_columnar_file`, without reading its rows.
+
+        Args:
+            file_path (str): The path to the file.
+
+        Returns:
+            ColumnarFile: The file, giving lazy access to its rows and columns.
+        """
+        try:
+            return ColumnarFile(file_path, cls)
+        except FileNotFoundError as e:
+            raise FileNotFoundError(f"Unable to load file {file_path}. File not Found.") from e
+
     def __str__(self) -> str:
         """Returns a string representation of the object."""
         try:
@@ -126,7 +308,31 @@ class BaseObject(SQLModel):
             raise Exception(f"Unable to load file {file_path}. {e}") from e
 
     @classmethod
-    def load_from_json_file(cls, file_path: str) -> "BaseObject":
+    def load_from_json(cls: type[T], data: str | bytes) -> T:
+        """Parses and validates an object from json with pydantic-core.
+
+        Args:
+            data (str | bytes): The json, as produced by `convert_to_json`.
+
+        Returns:
+            object: The object.
+        """
+        return _json_validator(cls).validate_json(data)
+
+    @classmethod
+    def load_list_from_json(cls: type[T], data: str | bytes) -> list[T]:
+        """Parses and validates a json array of objects of this class, as produced by `convert_list_to_json`.
+
+        Args:
+            data (str | bytes): The json array.
+
+        Returns:
+            list[object]: The objects.
+        """
+        return _json_validator(cls, many=True).validate_json(data)
+
+    @classmethod
+    def load_from_json_file(cls: type[T], file_path: str) -> T:
         """Loads an object from a json file and returns the object.
 
         Args:
@@ -136,11 +342,46 @@ class BaseObject(SQLModel):
             object: The objects.
         """
         try:
-            with open(file_path, "r") as file:
-                return cls(**json.load(file))
+            with open(file_path, "rb") as file:
+                return cls.load_from_json(file.read())
         except ValidationError as e:
-            raise ValidationError(f"Unable to load file {file_path}. Some fields are missing . \n {e}") from e
+            raise ValueError(f"Unable to load file {file_path}. Some fields are missing . \n {e}") from e
         except FileNotFoundError as e:
             raise FileNotFoundError(f"Unable to load file {file_path}. File not Found.") from e
         except Exception as e:
             raise Exception(f"Unable to load file {file_path}. {e}") from e
+
+    @classmethod
+    def load_list_from_json_file(cls: type[T], file_path: str) -> list[T]:
+        """Loads a list of objects from a json file written by `save_list_to_json_file`.
+
+        Args:
+            file_path (str): The path to the file.
+
+        Returns:
+            list[object]: The objects.
+        """
+        try:
+            with open(file_path, "rb") as file:
+                return cls.load_list_from_json(file.read())
+        except ValidationError as e:
+            raise ValueError(f"Unable to load file {file_path}. Some fields are missing . \n {e}") from e
+        except FileNotFoundError as e:
+            raise FileNotFoundError(f"Unable to load file {file_path}. File not Found.") from e
+        except Exception as e:
+            raise Exception(f"Unable to load file {file_path}. {e}") from e
+
+
+class TrustedObject(BaseObject):
+    """This class is the base class for the response models built by the server.
+
+    Instances are trusted once built: assignments are not validated and instances are not validated again when nested
+    in another model or checked against a route's `response_model`. Combined with `trusted`, a response object costs no
+    validation at all. Request models must keep deriving from `BaseObject`.
+    """
+
+    class Config:
+        """This class is used to configure the TrustedObject class, on top of the BaseObject configuration."""
+
+        validate_assignment = False
+        revalidate_instances = "never"
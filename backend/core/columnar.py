@@ -0,0 +1,266 @@
+"""
+This module provides a columnar binary file format for lists of `BaseObject` of the same class.
+
+Every field is stored as a contiguous NumPy array: integers, floats and booleans as is, dates and datetimes as
+`datetime64` and strings as codes into a table of distinct values, so repeated names are stored once. Optional fields
+get a separate validity mask. The file starts with a small json header giving the offset of every array, and arrays
+are 64-byte aligned, so a reader memory-maps the file and reads one column, or materializes one row, without
+deserializing the rest. Unlike pickle, loading a file never executes code.
+
+Layout: `MAGIC`, the header length (little-endian uint64), the json header, then the arrays.
+
+**Key Classes:**
+
+- `ColumnarFile`: A memory-mapped columnar file, giving lazy access to its rows and columns.
+
+**Key Functions:**
+
+- `write_columnar`: Writes a list of objects of the same class to a columnar file.
+"""
+
+import json
+import types
+import typing
+from datetime import date, datetime, timezone
+from typing import Any, Generic, Iterator, Literal, Sequence, TypeVar, overload
+
+import numpy as np
+
+if typing.TYPE_CHECKING:
+    from backend.core.base_object import BaseObject
+
+MAGIC = b"BOCOLv1\n"
+ALIGNMENT = 64
+
+T = TypeVar("T", bound="BaseObject")
+
+KINDS: dict[type, str] = {bool: "bool", int: "int", float: "float", str: "str", datetime: "datetime", date: "date"}
+DTYPES = {"bool": "?", "int": "<i8", "float": "<f8", "datetime": "<M8[us]", "date": "<M8[D]", "str": "<i4"}
+
+
+def _field_kind(annotation: Any) -> tuple[str, bool]:
+    """Returns the storage kind of a field annotation and whether it is optional."""
+    nullable = False
+    if typing.get_origin(annotation) in (typing.Union, types.UnionType):
+        arguments = [argument for argument in typing.get_args(annotation) if argument is not type(None)]
+        nullable = len(arguments) < len(typing.get_args(annotation))
+        annotation = arguments[0] if len(arguments) == 1 else annotation
+    literal_values = typing.get_args(annotation) if typing.get_origin(annotation) is Literal else ()
+    if literal_values and all(isinstance(value, str) for value in literal_values):
+        annotation = str
+    if annotation not in KINDS:
+        raise TypeError(f"Fields of type {annotation} cannot be stored in a columnar file")
+    return KINDS[annotation], nullable
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _model_name(cls: type) -> str:
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def _column_arrays(kind: str, values: list[Any]) -> tuple[dict[str, np.ndarray], dict[str, Any]]:
+    """Returns the arrays storing a column and the extra header attributes needed to read it back."""
+    arrays: dict[str, np.ndarray] = {}
+    attributes: dict[str, Any] = {}
+    if kind == "str":
+        codes: dict[str, int] = {}
+        arrays["values"] = np.fromiter(
+            (-1 if value is None else codes.setdefault(value, len(codes)) for value in values),
+            dtype=DTYPES[kind],
+            count=len(values),
+        )
+        encoded = [value.encode() for value in codes]
+        arrays["offsets"] = np.zeros(len(encoded) + 1, dtype="<i8")
+        np.cumsum([len(value) for value in encoded], out=arrays["offsets"][1:])
+        arrays["table"] = np.frombuffer(b"".join(encoded), dtype="u1")
+        return arrays, attributes
+
+    present = [value is not None for value in values]
+    if kind == "datetime":
+        aware = [value.tzinfo is not None for value in values if value is not None]
+        attributes["utc"] = bool(aware) and all(aware)
+        # Aware datetimes are stored in UTC, as naive `datetime64` values.
+        values = [
+            value.astimezone(timezone.utc).replace(tzinfo=None) if value is not None and value.tzinfo else value
+            for value in values
+        ]
+    filler = {"bool": False, "int": 0, "float": 0.0, "datetime": np.datetime64(0, "us"), "date": np.datetime64(0, "D")}
+    arrays["values"] = np.array([value if value is not None else filler[kind] for value in values], dtype=DTYPES[kind])
+    if not all(present):
+        arrays["mask"] = np.array(present, dtype="?")
+    return arrays, attributes
+
+
+def write_columnar(file_path: str, cls: type["BaseObject"], objects: Sequence["BaseObject"]) -> None:
+    """
+    Writes a list of objects of the same class to a columnar file.
+
+    Args:
+        file_path (str): The path to the file.
+        cls (type[BaseObject]): The class of the objects.
+        objects (Sequence[BaseObject]): The objects.
+
+    Raises:
+        TypeError: If an object is not an instance of `cls`, or a field is not a bool, int, float, str, date or
+            datetime, optional or not.
+
+    """
+    for obj in objects:
+        if type(obj) is not cls:
+            raise TypeError(f"Expected {cls.__name__} objects, got {type(obj).__name__}")
+
+    columns: list[dict[str, Any]] = []
+    buffers: list[tuple[int, np.ndarray]] = []
+    offset = 0
+    for name, field in cls.model_fields.items():
+        kind, nullable = _field_kind(field.annotation)
+        arrays, attributes = _column_arrays(kind, [getattr(obj, name) for obj in objects])
+        column: dict[str, Any] = {"name": name, "kind": kind, "nullable": nullable, "arrays": {}} | attributes
+        for array_name, array in arrays.items():
+            offset = _aligned(offset)
+            column["arrays"][array_name] = {"offset": offset, "dtype": array.dtype.str, "length": len(array)}
+            buffers.append((offset, array))
+            offset += array.nbytes
+        columns.append(column)
+
+    header = json.dumps({"model": _model_name(cls), "rows": len(objects), "columns": columns}).encode()
+    start = _aligned(len(MAGIC) + 8 + len(header))
+    with open(file_path, "wb") as file:
+        file.write(MAGIC + len(header).to_bytes(8, "little") + header)
+        for offset, array in buffers:
+            file.write(b"\0" * (start + offset - file.tell()))
+            file.write(array.tobytes())
+
+
+class ColumnarFile(Generic[T]):
+    """
+    A memory-mapped columnar file written by `write_columnar`.
+
+    Only the pages of the columns that are read are loaded from disk. Rows are materialized one at a time with
+    `model_construct`, as the values were validated when the objects were created and are typed by the file.
+
+    Attributes:
+        cls (type[BaseObject]): The class of the objects.
+        columns (list[str]): The names of the columns, in field order.
+
+    """
+
+    def __init__(self, file_path: str, cls: type[T]) -> None:
+        with open(file_path, "rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{file_path} is not a columnar file")
+            header_length = int.from_bytes(file.read(8), "little")
+            header = json.loads(file.read(header_length))
+        if header["model"] != _model_name(cls):
+            raise ValueError(f"{file_path} stores {header['model']} objects, not {_model_name(cls)}")
+
+        self.cls = cls
+        self._rows: int = header["rows"]
+        self._columns: dict[str, dict[str, Any]] = {column["name"]: column for column in header["columns"]}
+        self.columns = list(self._columns)
+        self._start = _aligned(len(MAGIC) + 8 + header_length)
+        self._map: np.ndarray | None = np.memmap(file_path, dtype="u1", mode="r")
+        self._tables: dict[str, list[str]] = {}
+
+    def _array(self, name: str, array_name: str) -> np.ndarray | None:
+        if self._map is None:
+            raise ValueError("I/O operation on a closed columnar file")
+        specification = self._columns[name]["arrays"].get(array_name)
+        if specification is None:
+            return None
+        dtype = np.dtype(specification["dtype"])
+        offset = self._start + specification["offset"]
+        return self._map[offset : offset + dtype.itemsize * specification["length"]].view(dtype)
+
+    def _table(self, name: str) -> list[str]:
+        if name not in self._tables:
+            offsets, table = self._array(name, "offsets"), self._array(name, "table")
+            assert offsets is not None and table is not None
+            data = table.tobytes()
+            self._tables[name] = [data[begin:end].decode() for begin, end in zip(offsets[:-1], offsets[1:])]
+        return self._tables[name]
+
+    def __len__(self) -> int:
+        return self._rows
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Returns a column, without reading the others.
+
+        Args:
+            name (str): The name of the field.
+
+        Returns:
+            np.ndarray: A read-only view on the file for numbers, booleans and dates, masked where values are None.
+                Strings are returned as an array of `str` objects, None where missing.
+
+        """
+        if name not in self._columns:
+            raise KeyError(f"{self.cls.__name__} has no column {name}")
+        values = self._array(name, "values")
+        assert values is not None
+        if self._columns[name]["kind"] == "str":
+            table = np.array(self._table(name) + [None], dtype=object)
+            return table[values]
+        mask = self._array(name, "mask")
+        return values if mask is None else np.ma.MaskedArray(values, mask=~mask)
+
+    def _value(self, name: str, index: int) -> Any:
+        column = self._columns[name]
+        values = self._array(name, "values")
+        assert values is not None
+        if column["kind"] == "str":
+            code = int(values[index])
+            return None if code < 0 else self._table(name)[code]
+        mask = self._array(name, "mask")
+        if mask is not None and not mask[index]:
+            return None
+        value = values[index].item()
+        if column["kind"] == "datetime" and column.get("utc"):
+            value = value.replace(tzinfo=timezone.utc)
+        return value
+
+    def row(self, index: int) -> T:
+        """
+        Materializes one row, reading only that row from every column.
+
+        Args:
+            index (int): The position of the row, negative positions count from the end.
+
+        Returns:
+            BaseObject: The object.
+
+        """
+        if not -self._rows <= index < self._rows:
+            raise IndexError(f"Row {index} out of range for {self._rows} rows")
+        index %= self._rows
+        return self.cls.model_construct(**{name: self._value(name, index) for name in self.columns})
+
+    @overload
+    def __getitem__(self, index: int) -> T:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[T]:
+        ...
+
+    def __getitem__(self, index: int | slice) -> T | list[T]:
+        if isinstance(index, slice):
+            return [self.row(position) for position in range(*index.indices(self._rows))]
+        return self.row(index)
+
+    def __iter__(self) -> Iterator[T]:
+        return (self.row(index) for index in range(self._rows))
+
+    def close(self) -> None:
+        """Releases the memory map. Arrays returned by `column` stay valid until they are garbage collected."""
+        self._map = None
+
+    def __enter__(self) -> "ColumnarFile[T]":
+        return self
+
+    def __exit__(self, *_: Any) -> None:
+        self.close()
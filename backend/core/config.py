@@ -1,14 +1,15 @@
-from typing import Any, Optional
+import os
+from typing import Any, Literal, Optional
 
-from dotenv import load_dotenv
 from pydantic import AnyHttpUrl, PostgresDsn, field_validator
 from pydantic_core.core_schema import ValidationInfo
-from pydantic_settings import BaseSettings
-
-load_dotenv()
+from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
 class Settings(BaseSettings):
+    # `.env` is read by the settings themselves, without exporting its variables to the process environment.
+    model_config = SettingsConfigDict(case_sensitive=True, env_file=".env", extra="ignore")
+
     PROJECT_NAME: str = ""
     BACKEND_CORS_ORIGINS: list[AnyHttpUrl] = []
 
@@ -20,14 +21,98 @@ class Settings(BaseSettings):
             return v
         raise ValueError(v)
 
+    HOST: str = "0.0.0.0"
+    PORT: int = 8000
+    # Worker processes of `poetry run start`, one per CPU when unset.
+    SERVER_WORKERS: Optional[int] = None
+    SERVER_LOOP: Literal["asyncio", "uvloop"] = "asyncio"
+    SERVER_HTTP: Literal["h11", "httptools"] = "h11"
+    SERVER_BACKLOG: int = 2048
+    # Keep idle connections open longer than the load balancer in front, so it never reuses a closed one.
+    SERVER_KEEP_ALIVE_TIMEOUT: int = 5
+    SERVER_GRACEFUL_TIMEOUT: int = 30
+    SERVER_LIMIT_CONCURRENCY: Optional[int] = None
+    SERVER_MAX_REQUESTS: Optional[int] = None
+    SERVER_ACCESS_LOG: bool = True
+    # Proxies whose X-Forwarded-For header gives the client address, e.g. the load balancer's IP or "*" when only it can
+    # reach the workers; uvicorn's default (FORWARDED_ALLOW_IPS, or 127.0.0.1) when unset.
+    SERVER_FORWARDED_ALLOW_IPS: Optional[str] = None
+    METRICS_ENABLED: bool = True
+
+    LOG_LEVEL: str = "DEBUG"
+    LOG_FORMAT: Literal["text", "json"] = "text"
+    LOG_QUEUE_SIZE: int = 10_000
+    # Share of the records kept per level, e.g. {"DEBUG": 0.1}.
+    LOG_SAMPLE_RATES: dict[str, float] = {}
+    # Records kept per second per level, e.g. {"ERROR": 50}.
+    LOG_RATE_LIMITS: dict[str, float] = {}
+
     POSTGRES_SERVER: str = "localhost"
     POSTGRES_USER: str = "postgres"
     POSTGRES_PASSWORD: str = "postgres"
     POSTGRES_DB: str = "postgres"
     DATABASE_URI: str = ""
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    # Connections older than this many seconds are replaced on checkout, never when -1.
+    DB_POOL_RECYCLE: int = -1
+    # "always" pings on every checkout, "idle" only connections idle for DB_POOL_PRE_PING_IDLE_SECONDS.
+    DB_POOL_PRE_PING: Literal["always", "idle", "never"] = "idle"
+    DB_POOL_PRE_PING_IDLE_SECONDS: float = 30.0
+    # Connections the database accepts from the whole service, shared by the worker processes.
+    DB_MAX_CONNECTIONS: Optional[int] = None
+    DB_CREATE_SCHEMA_ON_STARTUP: bool = True
     SECRET_KEY: str = ""
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24
+    TOKEN_CACHE_SIZE: int = 1024
+    # Entries of the user cache, two per user (by id and by username), and the seconds they are kept.
+    USER_CACHE_SIZE: int = 20_000
+    USER_CACHE_TTL: float = 300.0
+
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_EXECUTOR: Literal["thread", "process"] = "thread"
+    PASSWORD_HASH_WORKERS: Optional[int] = None
+    PASSWORD_HASH_MAX_PENDING: Optional[int] = None
+    PASSWORD_HASH_QUEUE_TIMEOUT: float = 5.0
+    # Login attempts per minute, and at once, allowed per username and per client IP; no limit when the rate is unset.
+    # Behind a load balancer, set SERVER_FORWARDED_ALLOW_IPS, or every login counts against the balancer's IP.
+    LOGIN_USERNAME_RATE_PER_MINUTE: Optional[float] = 10.0
+    LOGIN_USERNAME_BURST: int = 5
+    LOGIN_IP_RATE_PER_MINUTE: Optional[float] = 60.0
+    LOGIN_IP_BURST: int = 30
+    LOGIN_THROTTLE_MAX_KEYS: int = 100_000
+    # Login password checks waiting for or running on the password pool at once, twice its workers when unset.
+    LOGIN_MAX_CONCURRENT_CHECKS: Optional[int] = None
+    LOGIN_CHECK_QUEUE_TIMEOUT: float = 1.0
+    BULK_INSERT_BATCH_SIZE: int = 1000
+    BULK_MAX_ROWS: int = 100_000
+    # Rows read from the database cursor, and encoded, at a time by the streaming exports.
+    EXPORT_CHUNK_SIZE: int = 1000
+    # Snapshot built by `poetry run snapshot-fixtures`, memory-mapped by every worker.
+    FIXTURE_STORE_PATH: Optional[str] = None
+    STANDINGS_FORM_LENGTH: int = 5
+    PREDICTION_MAX_GOALS: int = 10
+    PREDICTION_HALF_LIFE_DAYS: Optional[float] = None
+    ELO_K: float = 20.0
+    ELO_HOME_ADVANTAGE: float = 60.0
+    ELO_INITIAL_RATING: float = 1500.0
+    RATING_CHECKPOINT_INTERVAL: int = 100
+    # Seconds between two checks by every server worker of the data versions, e.g. to drop the model after an ingestion.
+    DATA_VERSION_POLL_INTERVAL: float = 5.0
+    # Background jobs run by every server worker on a pool of JOB_WORKERS processes, polling the job table.
+    JOBS_ENABLED: bool = True
+    JOB_WORKERS: int = 1
+    JOB_POLL_INTERVAL: float = 1.0
+    # A running job renews its lease every JOB_HEARTBEAT_INTERVAL seconds; a lease not renewed for JOB_LEASE_SECONDS
+    # is taken as a crashed worker, and the job is put back to pending.
+    JOB_HEARTBEAT_INTERVAL: float = 5.0
+    JOB_LEASE_SECONDS: float = 30.0
+    # Seconds a stopping server worker waits for its running jobs before terminating them.
+    JOB_SHUTDOWN_TIMEOUT: float = 5.0
+    # Jobs of a type running at once across the service, by type, overriding the built-in limits.
+    JOB_CONCURRENCY: dict[str, int] = {}
 
     @field_validator("DATABASE_URI", mode="before")
     @classmethod
@@ -43,9 +128,9 @@ class Settings(BaseSettings):
         )
         return str(postgres_dsn)
 
-    class ConfigDict:
-        case_sensitive = True
-        env_file = ".env"
+    def server_workers(self) -> int:
+        """Returns the number of server worker processes."""
+        return self.SERVER_WORKERS or os.cpu_count() or 1
 
 
 settings = Settings()
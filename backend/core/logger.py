@@ -1,16 +1,208 @@
 """
 Basic logging, centralized so sinks/other logging necessities can be customized centrally
+
+Records are written by a background thread: the calling thread only renders the message and puts the record on a
+bounded queue, and a `QueueListener` formats it and writes it to the sink, so a burst of logs never blocks a request
+handler on the stream. Tracebacks are formatted by the listener too. When the queue is full, records are dropped
+rather than waited for.
+
+Records can be sampled (`LOG_SAMPLE_RATES`) and rate limited (`LOG_RATE_LIMITS`) per level before they are queued.
+Dropped records are counted in the `log_records_dropped_total` metric. Records are rendered as text or, with
+`LOG_FORMAT=json`, as one json object per line.
+
+Importing the module starts no thread: the listener is started by `start_logging`, called by the application
+lifespan, and stopped, after writing the queued records, by `stop_logging` (called by the lifespan on shutdown) or at
+exit. While it is stopped, e.g. in command line tools and job pool processes, records are written synchronously. A
+running listener is restarted around `fork`, so forked processes get their own queue and thread.
+
+**Key Classes:**
+
+- `JsonFormatter`: Formats records as json objects.
+- `SamplingFilter`: Drops a share of the records, and the records above a rate, per level.
+- `BackgroundQueueHandler`: Queues records for a background thread writing them to a sink.
+
+**Key Functions:**
+
+- `start_logging`: Starts writing records from a background thread.
+- `stop_logging`: Writes the queued records and stops the background thread.
 """
 
+import atexit
+import copy
+import json
 import logging
+import os
+import queue
+import random
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any
 
-logger = logging.getLogger(__name__)
-logger.setLevel(logging.DEBUG)
-logger.propagate = False
+from backend.core.config import settings
+from backend.core.metrics import Counter
 
-formatter = logging.Formatter(
+TEXT_FORMAT = (
     r"%(asctime)s - %(levelname)-7s %(threadName)-12s [%(filename)s:%(lineno)s - %(funcName)s()] - %(message)s"
 )
-handler = logging.StreamHandler()
-handler.setFormatter(formatter)
+
+LOG_RECORDS_DROPPED = Counter(
+    "log_records_dropped_total", "Log records dropped, by level and reason.", ("level", "reason")
+)
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as json objects, on one line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+            "file": record.filename,
+            "line": record.lineno,
+            "function": record.funcName,
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Drops a share of the records of some levels, and the records of some levels above a rate.
+
+    Rates are enforced with a token bucket per level holding one second of records, so short bursts pass.
+
+    Attributes:
+        sample_rates (dict[str, float]): The share of records kept per level name, 1 for all of them.
+        rate_limits (dict[str, float]): The records per second kept per level name.
+
+    """
+
+    def __init__(self, sample_rates: dict[str, float], rate_limits: dict[str, float]) -> None:
+        super().__init__()
+        self.sample_rates = {level.upper(): rate for level, rate in sample_rates.items()}
+        self.rate_limits = {level.upper(): rate for level, rate in rate_limits.items()}
+        self._buckets: dict[str, tuple[float, float]] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        level = record.levelname
+        sample_rate = self.sample_rates.get(level)
+        if sample_rate is not None and random.random() >= sample_rate:
+            LOG_RECORDS_DROPPED.inc(labels=(level, "sampled"))
+            return False
+        rate_limit = self.rate_limits.get(level)
+        if rate_limit is not None:
+            now = time.monotonic()
+            tokens, last = self._buckets.get(level, (rate_limit, now))
+            tokens = min(rate_limit, tokens + (now - last) * rate_limit)
+            if tokens < 1:
+                self._buckets[level] = (tokens, now)
+                LOG_RECORDS_DROPPED.inc(labels=(level, "rate_limited"))
+                return False
+            self._buckets[level] = (tokens - 1, now)
+        return True
+
+
+class _Listener(QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # Waits for room in a full queue, so stopping writes every queued record, unless the thread is gone.
+        while self._thread is not None and self._thread.is_alive():
+            try:
+                self.queue.put(self._sentinel, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+
+class BackgroundQueueHandler(QueueHandler):
+    """
+    Queues records for a `QueueListener` thread writing them to a sink, or writes them to the sink while stopped.
+
+    Attributes:
+        sink (logging.Handler): The handler writing the records.
+        queue_size (int): The capacity of the queue.
+
+    """
+
+    def __init__(self, sink: logging.Handler, queue_size: int) -> None:
+        super().__init__(queue.Queue(queue_size))
+        self.sink = sink
+        self.queue_size = queue_size
+        self.listener: QueueListener | None = None
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only the message is rendered in the calling thread, the listener formats the record and its traceback.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if self.listener is None:
+            self.sink.handle(record)
+            return
+        try:
+            self.queue.put_nowait(self.prepare(record))
+        except queue.Full:
+            LOG_RECORDS_DROPPED.inc(labels=(record.levelname, "queue_full"))
+        except Exception:
+            self.handleError(record)
+
+    def start(self) -> None:
+        """Starts the listener thread on a new queue, unless it is running."""
+        if self.listener is None:
+            self.queue = queue.Queue(self.queue_size)
+            self.listener = _Listener(self.queue, self.sink, respect_handler_level=True)
+            self.listener.start()
+
+    def stop(self) -> None:
+        """Writes the queued records and stops the listener thread, if it is running."""
+        listener, self.listener = self.listener, None
+        if listener is not None:
+            listener.stop()
+
+
+logger = logging.getLogger(__name__)
+logger.setLevel(settings.LOG_LEVEL)
+logger.propagate = False
+
+formatter = JsonFormatter() if settings.LOG_FORMAT == "json" else logging.Formatter(TEXT_FORMAT)
+sink = logging.StreamHandler()
+sink.setFormatter(formatter)
+handler = BackgroundQueueHandler(sink, settings.LOG_QUEUE_SIZE)
+handler.addFilter(SamplingFilter(settings.LOG_SAMPLE_RATES, settings.LOG_RATE_LIMITS))
 logger.addHandler(handler)
+
+
+def start_logging() -> None:
+    """Starts writing records from a background thread, unless it is running."""
+    handler.start()
+
+
+def stop_logging() -> None:
+    """Writes the queued records and stops the background thread; records are then written synchronously."""
+    handler.stop()
+
+
+_running_before_fork = False
+
+
+def _before_fork() -> None:
+    global _running_before_fork
+    _running_before_fork = handler.listener is not None
+    stop_logging()
+
+
+def _after_fork() -> None:
+    if _running_before_fork:
+        start_logging()
+
+
+atexit.register(stop_logging)
+# A forked child has no listener thread, and the queue could be left locked: the parent stops a running listener, and
+# both processes start their own.
+os.register_at_fork(before=_before_fork, after_in_parent=_after_fork, after_in_child=_after_fork)
@@ -0,0 +1,205 @@
+"""
+This module provides minimal Prometheus metrics: counters, gauges and histograms, rendered in the text exposition
+format.
+
+Metrics are updated on the request path, so updates take no lock: a labelled series is a dictionary entry updated in
+place, which is safe on the event loop thread. An update racing with another thread, e.g. from a tool using the
+synchronous engine, may be lost, which is acceptable for metrics. Rendering copies every series before reading it.
+
+Metrics are kept per process: with several server workers, every scrape reports the worker that served it.
+
+**Key Classes:**
+
+- `Counter`: A value that only goes up, e.g. a number of requests.
+- `Gauge`: A value that goes up and down, e.g. the requests in flight.
+- `Histogram`: Observations counted in cumulative buckets, e.g. latencies.
+- `Registry`: A set of metrics rendered together.
+
+**Key Functions:**
+
+- `render`: Renders the metrics of a registry in the Prometheus text format.
+"""
+
+import bisect
+import math
+from abc import ABC, abstractmethod
+from typing import Any, Iterable, Iterator
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds in seconds, from a fast query to a slow request.
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Labels = tuple[str, ...]
+
+
+class Registry:
+    """A set of metrics rendered together, by name."""
+
+    def __init__(self) -> None:
+        self.metrics: dict[str, "Metric"] = {}
+
+    def register(self, metric: "Metric") -> None:
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric {metric.name} is already registered")
+        self.metrics[metric.name] = metric
+
+
+REGISTRY = Registry()
+
+
+class Metric(ABC):
+    """
+    The base of the metric types.
+
+    Attributes:
+        name (str): The name of the metric.
+        documentation (str): The help text of the metric.
+        labelnames (tuple[str, ...]): The names of the labels, whose values are given in order on every update.
+
+    """
+
+    kind = "untyped"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Iterable[str] = (), registry: Registry | None = REGISTRY
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        if registry is not None:
+            registry.register(self)
+
+    @abstractmethod
+    def samples(self) -> Iterator[tuple[str, Labels, Labels, float]]:
+        """Yields the samples of the metric as (suffix, label names, label values, value)."""
+
+
+class Counter(Metric):
+    """A value that only goes up."""
+
+    kind = "counter"
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.values: dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1.0, labels: Labels = ()) -> None:
+        """
+        Increments the series of the given label values.
+
+        Args:
+            amount (float): The increment, not negative.
+            labels (tuple[str, ...]): The label values, in the order of `labelnames`.
+
+        """
+        self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def samples(self) -> Iterator[tuple[str, Labels, Labels, float]]:
+        for labels, value in list(self.values.items()):
+            yield "", self.labelnames, labels, value
+
+
+class Gauge(Counter):
+    """A value that goes up and down."""
+
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, labels: Labels = ()) -> None:
+        """Decrements the series of the given label values."""
+        self.values[labels] = self.values.get(labels, 0.0) - amount
+
+    def set(self, value: float, labels: Labels = ()) -> None:
+        """Sets the series of the given label values."""
+        self.values[labels] = value
+
+
+class Histogram(Metric):
+    """
+    Observations counted in buckets, rendered as cumulative `_bucket` series with their `_sum` and `_count`.
+
+    Attributes:
+        buckets (tuple[float, ...]): The upper bounds of the buckets, in increasing order, without `+Inf`.
+
+    """
+
+    kind = "histogram"
+
+    def __init__(self, *args: Any, buckets: Iterable[float] = DEFAULT_BUCKETS, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets))
+        # Per series: the observations in every bucket (not cumulative), then above the last one, and their sum.
+        self.series: dict[Labels, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        """
+        Records an observation in the series of the given label values.
+
+        Args:
+            value (float): The observation.
+            labels (tuple[str, ...]): The label values, in the order of `labelnames`.
+
+        """
+        series = self.series.get(labels)
+        if series is None:
+            series = self.series.setdefault(labels, ([0] * (len(self.buckets) + 1), [0.0]))
+        series[0][bisect.bisect_left(self.buckets, value)] += 1
+        series[1][0] += value
+
+    def samples(self) -> Iterator[tuple[str, Labels, Labels, float]]:
+        bucket_labelnames = self.labelnames + ("le",)
+        for labels, (counts, total) in list(self.series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (math.inf,), list(counts)):
+                cumulative += count
+                yield "_bucket", bucket_labelnames, labels + (_format_value(bound),), cumulative
+            yield "_sum", self.labelnames, labels, total[0]
+            yield "_count", self.labelnames, labels, cumulative
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value))
+
+
+def _escape(value: str, quotes: bool = True) -> str:
+    value = value.replace("\\", r"\\").replace("\n", r"\n")
+    return value.replace('"', r"\"") if quotes else value
+
+
+def render_metric(metric: Metric) -> str:
+    """
+    Renders one metric in the Prometheus text format.
+
+    Args:
+        metric (Metric): The metric.
+
+    Returns:
+        str: The `HELP` and `TYPE` lines, then one line per sample.
+
+    """
+    lines = [
+        f"# HELP {metric.name} {_escape(metric.documentation, quotes=False)}",
+        f"# TYPE {metric.name} {metric.kind}",
+    ]
+    for suffix, labelnames, labels, value in metric.samples():
+        label_text = ",".join(f'{name}="{_escape(str(label))}"' for name, label in zip(labelnames, labels))
+        if label_text:
+            label_text = f"{{{label_text}}}"
+        lines.append(f"{metric.name}{suffix}{label_text} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+
+def render(registry: Registry = REGISTRY) -> str:
+    """
+    Renders the metrics of a registry in the Prometheus text format.
+
+    Args:
+        registry (Registry): The registry, the default one if not given.
+
+    Returns:
+        str: The metrics.
+
+    """
+    return "".join(render_metric(metric) for metric in list(registry.metrics.values()))
@@ -0,0 +1,156 @@
+"""
+This module collects metrics of the database connection pools, so pools can be sized from data.
+
+`PoolMetrics` counts the connections opened, closed and invalidated and the checkouts from the SQLAlchemy pool
+events of an engine, and reads the checked out, idle and overflow connections from the pool when a snapshot is taken.
+The checkout wait time, from asking the pool for a connection to getting one, has no pool event: it is measured by
+the pool class returned by `timed_pool_class`, which also counts the checkouts that timed out.
+
+Counters are plain attributes updated without locks: the asynchronous engine only uses them from the event loop,
+and a lost update on the synchronous engine, used by tools and migrations, is harmless for metrics.
+
+**Key Classes:**
+
+- `PoolMetrics`: The metrics of the connection pool of an engine.
+
+**Key Functions:**
+
+- `timed_pool_class`: Returns a pool class measuring the checkout wait time.
+"""
+
+import bisect
+import time
+from typing import Any
+
+from sqlalchemy import Engine, event, exc
+from sqlalchemy.pool import Pool, PoolProxiedConnection, QueuePool
+
+from backend.models.pool import PoolStats
+
+# Upper bounds, in seconds, of the checkout wait time histogram buckets.
+WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class PoolMetrics:
+    """
+    The metrics of the connection pool of an engine, kept across engines replacing each other.
+
+    Attributes:
+        name (str): The name of the pool in snapshots.
+        connections_opened (int): The connections opened by the pool.
+        connections_closed (int): The connections closed by the pool.
+        invalidations (int): The connections invalidated, e.g. after a disconnection.
+        checkouts (int): The connections handed out by the pool.
+        timeouts (int): The checkouts that gave up after `DB_POOL_TIMEOUT` seconds.
+        wait_seconds_total (float): The time spent waiting for checkouts.
+        wait_seconds_max (float): The longest wait for a checkout.
+        wait_buckets (list[int]): The checkouts per wait time bucket of `WAIT_BUCKETS`, then above the last one.
+
+    """
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.connections_opened = 0
+        self.connections_closed = 0
+        self.invalidations = 0
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.wait_buckets = [0] * (len(WAIT_BUCKETS) + 1)
+        self._engine: Engine | None = None
+
+    def attach(self, engine: Engine) -> None:
+        """
+        Collects the metrics of the pool of an engine, replacing the previous engine.
+
+        Args:
+            engine (Engine): The engine, the `sync_engine` of an asynchronous one.
+
+        """
+        event.listen(engine, "connect", self._on_connect)
+        event.listen(engine, "close", self._on_close)
+        event.listen(engine, "invalidate", self._on_invalidate)
+        event.listen(engine, "checkout", self._on_checkout)
+        self._engine = engine
+
+    def _on_connect(self, *_: Any) -> None:
+        self.connections_opened += 1
+
+    def _on_close(self, *_: Any) -> None:
+        self.connections_closed += 1
+
+    def _on_invalidate(self, *_: Any) -> None:
+        self.invalidations += 1
+
+    def _on_checkout(self, *_: Any) -> None:
+        self.checkouts += 1
+
+    def observe_wait(self, seconds: float) -> None:
+        """
+        Records the wait time of a checkout.
+
+        Args:
+            seconds (float): The time from asking the pool for a connection to getting it, or giving up.
+
+        """
+        self.wait_seconds_total += seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+        self.wait_buckets[bisect.bisect_left(WAIT_BUCKETS, seconds)] += 1
+
+    def snapshot(self) -> PoolStats:
+        """
+        Returns the current metrics of the pool.
+
+        Returns:
+            PoolStats: The metrics, with zero gauges when no engine is attached or its pool is not a queue pool.
+
+        """
+        pool = self._engine.pool if self._engine is not None else None
+        size = checked_out = idle = overflow = 0
+        if isinstance(pool, QueuePool):
+            size, checked_out, idle = pool.size(), pool.checkedout(), pool.checkedin()
+            overflow = max(0, pool.overflow())
+        return PoolStats.trusted(
+            name=self.name,
+            size=size,
+            checked_out=checked_out,
+            idle=idle,
+            overflow=overflow,
+            connections_opened=self.connections_opened,
+            connections_closed=self.connections_closed,
+            invalidations=self.invalidations,
+            checkouts=self.checkouts,
+            timeouts=self.timeouts,
+            wait_seconds_total=self.wait_seconds_total,
+            wait_seconds_max=self.wait_seconds_max,
+            wait_buckets=dict(zip([str(bound) for bound in WAIT_BUCKETS] + ["+Inf"], self.wait_buckets)),
+        )
+
+
+def timed_pool_class(base: type[Pool], metrics: PoolMetrics) -> type[Pool]:
+    """
+    Returns a subclass of a pool class recording the checkout wait times and timeouts into `metrics`.
+
+    Pools are recreated with their own class when an engine is disposed, so the metrics carry over.
+
+    Args:
+        base (type[Pool]): The pool class of the engine, e.g. `QueuePool` or `AsyncAdaptedQueuePool`.
+        metrics (PoolMetrics): The metrics of the engine.
+
+    Returns:
+        type[Pool]: The pool class.
+
+    """
+
+    def connect(self: Pool) -> PoolProxiedConnection:
+        start = time.perf_counter()
+        try:
+            return base.connect(self)
+        except exc.TimeoutError:
+            metrics.timeouts += 1
+            raise
+        finally:
+            metrics.observe_wait(time.perf_counter() - start)
+
+    return type(f"Timed{base.__name__}", (base,), {"connect": connect, "__module__": __name__})
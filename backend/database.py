@@ -1,25 +1,215 @@
 """
 This module provides the necessary components for working with the database.
 
-The module sets up the database engine, session factory, and declarative base for defining database models.
+The module provides the database engines and the session factory. Engines are created on first use, not on import,
+so importing the application never connects to the database: a worker process only opens connections once it serves
+requests. The schema is managed by `backend.migrations.upgrade`, run by the application lifespan or by
+`poetry run migrate`.
+
+Request handlers use the asynchronous engine through the `get_session` dependency (`SessionDep`), so database I/O
+does not block the event loop. The synchronous engine is used for schema management and command line tools.
+
+The metrics of both pools are collected in `POOL_METRICS`, from the pool events (see `backend.core.pool_metrics`).
 
 """
 
-from sqlalchemy.ext.declarative import declared_attr
+import threading
+import time
+from typing import Annotated, Any, AsyncIterator
 
+from fastapi import Depends
+from sqlalchemy import Engine, event, exc
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlmodel import create_engine
-from sqlmodel import SQLModel
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from backend.core.config import settings
+from backend.core.pool_metrics import PoolMetrics, timed_pool_class
+from backend.instrumentation import instrument_engine
+
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+UPSERT_DIALECTS: dict[str, Any] = {
+    "postgresql": postgresql.insert,
+    "sqlite": sqlite.insert,
+}
+
+
+def to_async_url(database_uri: str) -> URL:
+    """
+    Converts a database URI to the equivalent URL using an asyncio driver.
+
+    Args:
+        database_uri (str): The database URI, e.g. `postgresql://...` or `sqlite:///...`.
+
+    Returns:
+        URL: The URL with an asyncio driver, e.g. `postgresql+asyncpg://...` or `sqlite+aiosqlite:///...`.
+
+    """
+    url = make_url(database_uri)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"Unsupported database backend {backend}")
+    return url.set(drivername=ASYNC_DRIVERS[backend])
+
+
+def to_sync_url(database_uri: str) -> URL:
+    """
+    Converts a database URI to the equivalent URL using the default synchronous driver.
+
+    Args:
+        database_uri (str): The database URI.
+
+    Returns:
+        URL: The URL with the default driver of its backend.
+
+    """
+    url = make_url(database_uri)
+    return url.set(drivername=url.get_backend_name())
+
+
+def pool_options(url: URL) -> dict[str, Any]:
+    """
+    Returns the connection pool options from the settings that apply to the given URL.
+
+    With `DB_MAX_CONNECTIONS` set, the pool and overflow of a worker process are capped to its share of that limit.
+    The "idle" pre-ping strategy is not a pool option: it is implemented by the pool event listeners.
+
+    Args:
+        url (URL): The database URL.
+
+    Returns:
+        dict: The keyword arguments for `create_engine`/`create_async_engine`.
+
+    """
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        # In-memory SQLite uses a single static connection, which takes no pool sizing.
+        return {}
+    pool_size, max_overflow = settings.DB_POOL_SIZE, settings.DB_MAX_OVERFLOW
+    if settings.DB_MAX_CONNECTIONS is not None:
+        # Every worker process opens its own pool, so each one gets its share of the connections.
+        connections = max(1, settings.DB_MAX_CONNECTIONS // settings.server_workers())
+        pool_size = min(pool_size, connections)
+        max_overflow = min(max_overflow, connections - pool_size)
+    return {
+        "pool_pre_ping": settings.DB_POOL_PRE_PING == "always",
+        "pool_size": pool_size,
+        "max_overflow": max_overflow,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+    }
+
+
+def _engine_options(url: URL, metrics: PoolMetrics) -> dict[str, Any]:
+    options = pool_options(url)
+    if options:
+        options["poolclass"] = timed_pool_class(url.get_dialect().get_pool_class(url), metrics)
+    return options
+
+
+def _watch_pool(engine: Engine, metrics: PoolMetrics) -> None:
+    """Collects the pool metrics of an engine and, with the "idle" strategy, pings connections that sat idle."""
+    metrics.attach(engine)
+    if settings.DB_POOL_PRE_PING != "idle":
+        return
+
+    def on_checkin(_dbapi_connection: Any, connection_record: Any) -> None:
+        connection_record.info["idle_since"] = time.monotonic()
+
+    def on_checkout(dbapi_connection: Any, connection_record: Any, _connection_proxy: Any) -> None:
+        idle_since = connection_record.info.pop("idle_since", None)
+        if idle_since is None or time.monotonic() - idle_since < settings.DB_POOL_PRE_PING_IDLE_SECONDS:
+            return
+        try:
+            engine.dialect.do_ping(dbapi_connection)
+        except Exception as e:
+            # The pool invalidates the connection and checks out another one.
+            raise exc.DisconnectionError() from e
+
+    event.listen(engine, "checkin", on_checkin)
+    event.listen(engine, "checkout", on_checkout)
+
+
+# Kept across engines, so counters only grow for the lifetime of the process.
+POOL_METRICS = {"sync": PoolMetrics("sync"), "async": PoolMetrics("async")}
+
+_lock = threading.Lock()
+_engine: Engine | None = None
+_async_engine: AsyncEngine | None = None
+_async_sessionmaker: async_sessionmaker[AsyncSession] | None = None
+
+
+def get_engine() -> Engine:
+    """
+    Returns the synchronous engine of the database configured in the settings, creating it on first call.
+
+    Returns:
+        Engine: The engine.
+
+    """
+    global _engine
+    with _lock:
+        if _engine is None:
+            url = to_sync_url(settings.DATABASE_URI)
+            _engine = create_engine(url, **_engine_options(url, POOL_METRICS["sync"]))
+            _watch_pool(_engine, POOL_METRICS["sync"])
+            instrument_engine(_engine, "sync")
+        return _engine
+
+
+def get_async_engine() -> AsyncEngine:
+    """
+    Returns the asynchronous engine of the database configured in the settings, creating it on first call.
+
+    Returns:
+        AsyncEngine: The engine.
+
+    """
+    return _async_database()[0]
+
+
+def _async_database() -> tuple[AsyncEngine, async_sessionmaker[AsyncSession]]:
+    global _async_engine, _async_sessionmaker
+    with _lock:
+        if _async_engine is None or _async_sessionmaker is None:
+            url = to_async_url(settings.DATABASE_URI)
+            _async_engine = create_async_engine(url, **_engine_options(url, POOL_METRICS["async"]))
+            _watch_pool(_async_engine.sync_engine, POOL_METRICS["async"])
+            instrument_engine(_async_engine.sync_engine, "async")
+            _async_sessionmaker = async_sessionmaker(
+                _async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+            )
+        return _async_engine, _async_sessionmaker
+
+
+async def dispose_engines() -> None:
+    """Closes the connections of both engines and forgets them, so the next use creates them again."""
+    global _engine, _async_engine, _async_sessionmaker
+    with _lock:
+        engine, async_engine = _engine, _async_engine
+        _engine = _async_engine = _async_sessionmaker = None
+    if async_engine is not None:
+        await async_engine.dispose()
+    if engine is not None:
+        engine.dispose()
+
+
+async def get_session() -> AsyncIterator[AsyncSession]:
+    """
+    Yields an asynchronous database session, closed once the request is done.
 
-engine = create_engine(settings.DATABASE_URI, pool_pre_ping=True)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Yields:
+        AsyncSession: The database session.
 
+    """
+    _, session_factory = _async_database()
+    async with session_factory() as session:
+        yield session
 
-Base = declarative_base()
 
-SQLModel.metadata = Base.metadata
-SQLModel.metadata.create_all(engine)
+SessionDep = Annotated[AsyncSession, Depends(get_session)]
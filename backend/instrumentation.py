@@ -0,0 +1,189 @@
+"""
+This module instruments the application for the `/metrics` endpoint.
+
+`MetricsMiddleware` records the latency, status code and in-flight count of HTTP requests, labelled by route template
+(e.g. `/fixtures/{fixture_id}`) rather than by path, so the number of series stays bounded. `instrument_engine` hooks
+the SQLAlchemy cursor events to time every query, and adds each query to the request it runs for, found through a
+context variable set by the middleware.
+
+**Key Classes:**
+
+- `MetricsMiddleware`: An ASGI middleware recording the metrics of HTTP requests.
+
+**Key Functions:**
+
+- `instrument_engine`: Times the queries of an engine.
+- `render_pool_metrics`: Renders the connection pool metrics in the Prometheus text format.
+"""
+
+import time
+from contextvars import ContextVar
+from typing import Any, Iterable
+
+from sqlalchemy import Engine, event
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.core.metrics import Counter, Gauge, Histogram, Metric, render_metric
+from backend.core.pool_metrics import WAIT_BUCKETS, PoolMetrics
+
+UNMATCHED_ROUTE = "unmatched"
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total", "HTTP requests, by method, route and status code.", ("method", "route", "status")
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds", "Latency of HTTP requests until the response is sent.", ("method", "route")
+)
+HTTP_REQUESTS_IN_FLIGHT = Gauge("http_requests_in_flight", "HTTP requests being served.")
+HTTP_REQUEST_DB_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Database queries run per HTTP request, by route.",
+    ("route",),
+    buckets=(0, 1, 2, 3, 5, 10, 25, 50, 100),
+)
+HTTP_REQUEST_DB_DURATION = Histogram(
+    "http_request_db_duration_seconds", "Time spent in database queries per HTTP request, by route.", ("route",)
+)
+DB_QUERIES = Counter("db_queries_total", "Database queries, by engine.", ("engine",))
+DB_QUERY_ERRORS = Counter("db_query_errors_total", "Database queries that raised an error, by engine.", ("engine",))
+DB_QUERY_DURATION = Histogram("db_query_duration_seconds", "Duration of database queries, by engine.", ("engine",))
+
+
+class RequestStats:
+    """The database queries run for the request being served."""
+
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.seconds = 0.0
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar("request_stats", default=None)
+
+
+class MetricsMiddleware:
+    """
+    An ASGI middleware recording the latency, status code and database queries of HTTP requests.
+
+    A plain ASGI middleware rather than a `BaseHTTPMiddleware`, which would wrap every response in a stream.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+        self._routes: dict[Any, str] = {}
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        HTTP_REQUESTS_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            duration = time.perf_counter() - start
+            HTTP_REQUESTS_IN_FLIGHT.dec()
+            _request_stats.reset(token)
+            route = self._route(scope)
+            HTTP_REQUESTS.inc(labels=(scope["method"], route, str(status_code)))
+            HTTP_REQUEST_DURATION.observe(duration, labels=(scope["method"], route))
+            HTTP_REQUEST_DB_QUERIES.observe(stats.queries, labels=(route,))
+            HTTP_REQUEST_DB_DURATION.observe(stats.seconds, labels=(route,))
+
+    def _route(self, scope: Scope) -> str:
+        # The router stores the matched endpoint in the scope; its path template is looked up once per endpoint.
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+        route = self._routes.get(endpoint)
+        if route is None:
+            route = next(
+                (r.path for r in scope["app"].routes if getattr(r, "endpoint", None) is endpoint), UNMATCHED_ROUTE
+            )
+            self._routes[endpoint] = route
+        return route
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """
+    Times the queries of an engine, and counts them in the request being served, if any.
+
+    Args:
+        engine (Engine): The engine, the `sync_engine` of an asynchronous one.
+        name (str): The value of the `engine` label.
+
+    """
+    labels = (name,)
+
+    def before_cursor_execute(connection: Any, *_: Any) -> None:
+        connection.info.setdefault("query_start", []).append(time.perf_counter())
+
+    def after_cursor_execute(connection: Any, *_: Any) -> None:
+        duration = time.perf_counter() - connection.info["query_start"].pop()
+        DB_QUERIES.inc(labels=labels)
+        DB_QUERY_DURATION.observe(duration, labels=labels)
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.seconds += duration
+
+    def handle_error(context: Any) -> None:
+        starts = context.connection.info.get("query_start") if context.connection is not None else None
+        if starts:
+            starts.pop()
+        DB_QUERY_ERRORS.inc(labels=labels)
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", after_cursor_execute)
+    event.listen(engine, "handle_error", handle_error)
+
+
+def render_pool_metrics(pools: Iterable[PoolMetrics]) -> str:
+    """
+    Renders the connection pool metrics in the Prometheus text format, labelled by pool.
+
+    Args:
+        pools (Iterable[PoolMetrics]): The metrics of the pools.
+
+    Returns:
+        str: The metrics.
+
+    """
+    stats = [pool.snapshot() for pool in pools]
+    metrics: list[Metric] = []
+    for field, kind, documentation in [
+        ("size", Gauge, "Connections kept open by the pool."),
+        ("checked_out", Gauge, "Connections in use."),
+        ("idle", Gauge, "Open connections waiting in the pool."),
+        ("overflow", Gauge, "Connections open above the pool size."),
+        ("connections_opened", Counter, "Connections opened."),
+        ("connections_closed", Counter, "Connections closed."),
+        ("invalidations", Counter, "Connections invalidated."),
+        ("checkouts", Counter, "Connections handed out."),
+        ("timeouts", Counter, "Checkouts that timed out."),
+    ]:
+        suffix = "_total" if kind is Counter else ""
+        metric = kind(f"db_pool_{field}{suffix}", documentation, ("pool",), registry=None)
+        for stat in stats:
+            metric.inc(getattr(stat, field), labels=(stat.name,))
+        metrics.append(metric)
+
+    wait = Histogram(
+        "db_pool_checkout_wait_seconds", "Time waited for a connection.", ("pool",), buckets=WAIT_BUCKETS, registry=None
+    )
+    for stat in stats:
+        wait.series[(stat.name,)] = (list(stat.wait_buckets.values()), [stat.wait_seconds_total])
+    metrics.append(wait)
+    return "".join(render_metric(metric) for metric in metrics)
@@ -1,14 +1,47 @@
-import os
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 import uvicorn
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from backend.core.config import settings
-from backend.routes import auth, admin
+from backend.core.logger import start_logging, stop_logging
+from backend.database import dispose_engines, get_engine
+from backend.instrumentation import MetricsMiddleware
+from backend.migrations import upgrade
+from backend.routes import auth, admin, fixtures, jobs, metrics, predictions, ratings, search, standings
+from backend.server import serve
+from backend.services.authentication import shutdown_password_pool
+from backend.services.jobs import get_job_scheduler
+from backend.services.search import load_search_index
+from backend.services.versions import get_version_watcher
+
+
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncIterator[None]:
+    """
+    Prepares the schema and the search index before the first request, and starts the data version watcher and the job
+    scheduler. On shutdown, stops them, releases the worker pools and connections, then writes the queued log records.
+    """
+    start_logging()
+    if settings.DB_CREATE_SCHEMA_ON_STARTUP:
+        await asyncio.to_thread(upgrade, get_engine())
+    await asyncio.to_thread(load_search_index, get_engine())
+    await get_version_watcher().start()
+    if settings.JOBS_ENABLED:
+        await get_job_scheduler().start()
+    yield
+    await get_job_scheduler().stop()
+    await get_version_watcher().stop()
+    shutdown_password_pool()
+    await dispose_engines()
+    stop_logging()
 
 
 def get_application() -> FastAPI:
-    _app = FastAPI(title=settings.PROJECT_NAME)
+    _app = FastAPI(title=settings.PROJECT_NAME, lifespan=lifespan)
 
     _app.add_middleware(
         CORSMiddleware,
@@ -17,9 +50,20 @@ def get_application() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    if settings.METRICS_ENABLED:
+        # Added last, so it is the outermost middleware and its latency covers the others.
+        _app.add_middleware(MetricsMiddleware)
 
     _app.include_router(auth.router)
     _app.include_router(admin.router)
+    _app.include_router(fixtures.router)
+    _app.include_router(standings.router)
+    _app.include_router(predictions.router)
+    _app.include_router(ratings.router)
+    _app.include_router(search.router)
+    _app.include_router(jobs.router)
+    if settings.METRICS_ENABLED:
+        _app.include_router(metrics.router)
 
     return _app
 
@@ -33,10 +77,10 @@ def test_connection() -> dict[str, str]:
 
 
 def debug() -> None:
-    """Launched with `poetry run start` at root level"""
-    uvicorn.run("backend.main:app", host="0.0.0.0", port=int(os.getenv("PORT", 8000)), reload=True)
+    """Launched with `poetry run debug` at root level"""
+    uvicorn.run("backend.main:app", host=settings.HOST, port=settings.PORT, reload=True)
 
 
 def start() -> None:
-    """Launched with `poetry run start` at root level without reload"""
-    uvicorn.run("backend.main:app", host="0.0.0.0", port=int(os.getenv("PORT", 8000)), reload=False)
+    """Launched with `poetry run start` at root level, with `SERVER_WORKERS` worker processes"""
+    serve(app)
@@ -0,0 +1,125 @@
+"""
+This module provides the schema management of the database: table creation and versioned migrations.
+
+`SQLModel.metadata.create_all` only creates missing tables, it never alters existing ones. Changes to existing tables
+(new indexes, constraints, columns) are therefore written here as migrations, which are applied in order and recorded
+in the `schema_migration` table so each runs once.
+
+`upgrade` runs both. It is run by the application lifespan when `DB_CREATE_SCHEMA_ON_STARTUP` is set, or once per
+deployment with `poetry run migrate` at root level.
+
+"""
+
+from datetime import datetime, timezone
+from typing import Callable
+
+from sqlalchemy import Column, DateTime, Engine, MetaData, String, Table, inspect, select, text
+from sqlalchemy.engine import Connection
+from sqlmodel import SQLModel
+
+from backend.core.logger import logger
+
+migration_metadata = MetaData()
+
+schema_migration = Table(
+    "schema_migration",
+    migration_metadata,
+    Column("version", String, primary_key=True),
+    Column("applied_at", DateTime(timezone=True), nullable=False),
+)
+
+
+def _unique_username(connection: Connection) -> None:
+    """Adds a unique index on `user.username`, failing if existing rows already share a username."""
+    if not inspect(connection).has_table("user"):
+        return
+    duplicates = connection.execute(
+        text('SELECT username FROM "user" GROUP BY username HAVING COUNT(*) > 1 ORDER BY username')
+    ).scalars()
+    duplicated = list(duplicates)
+    if duplicated:
+        raise RuntimeError(f"Unable to add a unique index on user.username, duplicated usernames: {duplicated}")
+    connection.execute(text('CREATE UNIQUE INDEX IF NOT EXISTS ix_user_username ON "user" (username)'))
+
+
+def _fixture_indexes(connection: Connection) -> None:
+    """Adds the composite indexes used by the fixture listing."""
+    if not inspect(connection).has_table("fixture"):
+        return
+    for name, columns in (
+        ("ix_fixture_date_id", "date, id"),
+        ("ix_fixture_league_date_id", "league_id, date, id"),
+        ("ix_fixture_season_date_id", "season_id, date, id"),
+        ("ix_fixture_home_team_date_id", "home_team_id, date, id"),
+        ("ix_fixture_away_team_date_id", "away_team_id, date, id"),
+        ("ix_fixture_status_date_id", "status, date, id"),
+    ):
+        connection.execute(text(f"CREATE INDEX IF NOT EXISTS {name} ON fixture ({columns})"))
+
+
+def _job_heartbeat(connection: Connection) -> None:
+    """Adds the lease of running jobs, `job.heartbeat_at`."""
+    inspector = inspect(connection)
+    if not inspector.has_table("job") or "heartbeat_at" in {c["name"] for c in inspector.get_columns("job")}:
+        return
+    connection.execute(text("ALTER TABLE job ADD COLUMN heartbeat_at TIMESTAMP"))
+
+
+MIGRATIONS: list[tuple[str, Callable[[Connection], None]]] = [
+    ("0001_unique_username", _unique_username),
+    ("0002_fixture_indexes", _fixture_indexes),
+    ("0003_job_heartbeat", _job_heartbeat),
+]
+
+
+def migrate(engine: Engine) -> list[str]:
+    """
+    Applies every migration that was not applied to the database yet, each in its own transaction.
+
+    Args:
+        engine (Engine): The engine of the database to migrate.
+
+    Returns:
+        list[str]: The versions of the applied migrations.
+
+    """
+    migration_metadata.create_all(engine)
+    with engine.connect() as connection:
+        applied = set(connection.execute(select(schema_migration.c.version)).scalars())
+
+    newly_applied = []
+    for version, migration in MIGRATIONS:
+        if version in applied:
+            continue
+        with engine.begin() as connection:
+            migration(connection)
+            connection.execute(schema_migration.insert().values(version=version, applied_at=datetime.now(timezone.utc)))
+        logger.info(f"Applied migration {version}")
+        newly_applied.append(version)
+    return newly_applied
+
+
+def upgrade(engine: Engine) -> list[str]:
+    """
+    Creates the missing tables of every model, then applies pending migrations.
+
+    Args:
+        engine (Engine): The engine of the database to upgrade.
+
+    Returns:
+        list[str]: The versions of the applied migrations.
+
+    """
+    # Registers every table model.
+    from backend.models import fixture, job, rating, standing, user, version  # noqa: F401
+
+    SQLModel.metadata.create_all(engine)
+    return migrate(engine)
+
+
+def main() -> None:
+    """Creates missing tables and applies pending migrations to the database configured in the settings."""
+    from backend.database import get_engine
+
+    applied = upgrade(get_engine())
+    print(f"Applied {len(applied)} migration(s): {', '.join(applied)}" if applied else "Database is up to date")
@@ -0,0 +1,124 @@
+"""
+This module defines the models for sports fixtures, normalized from fixture dumps such as `devdata/result.json`.
+
+Sport:
+    Represents a sport, e.g. football.
+
+League:
+    Represents a league of a sport in a country.
+
+Season:
+    Represents one season (year) of a league.
+
+Team:
+    Represents a team, shared by every league and season it plays in.
+
+Venue:
+    Represents the venue a fixture is played at.
+
+Fixture:
+    Represents a fixture between two teams, with its status and scores.
+
+FixtureRead:
+    Represents the data returned when listing fixtures.
+
+FixturePage:
+    Represents a page of fixtures and the cursor of the next page.
+
+Dates are stored as naive UTC datetimes so they compare the same way on every database backend.
+
+"""
+
+from datetime import date, datetime
+
+from sqlalchemy import Index, UniqueConstraint
+from sqlmodel import Field, SQLModel
+
+from backend.core.base_object import TrustedObject
+
+
+class Sport(SQLModel, table=True):
+    id: int | None = Field(default=None, primary_key=True)
+    name: str = Field(unique=True)
+
+
+class League(SQLModel, table=True):
+    id: int = Field(primary_key=True)
+    name: str
+    country: str
+    sport_id: int = Field(foreign_key="sport.id")
+
+
+class Season(SQLModel, table=True):
+    __table_args__ = (UniqueConstraint("league_id", "year"),)
+
+    id: int | None = Field(default=None, primary_key=True)
+    league_id: int = Field(foreign_key="league.id")
+    year: int
+    start: date | None = None
+    end: date | None = None
+    logo: str | None = None
+
+
+class Team(SQLModel, table=True):
+    id: int = Field(primary_key=True)
+    name: str
+    logo: str | None = None
+
+
+class Venue(SQLModel, table=True):
+    id: int = Field(primary_key=True)
+    name: str | None = None
+    city: str | None = None
+
+
+class Fixture(SQLModel, table=True):
+    # Every access path of the fixture listing filters on one column and pages on (date, id).
+    __table_args__ = (
+        Index("ix_fixture_date_id", "date", "id"),
+        Index("ix_fixture_league_date_id", "league_id", "date", "id"),
+        Index("ix_fixture_season_date_id", "season_id", "date", "id"),
+        Index("ix_fixture_home_team_date_id", "home_team_id", "date", "id"),
+        Index("ix_fixture_away_team_date_id", "away_team_id", "date", "id"),
+        Index("ix_fixture_status_date_id", "status", "date", "id"),
+    )
+
+    id: int = Field(primary_key=True)
+    season_id: int = Field(foreign_key="season.id")
+    league_id: int = Field(foreign_key="league.id")
+    date: datetime
+    status: str
+    round: str | None = None
+    venue_id: int | None = Field(default=None, foreign_key="venue.id")
+    home_team_id: int = Field(foreign_key="team.id")
+    away_team_id: int = Field(foreign_key="team.id")
+    winner_team_id: int | None = Field(default=None, foreign_key="team.id")
+    home_score: int | None = None
+    away_score: int | None = None
+    halftime_home_score: int | None = None
+    halftime_away_score: int | None = None
+    extratime_home_score: int | None = None
+    extratime_away_score: int | None = None
+    penalty_home_score: int | None = None
+    penalty_away_score: int | None = None
+
+
+class FixtureRead(TrustedObject):
+    id: int
+    date: datetime
+    status: str
+    round: str | None
+    league_id: int
+    season_id: int
+    venue_id: int | None
+    home_team_id: int
+    home_team_name: str
+    away_team_id: int
+    away_team_name: str
+    home_score: int | None
+    away_score: int | None
+
+
+class FixturePage(TrustedObject):
+    items: list[FixtureRead]
+    next_cursor: str | None = None
@@ -0,0 +1,74 @@
+"""
+This module defines the models of the background jobs run by the job scheduler.
+
+Job:
+    Represents a job in the persistent job table, with its status, progress and result.
+
+JobCreate:
+    Represents the data required to submit a job.
+
+JobRead:
+    Represents the data returned when reading a job.
+
+Parameters and results are stored as json text. At most one pending job exists per `dedup_key`, a digest of the type
+and parameters, so submitting a job identical to a pending one returns the pending one. A running job is leased by
+the scheduler named in `worker` for as long as its `heartbeat_at` is renewed.
+
+"""
+
+from datetime import datetime
+from typing import Any, Literal
+
+from sqlalchemy import Index, text
+from sqlmodel import Field, SQLModel
+
+from backend.core.base_object import BaseObject, TrustedObject
+
+JobStatus = Literal["pending", "running", "succeeded", "failed"]
+
+
+class Job(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_job_status_id", "status", "id"),
+        Index(
+            "ux_job_pending_dedup_key",
+            "dedup_key",
+            unique=True,
+            postgresql_where=text("status = 'pending'"),
+            sqlite_where=text("status = 'pending'"),
+        ),
+    )
+
+    id: int | None = Field(default=None, primary_key=True)
+    type: str
+    params: str = "{}"
+    dedup_key: str
+    status: str = "pending"
+    progress: float = 0.0
+    message: str | None = None
+    result: str | None = None
+    error: str | None = None
+    worker: str | None = None
+    heartbeat_at: datetime | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
+
+
+class JobCreate(BaseObject):
+    type: str
+    params: dict[str, Any] = {}
+
+
+class JobRead(TrustedObject):
+    id: int
+    type: str
+    params: dict[str, Any]
+    status: JobStatus
+    progress: float
+    message: str | None = None
+    result: Any = None
+    error: str | None = None
+    created_at: datetime
+    started_at: datetime | None = None
+    finished_at: datetime | None = None
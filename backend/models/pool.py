@@ -0,0 +1,46 @@
+"""
+This module defines the model of the connection pool metrics returned by `GET /admin/pools`.
+
+PoolStats:
+    Represents the current state and the cumulative counters of a database connection pool.
+
+"""
+
+from backend.core.base_object import TrustedObject
+
+
+class PoolStats(TrustedObject):
+    """
+    Represents the current state and the cumulative counters of a database connection pool.
+
+    Attributes:
+        name (str): The pool, `async` for request handlers or `sync` for schema management and tools.
+        size (int): The number of connections the pool keeps open.
+        checked_out (int): The connections currently in use.
+        idle (int): The open connections waiting in the pool.
+        overflow (int): The connections currently open above `size`.
+        connections_opened (int): The connections opened since the process started.
+        connections_closed (int): The connections closed since the process started.
+        invalidations (int): The connections invalidated, e.g. after a disconnection.
+        checkouts (int): The connections handed out.
+        timeouts (int): The checkouts that timed out waiting for a connection.
+        wait_seconds_total (float): The time spent waiting for checkouts.
+        wait_seconds_max (float): The longest wait for a checkout.
+        wait_buckets (dict[str, int]): The checkouts per wait time bucket, keyed by the bucket's upper bound in
+            seconds.
+
+    """
+
+    name: str
+    size: int
+    checked_out: int
+    idle: int
+    overflow: int
+    connections_opened: int
+    connections_closed: int
+    invalidations: int
+    checkouts: int
+    timeouts: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+    wait_buckets: dict[str, int]
@@ -0,0 +1,46 @@
+"""
+This module defines the models for fixture predictions.
+
+FixturePair:
+    Represents a fixture to predict, given by its teams.
+
+PredictionBatchRequest:
+    Represents the fixtures to predict: explicit pairs, or the upcoming fixtures of a season or round.
+
+Prediction:
+    Represents the predicted goals and outcome probabilities of a fixture.
+
+PredictionBatch:
+    Represents the predictions of a batch of fixtures.
+
+"""
+
+from backend.core.base_object import BaseObject, TrustedObject
+
+
+class FixturePair(BaseObject):
+    home_team_id: int
+    away_team_id: int
+    fixture_id: int | None = None
+
+
+class PredictionBatchRequest(BaseObject):
+    season_id: int | None = None
+    round: str | None = None
+    fixtures: list[FixturePair] | None = None
+
+
+class Prediction(TrustedObject):
+    fixture_id: int | None
+    home_team_id: int
+    away_team_id: int
+    expected_home_goals: float
+    expected_away_goals: float
+    home_win: float
+    draw: float
+    away_win: float
+
+
+class PredictionBatch(TrustedObject):
+    fitted_fixtures: int
+    predictions: list[Prediction]
@@ -0,0 +1,42 @@
+"""
+This module defines the models for Elo team ratings, stored as periodic checkpoints.
+
+RatingCheckpoint:
+    Represents the position in the fixture history, by `(date, fixture id)`, up to which a checkpoint was computed.
+
+TeamRating:
+    Represents the rating of a team at a checkpoint.
+
+TeamRatingRead:
+    Represents the rating of a team returned by the API.
+
+"""
+
+from datetime import datetime
+
+from sqlalchemy import Index
+from sqlmodel import Field, SQLModel
+
+from backend.core.base_object import TrustedObject
+
+
+class RatingCheckpoint(SQLModel, table=True):
+    __table_args__ = (Index("ix_ratingcheckpoint_last_date_last_fixture_id", "last_date", "last_fixture_id"),)
+
+    id: int | None = Field(default=None, primary_key=True)
+    last_date: datetime
+    last_fixture_id: int
+    fixtures: int
+
+
+class TeamRating(SQLModel, table=True):
+    checkpoint_id: int = Field(primary_key=True, foreign_key="ratingcheckpoint.id")
+    team_id: int = Field(primary_key=True)
+    rating: float
+    games: int
+
+
+class TeamRatingRead(TrustedObject):
+    team_id: int
+    rating: float
+    games: int
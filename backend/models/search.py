@@ -0,0 +1,23 @@
+"""
+This module defines the models of the results of `GET /search`.
+
+SearchKind:
+    The kinds of searchable entries: teams, venues and leagues.
+
+SearchResult:
+    Represents an entry whose name matches a search query.
+
+"""
+
+from typing import Literal
+
+from backend.core.base_object import TrustedObject
+
+SearchKind = Literal["team", "venue", "league"]
+
+
+class SearchResult(TrustedObject):
+    kind: SearchKind
+    id: int
+    name: str
+    city: str | None = None
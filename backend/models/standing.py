@@ -0,0 +1,79 @@
+"""
+This module defines the models for league standings, maintained incrementally from finished fixtures.
+
+Standing:
+    Represents the record of a team in a season: points, goals, home/away splits and recent form.
+
+StandingFixture:
+    Represents a finished fixture already counted in the standings, with the scores it was counted with.
+
+StandingRead:
+    Represents a row of a league table.
+
+"""
+
+from sqlmodel import Field, SQLModel
+
+from backend.core.base_object import TrustedObject
+
+
+class Standing(SQLModel, table=True):
+    season_id: int = Field(primary_key=True, foreign_key="season.id")
+    team_id: int = Field(primary_key=True, foreign_key="team.id")
+    played: int = 0
+    won: int = 0
+    drawn: int = 0
+    lost: int = 0
+    goals_for: int = 0
+    goals_against: int = 0
+    goal_difference: int = 0
+    points: int = 0
+    home_played: int = 0
+    home_won: int = 0
+    home_drawn: int = 0
+    home_lost: int = 0
+    home_goals_for: int = 0
+    home_goals_against: int = 0
+    away_played: int = 0
+    away_won: int = 0
+    away_drawn: int = 0
+    away_lost: int = 0
+    away_goals_for: int = 0
+    away_goals_against: int = 0
+    form: str = ""
+
+
+class StandingFixture(SQLModel, table=True):
+    fixture_id: int = Field(primary_key=True, foreign_key="fixture.id")
+    season_id: int = Field(index=True)
+    home_team_id: int
+    away_team_id: int
+    home_score: int
+    away_score: int
+
+
+class StandingRead(TrustedObject):
+    rank: int
+    team_id: int
+    team_name: str
+    played: int
+    won: int
+    drawn: int
+    lost: int
+    goals_for: int
+    goals_against: int
+    goal_difference: int
+    points: int
+    home_played: int
+    home_won: int
+    home_drawn: int
+    home_lost: int
+    home_goals_for: int
+    home_goals_against: int
+    away_played: int
+    away_won: int
+    away_drawn: int
+    away_lost: int
+    away_goals_for: int
+    away_goals_against: int
+    form: str
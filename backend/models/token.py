@@ -9,10 +9,10 @@ TokenData:
 
 """
 
-from backend.core.base_object import BaseObject
+from backend.core.base_object import TrustedObject
 
 
-class Token(BaseObject):
+class Token(TrustedObject):
     """
     Represents a token used in authentication.
 
@@ -26,7 +26,7 @@ class Token(BaseObject):
     token_type: str
 
 
-class TokenData(BaseObject):
+class TokenData(TrustedObject):
     """
     Represents the data contained in a token.
 
@@ -13,11 +13,19 @@ UserRead:
 User:
     Represents a user in the system with its associated attributes.
 
+BulkUserResult:
+    Represents the outcome of one row of a bulk user creation.
+
+BulkUserReport:
+    Represents the outcome of a bulk user creation.
+
 """
 
+from typing import Literal
+
 from sqlmodel import Field, SQLModel
 
-from backend.core.base_object import BaseObject
+from backend.core.base_object import BaseObject, TrustedObject
 
 
 class UserCreate(BaseObject):
@@ -32,7 +40,7 @@ class UserUpdate(BaseObject):
     is_admin: bool | None = None
 
 
-class UserRead(BaseObject):
+class UserRead(TrustedObject):
     id: int
     username: str
     is_admin: bool
@@ -40,12 +48,26 @@ class UserRead(BaseObject):
 
 class User(SQLModel, table=True):
     id: int | None = Field(default=None, primary_key=True)
-    username: str
+    username: str = Field(unique=True, index=True)
     password: str
     is_admin: bool
 
 
-class UserView(BaseObject):
+class UserView(TrustedObject):
     success: bool
     is_admin: bool
     username: str
+
+
+class BulkUserResult(TrustedObject):
+    index: int
+    username: str | None = None
+    status: Literal["created", "conflict", "invalid"]
+    detail: str | None = None
+
+
+class BulkUserReport(TrustedObject):
+    created: int = 0
+    conflicts: int = 0
+    invalid: int = 0
+    results: list[BulkUserResult] = []
@@ -0,0 +1,14 @@
+"""
+This module defines the version stamps of the data cached by the server workers.
+
+DataVersion:
+    Represents the version of a kind of data, e.g. "fixtures", incremented whenever that data changes.
+
+"""
+
+from sqlmodel import Field, SQLModel
+
+
+class DataVersion(SQLModel, table=True):
+    name: str = Field(primary_key=True)
+    version: int = 0
@@ -1,19 +1,26 @@
-from typing import Annotated
+import json
+from typing import Annotated, Any, AsyncIterator
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.security import OAuth2PasswordBearer
+from jose import JWTError
 from passlib.context import CryptContext
-from backend.database import SessionLocal
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlmodel.ext.asyncio.session import AsyncSession
 from starlette import status
 
 from backend.services.authentication import (
-    encrypt_password,
+    encrypt_password_async,
+    encrypt_passwords_async,
     decode_token,
 )
 from backend.core.config import settings
 from backend.core.logger import logger
-from backend.database import engine
+from backend.database import POOL_METRICS, SessionDep
+from backend.services.users import insert_user, insert_users, update_user
 from backend.models import user
+from backend.models.pool import PoolStats
 
 router = APIRouter(
     prefix="/admin",
@@ -26,27 +33,46 @@ ALGORITHM = settings.ALGORITHM
 bcrypt = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_bearer = OAuth2PasswordBearer(tokenUrl="auth/token")
 
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/jsonl", "application/ndjson")
+
+
+async def require_admin(access_token: Annotated[str, Depends(oauth2_bearer)]) -> dict:
+    """
+    Ensures the request is made with the token of an admin.
+
+    Args:
+        access_token (str): The bearer token of the request.
+
+    Returns:
+        dict: The decoded payload of the token.
+
+    """
+    try:
+        payload = decode_token(access_token)
+    except JWTError as e:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid authentication credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        ) from e
+    if payload.get("role") != "admin":
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Forbidden",
+        )
+    return payload
+
+
+AdminDep = Annotated[dict, Depends(require_admin)]
+
 
 @router.post("/create_user", status_code=status.HTTP_201_CREATED, response_model=user.UserView)
-async def create_as_super_user(
-    user_create: user.UserCreate, access_token: Annotated[str, Depends(oauth2_bearer)]
-) -> user.UserView:
+async def create_as_super_user(user_create: user.UserCreate, _: AdminDep, db: SessionDep) -> user.UserView:
     try:
-        with SessionLocal() as db:
-            existing_user = db.query(user.User).filter(user.User.username == (user_create.username)).first()
-            if not existing_user:
-                creator_role = decode_token(access_token).get("role")
-                if creator_role != "admin":
-                    raise HTTPException(
-                        status_code=status.HTTP_403_FORBIDDEN,
-                        detail="Forbidden",
-                    )
-                user_create.password = encrypt_password(user_create.password)
-                db_user = user.User.model_validate(user_create)
-                db.add(db_user)
-                db.commit()
-                db.refresh(db_user)
-                return user.UserView(success=True, is_admin=False, username=db_user.username)
+        password = await encrypt_password_async(user_create.password)
+        db_user = await insert_user(db, user_create.model_copy(update={"password": password}))
+        if db_user:
+            return user.UserView.trusted(success=True, is_admin=False, username=db_user.username)
     except HTTPException as e:
         raise e
     except Exception as e:
@@ -59,3 +85,156 @@ async def create_as_super_user(
         status_code=status.HTTP_409_CONFLICT,
         detail="User already exists",
     )
+
+
+@router.patch("/users/{username}", response_model=user.UserRead)
+async def update_as_super_user(
+    username: str, user_update: user.UserUpdate, _: AdminDep, db: SessionDep
+) -> user.UserRead:
+    """
+    Changes the username, password or role of a user; the fields left out are kept.
+
+    The role only applies to the tokens issued after the change.
+    """
+    if user_update.password is not None:
+        user_update = user_update.model_copy(update={"password": await encrypt_password_async(user_update.password)})
+    try:
+        db_user = await update_user(db, username, user_update)
+    except IntegrityError as e:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="User already exists",
+        ) from e
+    if db_user is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
+        )
+    return user.UserRead.trusted(id=db_user.id, username=db_user.username, is_admin=db_user.is_admin)
+
+
+@router.post("/users:bulk", response_model=user.BulkUserReport)
+async def bulk_create_users(request: Request, _: AdminDep, db: SessionDep) -> user.BulkUserReport:
+    """
+    Creates many users at once from a JSON array or an NDJSON stream of `UserCreate` objects.
+
+    The whole request is read and validated before any user is inserted, so a request over `BULK_MAX_ROWS` rows, or
+    whose stream fails, creates nothing. Passwords are then hashed in parallel on the password worker pool and rows are
+    inserted in batches of `BULK_INSERT_BATCH_SIZE`, each committed on its own. Every row gets a result in the report,
+    in input order.
+    """
+    report = user.BulkUserReport()
+    results: list[user.BulkUserResult] = []
+    valid: list[tuple[int, user.UserCreate]] = []
+    seen: set[str] = set()
+    try:
+        async for index, row in _read_bulk_rows(request):
+            if index >= settings.BULK_MAX_ROWS:
+                raise _too_many_rows()
+            try:
+                user_create = user.UserCreate.model_validate(row)
+            except ValidationError as e:
+                results.append(user.BulkUserResult.trusted(index=index, status="invalid", detail=_validation_detail(e)))
+                continue
+            if user_create.username in seen:
+                results.append(
+                    user.BulkUserResult.trusted(
+                        index=index, username=user_create.username, status="conflict", detail="Duplicated in request"
+                    )
+                )
+                continue
+            seen.add(user_create.username)
+            valid.append((index, user_create))
+        for start in range(0, len(valid), settings.BULK_INSERT_BATCH_SIZE):
+            results.extend(await _create_batch(db, valid[start : start + settings.BULK_INSERT_BATCH_SIZE]))
+    except HTTPException as e:
+        raise e
+    except Exception as e:
+        logger.error(e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal Server Error",
+        ) from e
+
+    results.sort(key=lambda result: result.index)
+    report.results = results
+    report.created = sum(result.status == "created" for result in results)
+    report.conflicts = sum(result.status == "conflict" for result in results)
+    report.invalid = sum(result.status == "invalid" for result in results)
+    return report
+
+
+@router.get("/pools", response_model=list[PoolStats])
+async def pool_stats(_: AdminDep) -> list[PoolStats]:
+    """
+    Returns the metrics of the database connection pools of this worker process.
+
+    Gauges are read from the pools, counters and checkout wait times accumulate since the process started.
+    """
+    return [metrics.snapshot() for metrics in POOL_METRICS.values()]
+
+
+async def _read_bulk_rows(request: Request) -> AsyncIterator[tuple[int, Any]]:
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    if content_type in NDJSON_CONTENT_TYPES:
+        index = 0
+        buffer = b""
+        async for chunk in request.stream():
+            buffer += chunk
+            *lines, buffer = buffer.split(b"\n")
+            for line in lines:
+                if line.strip():
+                    yield index, _parse_ndjson_line(line)
+                    index += 1
+        if buffer.strip():
+            yield index, _parse_ndjson_line(buffer)
+        return
+
+    try:
+        rows = json.loads(await request.body())
+    except json.JSONDecodeError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=f"Invalid JSON: {e}") from e
+    if not isinstance(rows, list):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Expected a JSON array of users")
+    if len(rows) > settings.BULK_MAX_ROWS:
+        raise _too_many_rows()
+    for index, row in enumerate(rows):
+        yield index, row
+
+
+def _too_many_rows() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+        detail=f"At most {settings.BULK_MAX_ROWS} users can be created at once",
+    )
+
+
+def _parse_ndjson_line(line: bytes) -> Any:
+    try:
+        return json.loads(line)
+    except json.JSONDecodeError:
+        # An unparsable line is reported as an invalid row instead of failing the whole stream.
+        return None
+
+
+def _validation_detail(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(loc) for loc in e['loc']) or 'row'}: {e['msg']}" for e in error.errors())
+
+
+async def _create_batch(db: AsyncSession, batch: list[tuple[int, user.UserCreate]]) -> list[user.BulkUserResult]:
+    if not batch:
+        return []
+    hashed = await encrypt_passwords_async([user_create.password for _, user_create in batch])
+    created = await insert_users(
+        db,
+        [user_create.model_copy(update={"password": password}) for (_, user_create), password in zip(batch, hashed)],
+    )
+    return [
+        user.BulkUserResult.trusted(
+            index=index,
+            username=user_create.username,
+            status="created" if user_create.username in created else "conflict",
+            detail=None if user_create.username in created else "User already exists",
+        )
+        for index, user_create in batch
+    ]
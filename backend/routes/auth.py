@@ -1,21 +1,23 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jose import JWTError
 from passlib.context import CryptContext
-from backend.database import SessionLocal
+from sqlmodel import select
 from starlette import status
 
 from backend.services.authentication import (
-    check_password,
-    encrypt_password,
+    dummy_password_hash,
+    encrypt_password_async,
     generate_token,
     decode_token,
 )
 from backend.core.config import settings
 from backend.core.logger import logger
-from backend.database import SessionLocal, engine
+from backend.database import SessionDep
+from backend.services.login_throttle import get_login_throttle
+from backend.services.users import get_user_read, insert_user
 from backend.models import token
 from backend.models import user
 
@@ -34,22 +36,20 @@ oauth2_bearer = OAuth2PasswordBearer(tokenUrl="auth/token")
 @router.post("/signup", status_code=status.HTTP_201_CREATED, response_model=user.UserView)
 async def create_user(
     user_create: user.UserCreate,
+    db: SessionDep,
 ) -> user.UserView:
+    if user_create.is_admin:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid role",
+        )
     try:
-        with SessionLocal() as db:
-            existing_user = db.query(user.User).filter(user.User.username == (user_create.username)).first()
-            if not existing_user:
-                if user_create.is_admin:
-                    raise HTTPException(
-                        status_code=status.HTTP_400_BAD_REQUEST,
-                        detail="Invalid role",
-                    )
-                user_create.password = encrypt_password(user_create.password)
-                db_user = user.User.model_validate(user_create)
-                db.add(db_user)
-                db.commit()
-                db.refresh(db_user)
-                return user.UserView(success=True, is_admin=False, username=db_user.username)
+        password = await encrypt_password_async(user_create.password)
+        db_user = await insert_user(db, user_create.model_copy(update={"password": password}))
+        if db_user:
+            return user.UserView.trusted(success=True, is_admin=False, username=db_user.username)
+    except HTTPException as e:
+        raise e
     except Exception as e:
         logger.error(e)
         raise HTTPException(
@@ -65,28 +65,28 @@ async def create_user(
 @router.post("/token", response_model=token.Token)
 async def login_for_access_token(
     access_token: Annotated[OAuth2PasswordRequestForm, Depends()],
+    db: SessionDep,
+    request: Request,
 ) -> token.Token:
-    with SessionLocal() as db:
-        db_user = db.query(user.User).where(user.User.username == access_token.username).first()
-        if not db_user:
-            raise HTTPException(
-                status_code=status.HTTP_401_NOT_FOUND,
-                detail="Incorrect username",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        if not check_password(access_token.password, db_user.password):
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Incorrect password",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
-        user_token = generate_token(username=access_token.username, is_admin=db_user.is_admin)
-        return token.Token(access_token=user_token, token_type="bearer")
+    throttle = get_login_throttle()
+    await throttle.acquire(access_token.username, request.client.host if request.client else None)
+    db_user = (await db.exec(select(user.User).where(user.User.username == access_token.username))).first()
+    # Unknown users are checked against a dummy hash, so they take as long and get the same error as a wrong password.
+    hashed = db_user.password if db_user else await dummy_password_hash()
+    if not await throttle.check_password(access_token.password, hashed) or not db_user:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Incorrect username or password",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    user_token = generate_token(username=access_token.username, is_admin=db_user.is_admin)
+    return token.Token.trusted(access_token=user_token, token_type="bearer")
 
 
 @router.get("/me")
 async def read_users_me(
     access_token: Annotated[str, Depends(oauth2_bearer)],
+    db: SessionDep,
 ) -> user.UserRead:
     try:
         payload = decode_token(access_token)
@@ -97,7 +97,6 @@ async def read_users_me(
                 detail="Invalid authentication credentials",
                 headers={"WWW-Authenticate": "Bearer"},
             )
-        token_data = token.TokenData(username=username, role=payload.get("role"))
     except JWTError as e:
         logger.error(e)
         raise HTTPException(
@@ -105,15 +104,10 @@ async def read_users_me(
             detail="Invalid authentication credentials",
             headers={"WWW-Authenticate": "Bearer"},
         ) from e
-    with SessionLocal() as db:
-        db_user = db.query(user.User).filter(user.User.username == token_data.username).first()
-        if db_user is None:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="User not found",
-            )
-        return user.UserRead(
-            id=db_user.id,
-            username=db_user.username,
-            is_admin=db_user.is_admin,
+    user_read = await get_user_read(db, username)
+    if user_read is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="User not found",
         )
+    return user_read
@@ -0,0 +1,73 @@
+from datetime import datetime
+from typing import Annotated, AsyncIterator
+
+from fastapi import APIRouter, Header, HTTPException, Query
+from starlette import status
+from starlette.responses import StreamingResponse
+
+from backend.database import SessionDep
+from backend.models.fixture import FixturePage, FixtureRead
+from backend.services.export import ExportFormat, export_response, stream_rows
+from backend.services.fixtures import fixture_statement, list_fixtures
+
+router = APIRouter(
+    prefix="/fixtures",
+    tags=["fixtures"],
+)
+
+
+@router.get("", response_model=FixturePage)
+async def read_fixtures(
+    db: SessionDep,
+    league_id: int | None = None,
+    season_id: int | None = None,
+    team_id: int | None = None,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    status_in: Annotated[list[str] | None, Query(alias="status")] = None,
+    cursor: str | None = None,
+    limit: Annotated[int, Query(ge=1, le=500)] = 50,
+) -> FixturePage:
+    try:
+        return await list_fixtures(
+            db,
+            league_id=league_id,
+            season_id=season_id,
+            team_id=team_id,
+            date_from=date_from,
+            date_to=date_to,
+            status=status_in,
+            cursor=cursor,
+            limit=limit,
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from e
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_fixtures(
+    league_id: int | None = None,
+    season_id: int | None = None,
+    team_id: int | None = None,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    status_in: Annotated[list[str] | None, Query(alias="status")] = None,
+    export_format: Annotated[ExportFormat, Query(alias="format")] = "ndjson",
+    accept_encoding: Annotated[str | None, Header()] = None,
+) -> StreamingResponse:
+    """
+    Streams every fixture matching the filters, ordered by date, as NDJSON or CSV, gzip-compressed if accepted.
+
+    Rows are read from a database cursor in chunks of `EXPORT_CHUNK_SIZE`, so whole leagues or seasons are exported
+    in bounded memory.
+    """
+    statement = fixture_statement(league_id, season_id, team_id, date_from, date_to, status_in)
+
+    async def chunks() -> AsyncIterator[list[FixtureRead]]:
+        async for rows in stream_rows(statement):
+            yield [FixtureRead.trusted(**row._mapping) for row in rows]
+
+    return export_response(chunks(), FixtureRead, export_format, "fixtures", accept_encoding)
@@ -0,0 +1,40 @@
+from fastapi import APIRouter, HTTPException
+from starlette import status
+
+from backend.database import SessionDep
+from backend.models.job import JobCreate, JobRead
+from backend.routes.admin import AdminDep
+from backend.services.jobs import read_job, submit_job
+
+router = APIRouter(
+    prefix="/jobs",
+    tags=["jobs"],
+)
+
+
+@router.post("", status_code=status.HTTP_202_ACCEPTED, response_model=JobRead)
+async def create_job(job_create: JobCreate, _: AdminDep, db: SessionDep) -> JobRead:
+    """
+    Submits a background job, or returns the pending job with the same type and parameters.
+
+    The job runs on the job worker pool of one of the server workers; poll `GET /jobs/{id}` for its progress. Its
+    result is applied in memory by that worker only: `ingest` refreshes its search index at once, the other workers
+    refresh theirs within `DATA_VERSION_POLL_INTERVAL` seconds, while `refit_model` installs the refitted model in that
+    worker alone, the others keeping theirs until the next ingestion.
+    """
+    try:
+        return await submit_job(db, job_create.type, job_create.params)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e)) from e
+
+
+@router.get("/{job_id}", response_model=JobRead)
+async def get_job(job_id: int, _: AdminDep, db: SessionDep) -> JobRead:
+    """Returns the status, progress and, once finished, the result or error of a background job."""
+    job = await read_job(db, job_id)
+    if job is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found",
+        )
+    return job
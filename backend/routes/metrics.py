@@ -0,0 +1,15 @@
+from fastapi import APIRouter, Response
+
+from backend.core.metrics import CONTENT_TYPE, render
+from backend.database import POOL_METRICS
+from backend.instrumentation import render_pool_metrics
+
+router = APIRouter(
+    tags=["metrics"],
+)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics() -> Response:
+    """Returns the metrics of this worker process in the Prometheus text format."""
+    return Response(render() + render_pool_metrics(POOL_METRICS.values()), media_type=CONTENT_TYPE)
@@ -0,0 +1,50 @@
+from typing import Annotated, AsyncIterator
+
+from fastapi import APIRouter, Header, HTTPException, Query
+from starlette import status
+from starlette.responses import StreamingResponse
+
+from backend.database import SessionDep
+from backend.models.prediction import Prediction, PredictionBatch, PredictionBatchRequest
+from backend.services.export import ExportFormat, export_response, stream_rows
+from backend.services.prediction import get_model, predict_batch, predict_rows, upcoming_statement
+
+router = APIRouter(
+    prefix="/predictions",
+    tags=["predictions"],
+)
+
+
+@router.post(":batch", response_model=PredictionBatch)
+async def predict_fixtures(request: PredictionBatchRequest, db: SessionDep) -> PredictionBatch:
+    try:
+        return await predict_batch(db, request)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        ) from e
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_predictions(
+    season_id: int,
+    db: SessionDep,
+    round: str | None = None,
+    export_format: Annotated[ExportFormat, Query(alias="format")] = "ndjson",
+    accept_encoding: Annotated[str | None, Header()] = None,
+) -> StreamingResponse:
+    """
+    Streams the predictions of the upcoming fixtures of a season, or of one of its rounds, as NDJSON or CSV,
+    gzip-compressed if accepted.
+
+    Fixtures are read from a database cursor and predicted in chunks of `EXPORT_CHUNK_SIZE`, one vectorized call each.
+    """
+    model = await get_model(db)
+    statement = upcoming_statement(season_id, round)
+
+    async def chunks() -> AsyncIterator[list[Prediction]]:
+        async for rows in stream_rows(statement):
+            yield predict_rows(model, rows)
+
+    return export_response(chunks(), Prediction, export_format, "predictions", accept_encoding)
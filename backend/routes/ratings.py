@@ -0,0 +1,21 @@
+from datetime import datetime, timezone
+
+from fastapi import APIRouter
+
+from backend.database import SessionDep
+from backend.models.rating import TeamRatingRead
+from backend.services.ratings import ratings_as_of
+
+router = APIRouter(
+    prefix="/ratings",
+    tags=["ratings"],
+)
+
+
+@router.get("", response_model=list[TeamRatingRead])
+async def read_ratings(
+    db: SessionDep,
+    as_of: datetime | None = None,
+    team_id: int | None = None,
+) -> list[TeamRatingRead]:
+    return await ratings_as_of(db, as_of or datetime.now(timezone.utc), team_id=team_id)
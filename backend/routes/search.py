@@ -0,0 +1,23 @@
+from typing import Annotated
+
+from fastapi import APIRouter, Query
+
+from backend.models.search import SearchResult
+from backend.services.search import get_search_index
+
+router = APIRouter(
+    prefix="/search",
+    tags=["search"],
+)
+
+
+@router.get("", response_model=list[SearchResult])
+async def search(
+    q: Annotated[str, Query(min_length=1, max_length=100)],
+    limit: Annotated[int, Query(ge=1, le=50)] = 10,
+) -> list[SearchResult]:
+    """
+    Returns the teams, venues and leagues whose name, or city for a venue, has words starting with the words of `q`,
+    ignoring accents and case.
+    """
+    return get_search_index().search(q, limit=limit)
@@ -0,0 +1,15 @@
+from fastapi import APIRouter
+
+from backend.database import SessionDep
+from backend.models.standing import StandingRead
+from backend.services.standings import read_standings
+
+router = APIRouter(
+    prefix="/standings",
+    tags=["standings"],
+)
+
+
+@router.get("/{season_id}", response_model=list[StandingRead])
+async def read_season_standings(season_id: int, db: SessionDep) -> list[StandingRead]:
+    return await read_standings(db, season_id)
@@ -0,0 +1,214 @@
+"""
+This module runs the application in production, with several worker processes sharing one listening socket.
+
+The supervisor process imports the application, upgrades the schema once, binds the socket and then forks the
+workers, which inherit the loaded application instead of importing it again. Each worker runs its own uvicorn server
+and event loop, so a CPU-bound request or a slow query only holds up one of them, and opens its own database
+connections on first use: the supervisor disposes its engines before forking.
+
+On SIGTERM or SIGINT the supervisor forwards SIGTERM to the workers, which stop accepting connections, finish the
+requests in flight within `SERVER_GRACEFUL_TIMEOUT` seconds and run the lifespan shutdown. Workers still running after
+that are killed. Workers that exit on their own, e.g. after `SERVER_MAX_REQUESTS` requests, are replaced.
+
+The event loop and HTTP parser are the standard library ones unless `SERVER_LOOP=uvloop` and `SERVER_HTTP=httptools`
+are set, which need the `uvloop` and `httptools` packages (`pip install uvicorn[standard]`).
+
+**Key Classes:**
+
+- `Supervisor`: Forks, watches and stops the worker processes.
+
+**Key Functions:**
+
+- `server_config`: Builds the uvicorn configuration from the settings.
+- `serve`: Runs an application with the configured number of worker processes.
+"""
+
+import asyncio
+import os
+import signal
+import socket
+import sys
+import time
+from types import FrameType
+from typing import Any
+
+import uvicorn
+from uvicorn.main import STARTUP_FAILURE
+
+from backend.core.config import settings
+from backend.core.logger import logger
+from backend.database import dispose_engines, get_engine
+from backend.migrations import upgrade
+
+POLL_INTERVAL_SECONDS = 0.1
+# Time left to the workers after the graceful timeout, for the lifespan shutdown, before they are killed.
+SHUTDOWN_MARGIN_SECONDS = 5.0
+
+
+def server_config(app: Any, **overrides: Any) -> uvicorn.Config:
+    """
+    Builds the uvicorn configuration of a worker from the settings.
+
+    Args:
+        app (Any): The ASGI application, or its import string.
+        **overrides (Any): Options replacing the ones from the settings.
+
+    Returns:
+        uvicorn.Config: The configuration.
+
+    """
+    options = {
+        "host": settings.HOST,
+        "port": settings.PORT,
+        "loop": settings.SERVER_LOOP,
+        "http": settings.SERVER_HTTP,
+        "backlog": settings.SERVER_BACKLOG,
+        "timeout_keep_alive": settings.SERVER_KEEP_ALIVE_TIMEOUT,
+        "timeout_graceful_shutdown": settings.SERVER_GRACEFUL_TIMEOUT,
+        "limit_concurrency": settings.SERVER_LIMIT_CONCURRENCY,
+        "limit_max_requests": settings.SERVER_MAX_REQUESTS,
+        "access_log": settings.SERVER_ACCESS_LOG,
+        "proxy_headers": True,
+        "forwarded_allow_ips": settings.SERVER_FORWARDED_ALLOW_IPS,
+    }
+    return uvicorn.Config(app, **(options | overrides))
+
+
+class Supervisor:
+    """
+    Forks the worker processes on a shared socket, replaces the ones that exit and stops them on SIGTERM or SIGINT.
+
+    Attributes:
+        config (uvicorn.Config): The configuration of the workers, loaded before forking.
+        workers (int): The number of worker processes.
+        processes (set[int]): The process ids of the running workers.
+
+    """
+
+    def __init__(self, config: uvicorn.Config, workers: int) -> None:
+        self.config = config
+        self.workers = workers
+        self.processes: set[int] = set()
+        self.should_exit = False
+        self.force_exit = False
+        self.exit_code = 0
+        self._socket: socket.socket | None = None
+
+    def run(self) -> int:
+        """
+        Runs the workers until the supervisor receives SIGTERM or SIGINT, or a worker fails to start.
+
+        Returns:
+            int: The exit code of the supervisor.
+
+        """
+        self._socket = self.config.bind_socket()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            signal.signal(signum, self.handle_exit)
+        logger.info(f"Starting {self.workers} workers on {self.config.host}:{self.config.port}")
+        try:
+            while not self.should_exit:
+                while len(self.processes) < self.workers and not self.should_exit:
+                    self.spawn()
+                time.sleep(POLL_INTERVAL_SECONDS)
+                self.reap()
+            self.stop()
+        finally:
+            self._socket.close()
+        return self.exit_code
+
+    def handle_exit(self, signum: int, _frame: FrameType | None) -> None:
+        """Starts a graceful shutdown, or kills the workers on a second SIGINT."""
+        if self.should_exit and signum == signal.SIGINT:
+            self.force_exit = True
+        self.should_exit = True
+
+    def spawn(self) -> None:
+        """Forks a worker serving the application on the shared socket."""
+        pid = os.fork()
+        if pid == 0:
+            self._run_worker()
+        self.processes.add(pid)
+
+    def _run_worker(self) -> None:
+        exit_code = 1
+        try:
+            for signum in (signal.SIGTERM, signal.SIGINT):
+                signal.signal(signum, signal.SIG_DFL)
+            server = uvicorn.Server(self.config)
+            server.run(sockets=[self._socket])
+            exit_code = 0 if server.started else STARTUP_FAILURE
+        finally:
+            os._exit(exit_code)
+
+    def reap(self) -> None:
+        """Collects the workers that exited, and stops the supervisor if one of them could not start."""
+        while self.processes:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                self.processes.clear()
+                return
+            if pid == 0:
+                return
+            self.processes.discard(pid)
+            exit_code = os.waitstatus_to_exitcode(status)
+            if self.should_exit:
+                continue
+            if exit_code == STARTUP_FAILURE:
+                logger.error(f"Worker {pid} failed to start, stopping")
+                self.exit_code = STARTUP_FAILURE
+                self.should_exit = True
+            else:
+                logger.warning(f"Worker {pid} exited with code {exit_code}, starting a new one")
+
+    def stop(self) -> None:
+        """Asks the workers to finish their requests, then kills the ones still running after the timeout."""
+        self._signal_workers(signal.SIGTERM)
+        deadline = time.monotonic() + (self.config.timeout_graceful_shutdown or 0) + SHUTDOWN_MARGIN_SECONDS
+        while self.processes and not self.force_exit and time.monotonic() < deadline:
+            time.sleep(POLL_INTERVAL_SECONDS)
+            self.reap()
+        if self.processes:
+            logger.warning(f"Killing {len(self.processes)} workers still running")
+            self._signal_workers(signal.SIGKILL)
+            for pid in self.processes:
+                os.waitpid(pid, 0)
+            self.processes.clear()
+
+    def _signal_workers(self, signum: int) -> None:
+        for pid in self.processes:
+            try:
+                os.kill(pid, signum)
+            except ProcessLookupError:
+                pass
+
+
+def serve(app: Any) -> None:
+    """
+    Runs an application with the server settings, in this process or in `SERVER_WORKERS` forked worker processes.
+
+    The schema is upgraded here, once, rather than in the lifespan of every worker.
+
+    Args:
+        app (Any): The ASGI application.
+
+    """
+    if settings.DB_CREATE_SCHEMA_ON_STARTUP:
+        upgrade(get_engine())
+        asyncio.run(dispose_engines())
+        settings.DB_CREATE_SCHEMA_ON_STARTUP = False
+
+    config = server_config(app)
+    workers = settings.server_workers()
+    if workers == 1:
+        server = uvicorn.Server(config)
+        server.run()
+        if not server.started:
+            sys.exit(STARTUP_FAILURE)
+        return
+
+    # Loaded before forking, so the workers share the loaded protocol classes and fail fast on missing packages.
+    config.load()
+    config.setup_event_loop()
+    sys.exit(Supervisor(config, workers).run())
@@ -7,10 +7,18 @@ It utilizes bcrypt for secure password hashing, the jose library for JWT token h
 
 - `encrypt_password`: Hashes a plaintext password using bcrypt.
 - `check_password`: Verifies a password against a hashed password using bcrypt.
+- `encrypt_password_async`: Runs `encrypt_password` on the password worker pool.
+- `check_password_async`: Runs `check_password` on the password worker pool.
+- `encrypt_passwords_async`: Encrypts a batch of passwords in parallel on the password worker pool.
+- `dummy_password_hash`: Returns a hash to check passwords against when a user does not exist.
 - `generate_token`: Creates a JWT authentication token with user information and an expiration time.
-- `decode_token`: Decodes a JWT authentication token and extracts its payload.
+- `decode_token`: Decodes a JWT authentication token and extracts its payload, using a cache of verified payloads.
+- `revoke_token`: Rejects a token until it expires.
+- `rotate_secret_key`: Replaces the signing key and invalidates every cached payload.
 """
 
+import secrets
+import time
 from datetime import datetime, timedelta
 from datetime import timezone
 from typing import Any
@@ -21,6 +29,61 @@ from starlette import status
 from starlette.exceptions import HTTPException
 
 from backend.core.config import settings
+from backend.core.metrics import Histogram
+from backend.services.token_cache import TokenCache
+from backend.services.worker_pool import BoundedExecutor, PoolSaturatedError
+
+token_cache = TokenCache(max_size=settings.TOKEN_CACHE_SIZE)
+
+PASSWORD_HASH_DURATION = Histogram(
+    "password_hash_duration_seconds",
+    "Time to hash or check passwords on the password worker pool, queueing included, by operation.",
+    ("operation",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+
+_password_pool: BoundedExecutor | None = None
+
+
+def get_password_pool() -> BoundedExecutor:
+    """
+    Returns the worker pool used for bcrypt hashing, creating it from the settings on first use.
+
+    Returns:
+        BoundedExecutor: The password worker pool.
+
+    """
+    global _password_pool
+    if _password_pool is None:
+        _password_pool = BoundedExecutor(
+            max_workers=settings.PASSWORD_HASH_WORKERS,
+            max_pending=settings.PASSWORD_HASH_MAX_PENDING,
+            kind=settings.PASSWORD_HASH_EXECUTOR,
+            queue_timeout=settings.PASSWORD_HASH_QUEUE_TIMEOUT,
+        )
+    return _password_pool
+
+
+def set_password_pool(pool: BoundedExecutor | None) -> None:
+    """
+    Replaces the password worker pool, shutting down the previous one.
+
+    Args:
+        pool (BoundedExecutor | None): The new pool, or None to recreate it from the settings on next use.
+
+    """
+    global _password_pool
+    if _password_pool is not None and _password_pool is not pool:
+        _password_pool.shutdown(wait=False)
+    _password_pool = pool
+
+
+def shutdown_password_pool() -> None:
+    """Shuts down the password worker pool, waiting for running jobs to finish."""
+    global _password_pool
+    if _password_pool is not None:
+        _password_pool.shutdown(wait=True)
+        _password_pool = None
 
 
 def encrypt_password(password: str) -> str:
@@ -36,7 +99,7 @@ def encrypt_password(password: str) -> str:
     """
     if not isinstance(password, str):
         raise TypeError(f"Password must be a string, not {str(type(password))}")
-    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(settings.BCRYPT_ROUNDS)).decode("utf-8")
 
 
 def check_password(password: str, hashed: str) -> bool:
@@ -54,6 +117,110 @@ def check_password(password: str, hashed: str) -> bool:
     return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
 
 
+async def encrypt_password_async(password: str) -> str:
+    """
+    Encrypts a password on the password worker pool without blocking the event loop.
+
+    Args:
+        password (str): The password to be encrypted.
+
+    Returns:
+        str: The encrypted password.
+
+    Raises:
+        HTTPException: 503 if the worker pool is saturated.
+
+    """
+    if not isinstance(password, str):
+        raise TypeError(f"Password must be a string, not {str(type(password))}")
+    start = time.perf_counter()
+    try:
+        return await get_password_pool().run(encrypt_password, password)
+    except PoolSaturatedError as e:
+        raise _service_unavailable() from e
+    finally:
+        PASSWORD_HASH_DURATION.observe(time.perf_counter() - start, labels=("encrypt",))
+
+
+async def encrypt_passwords_async(passwords: list[str]) -> list[str]:
+    """
+    Encrypts a batch of passwords in parallel on the password worker pool, without flooding its queue.
+
+    Args:
+        passwords (list[str]): The passwords to be encrypted.
+
+    Returns:
+        list[str]: The encrypted passwords, in the same order.
+
+    Raises:
+        HTTPException: 503 if the worker pool is saturated by other callers.
+
+    """
+    for password in passwords:
+        if not isinstance(password, str):
+            raise TypeError(f"Password must be a string, not {str(type(password))}")
+    start = time.perf_counter()
+    try:
+        return await get_password_pool().map(encrypt_password, passwords)
+    except PoolSaturatedError as e:
+        raise _service_unavailable() from e
+    finally:
+        PASSWORD_HASH_DURATION.observe(time.perf_counter() - start, labels=("encrypt_batch",))
+
+
+async def check_password_async(password: str, hashed: str) -> bool:
+    """
+    Checks a password against a hashed password on the password worker pool without blocking the event loop.
+
+    Args:
+        password (str): The password to be checked.
+        hashed (str): The hashed password to compare against.
+
+    Returns:
+        bool: True if the password matches the hashed password, False otherwise.
+
+    Raises:
+        HTTPException: 503 if the worker pool is saturated.
+
+    """
+    start = time.perf_counter()
+    try:
+        return await get_password_pool().run(check_password, password, hashed)
+    except PoolSaturatedError as e:
+        raise _service_unavailable() from e
+    finally:
+        PASSWORD_HASH_DURATION.observe(time.perf_counter() - start, labels=("check",))
+
+
+_dummy_hashes: dict[int, str] = {}
+
+
+async def dummy_password_hash() -> str:
+    """
+    Returns the hash of a random password, with the configured cost, to check passwords against for unknown users.
+
+    Checking a login of an unknown user as long as one of an existing user means the response time does not reveal
+    which usernames exist.
+
+    Returns:
+        str: The hash, computed once per number of bcrypt rounds.
+
+    """
+    hashed = _dummy_hashes.get(settings.BCRYPT_ROUNDS)
+    if hashed is None:
+        hashed = _dummy_hashes.setdefault(settings.BCRYPT_ROUNDS, await encrypt_password_async(secrets.token_urlsafe()))
+    return hashed
+
+
+def _service_unavailable() -> HTTPException:
+    retry_after = max(1, round(settings.PASSWORD_HASH_QUEUE_TIMEOUT))
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Server busy, try again later",
+        headers={"Retry-After": str(retry_after)},
+    )
+
+
 def generate_token(username: Any, is_admin: bool, expires_delta: int = settings.ACCESS_TOKEN_EXPIRE_MINUTES) -> str:
     """
     Generates a JSON Web Token (JWT) for authentication.
@@ -79,11 +246,50 @@ def decode_token(token: str) -> dict:
     """
     Decodes a JSON Web Token (JWT) and returns the payload as a dictionary.
 
+    Verified payloads are cached until the token expires, so repeated calls with the same token skip the signature
+    check.
+
     Args:
         token (str): The JWT to decode.
 
     Returns:
         dict: The decoded payload of the JWT.
 
+    Raises:
+        JWTError: If the token is invalid, expired or revoked.
+
+    """
+    if token_cache.is_revoked(token):
+        raise JWTError("Token has been revoked")
+    payload = token_cache.get(token)
+    if payload is None:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        token_cache.put(token, payload)
+    return payload
+
+
+def revoke_token(token: str) -> None:
+    """
+    Revokes a JSON Web Token (JWT), so `decode_token` rejects it until it expires.
+
+    Args:
+        token (str): The JWT to revoke.
+
+    Raises:
+        JWTError: If the token was not signed with the current key.
+
+    """
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM], options={"verify_exp": False})
+    token_cache.revoke(token, float(payload.get("exp", 0)))
+
+
+def rotate_secret_key(secret_key: str) -> None:
+    """
+    Replaces the key used to sign and verify tokens and drops every cached payload signed with the previous key.
+
+    Args:
+        secret_key (str): The new signing key.
+
     """
-    return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+    settings.SECRET_KEY = secret_key
+    token_cache.clear()
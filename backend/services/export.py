@@ -0,0 +1,196 @@
+"""
+This module provides streaming exports of query results as NDJSON or CSV, optionally gzip-compressed.
+
+Exports never hold the whole result: rows are read from a server-side cursor `EXPORT_CHUNK_SIZE` at a time, each
+chunk is turned into trusted objects, encoded and sent before the next one is read. Memory stays bounded by the chunk
+size and the first bytes leave as soon as the first chunk is read, whatever the size of the result.
+
+The rows are read on a connection of their own, opened when the response starts streaming: the session of the request
+is closed once the handler returns, before the body is sent. As the status is sent before the rows are read, an error
+while streaming truncates the response rather than turning it into an error response.
+
+Compression uses the gzip `Content-Encoding` when the client accepts it. Every chunk is flushed from the compressor,
+so compressing does not delay the chunks either.
+
+**Key Functions:**
+
+- `stream_rows`: Reads the rows of a query in chunks from a server-side cursor.
+- `encode_ndjson`: Encodes objects as NDJSON lines.
+- `encode_csv`: Encodes objects as CSV rows.
+- `encode_stream`: Encodes chunks of objects in an export format, optionally compressed.
+- `accepts_gzip`: Returns whether an `Accept-Encoding` header accepts gzip.
+- `export_response`: Returns the streaming response of an export.
+"""
+
+import csv
+import io
+import zlib
+from datetime import date
+from typing import Any, AsyncIterator, Literal, Sequence
+
+from sqlalchemy import Row
+from starlette.responses import StreamingResponse
+
+from backend.core.base_object import BaseObject
+from backend.core.config import settings
+from backend.database import get_async_engine
+
+ExportFormat = Literal["ndjson", "csv"]
+
+MEDIA_TYPES: dict[str, str] = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv; charset=utf-8",
+}
+
+
+async def stream_rows(statement: Any, chunk_size: int | None = None) -> AsyncIterator[Sequence[Row]]:
+    """
+    Reads the rows of a query in chunks from a server-side cursor, on a connection of its own.
+
+    Args:
+        statement (Select): The query.
+        chunk_size (int, optional): The number of rows per chunk. Defaults to `EXPORT_CHUNK_SIZE`.
+
+    Yields:
+        Sequence[Row]: The next rows of the query.
+
+    """
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    async with get_async_engine().connect() as connection:
+        result = await connection.stream(statement.execution_options(yield_per=chunk_size))
+        async for rows in result.partitions():
+            yield rows
+
+
+def encode_ndjson(objects: Sequence[BaseObject]) -> bytes:
+    """
+    Encodes objects as NDJSON lines, with pydantic-core.
+
+    Args:
+        objects (Sequence[BaseObject]): The objects.
+
+    Returns:
+        bytes: One compact json object per line, each line ending with a newline.
+
+    """
+    return b"".join(obj.convert_to_json_bytes() + b"\n" for obj in objects)
+
+
+def _csv_value(value: Any) -> Any:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    if isinstance(value, date):
+        return value.isoformat()
+    return value
+
+
+def encode_csv(objects: Sequence[BaseObject], fields: Sequence[str], header: bool = False) -> bytes:
+    """
+    Encodes objects as CSV rows.
+
+    Args:
+        objects (Sequence[BaseObject]): The objects, with flat fields.
+        fields (Sequence[str]): The fields written, in column order.
+        header (bool, optional): Whether to write the header row first. Defaults to False.
+
+    Returns:
+        bytes: The rows, UTF-8 encoded. Dates are written in ISO 8601 and missing values as empty cells.
+
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    if header:
+        writer.writerow(fields)
+    writer.writerows([_csv_value(obj.__dict__[field]) for field in fields] for obj in objects)
+    return buffer.getvalue().encode()
+
+
+async def encode_stream(
+    chunks: AsyncIterator[Sequence[BaseObject]],
+    model: type[BaseObject],
+    export_format: ExportFormat,
+    compress: bool = False,
+) -> AsyncIterator[bytes]:
+    """
+    Encodes chunks of objects in an export format, chunk by chunk.
+
+    Args:
+        chunks (AsyncIterator[Sequence[BaseObject]]): The objects, in chunks.
+        model (type[BaseObject]): The class of the objects, whose fields are the CSV columns.
+        export_format (str): "ndjson" or "csv".
+        compress (bool, optional): Whether to compress the output as a gzip stream. Defaults to False.
+
+    Yields:
+        bytes: The encoded chunks, the CSV header first.
+
+    """
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16) if compress else None
+    fields = list(model.model_fields)
+
+    def output(data: bytes) -> bytes:
+        # A sync flush sends everything compressed so far, so a chunk is never held back by the compressor.
+        return compressor.compress(data) + compressor.flush(zlib.Z_SYNC_FLUSH) if compressor else data
+
+    if export_format == "csv":
+        yield output(encode_csv([], fields, header=True))
+    async for objects in chunks:
+        if objects:
+            yield output(encode_ndjson(objects) if export_format == "ndjson" else encode_csv(objects, fields))
+    if compressor:
+        yield compressor.flush()
+
+
+def accepts_gzip(accept_encoding: str | None) -> bool:
+    """
+    Returns whether an `Accept-Encoding` header accepts gzip.
+
+    Args:
+        accept_encoding (str | None): The header, e.g. "gzip, deflate, br".
+
+    Returns:
+        bool: True if gzip is listed without a zero quality.
+
+    """
+    for coding in (accept_encoding or "").split(","):
+        name, _, parameters = coding.strip().partition(";")
+        if name.strip().lower() == "gzip":
+            quality = parameters.strip().removeprefix("q=")
+            try:
+                return not parameters or float(quality) > 0
+            except ValueError:
+                return False
+    return False
+
+
+def export_response(
+    chunks: AsyncIterator[Sequence[BaseObject]],
+    model: type[BaseObject],
+    export_format: ExportFormat,
+    filename: str,
+    accept_encoding: str | None = None,
+) -> StreamingResponse:
+    """
+    Returns the streaming response of an export, compressed if the client accepts gzip.
+
+    Args:
+        chunks (AsyncIterator[Sequence[BaseObject]]): The exported objects, in chunks.
+        model (type[BaseObject]): The class of the objects.
+        export_format (str): "ndjson" or "csv".
+        filename (str): The name of the downloaded file, without extension.
+        accept_encoding (str, optional): The `Accept-Encoding` header of the request.
+
+    Returns:
+        StreamingResponse: The response.
+
+    """
+    compress = accepts_gzip(accept_encoding)
+    headers = {"Content-Disposition": f'attachment; filename="{filename}.{export_format}"', "Vary": "Accept-Encoding"}
+    if compress:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        encode_stream(chunks, model, export_format, compress=compress),
+        media_type=MEDIA_TYPES[export_format],
+        headers=headers,
+    )
@@ -0,0 +1,431 @@
+"""
+This module provides a compact, read-only in-memory store of fixtures, saved to and loaded from a memory-mapped file.
+
+A fixture dump parsed with `json.load` holds every fixture as a tree of dictionaries, with its teams, venue and score
+blocks repeated, at many times the size of the file. The store instead interns teams, venues, seasons, statuses and
+rounds in small tables, and holds the fixtures in one NumPy structured array (`FIXTURE_DTYPE`) of fixed-size records,
+sorted by `(date, id)`, where they are referenced by position. Missing scores, venues and rounds are stored as -1.
+
+The fixtures of a team or a season are answered by index lookup: per team and per season, the positions of their
+fixtures are stored contiguously (in date order) with the offset of every group, as in a CSR matrix, so a slice costs
+two reads and a gather, whatever the size of the store.
+
+`FixtureStore.save` writes the arrays, 64-byte aligned, after a json header holding the string tables, like the
+columnar files of `backend.core.columnar`. `FixtureStore.load` memory-maps the file read-only: the server worker
+processes loading the same snapshot share one copy of its pages in the page cache, only the string tables are
+parsed per process.
+
+Snapshots are built with `poetry run snapshot-fixtures <dump.json> [<dump.json> ...] -o <snapshot>`, and served
+when `FIXTURE_STORE_PATH` points to one.
+
+**Key Classes:**
+
+- `FixtureStore`: Fixtures in a structured array, with their interned tables and per team and per season indexes.
+
+**Key Functions:**
+
+- `get_fixture_store`: Returns the store of `FIXTURE_STORE_PATH`, loading it on first use.
+- `set_fixture_store`: Replaces the fixture store.
+"""
+
+import argparse
+import json
+import os
+import tempfile
+from datetime import datetime
+from typing import Any, BinaryIO, Iterable
+
+import numpy as np
+
+from backend.core.config import settings
+from backend.core.logger import logger
+from backend.services.fixtures import as_naive_utc
+from backend.services.ingestion import SeasonContext, iter_fixtures, period_score
+
+MAGIC = b"FXSTORv1"
+ALIGNMENT = 64
+MISSING = -1
+
+FIXTURE_DTYPE = np.dtype(
+    [
+        ("id", "<i8"),
+        ("date", "<M8[s]"),
+        ("season", "<i4"),
+        ("home", "<i4"),
+        ("away", "<i4"),
+        ("venue", "<i4"),
+        ("round", "<i4"),
+        ("status", "<i2"),
+        ("home_score", "<i2"),
+        ("away_score", "<i2"),
+        ("halftime_home_score", "<i2"),
+        ("halftime_away_score", "<i2"),
+    ]
+)
+SEASON_DTYPE = np.dtype([("league_id", "<i8"), ("year", "<i4")])
+
+# The arrays of a store, in the order they are saved.
+ARRAYS = {
+    "fixtures": FIXTURE_DTYPE,
+    "team_ids": np.dtype("<i8"),
+    "venue_ids": np.dtype("<i8"),
+    "seasons": SEASON_DTYPE,
+    "team_offsets": np.dtype("<i8"),
+    "team_rows": np.dtype("<i4"),
+    "season_offsets": np.dtype("<i8"),
+    "season_rows": np.dtype("<i4"),
+}
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _code(value: Any) -> int:
+    return MISSING if value is None else int(value)
+
+
+def _group(keys: np.ndarray, positions: np.ndarray, groups: int) -> tuple[np.ndarray, np.ndarray]:
+    """Returns the offsets of every group and the positions sorted by group, then by position."""
+    order = np.lexsort((positions, keys))
+    offsets = np.zeros(groups + 1, dtype="<i8")
+    np.cumsum(np.bincount(keys, minlength=groups), out=offsets[1:])
+    return offsets, positions[order].astype("<i4")
+
+
+class FixtureStore:
+    """
+    Fixtures in a structured array sorted by `(date, id)`, with their interned tables and per team and per season
+    indexes.
+
+    Attributes:
+        fixtures (np.ndarray): The fixtures, of dtype `FIXTURE_DTYPE`; `season`, `home`, `away`, `venue`, `round` and
+            `status` are positions in the tables below.
+        team_ids (np.ndarray): The ids of the teams, sorted.
+        team_names (list[str | None]): The names of the teams, in the order of `team_ids`.
+        venue_ids (np.ndarray): The ids of the venues, sorted.
+        venue_names (list[str | None]): The names of the venues, in the order of `venue_ids`.
+        venue_cities (list[str | None]): The cities of the venues, in the order of `venue_ids`.
+        seasons (np.ndarray): The `(league_id, year)` of the seasons, sorted, of dtype `SEASON_DTYPE`.
+        league_names (dict[int, str]): The names of the leagues, by id.
+        statuses (list[str]): The statuses.
+        rounds (list[str]): The rounds.
+
+    """
+
+    def __init__(self, arrays: dict[str, np.ndarray], tables: dict[str, Any]) -> None:
+        self._arrays = arrays
+        self.fixtures = arrays["fixtures"]
+        self.team_ids = arrays["team_ids"]
+        self.venue_ids = arrays["venue_ids"]
+        self.seasons = arrays["seasons"]
+        self._team_offsets, self._team_rows = arrays["team_offsets"], arrays["team_rows"]
+        self._season_offsets, self._season_rows = arrays["season_offsets"], arrays["season_rows"]
+        self.team_names: list[str | None] = tables["team_names"]
+        self.venue_names: list[str | None] = tables["venue_names"]
+        self.venue_cities: list[str | None] = tables["venue_cities"]
+        self.league_names: dict[int, str] = {int(league_id): name for league_id, name in tables["league_names"].items()}
+        self.statuses: list[str] = tables["statuses"]
+        self.rounds: list[str] = tables["rounds"]
+
+    def __len__(self) -> int:
+        return len(self.fixtures)
+
+    @classmethod
+    def from_fixtures(cls, fixtures: Iterable[tuple[SeasonContext, dict]]) -> "FixtureStore":
+        """
+        Builds a store from fixtures as produced by `iter_fixtures`. A fixture met again replaces the previous one.
+
+        Args:
+            fixtures (Iterable[tuple[SeasonContext, dict]]): The fixtures with their season context.
+
+        Returns:
+            FixtureStore: The store.
+
+        """
+        teams: dict[int, str | None] = {}
+        venues: dict[int, tuple[str | None, str | None]] = {}
+        seasons: dict[tuple[int, int], int] = {}
+        league_names: dict[int, str] = {}
+        statuses: dict[str, int] = {}
+        rounds: dict[str, int] = {}
+        rows: dict[int, tuple] = {}
+        for context, fixture in fixtures:
+            home, away = fixture["home"], fixture["away"]
+            teams[home["id"]], teams[away["id"]] = home.get("name"), away.get("name")
+            venue = fixture.get("venue") or {}
+            if venue.get("id") is not None:
+                venues[venue["id"]] = (venue.get("name"), venue.get("city"))
+            league_names[context.league_id] = context.league_name
+            round_name = fixture.get("round")
+            # Team, venue and season ids are replaced by their position once every one of them is known.
+            rows[fixture["id"]] = (
+                fixture["id"],
+                np.datetime64(as_naive_utc(datetime.fromisoformat(fixture["date"])), "s"),
+                seasons.setdefault((context.league_id, context.year), len(seasons)),
+                home["id"],
+                away["id"],
+                _code(venue.get("id")),
+                MISSING if round_name is None else rounds.setdefault(round_name, len(rounds)),
+                statuses.setdefault(fixture["status"], len(statuses)),
+                _code(fixture.get("home_score")),
+                _code(fixture.get("away_score")),
+                _code(period_score(fixture, "halftime", "home")),
+                _code(period_score(fixture, "halftime", "away")),
+            )
+
+        array = np.array(list(rows.values()), dtype=FIXTURE_DTYPE)
+        array = array[np.lexsort((array["id"], array["date"]))]
+        team_ids = np.array(sorted(teams), dtype="<i8")
+        venue_ids = np.array(sorted(venues), dtype="<i8")
+        season_keys = sorted(seasons)
+        season_positions = np.empty(len(seasons), dtype="<i4")
+        season_positions[[seasons[key] for key in season_keys]] = np.arange(len(seasons))
+        array["home"] = np.searchsorted(team_ids, array["home"])
+        array["away"] = np.searchsorted(team_ids, array["away"])
+        has_venue = array["venue"] != MISSING
+        array["venue"][has_venue] = np.searchsorted(venue_ids, array["venue"][has_venue])
+        if len(array):
+            array["season"] = season_positions[array["season"]]
+
+        positions = np.arange(len(array))
+        team_offsets, team_rows = _group(
+            np.concatenate([array["home"], array["away"]]), np.concatenate([positions, positions]), len(team_ids)
+        )
+        season_offsets, season_rows = _group(array["season"], positions, len(seasons))
+        arrays = {
+            "fixtures": array,
+            "team_ids": team_ids,
+            "venue_ids": venue_ids,
+            "seasons": np.array(season_keys, dtype=SEASON_DTYPE),
+            "team_offsets": team_offsets,
+            "team_rows": team_rows,
+            "season_offsets": season_offsets,
+            "season_rows": season_rows,
+        }
+        tables = {
+            "team_names": [teams[team_id] for team_id in team_ids.tolist()],
+            "venue_names": [venues[venue_id][0] for venue_id in venue_ids.tolist()],
+            "venue_cities": [venues[venue_id][1] for venue_id in venue_ids.tolist()],
+            "league_names": league_names,
+            "statuses": list(statuses),
+            "rounds": list(rounds),
+        }
+        return cls(arrays, tables)
+
+    @classmethod
+    def from_dumps(cls, files: Iterable[BinaryIO]) -> "FixtureStore":
+        """
+        Builds a store from fixture dumps, stream-parsed so only the store is held in memory.
+
+        Args:
+            files (Iterable[BinaryIO]): The dumps, opened in binary mode; later dumps replace the fixtures of earlier
+                ones.
+
+        Returns:
+            FixtureStore: The store.
+
+        """
+        return cls.from_fixtures(item for file in files for item in iter_fixtures(file))
+
+    def save(self, file_path: str) -> None:
+        """
+        Saves the store to a file that `load` memory-maps.
+
+        The store is written to a temporary file next to the target, synced, then renamed over it, so workers that
+        memory-mapped the previous snapshot keep reading it intact until they load the new one.
+
+        Args:
+            file_path (str): The path to the file.
+
+        """
+        arrays = self._arrays
+        specifications: dict[str, dict[str, Any]] = {}
+        offset = 0
+        for name in ARRAYS:
+            offset = _aligned(offset)
+            specifications[name] = {"offset": offset, "length": len(arrays[name])}
+            offset += arrays[name].nbytes
+        tables = {
+            "team_names": self.team_names,
+            "venue_names": self.venue_names,
+            "venue_cities": self.venue_cities,
+            "league_names": self.league_names,
+            "statuses": self.statuses,
+            "rounds": self.rounds,
+        }
+        header = json.dumps({"arrays": specifications, "tables": tables}).encode()
+        start = _aligned(len(MAGIC) + 8 + len(header))
+        descriptor, temporary_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(file_path)), prefix=f".{os.path.basename(file_path)}.", suffix=".tmp"
+        )
+        try:
+            with os.fdopen(descriptor, "wb") as file:
+                file.write(MAGIC + len(header).to_bytes(8, "little") + header)
+                for name in ARRAYS:
+                    file.write(b"\0" * (start + specifications[name]["offset"] - file.tell()))
+                    file.write(np.ascontiguousarray(arrays[name]).tobytes())
+                file.flush()
+                os.fsync(file.fileno())
+            os.chmod(temporary_path, 0o644)
+            # Truncating a file other processes memory-mapped would crash them with SIGBUS: it is replaced instead.
+            os.replace(temporary_path, file_path)
+        except BaseException:
+            os.unlink(temporary_path)
+            raise
+
+    @classmethod
+    def load(cls, file_path: str) -> "FixtureStore":
+        """
+        Memory-maps a store saved by `save`, read-only.
+
+        Args:
+            file_path (str): The path to the file.
+
+        Returns:
+            FixtureStore: The store, whose arrays are views on the file.
+
+        Raises:
+            ValueError: If the file is not a fixture store.
+
+        """
+        with open(file_path, "rb") as file:
+            if file.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{file_path} is not a fixture store")
+            header_length = int.from_bytes(file.read(8), "little")
+            header = json.loads(file.read(header_length))
+        start = _aligned(len(MAGIC) + 8 + header_length)
+        data = np.memmap(file_path, dtype="u1", mode="r")
+        arrays = {}
+        for name, dtype in ARRAYS.items():
+            specification = header["arrays"][name]
+            offset = start + specification["offset"]
+            arrays[name] = data[offset : offset + dtype.itemsize * specification["length"]].view(dtype)
+        return cls(arrays, header["tables"])
+
+    def team_position(self, team_id: int) -> int | None:
+        """Returns the position of a team in `team_ids`, or None if it plays no fixture of the store."""
+        position = int(np.searchsorted(self.team_ids, team_id))
+        return position if position < len(self.team_ids) and self.team_ids[position] == team_id else None
+
+    def season_position(self, league_id: int, year: int) -> int | None:
+        """Returns the position of a season in `seasons`, or None if it has no fixture in the store."""
+        key = np.array((league_id, year), dtype=SEASON_DTYPE)
+        position = int(np.searchsorted(self.seasons, key))
+        return position if position < len(self.seasons) and self.seasons[position] == key else None
+
+    def team_fixtures(self, team_id: int) -> np.ndarray:
+        """
+        Returns the fixtures a team plays in, home or away.
+
+        Args:
+            team_id (int): The id of the team.
+
+        Returns:
+            np.ndarray: The fixtures, of dtype `FIXTURE_DTYPE`, in `(date, id)` order; empty for an unknown team.
+
+        """
+        position = self.team_position(team_id)
+        if position is None:
+            return self.fixtures[:0]
+        return self.fixtures[self._team_rows[self._team_offsets[position] : self._team_offsets[position + 1]]]
+
+    def season_fixtures(self, league_id: int, year: int) -> np.ndarray:
+        """
+        Returns the fixtures of a season.
+
+        Args:
+            league_id (int): The id of the league.
+            year (int): The year of the season.
+
+        Returns:
+            np.ndarray: The fixtures, of dtype `FIXTURE_DTYPE`, in `(date, id)` order; empty for an unknown season.
+
+        """
+        position = self.season_position(league_id, year)
+        if position is None:
+            return self.fixtures[:0]
+        return self.fixtures[self._season_rows[self._season_offsets[position] : self._season_offsets[position + 1]]]
+
+    def records(self, fixtures: np.ndarray) -> list[dict[str, Any]]:
+        """
+        Expands fixtures of the store into dictionaries with ids and names instead of positions.
+
+        Args:
+            fixtures (np.ndarray): Fixtures of the store, e.g. a slice returned by `team_fixtures`.
+
+        Returns:
+            list[dict]: One dictionary per fixture, with None for the missing values.
+
+        """
+        records = []
+        for fixture in fixtures.tolist():
+            fixture_id, date, season, home, away, venue, round_code, status, *scores = fixture
+            league_id, year = self.seasons[season].tolist()
+            records.append(
+                {
+                    "id": fixture_id,
+                    "date": date,
+                    "league_id": league_id,
+                    "year": year,
+                    "status": self.statuses[status],
+                    "round": None if round_code == MISSING else self.rounds[round_code],
+                    "venue_id": None if venue == MISSING else int(self.venue_ids[venue]),
+                    "home_team_id": int(self.team_ids[home]),
+                    "home_team_name": self.team_names[home],
+                    "away_team_id": int(self.team_ids[away]),
+                    "away_team_name": self.team_names[away],
+                }
+                | {
+                    name: None if score == MISSING else score
+                    for name, score in zip(FIXTURE_DTYPE.names[-4:], scores)  # type: ignore[index]
+                }
+            )
+        return records
+
+
+_fixture_store: FixtureStore | None = None
+
+
+def get_fixture_store() -> FixtureStore | None:
+    """
+    Returns the store of `FIXTURE_STORE_PATH`, memory-mapping it on first use.
+
+    Returns:
+        FixtureStore | None: The store, or None if no path is configured.
+
+    """
+    global _fixture_store
+    if _fixture_store is None and settings.FIXTURE_STORE_PATH:
+        _fixture_store = FixtureStore.load(settings.FIXTURE_STORE_PATH)
+        logger.info(f"Loaded {len(_fixture_store)} fixtures from {settings.FIXTURE_STORE_PATH}")
+    return _fixture_store
+
+
+def set_fixture_store(store: FixtureStore | None) -> None:
+    """
+    Replaces the fixture store.
+
+    Args:
+        store (FixtureStore | None): The new store, or None to load `FIXTURE_STORE_PATH` again on next use.
+
+    """
+    global _fixture_store
+    _fixture_store = store
+
+
+def main() -> None:
+    """Builds a fixture store snapshot from the fixture dumps given on the command line."""
+    parser = argparse.ArgumentParser(description="Build a memory-mappable snapshot of fixture dumps.")
+    parser.add_argument("files", nargs="+", help="Fixture dumps, e.g. devdata/result.json")
+    parser.add_argument("-o", "--output", required=True, help="The snapshot to write")
+    args = parser.parse_args()
+
+    files = [open(file_path, "rb") for file_path in args.files]
+    try:
+        store = FixtureStore.from_dumps(files)
+    finally:
+        for file in files:
+            file.close()
+    store.save(args.output)
+    print(f"Saved {len(store)} fixtures, {len(store.team_ids)} teams and {len(store.seasons)} seasons to {args.output}")
@@ -0,0 +1,182 @@
+"""
+This module provides the queries on fixtures.
+
+Fixtures are listed in `(date, id)` order with keyset pagination: the cursor encodes the `(date, id)` of the last
+fixture of a page and the next page starts strictly after it, so fetching a page costs the same whatever its depth.
+Only the listed columns are selected, and rows are turned into trusted `FixtureRead` objects without loading ORM
+entities or validating the values again.
+
+**Key Functions:**
+
+- `fixture_statement`: Returns the query of the fixtures matching the given filters.
+- `list_fixtures`: Returns a page of fixtures matching the given filters.
+- `encode_cursor`: Encodes the position of a fixture as an opaque cursor.
+- `decode_cursor`: Decodes a cursor produced by `encode_cursor`.
+"""
+
+import base64
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import or_, tuple_
+from sqlalchemy.orm import aliased
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.models.fixture import Fixture, FixturePage, FixtureRead, Team
+
+HomeTeam = aliased(Team)
+AwayTeam = aliased(Team)
+
+
+def as_naive_utc(value: datetime) -> datetime:
+    """
+    Converts a datetime to the naive UTC datetime fixtures are stored with. Naive datetimes are assumed to be UTC.
+
+    Args:
+        value (datetime): The datetime to convert.
+
+    Returns:
+        datetime: The naive UTC datetime.
+
+    """
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def encode_cursor(date: datetime, fixture_id: int) -> str:
+    """
+    Encodes the position of a fixture as an opaque cursor.
+
+    Args:
+        date (datetime): The date of the fixture.
+        fixture_id (int): The id of the fixture.
+
+    Returns:
+        str: The cursor.
+
+    """
+    return base64.urlsafe_b64encode(f"{date.isoformat()}|{fixture_id}".encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    """
+    Decodes a cursor produced by `encode_cursor`.
+
+    Args:
+        cursor (str): The cursor.
+
+    Returns:
+        tuple[datetime, int]: The date and id of the fixture the cursor points to.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+
+    """
+    try:
+        date, fixture_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(date), int(fixture_id)
+    except Exception as e:
+        raise ValueError(f"Invalid cursor {cursor}") from e
+
+
+def fixture_statement(
+    league_id: int | None = None,
+    season_id: int | None = None,
+    team_id: int | None = None,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    status: list[str] | None = None,
+) -> Any:
+    """
+    Returns the query of the fixtures matching the given filters, with the columns of `FixtureRead`, ordered by date.
+
+    Args:
+        league_id (int, optional): Only fixtures of this league.
+        season_id (int, optional): Only fixtures of this season.
+        team_id (int, optional): Only fixtures this team plays in, home or away.
+        date_from (datetime, optional): Only fixtures on or after this date.
+        date_to (datetime, optional): Only fixtures strictly before this date.
+        status (list[str], optional): Only fixtures with one of these statuses, e.g. ["FT", "NS"].
+
+    Returns:
+        Select: The query.
+
+    """
+    filters = []
+    if league_id is not None:
+        filters.append(col(Fixture.league_id) == league_id)
+    if season_id is not None:
+        filters.append(col(Fixture.season_id) == season_id)
+    if team_id is not None:
+        filters.append(or_(col(Fixture.home_team_id) == team_id, col(Fixture.away_team_id) == team_id))
+    if date_from is not None:
+        filters.append(col(Fixture.date) >= as_naive_utc(date_from))
+    if date_to is not None:
+        filters.append(col(Fixture.date) < as_naive_utc(date_to))
+    if status:
+        filters.append(col(Fixture.status).in_(status))
+
+    return (
+        select(
+            Fixture.id,
+            Fixture.date,
+            Fixture.status,
+            Fixture.round,
+            Fixture.league_id,
+            Fixture.season_id,
+            Fixture.venue_id,
+            Fixture.home_team_id,
+            HomeTeam.name.label("home_team_name"),  # type: ignore[attr-defined]
+            Fixture.away_team_id,
+            AwayTeam.name.label("away_team_name"),  # type: ignore[attr-defined]
+            Fixture.home_score,
+            Fixture.away_score,
+        )
+        .join(HomeTeam, HomeTeam.id == Fixture.home_team_id)  # type: ignore[arg-type]
+        .join(AwayTeam, AwayTeam.id == Fixture.away_team_id)  # type: ignore[arg-type]
+        .where(*filters)
+        .order_by(col(Fixture.date), col(Fixture.id))
+    )
+
+
+async def list_fixtures(
+    db: AsyncSession,
+    league_id: int | None = None,
+    season_id: int | None = None,
+    team_id: int | None = None,
+    date_from: datetime | None = None,
+    date_to: datetime | None = None,
+    status: list[str] | None = None,
+    cursor: str | None = None,
+    limit: int = 50,
+) -> FixturePage:
+    """
+    Returns a page of fixtures matching the given filters, ordered by date.
+
+    Args:
+        db (AsyncSession): The database session.
+        league_id (int, optional): Only fixtures of this league.
+        season_id (int, optional): Only fixtures of this season.
+        team_id (int, optional): Only fixtures this team plays in, home or away.
+        date_from (datetime, optional): Only fixtures on or after this date.
+        date_to (datetime, optional): Only fixtures strictly before this date.
+        status (list[str], optional): Only fixtures with one of these statuses, e.g. ["FT", "NS"].
+        cursor (str, optional): The `next_cursor` of the previous page.
+        limit (int, optional): The maximum number of fixtures in the page. Defaults to 50.
+
+    Returns:
+        FixturePage: The fixtures and the cursor of the next page, None on the last page.
+
+    """
+    statement = fixture_statement(league_id, season_id, team_id, date_from, date_to, status)
+    if cursor is not None:
+        after_date, after_id = decode_cursor(cursor)
+        # A row-value comparison lets the database seek straight to the cursor in the (..., date, id) indexes.
+        statement = statement.where(tuple_(col(Fixture.date), col(Fixture.id)) > tuple_(after_date, after_id))
+    rows = (await db.exec(statement.limit(limit + 1))).all()
+
+    items = [FixtureRead.trusted(**row._mapping) for row in rows[:limit]]
+    next_cursor = encode_cursor(items[-1].date, items[-1].id) if len(rows) > limit else None
+    return FixturePage.trusted(items=items, next_cursor=next_cursor)
@@ -0,0 +1,358 @@
+"""
+This module provides the ingestion pipeline for fixture dumps such as `devdata/result.json`.
+
+Dumps are nested sports -> countries -> leagues -> seasons -> fixtures documents. They are stream-parsed with ijson,
+so only the fixture being parsed and the current batch are held in memory, whatever the size of the dump. Teams and
+venues, repeated in every fixture, are de-duplicated and every table is bulk-upserted, so ingesting a dump again
+updates the existing rows (e.g. fixtures whose status changed) instead of duplicating them. The standings are updated
+in the same transaction as each batch, and the ratings are replayed once per ingestion from the earliest fixture
+added or corrected. The "fixtures" version is then bumped, which tells the server workers to drop their model and add
+the new names to their search index. When the ingestion runs in a server worker, its index is updated with the teams,
+venues and leagues of each batch as they are written.
+
+Launched with `poetry run ingest <dump.json> [<dump.json> ...]` at root level.
+
+**Key Classes:**
+
+- `FixtureIngestor`: Upserts the fixtures of one or more dumps into the database in batches.
+
+**Key Functions:**
+
+- `iter_fixtures`: Stream-parses a dump and yields every fixture along with its season context.
+- `period_score`: Returns the score of a side at the end of a period of a fixture of a dump.
+"""
+
+import argparse
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, BinaryIO, Iterator
+
+import ijson
+from sqlalchemy import Engine, select
+from sqlalchemy.engine import Connection
+from sqlmodel import SQLModel, col
+
+from backend.core.logger import logger
+from backend.database import UPSERT_DIALECTS
+from backend.models.fixture import Fixture, League, Season, Sport, Team, Venue
+from backend.services.fixtures import as_naive_utc
+from backend.services.ratings import RATED_COLUMNS, RATING_TABLES, Position, earliest_change, replay_ratings
+from backend.services.search import index_names
+from backend.services.standings import STANDING_TABLES, apply_fixtures
+from backend.services.versions import VERSION_TABLES, bump_version
+
+SEASON_PREFIX = "sports.item.countries.item.leagues.item.seasons.item"
+FIXTURE_PREFIX = f"{SEASON_PREFIX}.fixtures.item"
+SEASON_FIELDS = ("id", "year", "start", "end", "logo")
+
+FIXTURE_TABLES = [
+    *(table.__table__ for table in (Sport, League, Season, Team, Venue, Fixture)),  # type: ignore[attr-defined]
+    *STANDING_TABLES,
+    *RATING_TABLES,
+    *VERSION_TABLES,
+]
+
+
+@dataclass(frozen=True)
+class SeasonContext:
+    """The sport, country, league and season a fixture belongs to."""
+
+    sport: str
+    country: str
+    league_id: int
+    league_name: str
+    year: int
+    start: str | None = None
+    end: str | None = None
+    logo: str | None = None
+
+
+@dataclass
+class IngestionReport:
+    """Counts of the rows upserted by an ingestion."""
+
+    fixtures: int = 0
+    teams: int = 0
+    venues: int = 0
+    seasons: int = 0
+    rated: int = 0
+    files: list[str] = field(default_factory=list)
+
+
+def iter_fixtures(file: BinaryIO) -> Iterator[tuple[SeasonContext, dict]]:
+    """
+    Stream-parses a fixture dump and yields every fixture with the season it belongs to.
+
+    Season attributes are expected before the `fixtures` array, as in the dumps produced by the collector. Fixtures
+    met before their season's `year` are held back until the end of that season.
+
+    Args:
+        file (BinaryIO): The dump, opened in binary mode.
+
+    Yields:
+        tuple[SeasonContext, dict]: The season context and the fixture as parsed from the dump.
+
+    """
+    names: dict[str, Any] = {}
+    season: dict[str, Any] = {}
+    pending: list[dict] = []
+    builder: ijson.ObjectBuilder | None = None
+
+    def context() -> SeasonContext:
+        return SeasonContext(
+            sport=names["sport"],
+            country=names["country"],
+            league_id=names["league_id"],
+            league_name=names["league_name"],
+            year=int(season["year"]),
+            start=season.get("start"),
+            end=season.get("end"),
+            logo=season.get("logo"),
+        )
+
+    for prefix, event, value in ijson.parse(file, use_float=True):
+        if builder is not None:
+            builder.event(event, value)
+            if prefix == FIXTURE_PREFIX and event == "end_map":
+                if "year" in season:
+                    yield context(), builder.value
+                else:
+                    pending.append(builder.value)
+                builder = None
+        elif prefix == FIXTURE_PREFIX and event == "start_map":
+            builder = ijson.ObjectBuilder()
+            builder.event(event, value)
+        elif prefix == SEASON_PREFIX:
+            if event == "start_map":
+                season, pending = {}, []
+            elif event == "end_map" and pending:
+                current = context()
+                for fixture in pending:
+                    yield current, fixture
+                pending = []
+        elif prefix.startswith(SEASON_PREFIX + ".") and prefix[len(SEASON_PREFIX) + 1 :] in SEASON_FIELDS:
+            season[prefix[len(SEASON_PREFIX) + 1 :]] = value
+        elif prefix == "sports.item.name":
+            names["sport"] = value
+        elif prefix == "sports.item.countries.item.name":
+            names["country"] = value
+        elif prefix == "sports.item.countries.item.leagues.item.id":
+            names["league_id"] = int(value)
+        elif prefix == "sports.item.countries.item.leagues.item.name":
+            names["league_name"] = value
+
+
+def _parse_datetime(value: str) -> datetime:
+    return as_naive_utc(datetime.fromisoformat(value))
+
+
+def _parse_date(value: str | None) -> date | None:
+    return date.fromisoformat(value) if value else None
+
+
+def period_score(fixture: dict, period: str, side: str) -> int | None:
+    """
+    Returns the score of a side at the end of a period of a fixture of a dump.
+
+    Args:
+        fixture (dict): The fixture, as yielded by `iter_fixtures`.
+        period (str): The period, "halftime", "extratime" or "penalty".
+        side (str): The side, "home" or "away".
+
+    Returns:
+        int | None: The score, or None if the dump does not give it.
+
+    """
+    return ((fixture.get("score") or {}).get(period) or {}).get(side)
+
+
+def _upsert(connection: Connection, model: Any, rows: list[dict], index_elements: list[str]) -> None:
+    if not rows:
+        return
+    statement = UPSERT_DIALECTS[connection.dialect.name](model)
+    update_columns = {name: statement.excluded[name] for name in rows[0] if name not in index_elements}
+    if update_columns:
+        statement = statement.on_conflict_do_update(index_elements=index_elements, set_=update_columns)
+    else:
+        statement = statement.on_conflict_do_nothing(index_elements=index_elements)
+    connection.execute(statement, rows)
+
+
+class FixtureIngestor:
+    """
+    Upserts fixtures, and the sports, leagues, seasons, teams and venues they reference, in batches.
+
+    Only the ids of the teams, venues and seasons already written are kept between batches, so memory is bounded by
+    the batch size and the number of distinct teams, not by the number of fixtures.
+
+    Attributes:
+        engine (Engine): The engine of the database to write to.
+        batch_size (int): The number of fixtures upserted per statement.
+
+    """
+
+    def __init__(self, engine: Engine, batch_size: int = 1000) -> None:
+        if engine.dialect.name not in UPSERT_DIALECTS:
+            raise ValueError(f"Ingestion is not supported on {engine.dialect.name}")
+        self.engine = engine
+        self.batch_size = batch_size
+        self.report = IngestionReport()
+        self._season_ids: dict[tuple[int, int], int] = {}
+        self._team_ids: set[int] = set()
+        self._venue_ids: set[int] = set()
+        self._replay_from: Position | None = None
+
+    def create_tables(self) -> None:
+        """Creates the fixture, standings and ratings tables that do not exist yet."""
+        SQLModel.metadata.create_all(self.engine, tables=FIXTURE_TABLES)
+
+    def ingest_file(self, file_path: str) -> IngestionReport:
+        """
+        Ingests a fixture dump.
+
+        Args:
+            file_path (str): The path to the dump.
+
+        Returns:
+            IngestionReport: The counts of upserted rows, accumulated over every ingested file.
+
+        """
+        with open(file_path, "rb") as file:
+            self.ingest(iter_fixtures(file))
+        self.report.files.append(file_path)
+        logger.info(f"Ingested {file_path}: {self.report}")
+        return self.report
+
+    def ingest(self, fixtures: Iterator[tuple[SeasonContext, dict]]) -> IngestionReport:
+        """
+        Ingests fixtures as produced by `iter_fixtures`, committing every `batch_size` fixtures, then replays the
+        ratings from the earliest fixture that changed them and bumps the "fixtures" version, so the server workers
+        refresh what they derived from the fixtures.
+
+        Args:
+            fixtures (Iterator[tuple[SeasonContext, dict]]): The fixtures with their season context.
+
+        Returns:
+            IngestionReport: The counts of upserted rows.
+
+        """
+        batch: list[tuple[SeasonContext, dict]] = []
+        written = self.report.fixtures
+        for item in fixtures:
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                self._write_batch(batch)
+                batch = []
+        if batch:
+            self._write_batch(batch)
+        if self._replay_from is not None:
+            self.report.rated += replay_ratings(self.engine, since=self._replay_from)
+            self._replay_from = None
+        if self.report.fixtures > written:
+            with self.engine.begin() as connection:
+                bump_version(connection, "fixtures")
+        return self.report
+
+    def _season_id(self, connection: Connection, context: SeasonContext) -> int:
+        key = (context.league_id, context.year)
+        if key not in self._season_ids:
+            _upsert(connection, Sport, [{"name": context.sport}], ["name"])
+            sport_id = connection.execute(select(Sport.id).where(Sport.name == context.sport)).scalar_one()
+            league = {"id": context.league_id, "name": context.league_name, "country": context.country}
+            _upsert(connection, League, [league | {"sport_id": sport_id}], ["id"])
+            season = {
+                "league_id": context.league_id,
+                "year": context.year,
+                "start": _parse_date(context.start),
+                "end": _parse_date(context.end),
+                "logo": context.logo,
+            }
+            _upsert(connection, Season, [season], ["league_id", "year"])
+            self._season_ids[key] = connection.execute(
+                select(Season.id).where(Season.league_id == context.league_id, Season.year == context.year)
+            ).scalar_one()
+            self.report.seasons += 1
+        return self._season_ids[key]
+
+    def _write_batch(self, batch: list[tuple[SeasonContext, dict]]) -> None:
+        teams: dict[int, dict] = {}
+        venues: dict[int, dict] = {}
+        leagues: dict[int, str] = {}
+        rows: list[dict] = []
+        with self.engine.begin() as connection:
+            for context, fixture in batch:
+                for side in ("home", "away", "winner"):
+                    team = fixture.get(side)
+                    if team and team.get("id") is not None and team["id"] not in self._team_ids:
+                        teams[team["id"]] = {"id": team["id"], "name": team.get("name"), "logo": team.get("logo")}
+                venue = fixture.get("venue") or {}
+                if venue.get("id") is not None and venue["id"] not in self._venue_ids:
+                    venues[venue["id"]] = {"id": venue["id"], "name": venue.get("name"), "city": venue.get("city")}
+                leagues[context.league_id] = context.league_name
+                rows.append(
+                    {
+                        "id": fixture["id"],
+                        "season_id": self._season_id(connection, context),
+                        "league_id": context.league_id,
+                        "date": _parse_datetime(fixture["date"]),
+                        "status": fixture["status"],
+                        "round": fixture.get("round"),
+                        "venue_id": venue.get("id"),
+                        "home_team_id": fixture["home"]["id"],
+                        "away_team_id": fixture["away"]["id"],
+                        "winner_team_id": (fixture.get("winner") or {}).get("id"),
+                        "home_score": fixture.get("home_score"),
+                        "away_score": fixture.get("away_score"),
+                        "halftime_home_score": period_score(fixture, "halftime", "home"),
+                        "halftime_away_score": period_score(fixture, "halftime", "away"),
+                        "extratime_home_score": period_score(fixture, "extratime", "home"),
+                        "extratime_away_score": period_score(fixture, "extratime", "away"),
+                        "penalty_home_score": period_score(fixture, "penalty", "home"),
+                        "penalty_away_score": period_score(fixture, "penalty", "away"),
+                    }
+                )
+            previous = {
+                row.id: row._asdict() | {"status": row.status}
+                for row in connection.execute(
+                    select(*RATED_COLUMNS, Fixture.status).where(col(Fixture.id).in_([row["id"] for row in rows]))
+                )
+            }
+            _upsert(connection, Team, list(teams.values()), ["id"])
+            _upsert(connection, Venue, list(venues.values()), ["id"])
+            _upsert(connection, Fixture, rows, ["id"])
+            apply_fixtures(connection, rows)
+        changed = earliest_change(previous, rows)
+        if changed is not None:
+            self._replay_from = min(changed, self._replay_from or changed)
+        index_names(
+            [
+                *(("team", team["id"], team["name"], None) for team in teams.values()),
+                *(("venue", venue["id"], venue["name"], venue["city"]) for venue in venues.values()),
+                *(("league", league_id, name, None) for league_id, name in leagues.items()),
+            ]
+        )
+        self._team_ids.update(teams)
+        self._venue_ids.update(venues)
+        self.report.teams += len(teams)
+        self.report.venues += len(venues)
+        self.report.fixtures += len(rows)
+
+
+def main() -> None:
+    """Ingests the fixture dumps given on the command line into the database configured in the settings."""
+    from backend.database import get_engine
+
+    parser = argparse.ArgumentParser(description="Ingest fixture dumps into the database.")
+    parser.add_argument("files", nargs="+", help="Fixture dumps, e.g. devdata/result.json")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Fixtures upserted per statement")
+    args = parser.parse_args()
+
+    ingestor = FixtureIngestor(get_engine(), batch_size=args.batch_size)
+    ingestor.create_tables()
+    for file_path in args.files:
+        ingestor.ingest_file(file_path)
+    report = ingestor.report
+    print(
+        f"Ingested {report.fixtures} fixtures, {report.teams} teams, {report.venues} venues and {report.seasons} "
+        f"seasons from {len(report.files)} file(s)"
+    )
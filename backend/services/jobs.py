@@ -0,0 +1,562 @@
+"""
+This module provides the background job subsystem: a persistent job table and a scheduler running jobs on a process
+pool, so heavy work (refitting the prediction model, rebuilding standings or ratings, ingesting a dump) never runs in a
+request handler. It needs no broker: the database is the queue.
+
+`submit_job` inserts a pending job, or returns the pending job with the same type and parameters. Every server worker
+runs a `JobScheduler`, started by the application lifespan, which polls the pending jobs in submission order and
+claims one with a conditional UPDATE, so a job runs once whatever the number of workers. The UPDATE also checks that
+fewer than the type's `max_concurrency` jobs of that type are running. On PostgreSQL two workers claiming at the same
+instant can both see room for one more, so the limit is tight with SQLite and best effort with several workers on
+PostgreSQL.
+
+Claimed jobs run in a `ProcessPoolExecutor` of `JOB_WORKERS` processes, started by a fork server rather than forked
+from the server worker with its threads and connections. They open their own connections to the database and report
+their progress by updating their row, so `GET /jobs/{id}` is answered by any worker from the database. When a job
+ends, the scheduler records its result or error, and may apply its result in the server process, e.g. install a
+refitted model.
+
+A claimed job is leased by its scheduler: a thread of the pool process renews `heartbeat_at` every
+`JOB_HEARTBEAT_INTERVAL` seconds, and every scheduler puts the running jobs whose lease is older than
+`JOB_LEASE_SECONDS` back to pending, whichever host or process crashed. A stopping scheduler waits up to
+`JOB_SHUTDOWN_TIMEOUT` seconds for its running jobs, terminates the pool processes still running one, and only then
+puts them back to pending. Progress and results are only written by the lease holder, so a job whose lease expired
+stops at its next progress report rather than finishing alongside its rerun. Jobs may still run again, so job
+functions must be idempotent, as the built-in ones are.
+
+**Key Classes:**
+
+- `JobType`: A kind of job: its function, its concurrency limit and how its result is applied.
+- `JobContext`: Given to a job function in its worker process, to reach the database and report progress.
+- `JobScheduler`: Claims pending jobs and runs them on a process pool.
+
+The built-in job types, in `JOB_TYPES`, are `rebuild_standings` (parameter `season_id`, optional), `replay_ratings`,
+`ingest` (parameter `path`, a fixture dump readable by the server) and `refit_model`. Only the server worker that ran
+a job applies its result: `ingest` adds the ingested names to the search index of that worker at once, the others add
+them, and drop their model, when their data version watcher sees the change (see `backend.services.versions`);
+`refit_model` installs the refitted model in that worker alone, the others keep theirs until the next ingestion.
+
+**Key Functions:**
+
+- `submit_job`: Submits a job, or returns the identical pending job.
+- `read_job`: Returns a job.
+- `get_job_scheduler`: Returns the job scheduler, creating it from the settings on first use.
+- `set_job_scheduler`: Replaces the job scheduler.
+"""
+
+import asyncio
+import hashlib
+import json
+import os
+import multiprocessing
+import socket
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Iterator
+from uuid import uuid4
+
+from sqlalchemy import Engine, create_engine, func, or_, update
+from sqlalchemy.exc import IntegrityError, SQLAlchemyError
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.core.config import settings
+from backend.core.logger import logger
+from backend.models.job import Job, JobRead
+from backend.services.ingestion import FixtureIngestor, SeasonContext, iter_fixtures
+from backend.services.prediction import PoissonModel, load_history_from_engine, set_model
+from backend.services.ratings import replay_ratings
+from backend.services.search import refresh_search_index
+from backend.services.standings import rebuild_standings
+
+# Progress is written at most this often, except when a job reaches 100%.
+PROGRESS_INTERVAL = 0.5
+
+
+class JobLeaseLost(RuntimeError):
+    """Raised in a job whose lease expired, e.g. after a stall, as the job was put back to pending."""
+
+
+def _leased(job_id: int, worker: str) -> tuple[Any, ...]:
+    return col(Job.id) == job_id, col(Job.worker) == worker, col(Job.status) == "running"
+
+
+class JobContext:
+    """
+    Given to a job function in its worker process, to reach the database and report progress.
+
+    Attributes:
+        job_id (int): The id of the job.
+        engine (Engine): An engine of the database, owned by the worker process.
+        worker (str): The name of the scheduler holding the lease of the job.
+
+    """
+
+    def __init__(self, job_id: int, engine: Engine, worker: str) -> None:
+        self.job_id = job_id
+        self.engine = engine
+        self.worker = worker
+        self._reported = 0.0
+
+    def progress(self, fraction: float, message: str | None = None) -> None:
+        """
+        Records the progress of the job, at most every `PROGRESS_INTERVAL` seconds.
+
+        Args:
+            fraction (float): The share of the work done, from 0 to 1.
+            message (str, optional): A description of the current step.
+
+        Raises:
+            JobLeaseLost: If the job is no longer leased by its scheduler, so that it stops.
+
+        """
+        now = time.monotonic()
+        if fraction < 1 and now - self._reported < PROGRESS_INTERVAL:
+            return
+        self._reported = now
+        with self.engine.begin() as connection:
+            recorded = connection.execute(
+                update(Job)
+                .where(*_leased(self.job_id, self.worker))
+                .values(progress=min(max(fraction, 0.0), 1.0), message=message)
+            ).rowcount
+        if recorded == 0:
+            raise JobLeaseLost(f"Job {self.job_id} is no longer leased by {self.worker}")
+
+
+@dataclass(frozen=True)
+class JobType:
+    """
+    A kind of job.
+
+    Attributes:
+        run (Callable): The function run in a worker process with a `JobContext` and the parameters of the job. It
+            must be defined at module level, to be sent to the process pool, and return a picklable value.
+        max_concurrency (int): The maximum number of jobs of this type running at the same time.
+        finish (Callable, optional): Called in a thread of the server process with the value returned by `run`;
+            returns the json-serializable result stored in the job. Without it, the value is stored as is.
+
+    """
+
+    run: Callable[[JobContext, dict[str, Any]], Any]
+    max_concurrency: int = 1
+    finish: Callable[[Any], Any] | None = None
+
+
+_worker_engines: dict[tuple[int, str], Engine] = {}
+
+
+def _worker_engine(url: str) -> Engine:
+    # Every worker process opens its own connections, and keeps them for the jobs it runs next.
+    key = (os.getpid(), url)
+    if key not in _worker_engines:
+        _worker_engines[key] = create_engine(url)
+    return _worker_engines[key]
+
+
+def _heartbeat(engine: Engine, job_id: int, worker: str, interval: float, done: threading.Event) -> None:
+    while not done.wait(interval):
+        try:
+            with engine.begin() as connection:
+                renewed = connection.execute(update(Job).where(*_leased(job_id, worker)).values(heartbeat_at=_now()))
+        except SQLAlchemyError as e:
+            logger.warning(f"Could not renew the lease of job {job_id}: {e}")
+            continue
+        if renewed.rowcount == 0:
+            return  # Lost: the next progress report stops the job.
+
+
+def _execute(
+    run: Callable[[JobContext, dict[str, Any]], Any],
+    job_id: int,
+    worker: str,
+    params: dict[str, Any],
+    url: str,
+    heartbeat_interval: float,
+) -> Any:
+    engine = _worker_engine(url)
+    done = threading.Event()
+    heartbeat = threading.Thread(
+        target=_heartbeat, args=(engine, job_id, worker, heartbeat_interval, done), name=f"job-{job_id}", daemon=True
+    )
+    heartbeat.start()
+    try:
+        return run(JobContext(job_id, engine, worker), params)
+    finally:
+        done.set()
+        heartbeat.join()
+
+
+def _dedup_key(job_type: str, params: dict[str, Any]) -> str:
+    return hashlib.sha256(f"{job_type}:{json.dumps(params, sort_keys=True)}".encode()).hexdigest()
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def _read(job: Job) -> JobRead:
+    return JobRead.trusted(
+        id=job.id,
+        type=job.type,
+        params=json.loads(job.params),
+        status=job.status,
+        progress=job.progress,
+        message=job.message,
+        result=None if job.result is None else json.loads(job.result),
+        error=job.error,
+        created_at=job.created_at,
+        started_at=job.started_at,
+        finished_at=job.finished_at,
+    )
+
+
+async def submit_job(db: AsyncSession, job_type: str, params: dict[str, Any]) -> JobRead:
+    """
+    Submits a job, or returns the pending job with the same type and parameters.
+
+    Args:
+        db (AsyncSession): The database session.
+        job_type (str): The type of the job, a key of the scheduler's job types.
+        params (dict): The parameters of the job, json-serializable.
+
+    Returns:
+        JobRead: The new or the identical pending job.
+
+    Raises:
+        ValueError: If the type is unknown.
+
+    """
+    scheduler = get_job_scheduler()
+    if job_type not in scheduler.types:
+        raise ValueError(f"Unknown job type {job_type}, expected one of {sorted(scheduler.types)}")
+    key = _dedup_key(job_type, params)
+    pending = select(Job).where(col(Job.dedup_key) == key, col(Job.status) == "pending")
+    job = (await db.exec(pending)).first()
+    if job is None:
+        job = Job(type=job_type, params=json.dumps(params, sort_keys=True), dedup_key=key, created_at=_now())
+        db.add(job)
+        try:
+            await db.commit()
+            await db.refresh(job)
+        except IntegrityError:
+            # Submitted concurrently: the unique index on pending dedup keys let the other one in.
+            await db.rollback()
+            job = (await db.exec(pending)).first()
+            if job is None:
+                raise
+    scheduler.wake()
+    return _read(job)
+
+
+async def read_job(db: AsyncSession, job_id: int) -> JobRead | None:
+    """
+    Returns a job.
+
+    Args:
+        db (AsyncSession): The database session.
+        job_id (int): The id of the job.
+
+    Returns:
+        JobRead | None: The job, or None if it does not exist.
+
+    """
+    job = await db.get(Job, job_id)
+    return None if job is None else _read(job)
+
+
+class JobScheduler:
+    """
+    Claims pending jobs and runs them on a process pool.
+
+    Attributes:
+        engine (Engine): The engine of the database holding the job table.
+        types (dict[str, JobType]): The job types, by name.
+        workers (int): The number of worker processes, and of jobs this scheduler runs at the same time.
+        poll_interval (float): The seconds between two looks at the pending jobs, unless woken by a submission.
+        heartbeat_interval (float): The seconds between two renewals of the lease of a running job.
+        lease_seconds (float): The age of a lease after which its job is put back to pending.
+        shutdown_timeout (float): The seconds `stop` waits for the running jobs before terminating them.
+
+    """
+
+    def __init__(
+        self,
+        engine: Engine,
+        types: dict[str, JobType],
+        workers: int = 1,
+        poll_interval: float = 1.0,
+        heartbeat_interval: float = 5.0,
+        lease_seconds: float = 30.0,
+        shutdown_timeout: float = 5.0,
+    ) -> None:
+        self.engine = engine
+        self.types = types
+        self.workers = workers
+        self.poll_interval = poll_interval
+        self.heartbeat_interval = heartbeat_interval
+        self.lease_seconds = lease_seconds
+        self.shutdown_timeout = shutdown_timeout
+        self.name = self._new_name()
+        self._url = engine.url.render_as_string(hide_password=False)
+        self._executor: ProcessPoolExecutor | None = None
+        self._loop_task: asyncio.Task | None = None
+        self._running: dict[int, asyncio.Task] = {}
+        self._wake: asyncio.Event | None = None
+
+    @property
+    def started(self) -> bool:
+        return self._loop_task is not None
+
+    @staticmethod
+    def _new_name() -> str:
+        # Unique per start, so a restarted scheduler never takes the leases of its previous run for its own.
+        return f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+
+    async def start(self) -> None:
+        """Starts claiming jobs, and putting back to pending the running jobs whose lease expired."""
+        if self._loop_task is not None:
+            return
+        # The name is taken again, as the scheduler may be created before the server forks its workers.
+        self.name = self._new_name()
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("forkserver")
+        )
+        self._wake = asyncio.Event()
+        self._loop_task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """
+        Stops claiming jobs and waits up to `shutdown_timeout` seconds for the running ones, then terminates the pool
+        processes still running one and puts their jobs back to pending.
+        """
+        if self._loop_task is None:
+            return
+        self._loop_task.cancel()
+        await asyncio.gather(self._loop_task, return_exceptions=True)
+        unfinished: set[asyncio.Task] = set()
+        if self._running:
+            _, unfinished = await asyncio.wait(self._running.values(), timeout=self.shutdown_timeout)
+            for task in unfinished:
+                task.cancel()
+            await asyncio.gather(*unfinished, return_exceptions=True)
+        self._loop_task, self._running = None, {}
+        if self._executor is not None:
+            executor, self._executor = self._executor, None
+            if unfinished:
+                # The pool has no public way to stop a running call, and its processes must not outlive the requeue,
+                # or the job would run twice at once. Terminating them breaks the pool, which is shut down anyway.
+                for process in list(executor._processes.values()):  # type: ignore[attr-defined]
+                    process.terminate()
+            await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+        try:
+            await asyncio.to_thread(self._requeue, col(Job.worker) == self.name)
+        except SQLAlchemyError as e:
+            logger.warning(f"Could not requeue the running jobs: {e}")
+
+    def wake(self) -> None:
+        """Looks at the pending jobs now rather than after the poll interval."""
+        if self._wake is not None:
+            self._wake.set()
+
+    async def _loop(self) -> None:
+        assert self._wake is not None
+        while True:
+            try:
+                await asyncio.to_thread(self._requeue_expired)
+                if len(self._running) < self.workers:
+                    for job in await asyncio.to_thread(self._claim, self.workers - len(self._running)):
+                        self._running[job.id] = asyncio.create_task(self._run(job))  # type: ignore[index]
+            except Exception as e:
+                # E.g. the schema was not created yet: claiming is retried every poll interval until it is.
+                logger.error(f"Unable to claim jobs: {e}")
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wake.clear()
+
+    def _claim(self, slots: int) -> list[Job]:
+        """Claims up to `slots` pending jobs, in submission order, within the concurrency limit of their type."""
+        claimed: list[Job] = []
+        with self.engine.connect() as connection:
+            candidates = connection.execute(
+                select(Job).where(col(Job.status) == "pending").order_by(col(Job.id)).limit(slots * 4)
+            ).all()
+        for candidate in candidates:
+            job_type = self.types.get(candidate.type)
+            if len(claimed) == slots:
+                break
+            if job_type is None:
+                continue
+            running = (
+                select(func.count())
+                .select_from(Job)
+                .where(col(Job.type) == candidate.type, col(Job.status) == "running")
+                .scalar_subquery()
+            )
+            now = _now()
+            with self.engine.begin() as connection:
+                claim = connection.execute(
+                    update(Job)
+                    .where(col(Job.id) == candidate.id, col(Job.status) == "pending")
+                    .where(running < job_type.max_concurrency)
+                    .values(
+                        status="running", worker=self.name, started_at=now, heartbeat_at=now, progress=0.0, message=None
+                    )
+                )
+            if claim.rowcount == 1:
+                claimed.append(Job.model_validate(candidate._mapping))
+        return claimed
+
+    async def _run(self, job: Job) -> None:
+        assert job.id is not None and self._executor is not None
+        job_type = self.types[job.type]
+        values: dict[str, Any] = {"status": "succeeded", "progress": 1.0}
+        try:
+            loop = asyncio.get_running_loop()
+            value = await loop.run_in_executor(
+                self._executor,
+                _execute,
+                job_type.run,
+                job.id,
+                self.name,
+                json.loads(job.params),
+                self._url,
+                self.heartbeat_interval,
+            )
+            if job_type.finish is not None:
+                value = await asyncio.to_thread(job_type.finish, value)
+            values["result"] = json.dumps(value, default=str)
+            logger.info(f"Job {job.id} ({job.type}) succeeded")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            values = {"status": "failed", "error": "".join(traceback.format_exception_only(e)).strip()}
+            logger.error(f"Job {job.id} ({job.type}) failed: {e}")
+        finally:
+            self._running.pop(job.id, None)
+            self.wake()
+        await asyncio.to_thread(self._finish, job.id, values)
+
+    def _finish(self, job_id: int, values: dict[str, Any]) -> None:
+        with self.engine.begin() as connection:
+            finished = connection.execute(
+                update(Job).where(*_leased(job_id, self.name)).values(finished_at=_now(), **values)
+            ).rowcount
+        if finished == 0:
+            logger.warning(f"Job {job_id} ended after its lease expired, it was put back to pending")
+
+    def _requeue(self, *conditions: Any) -> int:
+        with self.engine.begin() as connection:
+            requeued = connection.execute(
+                update(Job)
+                .where(col(Job.status) == "running", *conditions)
+                .values(status="pending", worker=None, started_at=None, heartbeat_at=None, progress=0.0, message=None)
+            ).rowcount
+        if requeued:
+            logger.warning(f"Put {requeued} interrupted job(s) back to pending")
+        return requeued
+
+    def _requeue_expired(self) -> int:
+        expired = _now() - timedelta(seconds=self.lease_seconds)
+        # Jobs claimed before leases existed have no heartbeat.
+        return self._requeue(or_(col(Job.heartbeat_at) < expired, col(Job.heartbeat_at).is_(None)))
+
+
+def _rebuild_standings(context: JobContext, params: dict[str, Any]) -> dict[str, Any]:
+    return {"fixtures": rebuild_standings(context.engine, season_id=params.get("season_id"))}
+
+
+def _replay_ratings(context: JobContext, _params: dict[str, Any]) -> dict[str, Any]:
+    return {"fixtures": replay_ratings(context.engine)}
+
+
+def _ingest(context: JobContext, params: dict[str, Any]) -> dict[str, Any]:
+    ingestor = FixtureIngestor(context.engine)
+    ingestor.create_tables()
+    with open(params["path"], "rb") as file:
+        size = max(os.fstat(file.fileno()).st_size, 1)
+
+        def fixtures() -> Iterator[tuple[SeasonContext, dict]]:
+            for item in iter_fixtures(file):
+                context.progress(file.tell() / size * 0.9, "Upserting fixtures")
+                yield item
+            context.progress(0.9, "Replaying ratings")
+
+        report = ingestor.ingest(fixtures())
+    return {"fixtures": report.fixtures, "teams": report.teams, "venues": report.venues, "seasons": report.seasons}
+
+
+def _index_ingested(report: dict[str, Any]) -> dict[str, Any]:
+    from backend.database import get_engine
+
+    # The ingestion updated the search index of its pool process: the server worker reads the names back.
+    refresh_search_index(get_engine())
+    return report
+
+
+def _refit_model(context: JobContext, _params: dict[str, Any]) -> PoissonModel:
+    model = PoissonModel(max_goals=settings.PREDICTION_MAX_GOALS, half_life_days=settings.PREDICTION_HALF_LIFE_DAYS)
+    return model.fit(load_history_from_engine(context.engine))
+
+
+def _install_model(model: PoissonModel) -> dict[str, Any]:
+    set_model(model)
+    return {"fixtures": model.fixtures, "teams": len(model.team_ids)}
+
+
+# The built-in job types. The rebuilds write the same tables, so they run one at a time.
+JOB_TYPES: dict[str, JobType] = {
+    "rebuild_standings": JobType(_rebuild_standings),
+    "replay_ratings": JobType(_replay_ratings),
+    "ingest": JobType(_ingest, finish=_index_ingested),
+    "refit_model": JobType(_refit_model, finish=_install_model),
+}
+
+
+_job_scheduler: JobScheduler | None = None
+
+
+def get_job_scheduler() -> JobScheduler:
+    """
+    Returns the job scheduler, creating it from the settings with the built-in job types on first use.
+
+    Returns:
+        JobScheduler: The job scheduler, not started.
+
+    """
+    from backend.database import get_engine
+
+    global _job_scheduler
+    if _job_scheduler is None:
+        types = {
+            name: replace(job_type, max_concurrency=settings.JOB_CONCURRENCY.get(name, job_type.max_concurrency))
+            for name, job_type in JOB_TYPES.items()
+        }
+        _job_scheduler = JobScheduler(
+            get_engine(),
+            types,
+            workers=settings.JOB_WORKERS,
+            poll_interval=settings.JOB_POLL_INTERVAL,
+            heartbeat_interval=settings.JOB_HEARTBEAT_INTERVAL,
+            lease_seconds=settings.JOB_LEASE_SECONDS,
+            shutdown_timeout=settings.JOB_SHUTDOWN_TIMEOUT,
+        )
+    return _job_scheduler
+
+
+def set_job_scheduler(scheduler: JobScheduler | None) -> None:
+    """
+    Replaces the job scheduler.
+
+    Args:
+        scheduler (JobScheduler | None): The new scheduler, or None to create it from the settings on next use.
+
+    """
+    global _job_scheduler
+    _job_scheduler = scheduler
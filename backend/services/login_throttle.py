@@ -0,0 +1,242 @@
+"""
+This module throttles login attempts, so credential stuffing cannot exhaust the CPU with bcrypt verifications.
+
+Before its password is checked, every attempt takes a token from the bucket of its client IP, then from the bucket of
+its username. When a bucket is empty the attempt is rejected with 429 and a `Retry-After` delay, without any bcrypt
+work. Buckets refill continuously at their rate and hold at most their burst. They are kept by a pluggable
+`RateLimitBackend`. The default `InMemoryRateLimitBackend` is local to the process, so with several server workers
+each worker enforces the limits on its own share of the traffic. A shared backend such as Redis can implement the
+same interface.
+
+The client IP is the address uvicorn reports: behind a load balancer, it is taken from `X-Forwarded-For` only if the
+balancer is listed in `SERVER_FORWARDED_ALLOW_IPS`, otherwise every attempt shares the balancer's bucket.
+
+Login password checks are also capped: at most `LOGIN_MAX_CONCURRENT_CHECKS` wait for or run on the password worker
+pool at once. Beyond that, attempts wait `LOGIN_CHECK_QUEUE_TIMEOUT` seconds for a slot and are then rejected with
+503, so a flood of logins cannot take the whole pool from signups and cannot build a queue that delays every login.
+
+**Key Classes:**
+
+- `RateLimitBackend`: The interface of the token bucket stores.
+- `InMemoryRateLimitBackend`: Token buckets kept in a bounded LRU dictionary.
+- `LoginThrottle`: Applies the rate limits and the concurrency cap to login attempts.
+
+**Key Functions:**
+
+- `get_login_throttle`: Returns the login throttle, creating it from the settings on first use.
+- `set_login_throttle`: Replaces the login throttle.
+"""
+
+import asyncio
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from starlette import status
+from starlette.exceptions import HTTPException
+
+from backend.core.config import settings
+from backend.core.metrics import Counter
+from backend.services.authentication import check_password_async, get_password_pool
+
+LOGIN_ATTEMPTS_REJECTED = Counter(
+    "login_attempts_rejected_total",
+    "Login attempts rejected before their password was checked, by reason.",
+    ("reason",),
+)
+
+
+class RateLimitBackend(ABC):
+    """The interface of the token bucket stores."""
+
+    @abstractmethod
+    async def take(self, key: str, rate: float, burst: float) -> float:
+        """
+        Takes a token from the bucket of a key, creating it full if needed.
+
+        Args:
+            key (str): The key of the bucket.
+            rate (float): The tokens added to the bucket per second.
+            burst (float): The capacity of the bucket.
+
+        Returns:
+            float: 0 if a token was taken, or else the seconds until the next token.
+
+        """
+
+
+class InMemoryRateLimitBackend(RateLimitBackend):
+    """
+    Token buckets kept in memory, in a dictionary bounded to the most recently used keys.
+
+    An evicted bucket starts full again, so `max_keys` must be well above the number of keys used within the time a
+    bucket takes to refill.
+
+    Attributes:
+        max_keys (int): The maximum number of buckets kept.
+
+    """
+
+    def __init__(self, max_keys: int = 100_000) -> None:
+        self.max_keys = max_keys
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+    async def take(self, key: str, rate: float, burst: float) -> float:
+        now = time.monotonic()
+        tokens, updated = self._buckets.pop(key, (burst, now))
+        tokens = min(burst, tokens + (now - updated) * rate)
+        wait = 0.0
+        if tokens >= 1:
+            tokens -= 1
+        else:
+            wait = (1 - tokens) / rate
+        self._buckets[key] = (tokens, now)
+        if len(self._buckets) > self.max_keys:
+            self._buckets.popitem(last=False)
+        return wait
+
+
+class LoginThrottle:
+    """
+    Applies the per client IP and per username rate limits and the password check cap to login attempts.
+
+    Attributes:
+        backend (RateLimitBackend): The store of the token buckets.
+        username_rate (float | None): The attempts per second allowed per username, None for no limit.
+        username_burst (float): The attempts a username can make at once.
+        ip_rate (float | None): The attempts per second allowed per client IP, None for no limit.
+        ip_burst (float): The attempts a client IP can make at once.
+        max_concurrent_checks (int): The login password checks waiting for or running on the password pool at once.
+        queue_timeout (float): The seconds an attempt waits for a check slot before it is rejected.
+
+    """
+
+    def __init__(
+        self,
+        backend: RateLimitBackend,
+        username_rate: float | None,
+        username_burst: float,
+        ip_rate: float | None,
+        ip_burst: float,
+        max_concurrent_checks: int,
+        queue_timeout: float,
+    ) -> None:
+        self.backend = backend
+        self.username_rate = username_rate
+        self.username_burst = username_burst
+        self.ip_rate = ip_rate
+        self.ip_burst = ip_burst
+        self.max_concurrent_checks = max_concurrent_checks
+        self.queue_timeout = queue_timeout
+        self._slots: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    async def acquire(self, username: str, client_ip: str | None) -> None:
+        """
+        Takes a token for a login attempt from the bucket of its client IP, then from the bucket of its username.
+
+        Args:
+            username (str): The username of the attempt.
+            client_ip (str | None): The IP address of the client, None when unknown.
+
+        Raises:
+            HTTPException: 429 with a `Retry-After` header if either bucket is empty.
+
+        """
+        if self.ip_rate is not None and client_ip is not None:
+            wait = await self.backend.take(f"ip:{client_ip}", self.ip_rate, self.ip_burst)
+            if wait:
+                raise _too_many_attempts("ip", wait)
+        if self.username_rate is not None:
+            wait = await self.backend.take(f"username:{username}", self.username_rate, self.username_burst)
+            if wait:
+                raise _too_many_attempts("username", wait)
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        # asyncio primitives are bound to the loop they are first used on, so a new one is created per loop.
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_concurrent_checks)
+            self._loop = loop
+        return self._slots
+
+    async def check_password(self, password: str, hashed: str) -> bool:
+        """
+        Checks the password of a login attempt on the password worker pool, within the login check cap.
+
+        Args:
+            password (str): The password to be checked.
+            hashed (str): The hashed password to compare against.
+
+        Returns:
+            bool: True if the password matches the hashed password, False otherwise.
+
+        Raises:
+            HTTPException: 503 if no check slot became free within the queue timeout, or the pool is saturated.
+
+        """
+        slots = self._get_slots()
+        try:
+            await asyncio.wait_for(slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError as e:
+            LOGIN_ATTEMPTS_REJECTED.inc(labels=("concurrency",))
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Too many logins in progress, try again later",
+                headers={"Retry-After": "1"},
+            ) from e
+        try:
+            return await check_password_async(password, hashed)
+        finally:
+            slots.release()
+
+
+def _too_many_attempts(reason: str, wait: float) -> HTTPException:
+    LOGIN_ATTEMPTS_REJECTED.inc(labels=(reason,))
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Too many login attempts, try again later",
+        headers={"Retry-After": str(math.ceil(wait))},
+    )
+
+
+_login_throttle: LoginThrottle | None = None
+
+
+def get_login_throttle() -> LoginThrottle:
+    """
+    Returns the login throttle, creating it from the settings, with an in-memory backend, on first use.
+
+    Returns:
+        LoginThrottle: The login throttle.
+
+    """
+    global _login_throttle
+    if _login_throttle is None:
+        username_rate, ip_rate = settings.LOGIN_USERNAME_RATE_PER_MINUTE, settings.LOGIN_IP_RATE_PER_MINUTE
+        _login_throttle = LoginThrottle(
+            backend=InMemoryRateLimitBackend(max_keys=settings.LOGIN_THROTTLE_MAX_KEYS),
+            username_rate=username_rate / 60 if username_rate else None,
+            username_burst=settings.LOGIN_USERNAME_BURST,
+            ip_rate=ip_rate / 60 if ip_rate else None,
+            ip_burst=settings.LOGIN_IP_BURST,
+            max_concurrent_checks=settings.LOGIN_MAX_CONCURRENT_CHECKS or get_password_pool().max_workers * 2,
+            queue_timeout=settings.LOGIN_CHECK_QUEUE_TIMEOUT,
+        )
+    return _login_throttle
+
+
+def set_login_throttle(throttle: LoginThrottle | None) -> None:
+    """
+    Replaces the login throttle, e.g. by one with a shared backend.
+
+    Args:
+        throttle (LoginThrottle | None): The new throttle, or None to recreate it from the settings on next use.
+
+    """
+    global _login_throttle
+    _login_throttle = throttle
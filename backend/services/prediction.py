@@ -0,0 +1,440 @@
+"""
+This module provides the fixture prediction engine.
+
+Goals are modelled with independent Poisson distributions (Maher's model): the home team of a fixture is expected to
+score `base_rate * home_advantage * attack[home] * defence[away]` goals and the away team
+`base_rate * attack[away] * defence[home]`. Team strengths are fitted by iterative proportional fitting over the
+whole fixture history, and whole rounds or seasons are scored at once. Fitting and scoring are NumPy array operations
+over every fixture, never Python loops over fixtures.
+
+The model of a server worker is fitted on first use, in a worker thread so the event loop keeps serving, and dropped
+whenever an ingestion bumps the "fixtures" version (see `backend.services.versions`), to be fitted again on next use.
+
+**Key Classes:**
+
+- `FixtureHistory`: The finished fixtures a model is fitted on, as parallel arrays.
+- `PoissonModel`: Fits team strengths and predicts goal expectations and outcome probabilities.
+
+**Key Functions:**
+
+- `load_history`: Reads the finished fixtures of a dump such as `devdata/result.json`.
+- `load_history_from_db`: Reads the finished fixtures stored in the database.
+- `load_history_from_engine`: Reads the finished fixtures stored in the database, synchronously.
+- `get_model`: Returns the model fitted on the database, fitting it on first use.
+- `predict_rows`: Predicts `(fixture_id, home_team_id, away_team_id)` rows with one vectorized call.
+- `predict_batch`: Predicts explicit fixtures or the upcoming fixtures of a season or round in one batch.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, BinaryIO, Iterable, Sequence
+
+import numpy as np
+from sqlalchemy import Engine
+from sqlmodel import Session, col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.core.config import settings
+from backend.models.fixture import Fixture
+from backend.models.prediction import FixturePair, Prediction, PredictionBatch, PredictionBatchRequest
+from backend.services.ingestion import iter_fixtures
+from backend.services.standings import FINISHED_STATUSES
+
+
+@dataclass
+class FixtureHistory:
+    """Finished fixtures as parallel arrays, one entry per fixture."""
+
+    home_team_ids: np.ndarray
+    away_team_ids: np.ndarray
+    home_goals: np.ndarray
+    away_goals: np.ndarray
+    timestamps: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.home_team_ids)
+
+    @classmethod
+    def from_rows(cls, rows: list[tuple[int, int, int, int, float]]) -> "FixtureHistory":
+        """
+        Builds a history from `(home_team_id, away_team_id, home_goals, away_goals, timestamp)` rows.
+
+        Args:
+            rows (list[tuple]): The rows.
+
+        Returns:
+            FixtureHistory: The history.
+
+        """
+        array = np.array(rows, dtype=np.float64).reshape(-1, 5)
+        return cls(
+            home_team_ids=array[:, 0].astype(np.int64),
+            away_team_ids=array[:, 1].astype(np.int64),
+            home_goals=array[:, 2],
+            away_goals=array[:, 3],
+            timestamps=array[:, 4],
+        )
+
+
+def load_history(file: BinaryIO) -> FixtureHistory:
+    """
+    Reads the finished fixtures of a fixture dump.
+
+    Args:
+        file (BinaryIO): The dump, opened in binary mode.
+
+    Returns:
+        FixtureHistory: The finished fixtures with a score.
+
+    """
+    rows = [
+        (
+            fixture["home"]["id"],
+            fixture["away"]["id"],
+            fixture["home_score"],
+            fixture["away_score"],
+            datetime.fromisoformat(fixture["date"]).timestamp(),
+        )
+        for _, fixture in iter_fixtures(file)
+        if fixture["status"] in FINISHED_STATUSES
+        and fixture.get("home_score") is not None
+        and fixture.get("away_score") is not None
+    ]
+    return FixtureHistory.from_rows(rows)
+
+
+def _history_statement() -> Any:
+    columns = (Fixture.home_team_id, Fixture.away_team_id, Fixture.home_score, Fixture.away_score, Fixture.date)
+    return select(*columns).where(
+        col(Fixture.status).in_(FINISHED_STATUSES),
+        col(Fixture.home_score).is_not(None),
+        col(Fixture.away_score).is_not(None),
+    )
+
+
+def _history_from_rows(rows: Iterable[Any]) -> FixtureHistory:
+    return FixtureHistory.from_rows([(home, away, hg, ag, date.timestamp()) for home, away, hg, ag, date in rows])
+
+
+async def load_history_from_db(db: AsyncSession) -> FixtureHistory:
+    """
+    Reads the finished fixtures stored in the database.
+
+    Args:
+        db (AsyncSession): The database session.
+
+    Returns:
+        FixtureHistory: The finished fixtures with a score.
+
+    """
+    return _history_from_rows((await db.exec(_history_statement())).all())
+
+
+def load_history_from_engine(engine: Engine) -> FixtureHistory:
+    """
+    Reads the finished fixtures stored in the database, synchronously, e.g. in a background job.
+
+    Args:
+        engine (Engine): The engine of the database.
+
+    Returns:
+        FixtureHistory: The finished fixtures with a score.
+
+    """
+    with Session(engine) as session:
+        return _history_from_rows(session.exec(_history_statement()).all())
+
+
+class PoissonModel:
+    """
+    Independent Poisson goal model with per-team attack and defence strengths and a home advantage.
+
+    Attributes:
+        team_ids (np.ndarray): The sorted ids of the teams the model was fitted on.
+        attack (np.ndarray): The attack strength of each team, aligned with `team_ids`. Averages to 1.
+        defence (np.ndarray): The defence weakness of each team (higher concedes more), aligned with `team_ids`.
+            Averages to 1.
+        home_advantage (float): The multiplier applied to the goals expected from the home team.
+        base_rate (float): The goals expected from an average away team against an average home team.
+        max_goals (int): The highest score considered when computing outcome probabilities.
+
+    """
+
+    def __init__(self, max_goals: int = 10, half_life_days: float | None = None, iterations: int = 50) -> None:
+        self.max_goals = max_goals
+        self.half_life_days = half_life_days
+        self.iterations = iterations
+        self.team_ids = np.empty(0, dtype=np.int64)
+        self.attack = np.empty(0)
+        self.defence = np.empty(0)
+        self.home_advantage = 1.0
+        self.base_rate = 1.0
+        self.fixtures = 0
+
+    def fit(self, history: FixtureHistory) -> "PoissonModel":
+        """
+        Fits the team strengths on a fixture history.
+
+        Args:
+            history (FixtureHistory): The finished fixtures.
+
+        Returns:
+            PoissonModel: The fitted model itself.
+
+        """
+        self.fixtures = len(history)
+        if not self.fixtures:
+            return self
+        self.team_ids, inverse = np.unique(
+            np.concatenate([history.home_team_ids, history.away_team_ids]), return_inverse=True
+        )
+        home, away = inverse[: self.fixtures], inverse[self.fixtures :]
+        teams = len(self.team_ids)
+
+        weights = np.ones(self.fixtures)
+        if self.half_life_days:
+            age_days = (history.timestamps.max() - history.timestamps) / 86400
+            weights = 0.5 ** (age_days / self.half_life_days)
+        home_goals, away_goals = history.home_goals * weights, history.away_goals * weights
+
+        scored = np.bincount(home, home_goals, teams) + np.bincount(away, away_goals, teams)
+        conceded = np.bincount(home, away_goals, teams) + np.bincount(away, home_goals, teams)
+        attack, defence = np.ones(teams), np.ones(teams)
+        base_rate = max(away_goals.sum() / weights.sum(), 1e-9)
+        home_advantage = 1.0
+        for _ in range(self.iterations):
+            # Each update divides the goals observed by the goals expected from every other parameter.
+            home_rate = weights * base_rate * home_advantage
+            away_rate = weights * base_rate
+            attack_exposure = np.bincount(home, home_rate * defence[away], teams)
+            attack_exposure += np.bincount(away, away_rate * defence[home], teams)
+            attack = scored / np.maximum(attack_exposure, 1e-9)
+            attack /= attack.mean()
+            defence_exposure = np.bincount(away, home_rate * attack[home], teams)
+            defence_exposure += np.bincount(home, away_rate * attack[away], teams)
+            defence = conceded / np.maximum(defence_exposure, 1e-9)
+            defence /= defence.mean()
+            base_rate = away_goals.sum() / max((weights * attack[away] * defence[home]).sum(), 1e-9)
+            home_advantage = home_goals.sum() / max((weights * base_rate * attack[home] * defence[away]).sum(), 1e-9)
+
+        self.attack, self.defence = attack, np.maximum(defence, 1e-3)
+        self.base_rate, self.home_advantage = float(base_rate), float(home_advantage)
+        return self
+
+    def _team_index(self, team_ids: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        positions = np.searchsorted(self.team_ids, team_ids)
+        positions = np.minimum(positions, max(len(self.team_ids) - 1, 0))
+        known = (self.team_ids[positions] == team_ids) if len(self.team_ids) else np.zeros(len(team_ids), dtype=bool)
+        return positions, known
+
+    def expected_goals(self, home_team_ids: np.ndarray, away_team_ids: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the goals expected from each side of a batch of fixtures. Unknown teams get average strengths.
+
+        Args:
+            home_team_ids (np.ndarray): The ids of the home teams.
+            away_team_ids (np.ndarray): The ids of the away teams, aligned with `home_team_ids`.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The expected home goals and away goals.
+
+        """
+        home_team_ids, away_team_ids = np.asarray(home_team_ids), np.asarray(away_team_ids)
+        home, home_known = self._team_index(home_team_ids)
+        away, away_known = self._team_index(away_team_ids)
+        if len(self.team_ids):
+            home_attack = np.where(home_known, self.attack[home], 1.0)
+            home_defence = np.where(home_known, self.defence[home], 1.0)
+            away_attack = np.where(away_known, self.attack[away], 1.0)
+            away_defence = np.where(away_known, self.defence[away], 1.0)
+        else:
+            home_attack = home_defence = away_attack = away_defence = np.ones(len(home_team_ids))
+        expected_home = self.base_rate * self.home_advantage * home_attack * away_defence
+        expected_away = self.base_rate * away_attack * home_defence
+        return expected_home, expected_away
+
+    def predict(self, home_team_ids: np.ndarray, away_team_ids: np.ndarray) -> dict[str, np.ndarray]:
+        """
+        Predicts a batch of fixtures.
+
+        Args:
+            home_team_ids (np.ndarray): The ids of the home teams.
+            away_team_ids (np.ndarray): The ids of the away teams, aligned with `home_team_ids`.
+
+        Returns:
+            dict[str, np.ndarray]: Arrays aligned with the fixtures: `expected_home_goals`, `expected_away_goals`,
+                `home_win`, `draw` and `away_win` probabilities.
+
+        """
+        expected_home, expected_away = self.expected_goals(home_team_ids, away_team_ids)
+        home_pmf = poisson_pmf(expected_home, self.max_goals)
+        away_pmf = poisson_pmf(expected_away, self.max_goals)
+        # Joint probability of every score, one (max_goals + 1)² matrix per fixture.
+        scores = home_pmf[:, :, None] * away_pmf[:, None, :]
+        home_win = np.tril(np.ones((self.max_goals + 1,) * 2), -1)
+        total = scores.sum(axis=(1, 2))
+        return {
+            "expected_home_goals": expected_home,
+            "expected_away_goals": expected_away,
+            "home_win": (scores * home_win).sum(axis=(1, 2)) / total,
+            "draw": np.trace(scores, axis1=1, axis2=2) / total,
+            "away_win": (scores * home_win.T).sum(axis=(1, 2)) / total,
+        }
+
+
+def poisson_pmf(rates: np.ndarray, max_goals: int) -> np.ndarray:
+    """
+    Returns the Poisson probabilities of 0 to `max_goals` goals for each rate.
+
+    Args:
+        rates (np.ndarray): The expected goals, one per fixture.
+        max_goals (int): The highest number of goals.
+
+    Returns:
+        np.ndarray: An array of shape `(len(rates), max_goals + 1)`.
+
+    """
+    goals = np.arange(max_goals + 1)
+    log_factorials = np.concatenate([[0.0], np.cumsum(np.log(np.arange(1, max_goals + 1)))])
+    rates = np.maximum(np.asarray(rates, dtype=np.float64), 1e-12)
+    return np.exp(goals * np.log(rates)[:, None] - rates[:, None] - log_factorials)
+
+
+_model: PoissonModel | None = None
+
+
+async def get_model(db: AsyncSession) -> PoissonModel:
+    """
+    Returns the model fitted on the finished fixtures of the database, fitting it on first use.
+
+    Args:
+        db (AsyncSession): The database session.
+
+    Returns:
+        PoissonModel: The fitted model.
+
+    """
+    global _model
+    model = _model
+    if model is None:
+        model = PoissonModel(max_goals=settings.PREDICTION_MAX_GOALS, half_life_days=settings.PREDICTION_HALF_LIFE_DAYS)
+        history = await load_history_from_db(db)
+        # The fit is a few NumPy passes over the whole history: run off the event loop.
+        _model = model = await asyncio.to_thread(model.fit, history)
+    return model
+
+
+def set_model(model: PoissonModel | None) -> None:
+    """
+    Replaces the model used for predictions.
+
+    Args:
+        model (PoissonModel | None): The new model, or None to refit it from the database on next use.
+
+    """
+    global _model
+    _model = model
+
+
+def upcoming_statement(season_id: int, round: str | None = None) -> Any:
+    """
+    Returns the query of the `(id, home_team_id, away_team_id)` of the fixtures of a season, or of one of its rounds,
+    that are not finished yet, ordered by date.
+
+    Args:
+        season_id (int): The season.
+        round (str, optional): The round, e.g. "Regular Season - 17".
+
+    Returns:
+        Select: The query.
+
+    """
+    statement = (
+        select(Fixture.id, Fixture.home_team_id, Fixture.away_team_id)
+        .where(Fixture.season_id == season_id, col(Fixture.status).not_in(FINISHED_STATUSES))
+        .order_by(col(Fixture.date), col(Fixture.id))
+    )
+    if round is not None:
+        statement = statement.where(Fixture.round == round)
+    return statement
+
+
+async def upcoming_fixtures(db: AsyncSession, season_id: int, round: str | None = None) -> list[FixturePair]:
+    """
+    Returns the fixtures of a season, or of one of its rounds, that are not finished yet.
+
+    Args:
+        db (AsyncSession): The database session.
+        season_id (int): The season.
+        round (str, optional): The round, e.g. "Regular Season - 17".
+
+    Returns:
+        list[FixturePair]: The fixtures, ordered by date.
+
+    """
+    rows = (await db.exec(upcoming_statement(season_id, round))).all()
+    return [FixturePair(fixture_id=fixture_id, home_team_id=home, away_team_id=away) for fixture_id, home, away in rows]
+
+
+def predict_rows(model: PoissonModel, fixtures: Sequence[tuple[int | None, int, int]]) -> list[Prediction]:
+    """
+    Predicts fixtures with a single vectorized call to a model.
+
+    Args:
+        model (PoissonModel): The fitted model.
+        fixtures (Sequence[tuple[int | None, int, int]]): The `(fixture_id, home_team_id, away_team_id)` of the
+            fixtures, e.g. rows of `upcoming_statement`.
+
+    Returns:
+        list[Prediction]: The predictions, in the order of the fixtures.
+
+    """
+    home_team_ids = np.fromiter((fixture[1] for fixture in fixtures), dtype=np.int64, count=len(fixtures))
+    away_team_ids = np.fromiter((fixture[2] for fixture in fixtures), dtype=np.int64, count=len(fixtures))
+    predicted = {name: values.tolist() for name, values in model.predict(home_team_ids, away_team_ids).items()}
+    return [
+        Prediction.trusted(
+            fixture_id=fixture_id,
+            home_team_id=home_team_id,
+            away_team_id=away_team_id,
+            expected_home_goals=predicted["expected_home_goals"][number],
+            expected_away_goals=predicted["expected_away_goals"][number],
+            home_win=predicted["home_win"][number],
+            draw=predicted["draw"][number],
+            away_win=predicted["away_win"][number],
+        )
+        for number, (fixture_id, home_team_id, away_team_id) in enumerate(fixtures)
+    ]
+
+
+async def predict_batch(db: AsyncSession, request: PredictionBatchRequest) -> PredictionBatch:
+    """
+    Predicts a batch of fixtures with a single vectorized call to the model.
+
+    Args:
+        db (AsyncSession): The database session.
+        request (PredictionBatchRequest): The explicit fixtures, or the season (and round) whose upcoming fixtures
+            are predicted.
+
+    Returns:
+        PredictionBatch: The predictions, in the order of the fixtures.
+
+    Raises:
+        ValueError: If the request gives neither fixtures nor a season.
+
+    """
+    if request.fixtures is not None:
+        fixtures = request.fixtures
+    elif request.season_id is not None:
+        fixtures = await upcoming_fixtures(db, request.season_id, request.round)
+    else:
+        raise ValueError("Either fixtures or season_id must be given")
+
+    model = await get_model(db)
+    return PredictionBatch.trusted(
+        fitted_fixtures=model.fixtures,
+        predictions=predict_rows(
+            model, [(fixture.fixture_id, fixture.home_team_id, fixture.away_team_id) for fixture in fixtures]
+        ),
+    )
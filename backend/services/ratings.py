@@ -0,0 +1,273 @@
+"""
+This module maintains Elo team ratings over every finished fixture, with periodic checkpoints.
+
+Ratings are computed in a single chronological pass over the finished fixtures, ordered by `(date, id)`. Every
+`RATING_CHECKPOINT_INTERVAL` fixtures, at the end of a matchday, a snapshot of every team's rating is stored with the
+position it was computed up to. When a fixture is added or corrected, only the checkpoints at or after its position are
+dropped and the ratings are replayed from the latest remaining one. Ratings as of any date are read from the nearest
+checkpoint before that date, followed by a replay of the few fixtures played since.
+
+Launched with `poetry run rebuild-ratings` at root level for backfills.
+
+**Key Classes:**
+
+- `RatingState`: The ratings of every team at a position in the fixture history.
+
+**Key Functions:**
+
+- `replay_ratings`: Recomputes the ratings and checkpoints from a position in the fixture history.
+- `earliest_change`: Returns the earliest position at which an upsert of fixtures changes the ratings.
+- `ratings_as_of`: Returns the ratings of every team as of a date.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Iterable
+
+from sqlalchemy import Engine, delete, insert, select, tuple_
+from sqlalchemy.engine import Connection
+from sqlmodel import SQLModel, col
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.core.config import settings
+from backend.models.fixture import Fixture
+from backend.models.rating import RatingCheckpoint, TeamRating, TeamRatingRead
+from backend.services.fixtures import as_naive_utc
+from backend.services.standings import FINISHED_STATUSES
+
+RATING_TABLES = [RatingCheckpoint.__table__, TeamRating.__table__]  # type: ignore[attr-defined]
+
+RATED_COLUMNS: list[Any] = [
+    Fixture.id,
+    Fixture.date,
+    Fixture.home_team_id,
+    Fixture.away_team_id,
+    Fixture.home_score,
+    Fixture.away_score,
+]
+
+RATED_FILTERS = (
+    col(Fixture.status).in_(FINISHED_STATUSES),
+    col(Fixture.home_score).is_not(None),
+    col(Fixture.away_score).is_not(None),
+)
+
+Position = tuple[datetime, int]
+
+
+@dataclass
+class RatingState:
+    """
+    The ratings of every team after the fixtures up to `position`.
+
+    Attributes:
+        ratings (dict[int, float]): The rating of every team that played, by team id.
+        games (dict[int, int]): The number of rated fixtures of every team, by team id.
+        position (tuple[datetime, int], optional): The `(date, id)` of the last rated fixture.
+        since_checkpoint (int): The number of fixtures rated since the last checkpoint.
+
+    """
+
+    ratings: dict[int, float] = field(default_factory=dict)
+    games: dict[int, int] = field(default_factory=dict)
+    position: Position | None = None
+    since_checkpoint: int = 0
+    k: float = field(default_factory=lambda: settings.ELO_K)
+    home_advantage: float = field(default_factory=lambda: settings.ELO_HOME_ADVANTAGE)
+    initial_rating: float = field(default_factory=lambda: settings.ELO_INITIAL_RATING)
+
+    def apply(
+        self, fixture_id: int, date: datetime, home_team_id: int, away_team_id: int, home_score: int, away_score: int
+    ) -> None:
+        """Rates a finished fixture, which must come after `position`."""
+        home = self.ratings.get(home_team_id, self.initial_rating)
+        away = self.ratings.get(away_team_id, self.initial_rating)
+        expected = 1 / (1 + 10 ** ((away - home - self.home_advantage) / 400))
+        result = 1.0 if home_score > away_score else 0.5 if home_score == away_score else 0.0
+        delta = self.k * (result - expected)
+        self.ratings[home_team_id] = home + delta
+        self.ratings[away_team_id] = away - delta
+        self.games[home_team_id] = self.games.get(home_team_id, 0) + 1
+        self.games[away_team_id] = self.games.get(away_team_id, 0) + 1
+        self.position = (date, fixture_id)
+        self.since_checkpoint += 1
+
+    def read(self, team_id: int | None = None) -> list[TeamRatingRead]:
+        """Returns the ratings of every team, or of one team, best first."""
+        team_ids = [team_id] if team_id is not None else self.ratings
+        return sorted(
+            (
+                TeamRatingRead.trusted(team_id=team, rating=self.ratings[team], games=self.games[team])
+                for team in team_ids
+                if team in self.ratings
+            ),
+            key=lambda rating: (-rating.rating, rating.team_id),
+        )
+
+
+def _restore(rows: Iterable[Any], checkpoint: Any | None) -> RatingState:
+    state = RatingState()
+    if checkpoint is not None:
+        state.position = (checkpoint.last_date, checkpoint.last_fixture_id)
+        for row in rows:
+            state.ratings[row.team_id] = row.rating
+            state.games[row.team_id] = row.games
+    return state
+
+
+def _write_checkpoint(connection: Connection, state: RatingState, fixtures: int) -> None:
+    assert state.position is not None
+    checkpoint_id = connection.execute(
+        insert(RatingCheckpoint).values(
+            last_date=state.position[0],
+            last_fixture_id=state.position[1],
+            fixtures=fixtures,
+        )
+    ).inserted_primary_key[0]
+    connection.execute(
+        insert(TeamRating),
+        [
+            {"checkpoint_id": checkpoint_id, "team_id": team_id, "rating": rating, "games": state.games[team_id]}
+            for team_id, rating in state.ratings.items()
+        ],
+    )
+    state.since_checkpoint = 0
+
+
+def replay_ratings(engine: Engine, since: Position | None = None, batch_size: int = 1000) -> int:
+    """
+    Recomputes the ratings from the latest checkpoint before a position in the fixture history.
+
+    The checkpoints at or after `since` are dropped, the ratings are restored from the latest remaining checkpoint and
+    the fixtures after it are replayed, writing new checkpoints along the way and a last one at the end.
+
+    Args:
+        engine (Engine): The engine of the database.
+        since (tuple[datetime, int], optional): The `(date, id)` of the earliest fixture added or corrected. Defaults
+            to a replay from scratch.
+        batch_size (int, optional): The number of fixtures fetched at a time. Defaults to 1000.
+
+    Returns:
+        int: The number of fixtures replayed.
+
+    """
+    SQLModel.metadata.create_all(engine, tables=RATING_TABLES)
+    interval = settings.RATING_CHECKPOINT_INTERVAL
+    with engine.begin() as connection:
+        stale = select(RatingCheckpoint.id)
+        if since is not None:
+            stale = stale.where(
+                tuple_(col(RatingCheckpoint.last_date), col(RatingCheckpoint.last_fixture_id)) >= tuple_(*since)
+            )
+        connection.execute(delete(TeamRating).where(col(TeamRating.checkpoint_id).in_(stale)))
+        connection.execute(delete(RatingCheckpoint).where(col(RatingCheckpoint.id).in_(stale)))
+
+        checkpoint = connection.execute(
+            select(RatingCheckpoint)
+            .order_by(col(RatingCheckpoint.last_date).desc(), col(RatingCheckpoint.last_fixture_id).desc())
+            .limit(1)
+        ).first()
+        rated = checkpoint.fixtures if checkpoint is not None else 0
+        state = _restore(
+            connection.execute(select(TeamRating).where(TeamRating.checkpoint_id == checkpoint.id))
+            if checkpoint is not None
+            else [],
+            checkpoint,
+        )
+
+        query = select(*RATED_COLUMNS).where(*RATED_FILTERS).order_by(col(Fixture.date), col(Fixture.id))
+        if state.position is not None:
+            query = query.where(tuple_(col(Fixture.date), col(Fixture.id)) > tuple_(*state.position))
+        replayed = 0
+        result = connection.execution_options(yield_per=batch_size).execute(query)
+        for rows in result.partitions():
+            for row in rows:
+                # Checkpoints are only taken between matchdays, so a date never spans two of them.
+                if state.since_checkpoint >= interval and state.position and row.date.date() > state.position[0].date():
+                    _write_checkpoint(connection, state, rated + replayed)
+                state.apply(*row)
+                replayed += 1
+        if state.since_checkpoint:
+            _write_checkpoint(connection, state, rated + replayed)
+    return replayed
+
+
+def _is_rated(fixture: dict) -> bool:
+    return (
+        fixture["status"] in FINISHED_STATUSES
+        and fixture.get("home_score") is not None
+        and fixture.get("away_score") is not None
+    )
+
+
+def earliest_change(previous: dict[int, dict], fixtures: list[dict]) -> Position | None:
+    """
+    Returns the earliest position in the fixture history at which an upsert of fixtures changes the ratings.
+
+    Args:
+        previous (dict[int, dict]): The stored fixtures before the upsert, by id, with the same columns as `fixtures`.
+        fixtures (list[dict]): The upserted fixture rows, with at least `id`, `date`, `status`, `home_team_id`,
+            `away_team_id`, `home_score` and `away_score`.
+
+    Returns:
+        tuple[datetime, int], optional: The `(date, id)` to replay from, None if no rated fixture changed.
+
+    """
+    positions: list[Position] = []
+    keys = ("date", "home_team_id", "away_team_id", "home_score", "away_score")
+    for fixture in fixtures:
+        before = previous.get(fixture["id"])
+        old = tuple(before[key] for key in keys) if before is not None and _is_rated(before) else None
+        new = tuple(fixture[key] for key in keys) if _is_rated(fixture) else None
+        if old == new:
+            continue
+        for rated in (old, new):
+            if rated is not None:
+                positions.append((rated[0], fixture["id"]))
+    return min(positions, default=None)
+
+
+async def ratings_as_of(db: AsyncSession, when: datetime, team_id: int | None = None) -> list[TeamRatingRead]:
+    """
+    Returns the ratings after every fixture played up to a date, best first.
+
+    Args:
+        db (AsyncSession): The database session.
+        when (datetime): The date, naive datetimes are assumed to be UTC.
+        team_id (int, optional): Only the rating of this team.
+
+    Returns:
+        list[TeamRatingRead]: The ratings of the teams that played before the date.
+
+    """
+    when = as_naive_utc(when)
+    checkpoint = (
+        await db.exec(
+            select(RatingCheckpoint)  # type: ignore[call-overload]
+            .where(col(RatingCheckpoint.last_date) <= when)
+            .order_by(col(RatingCheckpoint.last_date).desc(), col(RatingCheckpoint.last_fixture_id).desc())
+            .limit(1)
+        )
+    ).first()
+    rows: Any = []
+    if checkpoint is not None:
+        checkpoint = checkpoint[0]
+        # Every rating is needed even for a single team, as the fixtures replayed involve its opponents.
+        ratings = select(TeamRating).where(TeamRating.checkpoint_id == checkpoint.id)
+        rows = [row[0] for row in (await db.exec(ratings)).all()]  # type: ignore[call-overload]
+    state = _restore(rows, checkpoint)
+
+    query = select(*RATED_COLUMNS).where(*RATED_FILTERS, col(Fixture.date) <= when)
+    if state.position is not None:
+        query = query.where(tuple_(col(Fixture.date), col(Fixture.id)) > tuple_(*state.position))
+    for row in (await db.exec(query.order_by(col(Fixture.date), col(Fixture.id)))).all():  # type: ignore[call-overload]
+        state.apply(*row)
+    return state.read(team_id)
+
+
+def main() -> None:
+    """Recomputes the ratings of the database configured in the settings from scratch."""
+    from backend.database import get_engine
+
+    replayed = replay_ratings(get_engine())
+    print(f"Rebuilt ratings from {replayed} finished fixtures")
@@ -0,0 +1,273 @@
+"""
+This module provides an in-memory prefix index over the names of teams, venues and leagues, for autocomplete.
+
+Names are folded before they are indexed and searched: decomposed to NFKD, stripped of combining marks and casefolded,
+so "munchen" finds "München". Every word of a name (and of a venue's city) is kept in one sorted list of
+`(word, entry)` pairs, and a query looks its longest word up with `bisect`, then scans the words it prefixes. The
+other words of the query must prefix some word of the entry too. Matches are ranked by whether the whole name starts
+with the query, then by length, and the top results are returned, without touching the database.
+
+The index is built at startup from the fixture store, or from the database when no store is configured. An ingestion
+updates the index of its own process with the teams, venues and leagues of every batch; the other server workers, and
+the one whose background job ran it in a pool process, add the names of the database to theirs when the data version
+watcher sees the fixtures change (see `backend.services.versions`). Updates copy the index and swap it in at once, so a
+search running in another thread always reads a consistent index.
+
+**Key Classes:**
+
+- `SearchIndex`: A prefix index of named entries.
+
+**Key Functions:**
+
+- `fold`: Folds a text for accent and case insensitive matching.
+- `get_search_index`: Returns the search index, building it from the fixture store on first use.
+- `set_search_index`: Replaces the search index.
+- `load_search_index`: Builds the search index from the fixture store, or else from the database.
+- `refresh_search_index`: Adds the teams, venues and leagues of the database to the search index.
+- `index_names`: Adds or renames entries of the search index, if it was built.
+"""
+
+import bisect
+import heapq
+import re
+import threading
+import typing
+import unicodedata
+from typing import Iterable
+
+from sqlalchemy import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session, select
+
+from backend.core.logger import logger
+from backend.models.fixture import League, Team, Venue
+from backend.models.search import SearchKind, SearchResult
+
+if typing.TYPE_CHECKING:
+    from backend.services.fixture_store import FixtureStore
+
+WORD = re.compile(r"\w+")
+
+Entry = tuple[SearchKind, int, str, str | None]
+Key = tuple[SearchKind, int]
+
+
+def fold(text: str) -> str:
+    """
+    Folds a text for accent and case insensitive matching.
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        str: The text without accents, casefolded.
+
+    """
+    return "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c)).casefold()
+
+
+class SearchIndex:
+    """
+    A prefix index of named entries: teams, venues (with their city) and leagues.
+
+    Attributes:
+        entries (dict[tuple[str, int], tuple]): The `(kind, id, name, city)` of every entry, by kind and id.
+
+    """
+
+    def __init__(self, entries: Iterable[Entry] = ()) -> None:
+        # The sorted (word, kind, id) list, the entries and the words of every entry, replaced together on update.
+        self._state: tuple[list[tuple[str, SearchKind, int]], dict[Key, Entry], dict[Key, list[str]]] = ([], {}, {})
+        self._lock = threading.Lock()
+        self.update(entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    @property
+    def entries(self) -> dict[Key, Entry]:
+        return self._state[1]
+
+    @classmethod
+    def from_store(cls, store: "FixtureStore") -> "SearchIndex":
+        """
+        Builds an index of the teams, venues and leagues of a fixture store.
+
+        Args:
+            store (FixtureStore): The store.
+
+        Returns:
+            SearchIndex: The index.
+
+        """
+        teams = (("team", team_id, name, None) for team_id, name in zip(store.team_ids.tolist(), store.team_names))
+        venues = (
+            ("venue", venue_id, name, city)
+            for venue_id, name, city in zip(store.venue_ids.tolist(), store.venue_names, store.venue_cities)
+        )
+        leagues = (("league", league_id, name, None) for league_id, name in store.league_names.items())
+        return cls([*teams, *venues, *leagues])  # type: ignore[list-item]
+
+    def update(self, entries: Iterable[Entry]) -> None:
+        """
+        Adds entries, or replaces the entries of the same kind and id. Entries without a name are skipped.
+
+        Args:
+            entries (Iterable[tuple]): The `(kind, id, name, city)` of the entries.
+
+        """
+        with self._lock:
+            index, current, words_by_key = self._state
+            added: list[tuple[str, SearchKind, int]] = []
+            for kind, entry_id, name, city in entries:
+                key = (kind, entry_id)
+                if not name or current.get(key) == (kind, entry_id, name, city):
+                    continue
+                if current is self.entries:
+                    index, current, words_by_key = list(index), dict(current), dict(words_by_key)
+                for word in words_by_key.pop(key, []):
+                    del index[bisect.bisect_left(index, (word, kind, entry_id))]
+                words = sorted(set(WORD.findall(fold(f"{name} {city or ''}"))))
+                added.extend((word, kind, entry_id) for word in words)
+                current[key] = (kind, entry_id, name, city)
+                words_by_key[key] = words
+            if added:
+                # Sorting a sorted list extended with a sorted run merges them in linear time.
+                index.extend(sorted(added))
+                index.sort()
+            self._state = (index, current, words_by_key)
+
+    def search(self, query: str, limit: int = 10) -> list[SearchResult]:
+        """
+        Returns the entries whose name or city has a word starting with every word of a query.
+
+        Args:
+            query (str): The query, e.g. the beginning of a name.
+            limit (int): The maximum number of results.
+
+        Returns:
+            list[SearchResult]: The best matches: the names starting with the query first, then the shortest.
+
+        """
+        words = WORD.findall(fold(query))
+        if not words:
+            return []
+        folded_query = " ".join(words)
+        # The longest word is looked up, as it prefixes the fewest words, and the others are checked per match.
+        first, *others = sorted(words, key=len, reverse=True)
+        index, entries, entry_words = self._state
+        matches = set()
+        for position in range(bisect.bisect_left(index, (first,)), len(index)):
+            word, kind, entry_id = index[position]
+            if not word.startswith(first):
+                break
+            key = (kind, entry_id)
+            if all(any(other_word.startswith(other) for other_word in entry_words[key]) for other in others):
+                matches.add(key)
+
+        def rank(key: Key) -> tuple[bool, int, str]:
+            name = entries[key][2]
+            return not fold(name).startswith(folded_query), len(name), name
+
+        return [
+            SearchResult.trusted(kind=kind, id=entry_id, name=name, city=city)
+            for kind, entry_id, name, city in (entries[key] for key in heapq.nsmallest(limit, matches, key=rank))
+        ]
+
+
+_search_index: SearchIndex | None = None
+
+
+def get_search_index() -> SearchIndex:
+    """
+    Returns the search index, building it from the fixture store, or empty without a store, on first use.
+
+    Returns:
+        SearchIndex: The search index.
+
+    """
+    # Imported here, as the fixture store depends on the ingestion pipeline, which updates this index.
+    from backend.services.fixture_store import get_fixture_store
+
+    global _search_index
+    if _search_index is None:
+        store = get_fixture_store()
+        _search_index = SearchIndex.from_store(store) if store is not None else SearchIndex()
+    return _search_index
+
+
+def set_search_index(index: SearchIndex | None) -> None:
+    """
+    Replaces the search index.
+
+    Args:
+        index (SearchIndex | None): The new index, or None to build it again on next use.
+
+    """
+    global _search_index
+    _search_index = index
+
+
+def _database_entries(engine: Engine) -> list[Entry]:
+    with Session(engine) as session:
+        teams = [("team", team_id, name, None) for team_id, name in session.exec(select(Team.id, Team.name))]
+        venues = [("venue", *row) for row in session.exec(select(Venue.id, Venue.name, Venue.city))]
+        leagues = [("league", *row, None) for row in session.exec(select(League.id, League.name))]
+    return [*teams, *venues, *leagues]  # type: ignore[list-item]
+
+
+def load_search_index(engine: Engine) -> SearchIndex:
+    """
+    Builds the search index from the fixture store, or else from the teams, venues and leagues of the database.
+
+    Args:
+        engine (Engine): The engine of the database, only read without a fixture store.
+
+    Returns:
+        SearchIndex: The new search index.
+
+    """
+    from backend.services.fixture_store import get_fixture_store
+
+    global _search_index
+    store = get_fixture_store()
+    if store is not None:
+        _search_index = SearchIndex.from_store(store)
+        return _search_index
+    try:
+        entries = _database_entries(engine)
+    except SQLAlchemyError as e:
+        # E.g. the schema was not created yet: the index starts empty and is filled by the ingestions.
+        logger.warning(f"Could not load the search index from the database: {e}")
+        entries = []
+    _search_index = SearchIndex(entries)
+    return _search_index
+
+
+def refresh_search_index(engine: Engine) -> None:
+    """
+    Adds the teams, venues and leagues of the database to the search index, or renames them, e.g. after an ingestion
+    run by another process.
+
+    Args:
+        engine (Engine): The engine of the database.
+
+    """
+    try:
+        entries = _database_entries(engine)
+    except SQLAlchemyError as e:
+        logger.warning(f"Could not refresh the search index from the database: {e}")
+        return
+    get_search_index().update(entries)
+
+
+def index_names(entries: Iterable[Entry]) -> None:
+    """
+    Adds or renames entries of the search index, if it was built; otherwise they are indexed when it is built.
+
+    Args:
+        entries (Iterable[tuple]): The `(kind, id, name, city)` of the entries.
+
+    """
+    if _search_index is not None:
+        _search_index.update(entries)
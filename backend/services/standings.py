@@ -0,0 +1,248 @@
+"""
+This module maintains the league standings incrementally from finished fixtures.
+
+Every finished fixture counted in the standings is recorded in `standingfixture` with the scores it was counted with.
+When fixtures are ingested, only the difference with that record is applied: a fixture that just finished is added,
+a corrected score is removed with its old scores and added again with the new ones, and a fixture that is no longer
+finished is removed. Counters are updated with `col = col + delta` upserts, so a league table stays a single indexed
+read whatever the number of fixtures. The recent form of the affected teams is recomputed from their last fixtures.
+
+Launched with `poetry run rebuild-standings [--season <id>]` at root level for backfills.
+
+**Key Functions:**
+
+- `apply_fixtures`: Updates the standings for a batch of upserted fixtures.
+- `rebuild_standings`: Recomputes the standings of one or every season from the fixtures.
+- `read_standings`: Returns the league table of a season.
+"""
+
+import argparse
+from collections import defaultdict
+from typing import Any
+
+from sqlalchemy import Engine, delete, or_, select
+from sqlalchemy.engine import Connection
+from sqlmodel import col
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.core.config import settings
+from backend.database import UPSERT_DIALECTS
+from backend.models.fixture import Fixture, Team
+from backend.models.standing import Standing, StandingFixture, StandingRead
+
+FINISHED_STATUSES = ("FT", "AET", "PEN")
+
+COUNTERS = [
+    column.name
+    for column in Standing.__table__.columns  # type: ignore[attr-defined]
+    if column.name not in ("season_id", "team_id", "form")
+]
+
+STANDING_TABLES = [Standing.__table__, StandingFixture.__table__]  # type: ignore[attr-defined]
+
+
+def _is_counted(fixture: dict) -> bool:
+    return (
+        fixture["status"] in FINISHED_STATUSES
+        and fixture.get("home_score") is not None
+        and fixture.get("away_score") is not None
+    )
+
+
+def _add_result(deltas: dict[tuple[int, int], dict[str, int]], season_id: int, fixture: dict, sign: int) -> None:
+    for side, team_id, scored, conceded in (
+        ("home", fixture["home_team_id"], fixture["home_score"], fixture["away_score"]),
+        ("away", fixture["away_team_id"], fixture["away_score"], fixture["home_score"]),
+    ):
+        result = "won" if scored > conceded else "drawn" if scored == conceded else "lost"
+        delta = deltas[(season_id, team_id)]
+        delta["played"] += sign
+        delta[result] += sign
+        delta["goals_for"] += sign * scored
+        delta["goals_against"] += sign * conceded
+        delta["goal_difference"] += sign * (scored - conceded)
+        delta["points"] += sign * {"won": 3, "drawn": 1, "lost": 0}[result]
+        delta[f"{side}_played"] += sign
+        delta[f"{side}_{result}"] += sign
+        delta[f"{side}_goals_for"] += sign * scored
+        delta[f"{side}_goals_against"] += sign * conceded
+
+
+def apply_fixtures(connection: Connection, fixtures: list[dict]) -> set[tuple[int, int]]:
+    """
+    Updates the standings for a batch of fixtures that were just upserted, in the caller's transaction.
+
+    Args:
+        connection (Connection): The connection of the ingestion transaction.
+        fixtures (list[dict]): The upserted fixture rows, with at least `id`, `season_id`, `status`, `home_team_id`,
+            `away_team_id`, `home_score` and `away_score`.
+
+    Returns:
+        set[tuple[int, int]]: The `(season_id, team_id)` pairs whose standing changed.
+
+    """
+    if not fixtures:
+        return set()
+    counted = {
+        row.fixture_id: row._asdict()
+        for row in connection.execute(
+            select(StandingFixture).where(col(StandingFixture.fixture_id).in_([fixture["id"] for fixture in fixtures]))
+        )
+    }
+
+    deltas: dict[tuple[int, int], dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    to_count: list[dict] = []
+    to_uncount: list[int] = []
+    for fixture in fixtures:
+        previous = counted.get(fixture["id"])
+        current = (
+            {
+                "fixture_id": fixture["id"],
+                "season_id": fixture["season_id"],
+                "home_team_id": fixture["home_team_id"],
+                "away_team_id": fixture["away_team_id"],
+                "home_score": fixture["home_score"],
+                "away_score": fixture["away_score"],
+            }
+            if _is_counted(fixture)
+            else None
+        )
+        if previous == current:
+            continue
+        if previous is not None:
+            _add_result(deltas, previous["season_id"], previous, -1)
+            to_uncount.append(fixture["id"])
+        if current is not None:
+            _add_result(deltas, current["season_id"], current, +1)
+            to_count.append(current)
+
+    if to_uncount:
+        connection.execute(delete(StandingFixture).where(col(StandingFixture.fixture_id).in_(to_uncount)))
+    if to_count:
+        connection.execute(UPSERT_DIALECTS[connection.dialect.name](StandingFixture), to_count)
+    if deltas:
+        _increment(connection, deltas)
+        _refresh_form(connection, set(deltas))
+    return set(deltas)
+
+
+def _increment(connection: Connection, deltas: dict[tuple[int, int], dict[str, int]]) -> None:
+    rows = [
+        {"season_id": season_id, "team_id": team_id, "form": ""} | {name: delta[name] for name in COUNTERS}
+        for (season_id, team_id), delta in deltas.items()
+    ]
+    table = Standing.__table__  # type: ignore[attr-defined]
+    statement = UPSERT_DIALECTS[connection.dialect.name](Standing)
+    statement = statement.on_conflict_do_update(
+        index_elements=["season_id", "team_id"],
+        set_={name: table.c[name] + statement.excluded[name] for name in COUNTERS},
+    )
+    connection.execute(statement, rows)
+
+
+def _refresh_form(connection: Connection, teams: set[tuple[int, int]]) -> None:
+    length = settings.STANDINGS_FORM_LENGTH
+    for season_id, team_id in teams:
+        last_fixtures = connection.execute(
+            select(StandingFixture.home_team_id, StandingFixture.home_score, StandingFixture.away_score)
+            .join(Fixture, col(Fixture.id) == StandingFixture.fixture_id)
+            .where(
+                StandingFixture.season_id == season_id,
+                or_(StandingFixture.home_team_id == team_id, StandingFixture.away_team_id == team_id),
+            )
+            .order_by(col(Fixture.date).desc(), col(Fixture.id).desc())
+            .limit(length)
+        ).all()
+        form = ""
+        for home_team_id, home_score, away_score in reversed(last_fixtures):
+            scored, conceded = (home_score, away_score) if home_team_id == team_id else (away_score, home_score)
+            form += "W" if scored > conceded else "D" if scored == conceded else "L"
+        connection.execute(
+            Standing.__table__.update()  # type: ignore[attr-defined]
+            .where(Standing.season_id == season_id, Standing.team_id == team_id)
+            .values(form=form)
+        )
+
+
+def rebuild_standings(engine: Engine, season_id: int | None = None, batch_size: int = 1000) -> int:
+    """
+    Recomputes the standings of one or every season from the fixtures, e.g. after a backfill.
+
+    Args:
+        engine (Engine): The engine of the database.
+        season_id (int, optional): The season to rebuild. Defaults to every season.
+        batch_size (int, optional): The number of fixtures applied per statement. Defaults to 1000.
+
+    Returns:
+        int: The number of fixtures read.
+
+    """
+    Standing.metadata.create_all(engine, tables=STANDING_TABLES)
+    columns: list[Any] = [
+        Fixture.id,
+        Fixture.season_id,
+        Fixture.status,
+        Fixture.home_team_id,
+        Fixture.away_team_id,
+        Fixture.home_score,
+        Fixture.away_score,
+    ]
+    query = select(*columns).where(col(Fixture.status).in_(FINISHED_STATUSES)).order_by(col(Fixture.id))
+    if season_id is not None:
+        query = query.where(Fixture.season_id == season_id)
+
+    read = 0
+    with engine.begin() as connection:
+        for model in (Standing, StandingFixture):
+            statement = delete(model)
+            if season_id is not None:
+                statement = statement.where(model.season_id == season_id)  # type: ignore[attr-defined]
+            connection.execute(statement)
+        result = connection.execution_options(yield_per=batch_size).execute(query)
+        for rows in result.partitions():
+            fixtures = [row._asdict() for row in rows]
+            apply_fixtures(connection, fixtures)
+            read += len(fixtures)
+    return read
+
+
+async def read_standings(db: AsyncSession, season_id: int) -> list[StandingRead]:
+    """
+    Returns the league table of a season, ranked by points, goal difference and goals scored.
+
+    Args:
+        db (AsyncSession): The database session.
+        season_id (int): The season.
+
+    Returns:
+        list[StandingRead]: The rows of the table, empty if the season has no finished fixture.
+
+    """
+    statement = (
+        select(Standing, Team.name)
+        .join(Team, col(Team.id) == Standing.team_id)
+        .where(Standing.season_id == season_id)
+        .order_by(
+            col(Standing.points).desc(),
+            col(Standing.goal_difference).desc(),
+            col(Standing.goals_for).desc(),
+            col(Team.name),
+        )
+    )
+    rows = (await db.exec(statement)).all()  # type: ignore[call-overload]
+    return [
+        StandingRead.trusted(**standing.model_dump(exclude={"season_id"}), rank=rank, team_name=team_name)
+        for rank, (standing, team_name) in enumerate(rows, start=1)
+    ]
+
+
+def main() -> None:
+    """Rebuilds the standings of the database configured in the settings."""
+    from backend.database import get_engine
+
+    parser = argparse.ArgumentParser(description="Rebuild the standings from the fixtures.")
+    parser.add_argument("--season", type=int, default=None, help="Only rebuild this season")
+    args = parser.parse_args()
+
+    read = rebuild_standings(get_engine(), season_id=args.season)
+    print(f"Rebuilt standings from {read} finished fixtures")
@@ -0,0 +1,131 @@
+"""
+This module provides a bounded, expiry-aware cache of verified JWT payloads.
+
+Entries are keyed by the SHA-256 digest of the token, so raw tokens are never kept in memory, and each entry is
+dropped once the token's `exp` claim has passed. Revoked tokens are remembered until they expire so they can be
+rejected without verifying their signature again.
+
+**Key Classes:**
+
+- `TokenCache`: LRU cache of decoded token payloads with hit and miss counters.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+class TokenCache:
+    """
+    LRU cache of verified token payloads, evicted at the token's expiration time.
+
+    Attributes:
+        max_size (int): The maximum number of payloads kept in the cache.
+        hits (int): The number of lookups answered from the cache.
+        misses (int): The number of lookups that were not in the cache.
+
+    """
+
+    def __init__(self, max_size: int = 1024) -> None:
+        if max_size < 0:
+            raise ValueError(f"max_size must be positive, not {max_size}")
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[bytes, tuple[float, dict]] = OrderedDict()
+        self._revoked: dict[bytes, float] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def digest(token: str) -> bytes:
+        """Returns the cache key of a token."""
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> dict | None:
+        """
+        Returns the cached payload of a token if it is present and not expired.
+
+        Args:
+            token (str): The encoded token.
+
+        Returns:
+            dict | None: A copy of the cached payload, or None on a miss.
+
+        """
+        key = self.digest(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return dict(entry[1])
+
+    def put(self, token: str, payload: dict) -> None:
+        """
+        Caches the verified payload of a token until its `exp` claim. Payloads without `exp` are not cached.
+
+        Args:
+            token (str): The encoded token.
+            payload (dict): The verified payload.
+
+        """
+        expires_at = payload.get("exp")
+        if self.max_size == 0 or not isinstance(expires_at, (int, float)) or expires_at <= time.time():
+            return
+        key = self.digest(token)
+        with self._lock:
+            self._entries[key] = (float(expires_at), dict(payload))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def is_revoked(self, token: str) -> bool:
+        """
+        Checks if a token was revoked and has not expired yet.
+
+        Args:
+            token (str): The encoded token.
+
+        Returns:
+            bool: True if the token was revoked.
+
+        """
+        if not self._revoked:
+            return False
+        expires_at = self._revoked.get(self.digest(token))
+        return expires_at is not None and expires_at > time.time()
+
+    def revoke(self, token: str, expires_at: float) -> None:
+        """
+        Evicts a token and rejects it until it expires.
+
+        Args:
+            token (str): The encoded token.
+            expires_at (float): The token's expiration time as a POSIX timestamp.
+
+        """
+        key = self.digest(token)
+        now = time.time()
+        with self._lock:
+            self._entries.pop(key, None)
+            self._revoked = {k: exp for k, exp in self._revoked.items() if exp > now}
+            if expires_at > now:
+                self._revoked[key] = expires_at
+
+    def clear(self) -> None:
+        """Evicts every cached payload, e.g. after the signing key was rotated. Revocations are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict[str, int]:
+        """Returns the hit and miss counters and the current size of the cache."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries), "max_size": self.max_size}
@@ -0,0 +1,206 @@
+"""
+This module provides a cache of the `UserRead` projections of users, so authenticated reads need no query.
+
+Every user is cached under its id and its username for `USER_CACHE_TTL` seconds. The write paths keep the cache
+coherent: a created user is written through, and a changed user is invalidated under both its old and new keys. A
+lookup that misses reads the database, then caches the row unless the cache was invalidated in between, so a read
+racing with an update cannot put the old row back.
+
+Entries are kept by a pluggable `UserCacheBackend`. The default `InMemoryUserCacheBackend` is local to the process:
+with several server workers, a change is only invalidated in the worker that made it, and other workers serve the
+old row until it expires, so the TTL bounds the staleness. A shared backend such as Redis can implement the same
+interface.
+
+**Key Classes:**
+
+- `UserCacheBackend`: The interface of the user cache stores.
+- `InMemoryUserCacheBackend`: An LRU dictionary of users with an expiration time.
+- `UserCache`: Caches users under their id and username.
+
+**Key Functions:**
+
+- `get_user_cache`: Returns the user cache, creating it from the settings on first use.
+- `set_user_cache`: Replaces the user cache.
+"""
+
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from backend.core.config import settings
+from backend.core.metrics import Counter
+from backend.models import user
+
+USER_CACHE_LOOKUPS = Counter("user_cache_lookups_total", "Lookups of the user cache, by result.", ("result",))
+
+
+class UserCacheBackend(ABC):
+    """The interface of the user cache stores."""
+
+    @abstractmethod
+    async def get(self, key: str) -> user.UserRead | None:
+        """
+        Returns the user cached under a key, if it has not expired.
+
+        Args:
+            key (str): The key.
+
+        Returns:
+            UserRead | None: A copy of the user, or None on a miss.
+
+        """
+
+    @abstractmethod
+    async def set(self, keys: list[str], value: user.UserRead, ttl: float) -> None:
+        """
+        Caches a user under several keys.
+
+        Args:
+            keys (list[str]): The keys.
+            value (UserRead): The user.
+            ttl (float): The seconds the user is kept.
+
+        """
+
+    @abstractmethod
+    async def delete(self, keys: list[str]) -> None:
+        """
+        Evicts the users cached under some keys.
+
+        Args:
+            keys (list[str]): The keys, missing ones are ignored.
+
+        """
+
+
+class InMemoryUserCacheBackend(UserCacheBackend):
+    """
+    An LRU dictionary of users with an expiration time.
+
+    Attributes:
+        max_size (int): The maximum number of entries, each user taking one per key.
+
+    """
+
+    def __init__(self, max_size: int = 10_000) -> None:
+        if max_size < 0:
+            raise ValueError(f"max_size must be positive, not {max_size}")
+        self.max_size = max_size
+        self._entries: OrderedDict[str, tuple[float, user.UserRead]] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    async def get(self, key: str) -> user.UserRead | None:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry[1].model_copy()
+
+    async def set(self, keys: list[str], value: user.UserRead, ttl: float) -> None:
+        if self.max_size == 0 or ttl <= 0:
+            return
+        expires_at = time.monotonic() + ttl
+        for key in keys:
+            self._entries[key] = (expires_at, value.model_copy())
+            self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    async def delete(self, keys: list[str]) -> None:
+        for key in keys:
+            self._entries.pop(key, None)
+
+
+class UserCache:
+    """
+    Caches users under their id and their username.
+
+    Attributes:
+        backend (UserCacheBackend): The store of the users.
+        ttl (float): The seconds a user is kept.
+        generation (int): The number of invalidations so far, to detect an invalidation during a lookup.
+
+    """
+
+    def __init__(self, backend: UserCacheBackend, ttl: float) -> None:
+        self.backend = backend
+        self.ttl = ttl
+        self.generation = 0
+
+    @staticmethod
+    def _keys(user_id: int | None = None, username: str | None = None) -> list[str]:
+        keys = [] if user_id is None else [f"id:{user_id}"]
+        return keys if username is None else keys + [f"username:{username}"]
+
+    async def get_by_id(self, user_id: int) -> user.UserRead | None:
+        """Returns the cached user of an id, or None on a miss."""
+        return await self._get(self._keys(user_id=user_id)[0])
+
+    async def get_by_username(self, username: str) -> user.UserRead | None:
+        """Returns the cached user of a username, or None on a miss."""
+        return await self._get(self._keys(username=username)[0])
+
+    async def _get(self, key: str) -> user.UserRead | None:
+        cached = await self.backend.get(key)
+        USER_CACHE_LOOKUPS.inc(labels=("hit" if cached is not None else "miss",))
+        return cached
+
+    async def put(self, value: user.UserRead, generation: int | None = None) -> None:
+        """
+        Caches a user under its id and username.
+
+        Args:
+            value (UserRead): The user.
+            generation (int | None): The `generation` read before the user was queried; the user is not cached if
+                the cache was invalidated since. None to cache it anyway, for a user that was just written.
+
+        """
+        if generation is not None and generation != self.generation:
+            return
+        await self.backend.set(self._keys(value.id, value.username), value, self.ttl)
+
+    async def invalidate(self, user_id: int | None = None, username: str | None = None) -> None:
+        """
+        Evicts a user, under whichever of its id and username are given.
+
+        Args:
+            user_id (int | None): The id of the user.
+            username (str | None): The username of the user.
+
+        """
+        self.generation += 1
+        await self.backend.delete(self._keys(user_id, username))
+
+
+_user_cache: UserCache | None = None
+
+
+def get_user_cache() -> UserCache:
+    """
+    Returns the user cache, creating it from the settings, with an in-memory backend, on first use.
+
+    Returns:
+        UserCache: The user cache.
+
+    """
+    global _user_cache
+    if _user_cache is None:
+        _user_cache = UserCache(InMemoryUserCacheBackend(settings.USER_CACHE_SIZE), settings.USER_CACHE_TTL)
+    return _user_cache
+
+
+def set_user_cache(cache: UserCache | None) -> None:
+    """
+    Replaces the user cache, e.g. by one with a shared backend.
+
+    Args:
+        cache (UserCache | None): The new cache, or None to recreate it from the settings on next use.
+
+    """
+    global _user_cache
+    _user_cache = cache
@@ -0,0 +1,171 @@
+"""
+This module provides the database operations on users.
+
+**Key Functions:**
+
+- `insert_user`: Inserts a user in a single statement, returning None if the username is already taken.
+- `insert_users`: Inserts a batch of users with a single multi-row statement, skipping taken usernames.
+- `get_user_read`: Returns the `UserRead` projection of a user, from the user cache when possible.
+- `update_user`: Updates a user and invalidates its cached projection.
+
+The write paths keep the user cache coherent: a created user is written through to it, and a changed one evicted.
+"""
+
+from sqlalchemy import insert
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import col, select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.database import UPSERT_DIALECTS
+from backend.models import user
+from backend.services.user_cache import get_user_cache
+
+
+async def insert_user(db: AsyncSession, user_create: user.UserCreate) -> user.User | None:
+    """
+    Inserts a user and commits, relying on the unique index on `username` to detect duplicates.
+
+    On PostgreSQL and SQLite the conflict is resolved by the INSERT itself (`ON CONFLICT DO NOTHING RETURNING`), so
+    creating a user takes a single round trip and is free of the race of a query-then-insert.
+
+    Args:
+        db (AsyncSession): The database session.
+        user_create (UserCreate): The user to create, with an already hashed password.
+
+    Returns:
+        User | None: The created user, or None if the username already exists.
+
+    """
+    values = user_create.model_dump()
+    dialect = db.bind.dialect.name if db.bind is not None else ""
+    if dialect in UPSERT_DIALECTS:
+        statement = (
+            UPSERT_DIALECTS[dialect](user.User)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=[user.User.username])
+            .returning(user.User.id)
+        )
+        user_id = (await db.exec(statement)).scalar_one_or_none()
+        await db.commit()
+    else:
+        try:
+            user_id = (await db.exec(insert(user.User).values(**values).returning(user.User.id))).scalar_one()
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            return None
+    if user_id is None:
+        return None
+    db_user = user.User(id=user_id, **values)
+    await get_user_cache().put(_read(db_user))
+    return db_user
+
+
+async def insert_users(db: AsyncSession, users: list[user.UserCreate]) -> set[str]:
+    """
+    Inserts a batch of users and commits, skipping the usernames that already exist.
+
+    The rows are sent with a single executemany, which SQLAlchemy batches into multi-row INSERT statements.
+
+    Args:
+        db (AsyncSession): The database session.
+        users (list[UserCreate]): The users to create, with already hashed passwords and distinct usernames.
+
+    Returns:
+        set[str]: The usernames that were created.
+
+    """
+    if not users:
+        return set()
+    rows = [user_create.model_dump() for user_create in users]
+    dialect = db.bind.dialect.name if db.bind is not None else ""
+    if dialect in UPSERT_DIALECTS:
+        statement = (
+            UPSERT_DIALECTS[dialect](user.User)
+            .on_conflict_do_nothing(index_elements=[user.User.username])
+            .returning(user.User.username)
+        )
+        created = set((await db.exec(statement, params=rows)).scalars())
+        await db.commit()
+        await _invalidate_usernames(created)
+        return created
+
+    usernames = [row["username"] for row in rows]
+    existing = set((await db.exec(select(user.User.username).where(col(user.User.username).in_(usernames)))).all())
+    new_rows = [row for row in rows if row["username"] not in existing]
+    if new_rows:
+        await db.exec(insert(user.User), params=new_rows)
+    await db.commit()
+    created = {row["username"] for row in new_rows}
+    await _invalidate_usernames(created)
+    return created
+
+
+async def get_user_read(db: AsyncSession, username: str) -> user.UserRead | None:
+    """
+    Returns the `UserRead` projection of a user, from the user cache, or else from the database and then cached.
+
+    Args:
+        db (AsyncSession): The database session, only used on a cache miss.
+        username (str): The username of the user.
+
+    Returns:
+        UserRead | None: The user, or None if it does not exist. Missing users are not cached.
+
+    """
+    cache = get_user_cache()
+    cached = await cache.get_by_username(username)
+    if cached is not None:
+        return cached
+    generation = cache.generation
+    db_user = (await db.exec(select(user.User).where(user.User.username == username))).first()
+    if db_user is None:
+        return None
+    user_read = _read(db_user)
+    await cache.put(user_read, generation)
+    return user_read
+
+
+async def update_user(db: AsyncSession, username: str, user_update: user.UserUpdate) -> user.User | None:
+    """
+    Updates the given fields of a user and commits, then evicts the user from the user cache.
+
+    Args:
+        db (AsyncSession): The database session.
+        username (str): The current username of the user.
+        user_update (UserUpdate): The fields to change, with an already hashed password.
+
+    Returns:
+        User | None: The updated user, or None if it does not exist.
+
+    Raises:
+        IntegrityError: If the new username is already taken; the session is rolled back.
+
+    """
+    db_user = (await db.exec(select(user.User).where(user.User.username == username))).first()
+    if db_user is None:
+        return None
+    for field, value in user_update.model_dump(exclude_unset=True, exclude_none=True).items():
+        setattr(db_user, field, value)
+    db.add(db_user)
+    try:
+        await db.commit()
+    except IntegrityError:
+        await db.rollback()
+        raise
+    await db.refresh(db_user)
+    cache = get_user_cache()
+    await cache.invalidate(user_id=db_user.id, username=username)
+    await cache.invalidate(username=db_user.username)
+    return db_user
+
+
+def _read(db_user: user.User) -> user.UserRead:
+    return user.UserRead.trusted(id=db_user.id, username=db_user.username, is_admin=db_user.is_admin)
+
+
+async def _invalidate_usernames(usernames: set[str]) -> None:
+    # Created users were not cached unless a row with the same username was deleted, so they are only evicted.
+    cache = get_user_cache()
+    for username in usernames:
+        await cache.invalidate(username=username)
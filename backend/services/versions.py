@@ -0,0 +1,189 @@
+"""
+This module provides the version stamps telling the server workers that the data they cache has changed.
+
+Server workers keep data derived from the database in memory, e.g. the fitted prediction model. The processes changing
+that data are often others: `poetry run ingest`, a background job in a pool process, another server worker. Instead of
+reaching every process, the writer increments the version of the data in the `DataVersion` table, in the transaction
+that changes it or right after it commits. Every server worker runs a `VersionWatcher`, started by the application
+lifespan, which reads the versions every `DATA_VERSION_POLL_INTERVAL` seconds and calls the callbacks subscribed to
+the versions that changed, e.g. to drop the model so that it is refitted on next use, or to add the ingested names to
+the search index.
+
+**Key Classes:**
+
+- `VersionWatcher`: Polls the version stamps and calls the callbacks subscribed to the changed ones.
+
+**Key Functions:**
+
+- `bump_version`: Increments the version of a kind of data.
+- `read_versions`: Returns the version of every kind of data.
+- `get_version_watcher`: Returns the version watcher, with the callbacks of the server caches, on first use.
+- `set_version_watcher`: Replaces the version watcher.
+"""
+
+import asyncio
+from collections import defaultdict
+from typing import Callable
+
+from sqlalchemy import Engine, select, update
+from sqlalchemy.engine import Connection
+from sqlalchemy.exc import SQLAlchemyError
+
+from backend.core.config import settings
+from backend.core.logger import logger
+from backend.database import UPSERT_DIALECTS
+from backend.models.version import DataVersion
+
+VERSION_TABLES = [DataVersion.__table__]  # type: ignore[attr-defined]
+
+
+def bump_version(connection: Connection, name: str) -> None:
+    """
+    Increments the version of a kind of data, creating it at 1.
+
+    Args:
+        connection (Connection): The connection, ideally the transaction that changed the data.
+        name (str): The kind of data, e.g. "fixtures".
+
+    """
+    dialect = connection.dialect.name
+    if dialect in UPSERT_DIALECTS:
+        statement = UPSERT_DIALECTS[dialect](DataVersion).values(name=name, version=1)
+        connection.execute(
+            statement.on_conflict_do_update(index_elements=["name"], set_={"version": DataVersion.version + 1})
+        )
+        return
+    bumped = connection.execute(
+        update(DataVersion).where(DataVersion.name == name).values(version=DataVersion.version + 1)
+    )
+    if bumped.rowcount == 0:
+        connection.execute(DataVersion.__table__.insert().values(name=name, version=1))  # type: ignore[attr-defined]
+
+
+def read_versions(engine: Engine) -> dict[str, int]:
+    """
+    Returns the version of every kind of data.
+
+    Args:
+        engine (Engine): The engine of the database.
+
+    Returns:
+        dict[str, int]: The versions, by kind of data.
+
+    """
+    with engine.connect() as connection:
+        return {name: version for name, version in connection.execute(select(DataVersion.name, DataVersion.version))}
+
+
+class VersionWatcher:
+    """
+    Polls the version stamps and calls the callbacks subscribed to the changed ones.
+
+    The first successful read only records the versions: the caches of a worker are loaded after it starts, from data
+    at least as recent.
+
+    Attributes:
+        engine (Engine): The engine of the database.
+        interval (float): The seconds between two reads of the versions.
+
+    """
+
+    def __init__(self, engine: Engine, interval: float = 5.0) -> None:
+        self.engine = engine
+        self.interval = interval
+        self._subscribers: dict[str, list[Callable[[], None]]] = defaultdict(list)
+        self._versions: dict[str, int] | None = None
+        self._task: asyncio.Task | None = None
+
+    def subscribe(self, name: str, callback: Callable[[], None]) -> None:
+        """
+        Calls a function whenever the version of a kind of data changes.
+
+        Args:
+            name (str): The kind of data, e.g. "fixtures".
+            callback (Callable[[], None]): The function, called in a worker thread.
+
+        """
+        self._subscribers[name].append(callback)
+
+    def check(self) -> set[str]:
+        """
+        Reads the versions and calls the callbacks subscribed to the changed ones.
+
+        Returns:
+            set[str]: The kinds of data whose version changed since the previous check.
+
+        """
+        try:
+            versions = read_versions(self.engine)
+        except SQLAlchemyError as e:
+            # E.g. the schema was not created yet: the versions are read again on next check.
+            logger.warning(f"Could not read the data versions: {e}")
+            return set()
+        previous, self._versions = self._versions, versions
+        if previous is None:
+            return set()
+        changed = {name for name, version in versions.items() if previous.get(name) != version}
+        for name in changed:
+            for callback in self._subscribers[name]:
+                try:
+                    callback()
+                except Exception as e:
+                    logger.error(f"Unable to refresh after a change of {name}: {e}")
+        return changed
+
+    async def start(self) -> None:
+        """Records the current versions, then checks them every `interval` seconds."""
+        if self._task is None:
+            await asyncio.to_thread(self.check)
+            self._task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """Stops checking the versions."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            await asyncio.to_thread(self.check)
+
+
+_version_watcher: VersionWatcher | None = None
+
+
+def get_version_watcher() -> VersionWatcher:
+    """
+    Returns the version watcher, creating it from the settings on first use, with the prediction model dropped and
+    the search index refreshed whenever the fixtures change.
+
+    Returns:
+        VersionWatcher: The version watcher, not started.
+
+    """
+    # Imported here, as the ingestion pipeline bumps the versions and the prediction service depends on it.
+    from backend.database import get_engine
+    from backend.services.prediction import set_model
+    from backend.services.search import refresh_search_index
+
+    global _version_watcher
+    if _version_watcher is None:
+        engine = get_engine()
+        _version_watcher = VersionWatcher(engine, interval=settings.DATA_VERSION_POLL_INTERVAL)
+        _version_watcher.subscribe("fixtures", lambda: set_model(None))
+        _version_watcher.subscribe("fixtures", lambda: refresh_search_index(engine))
+    return _version_watcher
+
+
+def set_version_watcher(watcher: VersionWatcher | None) -> None:
+    """
+    Replaces the version watcher.
+
+    Args:
+        watcher (VersionWatcher | None): The new watcher, or None to create it from the settings on next use.
+
+    """
+    global _version_watcher
+    _version_watcher = watcher
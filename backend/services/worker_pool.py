@@ -0,0 +1,141 @@
+"""
+This module provides a bounded executor used to run CPU-bound work off the event loop.
+
+Work is dispatched either to a thread pool (for functions that release the GIL, such as bcrypt) or to a process
+pool. The number of submitted-but-unfinished jobs is capped, so callers get back-pressure instead of an ever growing
+queue when the workers are saturated.
+
+**Key Classes:**
+
+- `BoundedExecutor`: Runs callables on a worker pool with a bounded number of pending jobs.
+- `PoolSaturatedError`: Raised when a job could not be queued before the queue timeout expired.
+"""
+
+import asyncio
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Iterable, Literal, TypeVar
+
+T = TypeVar("T")
+
+ExecutorKind = Literal["thread", "process"]
+
+
+class PoolSaturatedError(RuntimeError):
+    """Raised when a bounded executor has no free slot within the queue timeout."""
+
+
+class BoundedExecutor:
+    """
+    Runs blocking callables on a worker pool with a bounded number of pending jobs.
+
+    Attributes:
+        max_workers (int): The number of workers in the pool.
+        max_pending (int): The maximum number of jobs queued or running at the same time.
+        queue_timeout (float): Seconds to wait for a free slot before raising `PoolSaturatedError`.
+        kind (str): Either "thread" or "process".
+
+    """
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        max_pending: int | None = None,
+        kind: ExecutorKind = "thread",
+        queue_timeout: float = 5.0,
+    ) -> None:
+        if kind not in ("thread", "process"):
+            raise ValueError(f"Executor kind must be 'thread' or 'process', not {kind}")
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.max_pending = max_pending or self.max_workers * 4
+        if self.max_pending < self.max_workers:
+            raise ValueError("max_pending must be greater than or equal to max_workers")
+        self.queue_timeout = queue_timeout
+        self.kind = kind
+        self._executor: Executor | None = None
+        self._slots: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Returns the number of jobs currently queued or running."""
+        return self._pending
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.kind == "process":
+                self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="bounded-pool")
+        return self._executor
+
+    def _get_slots(self) -> asyncio.Semaphore:
+        # asyncio primitives are bound to the loop they are first used on, so a new one is created per loop.
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._loop is not loop:
+            self._slots = asyncio.Semaphore(self.max_pending)
+            self._loop = loop
+        return self._slots
+
+    async def run(self, func: Callable[..., T], *args: Any) -> T:
+        """
+        Runs a callable on the worker pool and waits for its result.
+
+        Args:
+            func (Callable): The callable to run. It must be picklable when the pool is a process pool.
+            *args: The positional arguments passed to the callable.
+
+        Returns:
+            The value returned by the callable.
+
+        Raises:
+            PoolSaturatedError: If no slot became free within `queue_timeout` seconds.
+
+        """
+        slots = self._get_slots()
+        try:
+            await asyncio.wait_for(slots.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError as e:
+            raise PoolSaturatedError(f"{self.max_pending} jobs already pending, try again later") from e
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), func, *args)
+        finally:
+            self._pending -= 1
+            slots.release()
+
+    async def map(self, func: Callable[..., T], *iterables: Iterable[Any]) -> list[T]:
+        """
+        Runs a callable on the worker pool for every set of arguments, keeping at most `max_workers` jobs pending.
+
+        Unlike many concurrent calls to `run`, a large batch does not fill the queue, so it cannot starve other callers
+        of the pool or fail with `PoolSaturatedError` because of its own size.
+
+        Args:
+            func (Callable): The callable to run.
+            *iterables: The iterables of positional arguments, zipped together like the built-in `map`.
+
+        Returns:
+            list: The results, in the order of the arguments.
+
+        """
+        workers = asyncio.Semaphore(self.max_workers)
+
+        async def run_one(args: tuple[Any, ...]) -> T:
+            async with workers:
+                return await self.run(func, *args)
+
+        return await asyncio.gather(*(run_one(args) for args in zip(*iterables)))
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Shuts down the underlying pool. A new pool is created on the next call to `run`.
+
+        Args:
+            wait (bool, optional): Whether to wait for running jobs to finish. Defaults to True.
+
+        """
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
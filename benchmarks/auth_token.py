@@ -0,0 +1,75 @@
+"""
+Benchmark of `/auth/token` throughput for an increasing number of password hashing workers.
+
+Runs the real application in-process through `httpx.AsyncClient` against a temporary SQLite database and fires
+concurrent logins for every worker count, so the scaling of bcrypt verification with the available cores is visible.
+
+Usage:
+    python -m benchmarks.auth_token [--requests 64] [--concurrency 32] [--executor thread]
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URI", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+os.environ.setdefault("PROJECT_NAME", "predictions-benchmark")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+
+import httpx  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+
+from backend.database import get_engine  # noqa: E402
+from backend.main import app  # noqa: E402
+from backend.services.authentication import set_password_pool, shutdown_password_pool  # noqa: E402
+from backend.services.worker_pool import BoundedExecutor, ExecutorKind  # noqa: E402
+
+USERNAME = "benchmark"
+PASSWORD = "benchmark-password"
+
+
+async def _login_burst(client: httpx.AsyncClient, requests: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def login() -> None:
+        async with semaphore:
+            response = await client.post("/auth/token", data={"username": USERNAME, "password": PASSWORD})
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(requests)))
+    return time.perf_counter() - start
+
+
+async def run(requests: int, concurrency: int, executor: ExecutorKind) -> None:
+    SQLModel.metadata.create_all(get_engine())
+    transport = httpx.ASGITransport(app=app)  # type: ignore[arg-type]
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await client.post("/auth/signup", json={"username": USERNAME, "password": PASSWORD})
+        cores = os.cpu_count() or 1
+        worker_counts = sorted({1, 2, 4, cores} & set(range(1, cores + 1)))
+        baseline = None
+        print(f"{'workers':>8} {'req/s':>10} {'speed-up':>9}")
+        for workers in worker_counts:
+            set_password_pool(BoundedExecutor(max_workers=workers, max_pending=concurrency, kind=executor))
+            await _login_burst(client, workers, workers)
+            elapsed = await _login_burst(client, requests, concurrency)
+            throughput = requests / elapsed
+            baseline = baseline or throughput
+            print(f"{workers:>8} {throughput:>10.1f} {throughput / baseline:>8.2f}x")
+    shutdown_password_pool()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread")
+    args = parser.parse_args()
+    asyncio.run(run(args.requests, args.concurrency, args.executor))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+Benchmark of `POST /admin/users:bulk` against looping `POST /admin/create_user` once per user.
+
+Runs the real application in-process through `httpx.AsyncClient` against a temporary SQLite database. bcrypt is
+lowered to `--rounds` (4 by default) so the comparison measures the per-user HTTP, query and commit overhead that the
+bulk endpoint removes rather than the hashing cost, which both paths pay.
+
+Usage:
+    python -m benchmarks.bulk_users [--users 10000] [--rounds 4] [--concurrency 8]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URI", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+os.environ.setdefault("PROJECT_NAME", "predictions-benchmark")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+if "--rounds" in sys.argv:
+    os.environ["BCRYPT_ROUNDS"] = sys.argv[sys.argv.index("--rounds") + 1]
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+import httpx  # noqa: E402
+from sqlmodel import SQLModel  # noqa: E402
+
+from backend.database import get_engine  # noqa: E402
+from backend.main import app  # noqa: E402
+from backend.services.authentication import generate_token, shutdown_password_pool  # noqa: E402
+
+HEADERS = {"Authorization": f"Bearer {generate_token(username='benchmark', is_admin=True)}"}
+
+
+async def single_endpoint(client: httpx.AsyncClient, users: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def create(number: int) -> None:
+        async with semaphore:
+            body = {"username": f"single{number}", "password": "benchmark"}
+            response = await client.post("/admin/create_user", json=body, headers=HEADERS)
+            response.raise_for_status()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(create(number) for number in range(users)))
+    return time.perf_counter() - start
+
+
+async def bulk_endpoint(client: httpx.AsyncClient, users: int) -> float:
+    rows = [{"username": f"bulk{number}", "password": "benchmark"} for number in range(users)]
+    start = time.perf_counter()
+    response = await client.post("/admin/users:bulk", json=rows, headers=HEADERS, timeout=None)
+    response.raise_for_status()
+    assert response.json()["created"] == users
+    return time.perf_counter() - start
+
+
+async def run(users: int, concurrency: int) -> None:
+    SQLModel.metadata.create_all(get_engine())
+    transport = httpx.ASGITransport(app=app)  # type: ignore[arg-type]
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        single = await single_endpoint(client, users, concurrency)
+        bulk = await bulk_endpoint(client, users)
+    shutdown_password_pool()
+    print(f"{'endpoint':>20} {'seconds':>9} {'users/s':>9}")
+    print(f"{'/admin/create_user':>20} {single:>9.2f} {users / single:>9.0f}")
+    print(f"{'/admin/users:bulk':>20} {bulk:>9.2f} {users / bulk:>9.0f}")
+    print(f"speed-up: {single / bulk:.1f}x")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=10_000)
+    parser.add_argument("--rounds", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=8)
+    args = parser.parse_args()
+    asyncio.run(run(args.users, args.concurrency))
+
+
+if __name__ == "__main__":
+    main()
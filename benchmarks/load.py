@@ -0,0 +1,189 @@
+"""
+Load test of the authentication endpoints, with latency percentiles and a regression check against a baseline.
+
+Runs the real application in-process through `httpx.AsyncClient` against a temporary SQLite database, or the
+database of `DATABASE_URI` when set, whose schema is upgraded first. Every scenario sends `--requests` requests,
+`--concurrency` at a time, after a short warm-up, and reports the p50/p95/p99 latencies and the requests per second:
+
+- `test_connection`: `GET /test_connection`, the cost of the framework alone;
+- `signup`: `POST /auth/signup` with new usernames;
+- `token`: `POST /auth/token` for an existing user;
+- `me`: `GET /auth/me` with a valid token;
+- `create_user`: `POST /admin/create_user` with new usernames, as an admin.
+
+`--save-baseline` writes the results to a json file. `--baseline` compares the results to such a file and exits with
+status 1 when a percentile is more than `--threshold` (a fraction) above the baseline, or the throughput more than
+`--threshold` below it. A baseline is only meaningful on the machine, settings and options that produced it.
+
+Usage:
+    python -m benchmarks.load [--requests 200] [--concurrency 16] [--bcrypt-rounds 4] [--scenarios token me]
+        [--save-baseline baseline.json] [--baseline baseline.json] [--threshold 0.2]
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any, Awaitable, Callable
+
+os.environ.setdefault("DATABASE_URI", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+os.environ.setdefault("PROJECT_NAME", "predictions-benchmark")
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+import httpx  # noqa: E402
+import numpy as np  # noqa: E402
+
+from backend.core.config import settings  # noqa: E402
+from backend.database import dispose_engines, get_engine  # noqa: E402
+from backend.main import app  # noqa: E402
+from backend.migrations import upgrade  # noqa: E402
+from backend.services.authentication import generate_token, shutdown_password_pool  # noqa: E402
+
+USERNAME = "load-test"
+PASSWORD = "load-test-password"
+PERCENTILES = (50, 95, 99)
+WARMUP_REQUESTS = 5
+
+Request = Callable[[httpx.AsyncClient], Awaitable[httpx.Response]]
+
+
+def _scenarios() -> dict[str, Request]:
+    usernames = (f"load-test-{number}-{time.time_ns()}" for number in itertools.count())
+    admin_headers = {"Authorization": f"Bearer {generate_token(username='load-test-admin', is_admin=True)}"}
+    user_headers = {"Authorization": f"Bearer {generate_token(username=USERNAME, is_admin=False)}"}
+    return {
+        "test_connection": lambda client: client.get("/test_connection"),
+        "signup": lambda client: client.post("/auth/signup", json={"username": next(usernames), "password": PASSWORD}),
+        "token": lambda client: client.post("/auth/token", data={"username": USERNAME, "password": PASSWORD}),
+        "me": lambda client: client.get("/auth/me", headers=user_headers),
+        "create_user": lambda client: client.post(
+            "/admin/create_user", json={"username": next(usernames), "password": PASSWORD}, headers=admin_headers
+        ),
+    }
+
+
+async def _measure(client: httpx.AsyncClient, request: Request, requests: int, concurrency: int) -> dict[str, float]:
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+    errors = 0
+
+    async def send() -> None:
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            response = await request(client)
+            latencies.append(time.perf_counter() - start)
+            errors += not response.is_success
+
+    for _ in range(WARMUP_REQUESTS):
+        await send()
+    latencies.clear()
+    errors = 0
+
+    start = time.perf_counter()
+    await asyncio.gather(*(send() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    values = np.percentile(np.array(latencies) * 1000, PERCENTILES)
+    return {f"p{percentile}_ms": float(value) for percentile, value in zip(PERCENTILES, values)} | {
+        "requests_per_second": requests / elapsed,
+        "errors": errors,
+    }
+
+
+async def run(names: list[str], requests: int, concurrency: int) -> dict[str, dict[str, float]]:
+    upgrade(get_engine())
+    scenarios = _scenarios()
+    results: dict[str, dict[str, float]] = {}
+    transport = httpx.ASGITransport(app=app)  # type: ignore[arg-type]
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+        await client.post("/auth/signup", json={"username": USERNAME, "password": PASSWORD})
+        print(f"{'scenario':>16} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'req/s':>9} {'errors':>7}")
+        for name in names:
+            result = results[name] = await _measure(client, scenarios[name], requests, concurrency)
+            print(
+                f"{name:>16} {result['p50_ms']:>9.2f} {result['p95_ms']:>9.2f} {result['p99_ms']:>9.2f} "
+                f"{result['requests_per_second']:>9.1f} {result['errors']:>7.0f}"
+            )
+    shutdown_password_pool()
+    await dispose_engines()
+    return results
+
+
+def regressions(
+    results: dict[str, dict[str, float]], baseline: dict[str, dict[str, float]], threshold: float
+) -> list[str]:
+    """
+    Compares results to a baseline.
+
+    Args:
+        results (dict): The metrics per scenario.
+        baseline (dict): The baseline metrics per scenario; scenarios missing from either side are not compared.
+        threshold (float): The tolerated relative change, e.g. 0.2 for 20%.
+
+    Returns:
+        list[str]: A description of every regression, or errors in a scenario that had none.
+
+    """
+    found = []
+    for name in results.keys() & baseline.keys():
+        current, reference = results[name], baseline[name]
+        for percentile in PERCENTILES:
+            key = f"p{percentile}_ms"
+            if current[key] > reference[key] * (1 + threshold):
+                found.append(f"{name}: {key} {current[key]:.2f} > {reference[key]:.2f} + {threshold:.0%}")
+        if current["requests_per_second"] < reference["requests_per_second"] * (1 - threshold):
+            found.append(
+                f"{name}: requests_per_second {current['requests_per_second']:.1f} "
+                f"< {reference['requests_per_second']:.1f} - {threshold:.0%}"
+            )
+        if current["errors"] > reference["errors"]:
+            found.append(f"{name}: {current['errors']:.0f} errors, {reference['errors']:.0f} in the baseline")
+    return sorted(found)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--bcrypt-rounds", type=int, default=settings.BCRYPT_ROUNDS)
+    parser.add_argument("--scenarios", nargs="+", choices=list(_scenarios()), default=list(_scenarios()))
+    parser.add_argument("--save-baseline", metavar="PATH")
+    parser.add_argument("--baseline", metavar="PATH")
+    parser.add_argument("--threshold", type=float, default=0.2)
+    args = parser.parse_args()
+
+    settings.BCRYPT_ROUNDS = args.bcrypt_rounds
+    # Every request comes from one client and the token scenario logs one user in repeatedly: the login throttle
+    # would reject most of them, and its check cap is sized to the client concurrency.
+    settings.LOGIN_USERNAME_RATE_PER_MINUTE = settings.LOGIN_IP_RATE_PER_MINUTE = None
+    settings.LOGIN_MAX_CONCURRENT_CHECKS = args.concurrency
+    results = asyncio.run(run(args.scenarios, args.requests, args.concurrency))
+    options: dict[str, Any] = {
+        "requests": args.requests,
+        "concurrency": args.concurrency,
+        "bcrypt_rounds": args.bcrypt_rounds,
+    }
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as file:
+            json.dump({"options": options, "results": results}, file, indent=4)
+    if args.baseline:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        if baseline["options"] != options:
+            print(f"Warning: the baseline was measured with {baseline['options']}, not {options}")
+        found = regressions(results, baseline["results"], args.threshold)
+        for regression in found:
+            print(f"Regression: {regression}")
+        if found:
+            sys.exit(1)
+        print(f"No regression above {args.threshold:.0%} against {args.baseline}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+"""
+Micro-benchmark of the per-request cost of building response models, strict versus trusted.
+
+For every response model built in a request, measures in microseconds per object:
+- construction: with the strict `BaseObject` configuration, with the `TrustedObject` configuration, and with
+  `trusted`;
+- an attribute assignment, as routes used to do with `user_create.password = ...`;
+- the validation FastAPI runs on the returned object against the route's `response_model`.
+
+The strict figures use a copy of each model with the `BaseObject` configuration, as the models had before.
+
+Usage:
+    python -m benchmarks.models [--number 20000]
+"""
+
+import argparse
+import os
+import tempfile
+import timeit
+from datetime import datetime
+from typing import Any, Callable
+
+os.environ.setdefault("DATABASE_URI", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+from pydantic import TypeAdapter  # noqa: E402
+
+from backend.core.base_object import BaseObject  # noqa: E402
+from backend.models.fixture import FixtureRead  # noqa: E402
+from backend.models.prediction import Prediction  # noqa: E402
+from backend.models.standing import StandingRead  # noqa: E402
+from backend.models.token import Token, TokenData  # noqa: E402
+from backend.models.user import UserRead, UserView  # noqa: E402
+
+MODELS: list[tuple[type[BaseObject], dict[str, Any], str, Any]] = [
+    (UserView, {"success": True, "is_admin": False, "username": "alice"}, "username", "bob"),
+    (UserRead, {"id": 1, "username": "alice", "is_admin": False}, "username", "bob"),
+    (Token, {"access_token": "x" * 160, "token_type": "bearer"}, "access_token", "y" * 160),
+    (TokenData, {"username": "alice", "role": "user"}, "role", "admin"),
+    (
+        FixtureRead,
+        {
+            "id": 1035037,
+            "date": datetime(2023, 8, 11, 19),
+            "status": "FT",
+            "round": "Regular Season - 1",
+            "league_id": 39,
+            "season_id": 1,
+            "venue_id": 512,
+            "home_team_id": 44,
+            "home_team_name": "Burnley",
+            "away_team_id": 50,
+            "away_team_name": "Manchester City",
+            "home_score": 0,
+            "away_score": 3,
+        },
+        "status",
+        "AET",
+    ),
+    (
+        StandingRead,
+        {name: 0 for name in StandingRead.model_fields if name not in ("team_name", "form")}
+        | {"rank": 1, "team_name": "Arsenal", "form": "WWDLW"},
+        "form",
+        "WWWWW",
+    ),
+    (
+        Prediction,
+        {
+            "fixture_id": 1,
+            "home_team_id": 44,
+            "away_team_id": 50,
+            "expected_home_goals": 1.2,
+            "expected_away_goals": 1.9,
+            "home_win": 0.25,
+            "draw": 0.25,
+            "away_win": 0.5,
+        },
+        "draw",
+        0.3,
+    ),
+]
+
+
+def microseconds(function: Callable[[], Any], number: int) -> float:
+    return min(timeit.repeat(function, number=number, repeat=3)) / number * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--number", type=int, default=20_000)
+    args = parser.parse_args()
+    number = args.number
+
+    print(f"{'model':>14} {'mode':>8} {'build':>8} {'assign':>8} {'response':>9} {'total':>8}  (µs)")
+    for model, values, field, value in MODELS:
+        strict_config = model.model_config | {"validate_assignment": True, "revalidate_instances": "always"}
+        strict_model = type(
+            f"Strict{model.__name__}", (model,), {"model_config": strict_config, "__module__": __name__}
+        )
+        modes: list[tuple[str, type[BaseObject], Callable[[], BaseObject]]] = [
+            ("strict", strict_model, lambda: strict_model(**values)),
+            ("init", model, lambda: model(**values)),
+            ("trusted", model, lambda: model.trusted(**values)),
+        ]
+        for mode, cls, build in modes:
+            instance = build()
+            adapter = TypeAdapter(cls)
+            timings = [
+                microseconds(build, number),
+                microseconds(lambda: setattr(instance, field, value), number),
+                microseconds(lambda: adapter.validate_python(instance), number),
+            ]
+            print(
+                f"{model.__name__:>14} {mode:>8} {timings[0]:>8.2f} {timings[1]:>8.2f} {timings[2]:>9.2f} "
+                f"{sum(timings):>8.2f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
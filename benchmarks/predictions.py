@@ -0,0 +1,81 @@
+"""
+Benchmark of batched fixture predictions against a naive per-fixture Python loop.
+
+Fits the Poisson model on `devdata/result.json`, then predicts random fixtures between its teams, once with a single
+vectorized `PoissonModel.predict` call and once fixture by fixture with `math` functions, as a straightforward
+implementation would. Both run on one core.
+
+Usage:
+    python -m benchmarks.predictions [--fixtures 10000] [--dump devdata/result.json]
+"""
+
+import argparse
+import math
+import os
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URI", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+import numpy as np  # noqa: E402
+
+from backend.services.prediction import PoissonModel, load_history  # noqa: E402
+
+
+def naive_predict(
+    model: PoissonModel, index: dict[int, int], home_team_id: int, away_team_id: int
+) -> tuple[float, float, float]:
+    home, away = index[home_team_id], index[away_team_id]
+    expected_home = model.base_rate * model.home_advantage * model.attack[home] * model.defence[away]
+    expected_away = model.base_rate * model.attack[away] * model.defence[home]
+    home_win = draw = away_win = 0.0
+    for home_goals in range(model.max_goals + 1):
+        for away_goals in range(model.max_goals + 1):
+            probability = (
+                expected_home**home_goals * math.exp(-expected_home) / math.factorial(home_goals)
+            ) * (expected_away**away_goals * math.exp(-expected_away) / math.factorial(away_goals))
+            if home_goals > away_goals:
+                home_win += probability
+            elif home_goals == away_goals:
+                draw += probability
+            else:
+                away_win += probability
+    total = home_win + draw + away_win
+    return home_win / total, draw / total, away_win / total
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixtures", type=int, default=10_000)
+    parser.add_argument("--dump", default="devdata/result.json")
+    args = parser.parse_args()
+
+    with open(args.dump, "rb") as file:
+        history = load_history(file)
+    start = time.perf_counter()
+    model = PoissonModel().fit(history)
+    print(f"fit on {len(history)} fixtures: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    rng = np.random.default_rng(0)
+    home = rng.choice(model.team_ids, args.fixtures)
+    away = rng.choice(model.team_ids, args.fixtures)
+
+    start = time.perf_counter()
+    batched = model.predict(home, away)
+    vectorized = time.perf_counter() - start
+
+    sample = min(args.fixtures, 2_000)
+    index = {team_id: position for position, team_id in enumerate(model.team_ids.tolist())}
+    start = time.perf_counter()
+    naive = [naive_predict(model, index, int(h), int(a)) for h, a in zip(home[:sample], away[:sample])]
+    looped = (time.perf_counter() - start) * args.fixtures / sample
+
+    assert np.allclose([n[0] for n in naive], batched["home_win"][:sample])
+    print(f"{'engine':>12} {'predictions/s':>14}")
+    print(f"{'vectorized':>12} {args.fixtures / vectorized:>14.0f}")
+    print(f"{'naive loop':>12} {args.fixtures / looped:>14.0f}")
+    print(f"speed-up: {looped / vectorized:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark of the compact pydantic-core serialization of `BaseObject` against the indented `json` encoder.
+
+Builds fixture pages like the ones returned by `GET /fixtures`, then serializes them with `convert_to_json()` (the
+`json.dumps(indent=4)` encoder walking `__dict__`), `convert_to_json(compact=True)` and `convert_list_to_json`, and
+parses them back with `load_from_json` and `load_list_from_json`.
+
+Usage:
+    python -m benchmarks.serialization [--pages 200] [--page-size 50]
+"""
+
+import argparse
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+os.environ.setdefault("DATABASE_URI", f"sqlite:///{tempfile.mkdtemp()}/bench.db")
+
+from backend.models.fixture import FixturePage, FixtureRead  # noqa: E402
+
+
+def make_pages(pages: int, page_size: int) -> list[FixturePage]:
+    kickoff = datetime(2023, 8, 11, 19)
+    return [
+        FixturePage(
+            items=[
+                FixtureRead(
+                    id=page * page_size + number,
+                    date=kickoff + timedelta(hours=page * page_size + number),
+                    status="FT",
+                    round=f"Regular Season - {page % 38 + 1}",
+                    league_id=39,
+                    season_id=1,
+                    venue_id=512,
+                    home_team_id=44,
+                    home_team_name="Burnley",
+                    away_team_id=50,
+                    away_team_name="Manchester City",
+                    home_score=number % 4,
+                    away_score=number % 3,
+                )
+                for number in range(page_size)
+            ],
+            next_cursor=f"cursor-{page}",
+        )
+        for page in range(pages)
+    ]
+
+
+def timed(function: Callable[[], Any]) -> tuple[float, Any]:
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--page-size", type=int, default=50)
+    args = parser.parse_args()
+
+    pages = make_pages(args.pages, args.page_size)
+    fixtures = [fixture for page in pages for fixture in page.items]
+    count = len(fixtures)
+
+    indented_time, indented = timed(lambda: [page.convert_to_json() for page in pages])
+    compact_time, compact = timed(lambda: [page.convert_to_json(compact=True) for page in pages])
+    batch_time, batch = timed(lambda: FixtureRead.convert_list_to_json(fixtures))
+    # The json validators are built on first use, outside of the measures.
+    FixturePage.load_from_json(compact[0]), FixtureRead.load_list_from_json(b"[]")
+    load_time, loaded = timed(lambda: [FixturePage.load_from_json(page) for page in compact])
+    load_batch_time, loaded_batch = timed(lambda: FixtureRead.load_list_from_json(batch))
+
+    assert loaded == pages and loaded_batch == fixtures
+    print(f"{'path':>28} {'fixtures/s':>12} {'bytes':>10}")
+    print(f"{'convert_to_json()':>28} {count / indented_time:>12.0f} {sum(map(len, indented)):>10}")
+    print(f"{'convert_to_json(compact)':>28} {count / compact_time:>12.0f} {sum(map(len, compact)):>10}")
+    print(f"{'convert_list_to_json':>28} {count / batch_time:>12.0f} {len(batch):>10}")
+    print(f"{'load_from_json':>28} {count / load_time:>12.0f}")
+    print(f"{'load_list_from_json':>28} {count / load_batch_time:>12.0f}")
+    print(f"speed-up (compact): {indented_time / compact_time:.1f}x, (batch): {indented_time / batch_time:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Benchmark of the login lookup (`SELECT ... FROM user WHERE username = ?`) as the user table grows.
+
+Fills a temporary SQLite database with synthetic users in bulk and measures the latency of lookups by username at
+increasing table sizes. With the unique index on `user.username` the latency stays flat; `--no-index` drops the index
+to show the sequential scan it replaces.
+
+Usage:
+    python -m benchmarks.user_lookup [--users 1000000] [--lookups 2000] [--no-index]
+"""
+
+import argparse
+import random
+import statistics
+import tempfile
+import time
+
+from sqlalchemy import create_engine, insert, select, text
+from sqlmodel import SQLModel
+
+from backend.models.user import User
+
+BATCH_SIZE = 50_000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--users", type=int, default=1_000_000)
+    parser.add_argument("--lookups", type=int, default=2_000)
+    parser.add_argument("--no-index", action="store_true")
+    args = parser.parse_args()
+
+    engine = create_engine(f"sqlite:///{tempfile.mkdtemp()}/users.db")
+    SQLModel.metadata.create_all(engine, tables=[User.__table__])  # type: ignore[attr-defined]
+    if args.no_index:
+        with engine.begin() as connection:
+            connection.execute(text("DROP INDEX ix_user_username"))
+
+    checkpoints = sorted({size for size in (10_000, 100_000, args.users) if size <= args.users})
+    lookup = select(User.id, User.password, User.is_admin).where(User.username == text(":username"))
+    inserted = 0
+    print(f"{'users':>10} {'p50 (us)':>10} {'p99 (us)':>10}")
+    for checkpoint in checkpoints:
+        with engine.begin() as connection:
+            while inserted < checkpoint:
+                count = min(BATCH_SIZE, checkpoint - inserted)
+                rows = [
+                    {"username": f"user{number}", "password": "x" * 60, "is_admin": False}
+                    for number in range(inserted, inserted + count)
+                ]
+                connection.execute(insert(User), rows)
+                inserted += count
+
+        latencies = []
+        with engine.connect() as connection:
+            for _ in range(args.lookups):
+                username = f"user{random.randrange(inserted)}"
+                start = time.perf_counter()
+                connection.execute(lookup, {"username": username}).first()
+                latencies.append((time.perf_counter() - start) * 1e6)
+        p99 = statistics.quantiles(latencies, n=100)[98]
+        print(f"{inserted:>10} {statistics.median(latencies):>10.1f} {p99:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,24 @@
+import os
+import tempfile
+from typing import Iterator
+
+import pytest
+
+# The application reads its settings at import time, so the test database must be configured before any backend
+# module is imported.
+os.environ.setdefault("DATABASE_URI", f"sqlite:///{tempfile.mkdtemp()}/test.db")
+os.environ.setdefault("PROJECT_NAME", "predictions-test")
+os.environ.setdefault("SECRET_KEY", "test-secret-key")
+
+
+@pytest.fixture
+def database() -> Iterator[None]:
+    """Creates all tables before the test and drops them afterwards."""
+    from sqlmodel import SQLModel
+
+    from backend.database import get_engine
+    from backend.main import app  # noqa: F401  # registers every table model
+
+    SQLModel.metadata.create_all(get_engine())
+    yield
+    SQLModel.metadata.drop_all(get_engine())
@@ -0,0 +1,134 @@
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import pytest
+from pydantic import TypeAdapter, ValidationError
+
+from backend.models.fixture import FixturePage, FixtureRead
+from backend.models.user import BulkUserReport, UserCreate, UserRead, UserView
+
+
+def _fixture(fixture_id: int, **values: Any) -> FixtureRead:
+    return FixtureRead(
+        id=fixture_id,
+        date=datetime(2023, 8, 11, 19),
+        status="FT",
+        round="Regular Season - 1",
+        league_id=39,
+        season_id=1,
+        venue_id=None,
+        home_team_id=44,
+        home_team_name="Burnley",
+        away_team_id=50,
+        away_team_name="Manchester City",
+        home_score=0,
+        away_score=3,
+    ).model_copy(update=values)
+
+
+def test_compact_json_matches_indented_json() -> None:
+    # Arrange
+    page = FixturePage(items=[_fixture(1), _fixture(2, home_score=None)], next_cursor="abc")
+
+    # Act
+    compact = page.convert_to_json(compact=True)
+
+    # Assert
+    assert json.loads(compact) == json.loads(page.convert_to_json())
+    assert "\n" not in compact
+    assert page.convert_to_json_bytes() == compact.encode()
+
+
+@pytest.mark.parametrize("compact, test_id", [(True, "compact"), (False, "indented")])
+def test_json_file_round_trip(tmp_path: Path, compact: bool, test_id: Any) -> None:
+    # Arrange
+    page = FixturePage(items=[_fixture(1), _fixture(2)])
+    file_path = str(tmp_path / "page.json")
+
+    # Act
+    page.save_to_json_file(file_path, compact=compact)
+    loaded = FixturePage.load_from_json_file(file_path)
+
+    # Assert
+    assert loaded == page
+
+
+def test_list_round_trip(tmp_path: Path) -> None:
+    # Arrange
+    fixtures = [_fixture(fixture_id) for fixture_id in range(100)]
+    file_path = str(tmp_path / "fixtures.json")
+
+    # Act
+    FixtureRead.save_list_to_json_file(fixtures, file_path)
+    loaded = FixtureRead.load_list_from_json_file(file_path)
+
+    # Assert
+    assert loaded == fixtures
+    assert FixtureRead.load_list_from_json(FixtureRead.convert_list_to_json([])) == []
+
+
+def test_load_from_json_rejects_unknown_fields() -> None:
+    # Arrange
+    data = _fixture(1).convert_to_json_bytes().replace(b'{"id"', b'{"extra":1,"id"')
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        FixtureRead.load_from_json(data)
+
+
+def test_request_models_stay_strict() -> None:
+    # Arrange
+    user_create = UserCreate(username="strict", password="secret")
+
+    # Act / Assert
+    with pytest.raises(ValidationError):
+        user_create.password = 1234  # type: ignore[assignment]
+    with pytest.raises(ValidationError):
+        UserCreate(username="strict", password=1234)  # type: ignore[arg-type]
+
+
+def test_trusted_objects_skip_revalidation() -> None:
+    # Arrange
+    user_view = UserView.trusted(success=True, is_admin=False, username="trusted")
+
+    # Act
+    user_view.username = "renamed"
+    validated = TypeAdapter(UserView).validate_python(user_view)
+
+    # Assert
+    assert validated is user_view
+    assert user_view.model_fields_set == {"success", "is_admin", "username"}
+    assert json.loads(user_view.convert_to_json(compact=True)) == {
+        "success": True,
+        "is_admin": False,
+        "username": "renamed",
+    }
+    assert TypeAdapter(UserCreate).validate_python(UserCreate(username="a", password="b")).username == "a"
+
+
+def test_trusted_fills_defaults() -> None:
+    # Act
+    first, second = BulkUserReport.trusted(created=2), BulkUserReport.trusted()
+
+    # Assert
+    assert first == BulkUserReport(created=2)
+    assert first.model_fields_set == {"created"}
+    assert first.results is not second.results
+    with pytest.raises(TypeError):
+        UserView.trusted(success=True)
+
+
+@pytest.mark.parametrize(
+    "values, test_id",
+    [
+        ({"id": 1, "username": "a", "is_admn": True}, "EC1"),  # Misspelled field, with the same number of keys
+        ({"id": 1, "username": "a", "is_admin": True, "extra": 1}, "EC2"),  # Unknown field on top of every field
+        ({"id": 1, "username": "a"}, "EC3"),  # Required field left out
+    ],
+)
+def test_trusted_rejects_unknown_and_missing_fields(values: dict, test_id: Any) -> None:
+    # Assert
+    with pytest.raises(TypeError):
+        UserRead.trusted(**values)
@@ -0,0 +1,133 @@
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Any, Literal
+
+import numpy as np
+import pytest
+
+from backend.core.base_object import BaseObject
+from backend.models.fixture import FixtureRead
+from backend.models.user import BulkUserReport
+
+
+class Snapshot(BaseObject):
+    id: int
+    name: str | None
+    status: Literal["open", "closed"]
+    score: float
+    active: bool
+    day: date
+    taken_at: datetime | None
+
+
+def _fixtures(count: int) -> list[FixtureRead]:
+    return [
+        FixtureRead(
+            id=number,
+            date=datetime(2023, 8, 11, 19, number % 60),
+            status="FT" if number % 3 else "NS",
+            round=None if number % 7 == 0 else f"Regular Season - {number % 38 + 1}",
+            league_id=39,
+            season_id=1,
+            venue_id=None if number % 5 == 0 else 512,
+            home_team_id=44,
+            home_team_name="Bournemouth" if number % 2 else "Atlético Madrid",
+            away_team_id=50,
+            away_team_name="Manchester City",
+            home_score=None if number % 3 == 0 else number % 4,
+            away_score=None if number % 3 == 0 else number % 3,
+        )
+        for number in range(count)
+    ]
+
+
+def test_columnar_round_trip(tmp_path: Path) -> None:
+    # Arrange
+    fixtures = _fixtures(1000)
+    file_path = str(tmp_path / "fixtures.col")
+
+    # Act
+    FixtureRead.save_list_to_columnar_file(fixtures, file_path)
+    with FixtureRead.load_columnar_file(file_path) as columnar:
+        rows = list(columnar)
+        last = columnar[-1]
+        page = columnar[10:20]
+
+    # Assert
+    assert rows == fixtures
+    assert last == fixtures[-1]
+    assert page == fixtures[10:20]
+
+
+def test_columns_are_read_lazily(tmp_path: Path) -> None:
+    # Arrange
+    fixtures = _fixtures(100)
+    file_path = str(tmp_path / "fixtures.col")
+    FixtureRead.save_list_to_columnar_file(fixtures, file_path)
+
+    # Act
+    columnar = FixtureRead.load_columnar_file(file_path)
+    ids = columnar.column("id")
+    scores = columnar.column("home_score")
+    names = columnar.column("home_team_name")
+
+    # Assert
+    assert isinstance(ids, np.memmap) and ids.tolist() == list(range(100))
+    assert scores.tolist() == [fixture.home_score for fixture in fixtures]
+    assert names.tolist() == [fixture.home_team_name for fixture in fixtures]
+    assert columnar.column("date").dtype == np.dtype("datetime64[us]")
+    columnar.close()
+    with pytest.raises(ValueError):
+        columnar.row(0)
+
+
+@pytest.mark.parametrize(
+    "taken_at, test_id",
+    [
+        (datetime(2024, 1, 1, 12, tzinfo=timezone.utc), "aware"),
+        (datetime(2024, 1, 1, 12), "naive"),
+        (None, "missing"),
+    ],
+)
+def test_snapshot_field_types(tmp_path: Path, taken_at: datetime | None, test_id: Any) -> None:
+    # Arrange
+    snapshots = [
+        Snapshot(id=1, name="é", status="open", score=1.5, active=True, day=date(2024, 1, 1), taken_at=taken_at),
+        Snapshot(id=2, name=None, status="closed", score=-2.0, active=False, day=date(2024, 2, 29), taken_at=taken_at),
+    ]
+    file_path = str(tmp_path / "snapshots.col")
+
+    # Act
+    Snapshot.save_list_to_columnar_file(snapshots, file_path)
+    loaded = list(Snapshot.load_columnar_file(file_path))
+
+    # Assert
+    assert loaded == snapshots
+
+
+def test_empty_list(tmp_path: Path) -> None:
+    # Arrange
+    file_path = str(tmp_path / "empty.col")
+
+    # Act
+    FixtureRead.save_list_to_columnar_file([], file_path)
+    columnar = FixtureRead.load_columnar_file(file_path)
+
+    # Assert
+    assert len(columnar) == 0
+    assert list(columnar) == []
+    assert columnar.column("home_team_name").tolist() == []
+
+
+def test_invalid_files_and_models(tmp_path: Path) -> None:
+    # Arrange
+    file_path = str(tmp_path / "fixtures.col")
+    FixtureRead.save_list_to_columnar_file(_fixtures(3), file_path)
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        Snapshot.load_columnar_file(file_path)
+    with pytest.raises(TypeError):
+        BulkUserReport.save_list_to_columnar_file([BulkUserReport()], file_path)
+    with pytest.raises(TypeError):
+        Snapshot.save_list_to_columnar_file(_fixtures(1), file_path)
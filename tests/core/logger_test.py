@@ -0,0 +1,195 @@
+import io
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any, Iterator
+
+import pytest
+
+from backend.core import logger as logger_module
+from backend.core.logger import LOG_RECORDS_DROPPED, BackgroundQueueHandler, JsonFormatter, SamplingFilter
+
+
+class BlockingHandler(logging.StreamHandler):
+    def __init__(self) -> None:
+        super().__init__(io.StringIO())
+        self.unblocked = threading.Event()
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.unblocked.wait(timeout=5)
+        super().emit(record)
+
+
+def _logger(handler: logging.Handler) -> logging.Logger:
+    test_logger = logging.getLogger(f"tests.logger.{id(handler)}")
+    test_logger.propagate = False
+    test_logger.setLevel(logging.DEBUG)
+    test_logger.addHandler(handler)
+    return test_logger
+
+
+@pytest.fixture
+def stream() -> io.StringIO:
+    return io.StringIO()
+
+
+@pytest.fixture
+def queue_handler(stream: io.StringIO) -> Iterator[BackgroundQueueHandler]:
+    sink = logging.StreamHandler(stream)
+    sink.setFormatter(logging.Formatter("%(levelname)s %(message)s"))
+    handler = BackgroundQueueHandler(sink, queue_size=100)
+    handler.start()
+    yield handler
+    handler.stop()
+
+
+def test_records_are_written_by_the_listener_and_flushed_on_stop(
+    queue_handler: BackgroundQueueHandler, stream: io.StringIO
+) -> None:
+    # Arrange
+    test_logger = _logger(queue_handler)
+    arguments = ["first"]
+
+    # Act
+    for number in range(50):
+        test_logger.info("record %d of %s", number, arguments)
+    arguments[0] = "changed"
+    queue_handler.stop()
+    test_logger.warning("after stop")
+
+    # Assert
+    lines = stream.getvalue().splitlines()
+    assert lines == [f"INFO record {number} of ['first']" for number in range(50)] + ["WARNING after stop"]
+
+
+def test_queue_full_drops_records(stream: io.StringIO) -> None:
+    # Arrange
+    sink = BlockingHandler()
+    handler = BackgroundQueueHandler(sink, queue_size=1)
+    handler.start()
+    test_logger = _logger(handler)
+    before = LOG_RECORDS_DROPPED.values.get(("INFO", "queue_full"), 0.0)
+
+    # Act
+    test_logger.info("taken by the listener")
+    deadline = time.monotonic() + 5
+    while not handler.queue.empty():
+        assert time.monotonic() < deadline, "The listener did not take the first record"
+        time.sleep(0.001)
+    test_logger.info("queued")
+    test_logger.info("dropped")
+    sink.unblocked.set()
+    handler.stop()
+
+    # Assert
+    assert sink.stream.getvalue().splitlines() == ["taken by the listener", "queued"]
+    assert LOG_RECORDS_DROPPED.values[("INFO", "queue_full")] - before == 1
+
+
+def test_json_formatter_renders_one_object_per_line() -> None:
+    # Arrange
+    formatter = JsonFormatter()
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.getLogger("tests").makeRecord(
+            "tests", logging.ERROR, __file__, 42, "failed for %s", ("alice",), exc_info=sys.exc_info()
+        )
+
+    # Act
+    line = formatter.format(record)
+
+    # Assert
+    entry = json.loads(line)
+    assert "\n" not in line
+    assert (entry["level"], entry["message"], entry["line"]) == ("ERROR", "failed for alice", 42)
+    assert "ValueError: boom" in entry["exception"]
+
+
+@pytest.mark.parametrize(
+    "sample_rates, rate_limits, expected_kept, test_id",
+    [
+        ({}, {}, 20, "no_limit"),
+        ({"debug": 0.0}, {}, 10, "debug_sampled_out"),
+        ({}, {"DEBUG": 5, "INFO": 3}, 8, "rate_limited_per_level"),
+    ],
+)
+def test_sampling_filter(
+    monkeypatch: pytest.MonkeyPatch,
+    sample_rates: dict[str, float],
+    rate_limits: dict[str, float],
+    expected_kept: int,
+    test_id: str,
+) -> None:
+    # Arrange
+    monkeypatch.setattr(logger_module.time, "monotonic", lambda: 100.0)
+    sampling = SamplingFilter(sample_rates, rate_limits)
+    records = [
+        logging.LogRecord("tests", level, __file__, 1, "message", None, None)
+        for level in (logging.DEBUG, logging.INFO)
+        for _ in range(10)
+    ]
+
+    # Act
+    kept = [record for record in records if sampling.filter(record)]
+
+    # Assert
+    assert len(kept) == expected_kept
+
+
+def test_rate_limit_refills_over_time(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Arrange
+    now = [100.0]
+    monkeypatch.setattr(logger_module.time, "monotonic", lambda: now[0])
+    sampling = SamplingFilter({}, {"ERROR": 2})
+    record = logging.LogRecord("tests", logging.ERROR, __file__, 1, "message", None, None)
+
+    # Act
+    burst = [sampling.filter(record) for _ in range(3)]
+    now[0] += 0.5
+    refilled = [sampling.filter(record) for _ in range(2)]
+
+    # Assert
+    assert burst == [True, True, False]
+    assert refilled == [True, False]
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork")
+@pytest.mark.parametrize(
+    "running, test_id",
+    [
+        (True, "HP1"),  # Both processes restart their own listener
+        (False, "EC1"),  # Not started, e.g. in a command line tool: forking starts none
+    ],
+)
+def test_forked_child_writes_its_own_records(tmp_path: Path, running: bool, test_id: Any) -> None:
+    # Arrange
+    path = tmp_path / "fork.log"
+    with open(path, "w") as file:
+        previous = logger_module.sink.setStream(file)
+        if running:
+            logger_module.start_logging()
+        try:
+            # Act
+            pid = os.fork()
+            if pid == 0:
+                child_running = logger_module.handler.listener is not None
+                logger_module.logger.info("from the child")
+                logger_module.stop_logging()
+                os._exit(0 if child_running == running else 1)
+            _, status = os.waitpid(pid, 0)
+            parent_running = logger_module.handler.listener is not None
+            logger_module.logger.info("from the parent")
+        finally:
+            logger_module.stop_logging()
+            logger_module.sink.setStream(previous)
+
+    # Assert
+    assert os.waitstatus_to_exitcode(status) == 0, f"Test ID: {test_id}"
+    assert parent_running == running, f"Test ID: {test_id}"
+    lines = path.read_text().splitlines()
+    assert [line.rsplit(" - ", 1)[1] for line in lines] == ["from the child", "from the parent"], f"Test ID: {test_id}"
@@ -0,0 +1,74 @@
+import pytest
+
+from backend.core.metrics import Counter, Gauge, Histogram, Registry, render
+
+
+@pytest.fixture
+def registry() -> Registry:
+    return Registry()
+
+
+def test_render_counter_and_gauge(registry: Registry) -> None:
+    # Arrange
+    requests = Counter("requests_total", "Requests.", ("method", "route"), registry=registry)
+    in_flight = Gauge("in_flight", "In flight.", registry=registry)
+
+    # Act
+    requests.inc(labels=("GET", "/fixtures"))
+    requests.inc(2, labels=("GET", "/fixtures"))
+    requests.inc(labels=("POST", 'a"b\\c'))
+    in_flight.inc()
+    in_flight.inc()
+    in_flight.dec()
+
+    # Assert
+    assert render(registry).splitlines() == [
+        "# HELP requests_total Requests.",
+        "# TYPE requests_total counter",
+        'requests_total{method="GET",route="/fixtures"} 3.0',
+        'requests_total{method="POST",route="a\\"b\\\\c"} 1.0',
+        "# HELP in_flight In flight.",
+        "# TYPE in_flight gauge",
+        "in_flight 1.0",
+    ]
+
+
+@pytest.mark.parametrize(
+    "observations, expected_buckets, test_id",
+    [
+        ([0.05, 0.1, 0.3, 2.0], [2, 3, 4], "cumulative"),
+        ([0.1], [1, 1, 1], "bound_is_inclusive"),
+        ([], None, "no_observation"),
+    ],
+)
+def test_render_histogram(
+    registry: Registry, observations: list[float], expected_buckets: list[int] | None, test_id: str
+) -> None:
+    # Arrange
+    latency = Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.5, 0.1), registry=registry)
+
+    # Act
+    for observation in observations:
+        latency.observe(observation, labels=("/",))
+    lines = render(registry).splitlines()
+
+    # Assert
+    if expected_buckets is None:
+        assert lines == ["# HELP latency_seconds Latency.", "# TYPE latency_seconds histogram"]
+        return
+    assert lines[2:] == [
+        f'latency_seconds_bucket{{route="/",le="0.1"}} {float(expected_buckets[0])}',
+        f'latency_seconds_bucket{{route="/",le="0.5"}} {float(expected_buckets[1])}',
+        f'latency_seconds_bucket{{route="/",le="+Inf"}} {float(expected_buckets[2])}',
+        f'latency_seconds_sum{{route="/"}} {float(sum(observations))}',
+        f'latency_seconds_count{{route="/"}} {float(len(observations))}',
+    ]
+
+
+def test_metric_names_are_unique(registry: Registry) -> None:
+    # Arrange
+    Counter("requests_total", "Requests.", registry=registry)
+
+    # Act & Assert
+    with pytest.raises(ValueError):
+        Gauge("requests_total", "Requests.", registry=registry)
@@ -0,0 +1,61 @@
+from pathlib import Path
+
+import pytest
+from sqlalchemy import create_engine, exc
+from sqlalchemy.pool import QueuePool
+
+from backend.core.pool_metrics import WAIT_BUCKETS, PoolMetrics, timed_pool_class
+
+
+def test_snapshot_follows_checkouts_and_timeouts(tmp_path: Path) -> None:
+    # Arrange
+    metrics = PoolMetrics("test")
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=timed_pool_class(QueuePool, metrics),
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.05,
+    )
+    metrics.attach(engine)
+
+    # Act
+    connection = engine.connect()
+    in_use = metrics.snapshot()
+    with pytest.raises(exc.TimeoutError):
+        engine.connect()
+    connection.close()
+    released = metrics.snapshot()
+
+    # Assert
+    assert (in_use.size, in_use.checked_out, in_use.idle, in_use.overflow) == (1, 1, 0, 0)
+    assert (released.checked_out, released.idle) == (0, 1)
+    assert (released.connections_opened, released.checkouts, released.timeouts) == (1, 1, 1)
+    assert released.wait_seconds_max >= 0.05
+    assert sum(released.wait_buckets.values()) == 2
+    assert list(released.wait_buckets) == [str(bound) for bound in WAIT_BUCKETS] + ["+Inf"]
+
+
+def test_metrics_carry_over_when_the_pool_is_recreated(tmp_path: Path) -> None:
+    # Arrange
+    metrics = PoolMetrics("test")
+    engine = create_engine(f"sqlite:///{tmp_path / 'pool.db'}", poolclass=timed_pool_class(QueuePool, metrics))
+    metrics.attach(engine)
+    engine.connect().close()
+
+    # Act
+    engine.dispose()
+    engine.connect().close()
+
+    # Assert
+    stats = metrics.snapshot()
+    assert (stats.connections_opened, stats.connections_closed, stats.checkouts) == (2, 1, 2)
+    assert sum(stats.wait_buckets.values()) == 2
+
+
+def test_snapshot_without_engine() -> None:
+    # Act
+    stats = PoolMetrics("test").snapshot()
+
+    # Assert
+    assert (stats.size, stats.checked_out, stats.idle, stats.checkouts) == (0, 0, 0, 0)
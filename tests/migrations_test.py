@@ -0,0 +1,69 @@
+from pathlib import Path
+
+import pytest
+from sqlalchemy import Engine, create_engine, inspect, text
+
+from backend.migrations import migrate
+
+
+def _legacy_database(path: Path, usernames: list[str]) -> Engine:
+    engine = create_engine(f"sqlite:///{path}")
+    with engine.begin() as connection:
+        connection.execute(
+            text('CREATE TABLE "user" (id INTEGER PRIMARY KEY, username VARCHAR, password VARCHAR, is_admin BOOLEAN)')
+        )
+        for username in usernames:
+            connection.execute(
+                text('INSERT INTO "user" (username, password, is_admin) VALUES (:username, \'x\', 0)'),
+                {"username": username},
+            )
+    return engine
+
+
+def test_migrate_adds_unique_username_index_once(tmp_path: Path) -> None:
+    # Arrange
+    engine = _legacy_database(tmp_path / "legacy.db", ["alice", "bob"])
+
+    # Act
+    first = migrate(engine)
+    second = migrate(engine)
+
+    # Assert
+    assert first == ["0001_unique_username", "0002_fixture_indexes", "0003_job_heartbeat"]
+    assert second == []
+    indexes = {index["name"]: index for index in inspect(engine).get_indexes("user")}
+    assert indexes["ix_user_username"]["unique"]
+
+
+def test_migrate_refuses_duplicated_usernames(tmp_path: Path) -> None:
+    # Arrange
+    engine = _legacy_database(tmp_path / "legacy.db", ["alice", "alice"])
+
+    # Act / Assert
+    with pytest.raises(RuntimeError, match="alice"):
+        migrate(engine)
+    assert "ix_user_username" not in {i["name"] for i in inspect(engine).get_indexes("user")}
+
+
+def test_migrate_skips_missing_tables(tmp_path: Path) -> None:
+    # Arrange
+    engine = create_engine(f"sqlite:///{tmp_path / 'empty.db'}")
+
+    # Act
+    applied = migrate(engine)
+
+    # Assert
+    assert applied == ["0001_unique_username", "0002_fixture_indexes", "0003_job_heartbeat"]
+
+
+def test_migrate_adds_job_heartbeat_column(tmp_path: Path) -> None:
+    # Arrange
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE job (id INTEGER PRIMARY KEY, type VARCHAR, worker VARCHAR)"))
+
+    # Act
+    migrate(engine)
+
+    # Assert
+    assert "heartbeat_at" in {column["name"] for column in inspect(engine).get_columns("job")}
@@ -0,0 +1,222 @@
+import json
+from typing import Any, Callable
+
+import httpx
+import pytest
+
+from backend.core.config import settings
+from backend.services.authentication import generate_token
+
+ADMIN_HEADERS = {"Authorization": f"Bearer {generate_token(username='root', is_admin=True)}"}
+USER_HEADERS = {"Authorization": f"Bearer {generate_token(username='alice', is_admin=False)}"}
+
+
+@pytest.fixture(autouse=True)
+def fast_hashing(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 4)
+
+
+def test_create_user_as_admin(run_with_client: Callable[..., Any]) -> None:
+    # Act
+    async def scenario(client: httpx.AsyncClient) -> tuple[httpx.Response, httpx.Response]:
+        body = {"username": "bob", "password": "secret"}
+        created = await client.post("/admin/create_user", json=body, headers=ADMIN_HEADERS)
+        duplicated = await client.post("/admin/create_user", json=body, headers=ADMIN_HEADERS)
+        return created, duplicated
+
+    created, duplicated = run_with_client(scenario)
+
+    # Assert
+    assert created.status_code == 201
+    assert duplicated.status_code == 409
+
+
+@pytest.mark.parametrize(
+    "headers, expected_status, test_id",
+    [
+        (USER_HEADERS, 403, "EC1"),  # Not an admin
+        ({"Authorization": "Bearer not-a-token"}, 401, "EC2"),  # Invalid token
+        ({}, 401, "EC3"),  # No token
+    ],
+)
+def test_admin_routes_require_admin(
+    run_with_client: Callable[..., Any], headers: dict, expected_status: int, test_id: Any
+) -> None:
+    # Act
+    async def scenario(client: httpx.AsyncClient) -> list[httpx.Response]:
+        return [
+            await client.post("/admin/create_user", json={"username": "bob", "password": "x"}, headers=headers),
+            await client.post("/admin/users:bulk", json=[{"username": "bob", "password": "x"}], headers=headers),
+            await client.get("/admin/pools", headers=headers),
+            await client.patch("/admin/users/bob", json={"is_admin": True}, headers=headers),
+        ]
+
+    responses = run_with_client(scenario)
+
+    # Assert
+    assert [response.status_code for response in responses] == [expected_status] * 4, f"Test ID: {test_id}"
+
+
+def test_bulk_create_from_json_array_reports_every_row(
+    run_with_client: Callable[..., Any], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Arrange
+    monkeypatch.setattr(settings, "BULK_INSERT_BATCH_SIZE", 2)
+    rows = [
+        {"username": "existing", "password": "secret"},
+        {"username": "u1", "password": "secret"},
+        {"username": "u2"},
+        {"username": "u1", "password": "other"},
+        {"username": "u3", "password": "secret", "is_admin": True},
+    ]
+
+    # Act
+    async def scenario(client: httpx.AsyncClient) -> httpx.Response:
+        await client.post("/admin/create_user", json=rows[0], headers=ADMIN_HEADERS)
+        return await client.post("/admin/users:bulk", json=rows, headers=ADMIN_HEADERS)
+
+    response = run_with_client(scenario)
+
+    # Assert
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["created"], report["conflicts"], report["invalid"]) == (2, 2, 1)
+    assert [result["status"] for result in report["results"]] == ["conflict", "created", "invalid", "conflict", "created"]
+    assert [result["index"] for result in report["results"]] == [0, 1, 2, 3, 4]
+
+
+def test_bulk_create_from_ndjson_stream(run_with_client: Callable[..., Any]) -> None:
+    # Arrange
+    lines = [json.dumps({"username": f"user{number}", "password": "secret"}) for number in range(5)]
+    body = ("\n".join(lines[:3]) + "\nnot json\n\n" + "\n".join(lines[3:])).encode()
+    headers = ADMIN_HEADERS | {"Content-Type": "application/x-ndjson"}
+
+    # Act
+    async def scenario(client: httpx.AsyncClient) -> tuple[httpx.Response, httpx.Response]:
+        bulk = await client.post("/admin/users:bulk", content=body, headers=headers)
+        login = await client.post("/auth/token", data={"username": "user4", "password": "secret"})
+        return bulk, login
+
+    bulk, login = run_with_client(scenario)
+
+    # Assert
+    assert bulk.status_code == 200
+    assert (bulk.json()["created"], bulk.json()["invalid"]) == (5, 1)
+    assert login.status_code == 200
+
+
+@pytest.mark.parametrize(
+    "body, test_id",
+    [
+        (b"{not json", "EC1"),
+        (b'{"username": "bob", "password": "secret"}', "EC2"),  # Not an array
+    ],
+)
+def test_bulk_create_rejects_malformed_body(run_with_client: Callable[..., Any], body: bytes, test_id: Any) -> None:
+    # Act
+    async def scenario(client: httpx.AsyncClient) -> httpx.Response:
+        headers = ADMIN_HEADERS | {"Content-Type": "application/json"}
+        return await client.post("/admin/users:bulk", content=body, headers=headers)
+
+    response = run_with_client(scenario)
+
+    # Assert
+    assert response.status_code == 400, f"Test ID: {test_id}"
+
+
+@pytest.mark.parametrize(
+    "content_type, test_id",
+    [
+        ("application/json", "EC1"),  # JSON array, rejected on its length
+        ("application/x-ndjson", "EC2"),  # NDJSON stream, rejected on the first extra row
+    ],
+)
+def test_bulk_create_limits_row_count(
+    run_with_client: Callable[..., Any], monkeypatch: pytest.MonkeyPatch, content_type: str, test_id: Any
+) -> None:
+    # Arrange
+    monkeypatch.setattr(settings, "BULK_MAX_ROWS", 3)
+    monkeypatch.setattr(settings, "BULK_INSERT_BATCH_SIZE", 1)
+    rows = [{"username": f"user{number}", "password": "secret"} for number in range(4)]
+    if content_type == "application/json":
+        body = json.dumps(rows)
+    else:
+        body = "\n".join(json.dumps(row) for row in rows)
+
+    # Act
+    async def scenario(client: httpx.AsyncClient) -> tuple[httpx.Response, httpx.Response]:
+        headers = ADMIN_HEADERS | {"Content-Type": content_type}
+        response = await client.post("/admin/users:bulk", content=body, headers=headers)
+        created = await client.post(
+            "/admin/create_user", json={"username": "user0", "password": "secret"}, headers=ADMIN_HEADERS
+        )
+        return response, created
+
+    response, created = run_with_client(scenario)
+
+    # Assert
+    assert response.status_code == 413, f"Test ID: {test_id}"
+    assert created.status_code == 201, f"Test ID: {test_id}"  # user0 was not created by the rejected request
+
+
+def test_pool_stats_report_the_request_connections(run_with_client: Callable[..., Any]) -> None:
+    # Act
+    async def scenario(client: httpx.AsyncClient) -> httpx.Response:
+        await client.post("/admin/create_user", json={"username": "bob", "password": "secret"}, headers=ADMIN_HEADERS)
+        return await client.get("/admin/pools", headers=ADMIN_HEADERS)
+
+    response = run_with_client(scenario)
+
+    # Assert
+    assert response.status_code == 200
+    pools = {pool["name"]: pool for pool in response.json()}
+    assert set(pools) == {"sync", "async"}
+    assert pools["async"]["checkouts"] >= 1
+    assert pools["async"]["checked_out"] == 0
+    assert pools["async"]["idle"] >= 1
+
+
+def test_update_user_invalidates_cached_user(run_with_client: Callable[..., Any]) -> None:
+    # Act
+    async def scenario(client: httpx.AsyncClient) -> list[httpx.Response]:
+        await client.post("/admin/create_user", json={"username": "bob", "password": "secret"}, headers=ADMIN_HEADERS)
+        old_headers = {"Authorization": f"Bearer {generate_token(username='bob', is_admin=False)}"}
+        new_headers = {"Authorization": f"Bearer {generate_token(username='robert', is_admin=False)}"}
+        before = await client.get("/auth/me", headers=old_headers)
+        updated = await client.patch(
+            "/admin/users/bob", json={"username": "robert", "is_admin": True}, headers=ADMIN_HEADERS
+        )
+        old = await client.get("/auth/me", headers=old_headers)
+        new = await client.get("/auth/me", headers=new_headers)
+        return [before, updated, old, new]
+
+    before, updated, old, new = run_with_client(scenario)
+
+    # Assert
+    assert before.json()["username"] == "bob"
+    assert updated.status_code == 200
+    assert updated.json() == {"id": before.json()["id"], "username": "robert", "is_admin": True}
+    assert old.status_code == 404
+    assert new.json() == updated.json()
+
+
+@pytest.mark.parametrize(
+    "username, body, expected_status, test_id",
+    [
+        ("nobody", {"is_admin": True}, 404, "EC1"),  # Unknown user
+        ("bob", {"username": "carol"}, 409, "EC2"),  # Username taken
+    ],
+)
+def test_update_user_errors(
+    run_with_client: Callable[..., Any], username: str, body: dict, expected_status: int, test_id: Any
+) -> None:
+    # Act
+    async def scenario(client: httpx.AsyncClient) -> httpx.Response:
+        for name in ("bob", "carol"):
+            await client.post("/admin/create_user", json={"username": name, "password": "x"}, headers=ADMIN_HEADERS)
+        return await client.patch(f"/admin/users/{username}", json=body, headers=ADMIN_HEADERS)
+
+    response = run_with_client(scenario)
+
+    # Assert
+    assert response.status_code == expected_status, f"Test ID: {test_id}"
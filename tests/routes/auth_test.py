@@ -0,0 +1,124 @@
+import asyncio
+from typing import Any, Callable
+
+import httpx
+
+from backend.core.config import settings
+from backend.instrumentation import DB_QUERIES
+
+
+def test_signup_login_and_me(run_with_client: Callable[..., Any]) -> None:
+    # Act
+    async def scenario(client: httpx.AsyncClient) -> tuple[httpx.Response, httpx.Response, httpx.Response]:
+        signup = await client.post("/auth/signup", json={"username": "alice", "password": "secret"})
+        login = await client.post("/auth/token", data={"username": "alice", "password": "secret"})
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        me = await client.get("/auth/me", headers=headers)
+        return signup, login, me
+
+    signup, login, me = run_with_client(scenario)
+
+    # Assert
+    assert signup.status_code == 201
+    assert signup.json() == {"success": True, "is_admin": False, "username": "alice"}
+    assert login.status_code == 200
+    assert login.json()["token_type"] == "bearer"
+    assert me.status_code == 200
+    assert me.json()["username"] == "alice"
+
+
+def test_signup_existing_user_conflicts(run_with_client: Callable[..., Any]) -> None:
+    # Act
+    async def scenario(client: httpx.AsyncClient) -> httpx.Response:
+        await client.post("/auth/signup", json={"username": "bob", "password": "secret"})
+        return await client.post("/auth/signup", json={"username": "bob", "password": "other"})
+
+    response = run_with_client(scenario)
+
+    # Assert
+    assert response.status_code == 409
+
+
+def test_signup_as_admin_is_rejected(run_with_client: Callable[..., Any]) -> None:
+    # Act
+    async def scenario(client: httpx.AsyncClient) -> httpx.Response:
+        return await client.post("/auth/signup", json={"username": "eve", "password": "secret", "is_admin": True})
+
+    response = run_with_client(scenario)
+
+    # Assert
+    assert response.status_code == 400
+
+
+def test_login_with_wrong_password_is_unauthorized(run_with_client: Callable[..., Any]) -> None:
+    # Act
+    async def scenario(client: httpx.AsyncClient) -> httpx.Response:
+        await client.post("/auth/signup", json={"username": "carol", "password": "secret"})
+        return await client.post("/auth/token", data={"username": "carol", "password": "wrong"})
+
+    response = run_with_client(scenario)
+
+    # Assert
+    assert response.status_code == 401
+
+
+def test_concurrent_signups_with_same_username_create_one_user(run_with_client: Callable[..., Any]) -> None:
+    # Act
+    async def scenario(client: httpx.AsyncClient) -> list[httpx.Response]:
+        return await asyncio.gather(
+            *(client.post("/auth/signup", json={"username": "dave", "password": "secret"}) for _ in range(3))
+        )
+
+    responses = run_with_client(scenario)
+
+    # Assert
+    assert sorted(response.status_code for response in responses) == [201, 409, 409]
+
+
+def test_login_with_unknown_username_is_unauthorized(run_with_client: Callable[..., Any]) -> None:
+    # Act
+    async def scenario(client: httpx.AsyncClient) -> tuple[httpx.Response, httpx.Response]:
+        await client.post("/auth/signup", json={"username": "frank", "password": "secret"})
+        unknown = await client.post("/auth/token", data={"username": "mallory", "password": "secret"})
+        wrong = await client.post("/auth/token", data={"username": "frank", "password": "wrong"})
+        return unknown, wrong
+
+    unknown, wrong = run_with_client(scenario)
+
+    # Assert
+    assert unknown.status_code == wrong.status_code == 401
+    assert unknown.json() == wrong.json() == {"detail": "Incorrect username or password"}
+
+
+def test_repeated_logins_are_throttled(run_with_client: Callable[..., Any]) -> None:
+    # Act
+    async def scenario(client: httpx.AsyncClient) -> list[httpx.Response]:
+        await client.post("/auth/signup", json={"username": "grace", "password": "secret"})
+        return [
+            await client.post("/auth/token", data={"username": "grace", "password": "wrong"})
+            for _ in range(settings.LOGIN_USERNAME_BURST + 1)
+        ]
+
+    responses = run_with_client(scenario)
+
+    # Assert
+    assert [response.status_code for response in responses] == [401] * settings.LOGIN_USERNAME_BURST + [429]
+    assert int(responses[-1].headers["Retry-After"]) >= 1
+
+
+def test_me_is_served_from_user_cache(run_with_client: Callable[..., Any]) -> None:
+    # Act
+    async def scenario(client: httpx.AsyncClient) -> tuple[httpx.Response, float]:
+        await client.post("/auth/signup", json={"username": "heidi", "password": "secret"})
+        login = await client.post("/auth/token", data={"username": "heidi", "password": "secret"})
+        headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+        before = DB_QUERIES.values.get(("async",), 0.0)
+        me = await client.get("/auth/me", headers=headers)
+        return me, DB_QUERIES.values.get(("async",), 0.0) - before
+
+    me, queries = run_with_client(scenario)
+
+    # Assert
+    assert me.status_code == 200
+    assert me.json()["username"] == "heidi"
+    assert queries == 0
@@ -0,0 +1,33 @@
+import asyncio
+from typing import Any, Awaitable, Callable
+
+import httpx
+import pytest
+
+from backend.database import get_async_engine
+from backend.main import app
+from backend.services.login_throttle import set_login_throttle
+from backend.services.user_cache import set_user_cache
+
+Scenario = Callable[[httpx.AsyncClient], Awaitable[Any]]
+
+
+@pytest.fixture
+def run_with_client(database: None) -> Callable[[Scenario], Any]:
+    """Returns a function running a scenario against the application in a fresh event loop."""
+
+    def run(scenario: Scenario) -> Any:
+        set_login_throttle(None)
+        set_user_cache(None)
+
+        async def main() -> Any:
+            transport = httpx.ASGITransport(app=app)  # type: ignore[arg-type]
+            try:
+                async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                    return await scenario(client)
+            finally:
+                await get_async_engine().dispose()
+
+        return asyncio.run(main())
+
+    return run
@@ -0,0 +1,139 @@
+import csv
+import io
+import json
+from pathlib import Path
+from typing import Any, Callable
+
+import httpx
+import pytest
+
+from backend.database import get_engine
+from backend.models.fixture import FixtureRead
+from backend.services.ingestion import FixtureIngestor
+
+DEVDATA = Path(__file__).parents[2] / "devdata" / "result.json"
+
+
+@pytest.fixture(autouse=True)
+def fixtures(database: None) -> None:
+    FixtureIngestor(get_engine()).ingest_file(str(DEVDATA))
+
+
+def _all_pages(run_with_client: Callable[..., Any], params: dict) -> list[dict]:
+    async def scenario(client: httpx.AsyncClient) -> list[dict]:
+        items: list[dict] = []
+        cursor = None
+        while True:
+            response = await client.get("/fixtures", params=params | ({"cursor": cursor} if cursor else {}))
+            assert response.status_code == 200
+            items.extend(response.json()["items"])
+            cursor = response.json()["next_cursor"]
+            if cursor is None:
+                return items
+
+    return run_with_client(scenario)
+
+
+def test_keyset_pages_cover_every_fixture_once_in_order(run_with_client: Callable[..., Any]) -> None:
+    # Act
+    items = _all_pages(run_with_client, {"league_id": 39, "limit": 100})
+
+    # Assert
+    assert len(items) == 380
+    assert len({item["id"] for item in items}) == 380
+    assert [(item["date"], item["id"]) for item in items] == sorted((item["date"], item["id"]) for item in items)
+
+
+def test_team_filter_matches_home_and_away_fixtures(run_with_client: Callable[..., Any]) -> None:
+    # Act
+    items = _all_pages(run_with_client, {"team_id": 50, "status": ["FT"], "limit": 7})
+
+    # Assert
+    assert items
+    assert all(50 in (item["home_team_id"], item["away_team_id"]) for item in items)
+    assert all(item["status"] == "FT" for item in items)
+    assert {item["home_team_name"] for item in items if item["home_team_id"] == 50} == {"Manchester City"}
+
+
+def test_date_range_filter(run_with_client: Callable[..., Any]) -> None:
+    # Act
+    items = _all_pages(
+        run_with_client, {"date_from": "2023-08-12T00:00:00+00:00", "date_to": "2023-08-13T00:00:00+00:00"}
+    )
+
+    # Assert
+    assert items
+    assert all(item["date"].startswith("2023-08-12") for item in items)
+
+
+@pytest.mark.parametrize(
+    "params, test_id",
+    [
+        ({"cursor": "not-a-cursor"}, "EC1"),
+        ({"limit": 0}, "EC2"),
+        ({"limit": 501}, "EC3"),
+    ],
+)
+def test_invalid_parameters(run_with_client: Callable[..., Any], params: dict, test_id: Any) -> None:
+    # Act
+    async def scenario(client: httpx.AsyncClient) -> httpx.Response:
+        return await client.get("/fixtures", params=params)
+
+    response = run_with_client(scenario)
+
+    # Assert
+    assert response.status_code in (400, 422), f"Test ID: {test_id}"
+
+
+@pytest.mark.parametrize(
+    "headers, expected_encoding, test_id",
+    [
+        ({"Accept-Encoding": "identity"}, None, "HP1"),
+        ({"Accept-Encoding": "gzip"}, "gzip", "HP2"),  # Compressed
+    ],
+)
+def test_export_streams_every_fixture_as_ndjson(
+    run_with_client: Callable[..., Any], headers: dict, expected_encoding: str | None, test_id: Any
+) -> None:
+    # Arrange
+    paged = _all_pages(run_with_client, {"league_id": 39, "limit": 500})
+
+    # Act
+    async def scenario(client: httpx.AsyncClient) -> httpx.Response:
+        return await client.get("/fixtures/export", params={"league_id": 39}, headers=headers)
+
+    response = run_with_client(scenario)
+
+    # Assert
+    assert response.status_code == 200, f"Test ID: {test_id}"
+    assert response.headers["content-type"] == "application/x-ndjson", f"Test ID: {test_id}"
+    assert response.headers.get("content-encoding") == expected_encoding, f"Test ID: {test_id}"
+    assert [json.loads(line) for line in response.text.splitlines()] == paged, f"Test ID: {test_id}"
+
+
+def test_export_streams_csv_with_header(run_with_client: Callable[..., Any]) -> None:
+    # Act
+    async def scenario(client: httpx.AsyncClient) -> httpx.Response:
+        return await client.get("/fixtures/export", params={"team_id": 50, "status": ["FT"], "format": "csv"})
+
+    response = run_with_client(scenario)
+
+    # Assert
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "text/csv; charset=utf-8"
+    assert response.headers["content-disposition"] == 'attachment; filename="fixtures.csv"'
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert rows
+    assert list(rows[0]) == list(FixtureRead.model_fields)
+    assert all("50" in (row["home_team_id"], row["away_team_id"]) and row["status"] == "FT" for row in rows)
+
+
+def test_export_rejects_unknown_format(run_with_client: Callable[..., Any]) -> None:
+    # Act
+    async def scenario(client: httpx.AsyncClient) -> httpx.Response:
+        return await client.get("/fixtures/export", params={"format": "xml"})
+
+    response = run_with_client(scenario)
+
+    # Assert
+    assert response.status_code == 422
@@ -0,0 +1,113 @@
+import asyncio
+from pathlib import Path
+from typing import Any, Callable
+
+import httpx
+import pytest
+
+from backend.database import get_engine
+from backend.services import jobs, search
+from backend.services.authentication import generate_token
+from backend.services.jobs import JOB_TYPES, JobScheduler
+from backend.services.search import SearchIndex
+
+DEVDATA = Path(__file__).parents[2] / "devdata" / "result.json"
+
+ADMIN_HEADERS = {"Authorization": f"Bearer {generate_token(username='root', is_admin=True)}"}
+USER_HEADERS = {"Authorization": f"Bearer {generate_token(username='alice', is_admin=False)}"}
+
+
+def test_identical_pending_jobs_are_deduplicated(run_with_client: Callable[..., Any]) -> None:
+    # Act
+    async def scenario(client: httpx.AsyncClient) -> list[httpx.Response]:
+        body = {"type": "rebuild_standings", "params": {"season_id": 1}}
+        return [
+            await client.post("/jobs", json=body, headers=ADMIN_HEADERS),
+            await client.post("/jobs", json=body, headers=ADMIN_HEADERS),
+            await client.post("/jobs", json={"type": "rebuild_standings", "params": {}}, headers=ADMIN_HEADERS),
+        ]
+
+    first, duplicated, other = run_with_client(scenario)
+
+    # Assert
+    assert [first.status_code, duplicated.status_code, other.status_code] == [202, 202, 202]
+    assert first.json()["status"] == "pending"
+    assert first.json()["params"] == {"season_id": 1}
+    assert duplicated.json()["id"] == first.json()["id"]
+    assert other.json()["id"] != first.json()["id"]
+
+
+def test_get_job_returns_status(run_with_client: Callable[..., Any]) -> None:
+    # Act
+    async def scenario(client: httpx.AsyncClient) -> tuple[httpx.Response, httpx.Response]:
+        created = await client.post("/jobs", json={"type": "replay_ratings"}, headers=ADMIN_HEADERS)
+        return created, await client.get(f"/jobs/{created.json()['id']}", headers=ADMIN_HEADERS)
+
+    created, read = run_with_client(scenario)
+
+    # Assert
+    assert read.status_code == 200
+    assert read.json() == created.json()
+    assert read.json()["progress"] == 0.0
+    assert read.json()["result"] is None
+
+
+def test_ingest_job_refreshes_search_index(
+    run_with_client: Callable[..., Any], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # Arrange
+    scheduler = JobScheduler(get_engine(), JOB_TYPES, poll_interval=0.05)
+    monkeypatch.setattr(jobs, "_job_scheduler", scheduler)
+    monkeypatch.setattr(search, "_search_index", SearchIndex())  # Loaded before the ingestion
+
+    # Act
+    async def scenario(client: httpx.AsyncClient) -> tuple[httpx.Response, httpx.Response, httpx.Response]:
+        await scheduler.start()
+        try:
+            before = await client.get("/search", params={"q": "manchester"})
+            body = {"type": "ingest", "params": {"path": str(DEVDATA)}}
+            created = await client.post("/jobs", json=body, headers=ADMIN_HEADERS)
+            job = created
+            for _ in range(600):
+                job = await client.get(f"/jobs/{created.json()['id']}", headers=ADMIN_HEADERS)
+                if job.json()["status"] in ("succeeded", "failed"):
+                    break
+                await asyncio.sleep(0.05)
+            return before, job, await client.get("/search", params={"q": "manchester"})
+        finally:
+            await scheduler.stop()
+
+    before, job, after = run_with_client(scenario)
+
+    # Assert
+    assert before.json() == []
+    assert job.json()["status"] == "succeeded", job.json()["error"]
+    assert [result["name"] for result in after.json()[:2]] == ["Manchester City", "Manchester United"]
+
+
+@pytest.mark.parametrize(
+    "method, path, body, headers, expected_status, test_id",
+    [
+        ("POST", "/jobs", {"type": "unknown"}, ADMIN_HEADERS, 400, "EC1"),  # Unknown job type
+        ("GET", "/jobs/999", None, ADMIN_HEADERS, 404, "EC2"),  # Unknown job
+        ("POST", "/jobs", {"type": "replay_ratings"}, USER_HEADERS, 403, "EC3"),  # Not an admin
+        ("GET", "/jobs/1", None, {}, 401, "EC4"),  # No token
+    ],
+)
+def test_job_errors(
+    run_with_client: Callable[..., Any],
+    method: str,
+    path: str,
+    body: dict | None,
+    headers: dict,
+    expected_status: int,
+    test_id: Any,
+) -> None:
+    # Act
+    async def scenario(client: httpx.AsyncClient) -> httpx.Response:
+        return await client.request(method, path, json=body, headers=headers)
+
+    response = run_with_client(scenario)
+
+    # Assert
+    assert response.status_code == expected_status, f"Test ID: {test_id}"
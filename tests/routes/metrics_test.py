@@ -0,0 +1,54 @@
+import re
+from typing import Any, Callable
+
+import httpx
+import pytest
+
+from backend.core.config import settings
+from backend.services.authentication import generate_token
+
+ADMIN_HEADERS = {"Authorization": f"Bearer {generate_token(username='root', is_admin=True)}"}
+
+
+def _sample(metrics: str, name: str, **labels: str) -> float:
+    label_text = ",".join(f'{key}="{value}"' for key, value in labels.items())
+    pattern = "^" + re.escape(f"{name}{{{label_text}}}" if labels else name) + r" (\S+)$"
+    match = re.search(pattern, metrics, re.MULTILINE)
+    return float(match.group(1)) if match else 0.0
+
+
+@pytest.fixture(autouse=True)
+def fast_hashing(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(settings, "BCRYPT_ROUNDS", 4)
+
+
+def test_metrics_record_requests_by_route_template(run_with_client: Callable[..., Any]) -> None:
+    # Act
+    async def scenario(client: httpx.AsyncClient) -> tuple[str, str]:
+        before = (await client.get("/metrics")).text
+        await client.get("/standings/1")
+        await client.get("/standings/2")
+        await client.get("/no/such/route")
+        await client.post("/admin/create_user", json={"username": "bob", "password": "secret"}, headers=ADMIN_HEADERS)
+        response = await client.get("/metrics")
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        return before, response.text
+
+    before, after = run_with_client(scenario)
+
+    # Assert
+    def delta(name: str, **labels: str) -> float:
+        return _sample(after, name, **labels) - _sample(before, name, **labels)
+
+    route = "/standings/{season_id}"
+    assert delta("http_requests_total", method="GET", route=route, status="200") == 2
+    assert delta("http_requests_total", method="GET", route="unmatched", status="404") == 1
+    assert delta("http_request_duration_seconds_count", method="GET", route=route) == 2
+    assert delta("http_request_db_queries_count", route=route) == 2
+    assert delta("http_request_db_queries_sum", route=route) >= 2
+    assert delta("http_request_db_duration_seconds_sum", route=route) > 0
+    assert delta("db_queries_total", engine="async") >= 3
+    assert delta("password_hash_duration_seconds_count", operation="encrypt") == 1
+    assert _sample(after, "http_requests_in_flight") == 1
+    assert _sample(after, "db_pool_checkouts_total", pool="async") > 0
+    assert 'db_pool_checkout_wait_seconds_bucket{pool="async",le="+Inf"}' in after
@@ -0,0 +1,89 @@
+import csv
+import io
+from pathlib import Path
+from typing import Any, Callable, Iterator
+
+import httpx
+import pytest
+from sqlmodel import Session, select
+
+from backend.database import get_engine
+from backend.models.fixture import Season
+from backend.services.ingestion import FixtureIngestor
+from backend.services.prediction import set_model
+
+DEVDATA = Path(__file__).parents[2] / "devdata" / "result.json"
+
+
+@pytest.fixture(autouse=True)
+def fixtures(database: None) -> Iterator[None]:
+    FixtureIngestor(get_engine()).ingest_file(str(DEVDATA))
+    set_model(None)
+    yield
+    set_model(None)
+
+
+def test_predict_upcoming_fixtures_of_a_round(run_with_client: Callable[..., Any]) -> None:
+    # Arrange
+    with Session(get_engine()) as session:
+        season_id = session.exec(select(Season.id).where(Season.league_id == 39)).one()
+
+    # Act
+    async def scenario(client: httpx.AsyncClient) -> httpx.Response:
+        body = {"season_id": season_id, "round": "Regular Season - 17"}
+        return await client.post("/predictions:batch", json=body)
+
+    response = run_with_client(scenario)
+
+    # Assert
+    assert response.status_code == 200
+    batch = response.json()
+    assert batch["fitted_fixtures"] == 1384
+    assert batch["predictions"]
+    assert all(prediction["fixture_id"] is not None for prediction in batch["predictions"])
+    for prediction in batch["predictions"]:
+        total = prediction["home_win"] + prediction["draw"] + prediction["away_win"]
+        assert total == pytest.approx(1.0)
+
+
+@pytest.mark.parametrize(
+    "body, expected_status, test_id",
+    [
+        ({"fixtures": [{"home_team_id": 50, "away_team_id": 44}]}, 200, "HP1"),
+        ({}, 400, "EC1"),
+        ({"fixtures": [{"home_team_id": 50}]}, 422, "EC2"),
+    ],
+)
+def test_predict_explicit_fixtures(
+    run_with_client: Callable[..., Any], body: dict, expected_status: int, test_id: Any
+) -> None:
+    # Act
+    async def scenario(client: httpx.AsyncClient) -> httpx.Response:
+        return await client.post("/predictions:batch", json=body)
+
+    response = run_with_client(scenario)
+
+    # Assert
+    assert response.status_code == expected_status, f"Test ID: {test_id}"
+
+
+def test_export_streams_predictions_of_upcoming_fixtures(run_with_client: Callable[..., Any]) -> None:
+    # Arrange
+    with Session(get_engine()) as session:
+        season_id = session.exec(select(Season.id).where(Season.league_id == 39)).one()
+
+    # Act
+    async def scenario(client: httpx.AsyncClient) -> tuple[httpx.Response, httpx.Response]:
+        batch = await client.post("/predictions:batch", json={"season_id": season_id})
+        export = await client.get("/predictions/export", params={"season_id": season_id, "format": "csv"})
+        return batch, export
+
+    batch, export = run_with_client(scenario)
+
+    # Assert
+    assert export.status_code == 200
+    rows = list(csv.DictReader(io.StringIO(export.text)))
+    expected = batch.json()["predictions"]
+    assert rows
+    assert [int(row["fixture_id"]) for row in rows] == [prediction["fixture_id"] for prediction in expected]
+    assert [float(row["home_win"]) for row in rows] == pytest.approx([p["home_win"] for p in expected])
@@ -0,0 +1,34 @@
+from pathlib import Path
+from typing import Any, Callable
+
+import httpx
+import pytest
+
+from backend.database import get_engine
+from backend.services import search
+from backend.services.ingestion import FixtureIngestor
+from backend.services.search import load_search_index
+
+DEVDATA = Path(__file__).parents[2] / "devdata" / "result.json"
+
+
+def test_search_loaded_from_database(run_with_client: Callable[..., Any], monkeypatch: pytest.MonkeyPatch) -> None:
+    # Arrange
+    FixtureIngestor(get_engine()).ingest_file(str(DEVDATA))
+    monkeypatch.setattr(search, "_search_index", None)
+    load_search_index(get_engine())
+
+    # Act
+    async def scenario(client: httpx.AsyncClient) -> list[httpx.Response]:
+        return [
+            await client.get("/search", params={"q": "manchester"}),
+            await client.get("/search", params={"q": "PREMIER", "limit": 1}),
+            await client.get("/search", params={"q": ""}),
+        ]
+
+    teams, leagues, empty = run_with_client(scenario)
+
+    # Assert
+    assert [result["name"] for result in teams.json()[:2]] == ["Manchester City", "Manchester United"]
+    assert leagues.json() == [{"kind": "league", "id": 39, "name": "Premier League", "city": None}]
+    assert empty.status_code == 422
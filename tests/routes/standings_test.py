@@ -0,0 +1,30 @@
+from pathlib import Path
+from typing import Any, Callable
+
+import httpx
+from sqlmodel import Session, select
+
+from backend.database import get_engine
+from backend.models.fixture import Season
+from backend.services.ingestion import FixtureIngestor
+
+DEVDATA = Path(__file__).parents[2] / "devdata" / "result.json"
+
+
+def test_read_season_standings(run_with_client: Callable[..., Any]) -> None:
+    # Arrange
+    FixtureIngestor(get_engine()).ingest_file(str(DEVDATA))
+    with Session(get_engine()) as session:
+        season_id = session.exec(select(Season.id).where(Season.league_id == 39)).one()
+
+    # Act
+    async def scenario(client: httpx.AsyncClient) -> tuple[httpx.Response, httpx.Response]:
+        return await client.get(f"/standings/{season_id}"), await client.get("/standings/999999")
+
+    standings, unknown = run_with_client(scenario)
+
+    # Assert
+    assert standings.status_code == 200
+    assert len(standings.json()) == 20
+    assert standings.json()[0]["rank"] == 1
+    assert unknown.json() == []
@@ -0,0 +1,102 @@
+import os
+import signal
+import socket
+import sqlite3
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Iterator
+
+import httpx
+import pytest
+
+from backend.core.config import settings
+from backend.server import server_config
+
+ROOT = Path(__file__).parents[1]
+STARTUP_TIMEOUT_SECONDS = 30.0
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _children(pid: int) -> set[int]:
+    return {int(child) for child in Path(f"/proc/{pid}/task/{pid}/children").read_text().split()}
+
+
+@pytest.fixture
+def server(tmp_path: Path) -> Iterator[tuple[subprocess.Popen, str, Path]]:
+    port = _free_port()
+    database = tmp_path / "server.db"
+    environment = os.environ | {
+        "DATABASE_URI": f"sqlite:///{database}",
+        "HOST": "127.0.0.1",
+        "PORT": str(port),
+        "SERVER_WORKERS": "2",
+        "SERVER_GRACEFUL_TIMEOUT": "2",
+        "PYTHONPATH": str(ROOT),
+    }
+    process = subprocess.Popen(
+        [sys.executable, "-c", "from backend.main import start; start()"],
+        cwd=ROOT,
+        env=environment,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + STARTUP_TIMEOUT_SECONDS
+    while True:
+        try:
+            httpx.get(f"{url}/test_connection")
+            break
+        except httpx.TransportError:
+            if process.poll() is not None or time.monotonic() > deadline:
+                process.kill()
+                pytest.fail("The server did not start")
+            time.sleep(0.1)
+    yield process, url, database
+    if process.poll() is None:
+        process.kill()
+        process.wait()
+
+
+@pytest.mark.skipif(not Path("/proc/self/task").exists(), reason="reads the process tree from /proc")
+def test_server_forks_workers_and_drains_on_sigterm(server: tuple[subprocess.Popen, str, Path]) -> None:
+    # Arrange
+    process, url, database = server
+    workers = _children(process.pid)
+
+    # Act
+    responses = [httpx.get(f"{url}/test_connection") for _ in range(10)]
+    process.send_signal(signal.SIGTERM)
+    exit_code = process.wait(timeout=15)
+
+    # Assert
+    assert len(workers) == 2
+    assert all(response.status_code == 200 for response in responses)
+    assert exit_code == 0
+    assert not any(Path(f"/proc/{pid}").exists() for pid in workers)
+    with sqlite3.connect(database) as connection:
+        tables = {name for (name,) in connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+    assert "user" in tables
+
+
+def test_server_config_follows_settings(monkeypatch: pytest.MonkeyPatch) -> None:
+    # Arrange
+    monkeypatch.setattr(settings, "SERVER_KEEP_ALIVE_TIMEOUT", 75)
+    monkeypatch.setattr(settings, "SERVER_GRACEFUL_TIMEOUT", 10)
+    monkeypatch.setattr(settings, "SERVER_MAX_REQUESTS", 5000)
+    monkeypatch.setattr(settings, "SERVER_FORWARDED_ALLOW_IPS", "10.0.0.1,10.0.0.2")
+
+    # Act
+    config = server_config("backend.main:app", port=9000)
+
+    # Assert
+    assert (config.timeout_keep_alive, config.timeout_graceful_shutdown, config.limit_max_requests) == (75, 10, 5000)
+    assert (config.loop, config.http, config.port) == ("asyncio", "h11", 9000)
+    assert config.proxy_headers
+    assert config.forwarded_allow_ips == "10.0.0.1,10.0.0.2"
@@ -1,6 +1,21 @@
+import asyncio
 from typing import Any
 import pytest
-from backend.services.authentication import encrypt_password
+from jose import JWTError
+from starlette.exceptions import HTTPException
+from backend.core.config import settings
+from backend.services.authentication import (
+    check_password_async,
+    decode_token,
+    encrypt_password,
+    encrypt_password_async,
+    generate_token,
+    revoke_token,
+    rotate_secret_key,
+    set_password_pool,
+    token_cache,
+)
+from backend.services.worker_pool import BoundedExecutor
 import bcrypt
 
 
@@ -40,3 +55,87 @@ def test_encrypt_password_error_cases(test_input: str, expected_exception: Any,
     with pytest.raises(expected_exception):
         # Act
         encrypt_password(test_input)
+
+
+def test_async_password_round_trip() -> None:
+    # Act
+    async def main() -> tuple[bool, bool]:
+        hashed = await encrypt_password_async("P@ssw0rd!")
+        return await check_password_async("P@ssw0rd!", hashed), await check_password_async("wrong", hashed)
+
+    matches, mismatches = asyncio.run(main())
+
+    # Assert
+    assert matches
+    assert not mismatches
+
+
+def test_encrypt_password_async_rejects_non_strings() -> None:
+    with pytest.raises(TypeError):
+        asyncio.run(encrypt_password_async(12345))  # type: ignore[arg-type]
+
+
+def test_saturated_password_pool_returns_service_unavailable() -> None:
+    # Arrange
+    set_password_pool(BoundedExecutor(max_workers=1, max_pending=1, queue_timeout=0.01))
+
+    # Act
+    async def main() -> list[Any]:
+        return await asyncio.gather(
+            encrypt_password_async("first"), encrypt_password_async("second"), return_exceptions=True
+        )
+
+    try:
+        results = asyncio.run(main())
+    finally:
+        set_password_pool(None)
+
+    # Assert
+    assert isinstance(results[0], str)
+    assert isinstance(results[1], HTTPException)
+    assert results[1].status_code == 503
+
+
+def test_decode_token_caches_verified_payload() -> None:
+    # Arrange
+    token_cache.clear()
+    user_token = generate_token(username="alice", is_admin=False)
+    hits = token_cache.hits
+
+    # Act
+    first = decode_token(user_token)
+    second = decode_token(user_token)
+
+    # Assert
+    assert first == second
+    assert first["user"] == "alice"
+    assert token_cache.hits == hits + 1
+
+
+def test_revoked_token_is_rejected() -> None:
+    # Arrange
+    user_token = generate_token(username="mallory", is_admin=False)
+    decode_token(user_token)
+
+    # Act
+    revoke_token(user_token)
+
+    # Assert
+    with pytest.raises(JWTError):
+        decode_token(user_token)
+
+
+def test_rotating_secret_key_invalidates_cached_tokens() -> None:
+    # Arrange
+    old_key = settings.SECRET_KEY
+    user_token = generate_token(username="bob", is_admin=False)
+    decode_token(user_token)
+
+    # Act
+    rotate_secret_key("another-secret-key")
+    try:
+        # Assert
+        with pytest.raises(JWTError):
+            decode_token(user_token)
+    finally:
+        rotate_secret_key(old_key)
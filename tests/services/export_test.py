@@ -0,0 +1,142 @@
+import asyncio
+import csv
+import gzip
+import io
+import json
+import zlib
+from datetime import datetime
+from pathlib import Path
+from typing import Any, AsyncIterator, Sequence
+
+import pytest
+
+from backend.database import get_async_engine, get_engine
+from backend.models.fixture import FixtureRead
+from backend.services.export import accepts_gzip, encode_csv, encode_stream, stream_rows
+from backend.services.fixtures import fixture_statement
+from backend.services.ingestion import FixtureIngestor
+
+DEVDATA = Path(__file__).parents[2] / "devdata" / "result.json"
+
+FIXTURES = [
+    FixtureRead.trusted(
+        id=1,
+        date=datetime(2023, 8, 11, 19, 0),
+        status="FT",
+        round="Regular Season - 1",
+        league_id=39,
+        season_id=1,
+        venue_id=None,
+        home_team_id=50,
+        home_team_name="Manchester, City",
+        away_team_id=44,
+        away_team_name="Burnley",
+        home_score=3,
+        away_score=0,
+    ),
+    FixtureRead.trusted(
+        id=2,
+        date=datetime(2023, 8, 12, 14, 0),
+        status="NS",
+        round=None,
+        league_id=39,
+        season_id=1,
+        venue_id=556,
+        home_team_id=42,
+        home_team_name="Arsenal",
+        away_team_id=65,
+        away_team_name="Nottingham Forest",
+        home_score=None,
+        away_score=None,
+    ),
+]
+
+
+async def _chunks(chunks: list[Sequence[FixtureRead]]) -> AsyncIterator[Sequence[FixtureRead]]:
+    for chunk in chunks:
+        yield chunk
+
+
+def _collect(stream: AsyncIterator[bytes]) -> list[bytes]:
+    async def main() -> list[bytes]:
+        return [data async for data in stream]
+
+    return asyncio.run(main())
+
+
+def test_encode_csv_writes_missing_values_as_empty_cells() -> None:
+    # Act
+    data = encode_csv(FIXTURES, ["id", "date", "round", "home_team_name", "home_score"], header=True)
+
+    # Assert
+    assert list(csv.reader(io.StringIO(data.decode()))) == [
+        ["id", "date", "round", "home_team_name", "home_score"],
+        ["1", "2023-08-11T19:00:00", "Regular Season - 1", "Manchester, City", "3"],
+        ["2", "2023-08-12T14:00:00", "", "Arsenal", ""],
+    ]
+
+
+@pytest.mark.parametrize(
+    "export_format, chunks, expected_outputs, test_id",
+    [
+        ("ndjson", [FIXTURES[:1], FIXTURES[1:]], 2, "HP1"),
+        ("csv", [FIXTURES[:1], FIXTURES[1:]], 3, "HP2"),  # Header first
+        ("csv", [], 1, "EC1"),  # No rows, only the header
+        ("ndjson", [[]], 0, "EC2"),  # Empty chunks are skipped
+    ],
+)
+def test_encode_stream_yields_one_output_per_chunk(
+    export_format: Any, chunks: list[Sequence[FixtureRead]], expected_outputs: int, test_id: Any
+) -> None:
+    # Act
+    outputs = _collect(encode_stream(_chunks(chunks), FixtureRead, export_format))
+
+    # Assert
+    assert len(outputs) == expected_outputs, f"Test ID: {test_id}"
+    if export_format == "ndjson" and outputs:
+        lines = b"".join(outputs).decode().splitlines()
+        assert [json.loads(line)["id"] for line in lines] == [1, 2], f"Test ID: {test_id}"
+
+
+def test_compressed_stream_is_gzip_of_plain_stream() -> None:
+    # Act
+    plain = _collect(encode_stream(_chunks([FIXTURES[:1], FIXTURES[1:]]), FixtureRead, "csv"))
+    compressed = _collect(encode_stream(_chunks([FIXTURES[:1], FIXTURES[1:]]), FixtureRead, "csv", compress=True))
+
+    # Assert
+    assert gzip.decompress(b"".join(compressed)) == b"".join(plain)
+    # Every chunk is flushed, so each one can be decompressed as soon as it is received.
+    decompressor = zlib.decompressobj(wbits=zlib.MAX_WBITS | 16)
+    assert decompressor.decompress(compressed[0]) == plain[0]
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected, test_id",
+    [
+        ("gzip, deflate, br", True, "HP1"),
+        ("br;q=1.0, gzip;q=0.5", True, "HP2"),
+        ("gzip;q=0", False, "EC1"),  # Explicitly refused
+        ("deflate", False, "EC2"),
+        (None, False, "EC3"),  # No header
+    ],
+)
+def test_accepts_gzip(accept_encoding: str | None, expected: bool, test_id: Any) -> None:
+    # Assert
+    assert accepts_gzip(accept_encoding) == expected, f"Test ID: {test_id}"
+
+
+def test_stream_rows_reads_query_in_chunks(database: None) -> None:
+    # Arrange
+    FixtureIngestor(get_engine()).ingest_file(str(DEVDATA))
+
+    # Act
+    async def main() -> list[int]:
+        try:
+            return [len(rows) async for rows in stream_rows(fixture_statement(league_id=39), chunk_size=100)]
+        finally:
+            await get_async_engine().dispose()
+
+    sizes = asyncio.run(main())
+
+    # Assert
+    assert sizes == [100, 100, 100, 80]
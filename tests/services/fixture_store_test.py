@@ -0,0 +1,178 @@
+import io
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytest
+
+from backend.services.fixture_store import FixtureStore
+from backend.services.ingestion import iter_fixtures
+
+DEVDATA = Path(__file__).parents[2] / "devdata" / "result.json"
+
+
+def _fixture(fixture_id: int, home: int, away: int, date: str, home_score: int | None = 1) -> dict[str, Any]:
+    return {
+        "id": fixture_id,
+        "date": date,
+        "status": "FT" if home_score is not None else "NS",
+        "venue": {"id": 100 + home, "name": f"Stadium {home}", "city": "City"},
+        "home": {"id": home, "name": f"Team {home}"},
+        "away": {"id": away, "name": f"Team {away}"},
+        "score": {"halftime": {"home": 0, "away": 0}},
+        "home_score": home_score,
+        "away_score": 0 if home_score is not None else None,
+        "round": "Regular Season - 1",
+    }
+
+
+def _dump(seasons: dict[int, list[dict]]) -> bytes:
+    league = {
+        "id": 1,
+        "name": "League",
+        "seasons": [{"year": year, "fixtures": fixtures} for year, fixtures in seasons.items()],
+    }
+    return json.dumps({"sports": [{"name": "football", "countries": [{"name": "x", "leagues": [league]}]}]}).encode()
+
+
+@pytest.fixture
+def store() -> FixtureStore:
+    dump = _dump(
+        {
+            2023: [
+                _fixture(3, 10, 20, "2023-08-12T15:00:00+00:00"),
+                _fixture(1, 20, 30, "2023-08-11T21:00:00+02:00"),
+                _fixture(2, 30, 10, "2023-08-20T15:00:00+00:00", home_score=None),
+            ],
+            2024: [_fixture(4, 10, 30, "2024-08-10T15:00:00+00:00")],
+        }
+    )
+    return FixtureStore.from_fixtures(iter_fixtures(io.BytesIO(dump)))
+
+
+def test_fixtures_are_sorted_by_date_and_interned(store: FixtureStore) -> None:
+    # Assert
+    assert store.fixtures["id"].tolist() == [1, 3, 2, 4]
+    assert store.team_ids.tolist() == [10, 20, 30]
+    assert store.team_names == ["Team 10", "Team 20", "Team 30"]
+    assert store.seasons.tolist() == [(1, 2023), (1, 2024)]
+    assert store.rounds == ["Regular Season - 1"]
+
+
+@pytest.mark.parametrize(
+    "team_id, expected_ids, test_id",
+    [
+        (10, [3, 2, 4], "HP1"),
+        (20, [1, 3], "HP2"),
+        (99, [], "EC1"),  # Unknown team
+    ],
+)
+def test_team_fixtures(store: FixtureStore, team_id: int, expected_ids: list[int], test_id: Any) -> None:
+    # Act
+    fixtures = store.team_fixtures(team_id)
+
+    # Assert
+    assert fixtures["id"].tolist() == expected_ids, f"Test ID: {test_id}"
+
+
+@pytest.mark.parametrize(
+    "year, expected_ids, test_id",
+    [
+        (2023, [1, 3, 2], "HP1"),
+        (2024, [4], "HP2"),
+        (2022, [], "EC1"),  # Unknown season
+    ],
+)
+def test_season_fixtures(store: FixtureStore, year: int, expected_ids: list[int], test_id: Any) -> None:
+    # Act
+    fixtures = store.season_fixtures(1, year)
+
+    # Assert
+    assert fixtures["id"].tolist() == expected_ids, f"Test ID: {test_id}"
+
+
+def test_records_expand_positions_and_missing_values(store: FixtureStore) -> None:
+    # Act
+    records = store.records(store.season_fixtures(1, 2023))
+
+    # Assert
+    assert records[0] == {
+        "id": 1,
+        "date": datetime(2023, 8, 11, 19, 0),
+        "league_id": 1,
+        "year": 2023,
+        "status": "FT",
+        "round": "Regular Season - 1",
+        "venue_id": 120,
+        "home_team_id": 20,
+        "home_team_name": "Team 20",
+        "away_team_id": 30,
+        "away_team_name": "Team 30",
+        "home_score": 1,
+        "away_score": 0,
+        "halftime_home_score": 0,
+        "halftime_away_score": 0,
+    }
+    assert (records[2]["status"], records[2]["home_score"], records[2]["away_score"]) == ("NS", None, None)
+
+
+def test_fixture_met_again_replaces_previous_one() -> None:
+    # Arrange
+    first = _dump({2023: [_fixture(1, 10, 20, "2023-08-11T15:00:00+00:00", home_score=None)]})
+    second = _dump({2023: [_fixture(1, 10, 20, "2023-08-11T15:00:00+00:00", home_score=2)]})
+
+    # Act
+    store = FixtureStore.from_dumps([io.BytesIO(first), io.BytesIO(second)])
+
+    # Assert
+    assert len(store) == 1
+    assert store.records(store.fixtures)[0]["home_score"] == 2
+
+
+def test_save_and_load_memory_maps_the_store(tmp_path: Path) -> None:
+    # Arrange
+    with open(DEVDATA, "rb") as file:
+        store = FixtureStore.from_dumps([file])
+    path = str(tmp_path / "fixtures.store")
+
+    # Act
+    store.save(path)
+    loaded = FixtureStore.load(path)
+
+    # Assert
+    assert isinstance(loaded.fixtures, np.memmap)
+    assert not loaded.fixtures.flags.writeable
+    assert np.array_equal(loaded.fixtures, store.fixtures)
+    assert loaded.team_names == store.team_names
+    assert loaded.records(loaded.team_fixtures(50)) == store.records(store.team_fixtures(50))
+    assert len(loaded.season_fixtures(39, 2023)) == 380
+
+
+def test_load_rejects_other_files(tmp_path: Path) -> None:
+    # Arrange
+    path = tmp_path / "other.store"
+    path.write_bytes(b"not a store")
+
+    # Assert
+    with pytest.raises(ValueError):
+        FixtureStore.load(str(path))
+
+
+def test_save_replaces_snapshot_without_touching_mapped_one(store: FixtureStore, tmp_path: Path) -> None:
+    # Arrange
+    path = str(tmp_path / "fixtures.store")
+    store.save(path)
+    mapped = FixtureStore.load(path)
+    expected = mapped.fixtures["id"].tolist()
+    smaller = FixtureStore.from_dumps([io.BytesIO(_dump({2023: [_fixture(9, 10, 20, "2023-08-11T15:00:00+00:00")]}))])
+
+    # Act
+    smaller.save(path)
+    reloaded = FixtureStore.load(path)
+
+    # Assert
+    assert mapped.fixtures["id"].tolist() == expected
+    assert reloaded.fixtures["id"].tolist() == [9]
+    assert [entry.name for entry in tmp_path.iterdir()] == ["fixtures.store"]
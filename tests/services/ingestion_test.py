@@ -0,0 +1,114 @@
+import io
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+from sqlalchemy import Engine, create_engine, func, select
+from sqlmodel import Session
+
+from backend.models.fixture import Fixture, League, Season, Sport, Team, Venue
+from backend.services.ingestion import FixtureIngestor, iter_fixtures
+
+DEVDATA = Path(__file__).parents[2] / "devdata" / "result.json"
+
+
+def _team(team_id: int) -> dict[str, Any]:
+    return {"id": team_id, "name": f"Team {team_id}", "logo": None}
+
+
+def _fixture(fixture_id: int, home: int, away: int, status: str = "FT", home_score: int | None = 1) -> dict[str, Any]:
+    return {
+        "id": fixture_id,
+        "date": "2023-08-11T21:00:00+02:00",
+        "status": status,
+        "venue": {"id": 100 + home, "name": f"Stadium {home}", "city": "City"},
+        "home": _team(home),
+        "away": _team(away),
+        "winner": _team(home) if home_score else None,
+        "score": {"fulltime": {"home": home_score, "away": 0}, "halftime": {"home": 0, "away": 0}},
+        "home_score": home_score,
+        "away_score": 0 if home_score is not None else None,
+        "round": "Regular Season - 1",
+    }
+
+
+def _dump(fixtures: list[dict], fixtures_first: bool = False) -> bytes:
+    season: dict[str, Any] = {"fixtures": fixtures} if fixtures_first else {}
+    season |= {"id": 1, "year": 2023, "start": "2023-08-11", "end": "2024-05-19", "logo": None}
+    season |= {"fixtures": fixtures}
+    league = {"id": 1, "name": "League", "seasons": [season]}
+    return json.dumps({"sports": [{"name": "football", "countries": [{"name": "x", "leagues": [league]}]}]}).encode()
+
+
+@pytest.fixture
+def engine(tmp_path: Path) -> Engine:
+    return create_engine(f"sqlite:///{tmp_path / 'fixtures.db'}")
+
+
+def _count(engine: Engine, model: Any) -> int:
+    with Session(engine) as session:
+        return session.scalar(select(func.count()).select_from(model)) or 0
+
+
+@pytest.mark.parametrize("fixtures_first, test_id", [(False, "HP1"), (True, "HP2")])
+def test_iter_fixtures_yields_season_context(fixtures_first: bool, test_id: Any) -> None:
+    # Arrange
+    dump = _dump([_fixture(1, 10, 20), _fixture(2, 20, 10)], fixtures_first=fixtures_first)
+
+    # Act
+    fixtures = list(iter_fixtures(io.BytesIO(dump)))
+
+    # Assert
+    assert [fixture["id"] for _, fixture in fixtures] == [1, 2], f"Test ID: {test_id}"
+    context = fixtures[0][0]
+    assert (context.sport, context.league_id, context.league_name, context.year) == ("football", 1, "League", 2023)
+
+
+def test_ingest_deduplicates_teams_and_venues(engine: Engine) -> None:
+    # Arrange
+    ingestor = FixtureIngestor(engine, batch_size=2)
+    ingestor.create_tables()
+    fixtures = [_fixture(1, 10, 20), _fixture(2, 20, 10), _fixture(3, 10, 30)]
+
+    # Act
+    report = ingestor.ingest(iter_fixtures(io.BytesIO(_dump(fixtures))))
+
+    # Assert
+    assert (report.fixtures, report.teams, report.venues, report.seasons) == (3, 3, 2, 1)
+    assert [_count(engine, model) for model in (Sport, League, Season, Team, Venue, Fixture)] == [1, 1, 1, 3, 2, 3]
+    with Session(engine) as session:
+        fixture = session.get(Fixture, 1)
+    assert fixture is not None
+    assert fixture.date.isoformat() == "2023-08-11T19:00:00"
+    assert (fixture.home_score, fixture.winner_team_id, fixture.halftime_home_score) == (1, 10, 0)
+
+
+def test_ingesting_again_updates_existing_fixtures(engine: Engine) -> None:
+    # Arrange
+    FixtureIngestor(engine).create_tables()
+    FixtureIngestor(engine).ingest(iter_fixtures(io.BytesIO(_dump([_fixture(1, 10, 20, "NS", None)]))))
+
+    # Act
+    FixtureIngestor(engine).ingest(iter_fixtures(io.BytesIO(_dump([_fixture(1, 10, 20, "FT", 2)]))))
+
+    # Assert
+    assert _count(engine, Fixture) == 1
+    with Session(engine) as session:
+        fixture = session.get(Fixture, 1)
+    assert fixture is not None
+    assert (fixture.status, fixture.home_score) == ("FT", 2)
+
+
+def test_ingest_devdata_dump(engine: Engine) -> None:
+    # Arrange
+    ingestor = FixtureIngestor(engine)
+    ingestor.create_tables()
+
+    # Act
+    report = ingestor.ingest_file(str(DEVDATA))
+
+    # Assert
+    assert report.fixtures == _count(engine, Fixture) == 2129
+    assert report.seasons == _count(engine, Season) == 5
+    assert report.venues == _count(engine, Venue) == 114
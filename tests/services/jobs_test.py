@@ -0,0 +1,182 @@
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+import pytest
+from sqlalchemy import Engine, create_engine
+from sqlmodel import Session, SQLModel, select
+
+from backend.models.job import Job
+from backend.services.jobs import JobContext, JobLeaseLost, JobScheduler, JobType
+
+FINISHED = ("succeeded", "failed")
+
+
+def _add(context: JobContext, params: dict[str, Any]) -> int:
+    context.progress(0.5, "Adding")
+    return params["a"] + params["b"]
+
+
+def _fail(_context: JobContext, _params: dict[str, Any]) -> None:
+    raise RuntimeError("Boom")
+
+
+def _sleep(_context: JobContext, params: dict[str, Any]) -> None:
+    time.sleep(params.get("seconds", 0))
+
+
+TYPES = {
+    "add": JobType(_add, finish=lambda total: {"total": total}),
+    "fail": JobType(_fail),
+    "sleep": JobType(_sleep, max_concurrency=1),
+}
+
+
+@pytest.fixture
+def engine(tmp_path: Path) -> Engine:
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    SQLModel.metadata.create_all(engine, tables=[Job.__table__])  # type: ignore[attr-defined]
+    return engine
+
+
+def _insert(engine: Engine, job_type: str, params: dict[str, Any], **values: Any) -> int:
+    with Session(engine) as session:
+        job = Job(type=job_type, params=json.dumps(params), dedup_key=json.dumps([job_type, params]), **values)
+        job.created_at = datetime(2024, 1, 1)
+        session.add(job)
+        session.commit()
+        assert job.id is not None
+        return job.id
+
+
+def _jobs(engine: Engine) -> dict[int, Job]:
+    with Session(engine) as session:
+        return {job.id: job for job in session.exec(select(Job))}  # type: ignore[misc]
+
+
+async def _run_until_finished(scheduler: JobScheduler, timeout: float = 30.0) -> dict[int, Job]:
+    await scheduler.start()
+    try:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            jobs = _jobs(scheduler.engine)
+            if all(job.status in FINISHED for job in jobs.values()):
+                return jobs
+            await asyncio.sleep(0.05)
+        raise TimeoutError("Jobs did not finish")
+    finally:
+        await scheduler.stop()
+
+
+@pytest.mark.parametrize(
+    "job_type, expected_status, expected_result, expected_error, test_id",
+    [
+        ("add", "succeeded", {"total": 3}, None, "HP1"),
+        ("fail", "failed", None, "RuntimeError: Boom", "EC1"),  # The job raises
+    ],
+)
+def test_scheduler_runs_jobs_on_process_pool(
+    engine: Engine,
+    job_type: str,
+    expected_status: str,
+    expected_result: Any,
+    expected_error: str | None,
+    test_id: Any,
+) -> None:
+    # Arrange
+    job_id = _insert(engine, job_type, {"a": 1, "b": 2})
+    scheduler = JobScheduler(engine, TYPES, workers=1, poll_interval=0.05)
+
+    # Act
+    job = asyncio.run(_run_until_finished(scheduler))[job_id]
+
+    # Assert
+    assert job.status == expected_status, f"Test ID: {test_id}"
+    assert (json.loads(job.result) if job.result else None) == expected_result, f"Test ID: {test_id}"
+    assert job.error == expected_error, f"Test ID: {test_id}"
+    assert job.started_at is not None and job.finished_at is not None, f"Test ID: {test_id}"
+
+
+def test_claim_respects_concurrency_limit_of_job_type(engine: Engine) -> None:
+    # Arrange
+    first = _insert(engine, "sleep", {"seconds": 1})
+    second = _insert(engine, "sleep", {"seconds": 2})
+    other = _insert(engine, "add", {"a": 1, "b": 2})
+    unknown = _insert(engine, "unknown", {})
+    scheduler = JobScheduler(engine, TYPES, workers=4)
+
+    # Act
+    claimed = scheduler._claim(4)
+
+    # Assert
+    assert [job.id for job in claimed] == [first, other]
+    jobs = _jobs(engine)
+    assert [jobs[job_id].status for job_id in (first, second, other, unknown)] == [
+        "running",
+        "pending",
+        "running",
+        "pending",
+    ]
+    assert jobs[first].worker == scheduler.name
+
+
+@pytest.mark.parametrize(
+    "heartbeat_at, expected_status, test_id",
+    [
+        (datetime(2024, 1, 1), "pending", "HP1"),  # Expired lease, e.g. a crashed process on any host
+        (None, "pending", "EC1"),  # Claimed before leases existed
+        ("now", "running", "EC2"),  # Renewed lease
+    ],
+)
+def test_expired_leases_are_requeued(engine: Engine, heartbeat_at: Any, expected_status: str, test_id: Any) -> None:
+    # Arrange
+    heartbeat_at = datetime.now(timezone.utc).replace(tzinfo=None) if heartbeat_at == "now" else heartbeat_at
+    job_id = _insert(
+        engine, "add", {"a": 1, "b": 1}, status="running", worker="elsewhere:1:0", heartbeat_at=heartbeat_at
+    )
+    scheduler = JobScheduler(engine, TYPES, lease_seconds=30)
+
+    # Act
+    scheduler._requeue_expired()
+
+    # Assert
+    job = _jobs(engine)[job_id]
+    assert job.status == expected_status, f"Test ID: {test_id}"
+    assert (job.worker is None) == (expected_status == "pending"), f"Test ID: {test_id}"
+
+
+def test_job_stops_once_its_lease_is_lost(engine: Engine) -> None:
+    # Arrange
+    job_id = _insert(engine, "add", {"a": 1, "b": 1}, status="running", worker="elsewhere:1:0")
+    context = JobContext(job_id, engine, "stalled:1:0")
+    scheduler = JobScheduler(engine, TYPES)
+
+    # Act / Assert
+    with pytest.raises(JobLeaseLost):
+        context.progress(0.5)
+    scheduler._finish(job_id, {"status": "succeeded"})
+    assert _jobs(engine)[job_id].status == "running"
+
+
+def test_stop_requeues_running_jobs(engine: Engine) -> None:
+    # Arrange
+    job_id = _insert(engine, "sleep", {"seconds": 5})
+    scheduler = JobScheduler(engine, TYPES, workers=1, poll_interval=0.05, shutdown_timeout=0.1)
+
+    # Act
+    async def main() -> tuple[str, list[Any]]:
+        await scheduler.start()
+        while _jobs(engine)[job_id].status != "running":
+            await asyncio.sleep(0.05)
+        processes = list(scheduler._executor._processes.values())  # type: ignore[union-attr]
+        await scheduler.stop()
+        return _jobs(engine)[job_id].status, processes
+
+    status, processes = asyncio.run(main())
+
+    # Assert
+    assert status == "pending"
+    assert not any(process.is_alive() for process in processes)  # Terminated, it cannot run alongside its rerun
@@ -0,0 +1,143 @@
+import asyncio
+from typing import Any
+from unittest.mock import patch
+
+import pytest
+from starlette.exceptions import HTTPException
+
+from backend.services import login_throttle
+from backend.services.login_throttle import InMemoryRateLimitBackend, LoginThrottle
+
+
+def _throttle(**overrides: Any) -> LoginThrottle:
+    options: dict[str, Any] = {
+        "backend": InMemoryRateLimitBackend(),
+        "username_rate": 1.0,
+        "username_burst": 2,
+        "ip_rate": 1.0,
+        "ip_burst": 3,
+        "max_concurrent_checks": 2,
+        "queue_timeout": 0.05,
+    }
+    return LoginThrottle(**(options | overrides))
+
+
+def test_backend_allows_burst_then_returns_wait() -> None:
+    # Arrange
+    backend = InMemoryRateLimitBackend()
+
+    # Act
+    async def main() -> list[float]:
+        return [await backend.take("key", rate=0.5, burst=2) for _ in range(3)]
+
+    waits = asyncio.run(main())
+
+    # Assert
+    assert waits[:2] == [0.0, 0.0]
+    assert waits[2] == pytest.approx(2.0, abs=0.01)
+
+
+def test_backend_refills_over_time() -> None:
+    # Arrange
+    backend = InMemoryRateLimitBackend()
+
+    # Act
+    async def main() -> list[float]:
+        return [await backend.take("key", rate=1.0, burst=1) for _ in range(3)]
+
+    with patch.object(login_throttle, "time") as clock:
+        clock.monotonic.side_effect = [0.0, 0.0, 1.5]
+        waits = asyncio.run(main())
+
+    # Assert
+    assert waits[0] == 0.0
+    assert waits[1] == pytest.approx(1.0)
+    assert waits[2] == 0.0
+
+
+def test_backend_evicts_least_recently_used_keys() -> None:
+    # Arrange
+    backend = InMemoryRateLimitBackend(max_keys=2)
+
+    # Act
+    async def main() -> list[float]:
+        await backend.take("a", rate=1.0, burst=1)
+        await backend.take("b", rate=1.0, burst=1)
+        await backend.take("c", rate=1.0, burst=1)
+        return [await backend.take("a", rate=1.0, burst=1), await backend.take("c", rate=1.0, burst=1)]
+
+    waits = asyncio.run(main())
+
+    # Assert
+    assert len(backend) == 2
+    assert waits[0] == 0.0
+    assert waits[1] > 0
+
+
+@pytest.mark.parametrize(
+    "test_id, attempts, expected_reason",
+    [
+        ("same_username", [("alice", "1.1.1.1")] * 3, "username"),
+        ("same_ip", [("alice", "1.1.1.1"), ("bob", "1.1.1.1"), ("carol", "1.1.1.1"), ("dave", "1.1.1.1")], "ip"),
+    ],
+)
+def test_acquire_rejects_attempts_above_burst(
+    test_id: str, attempts: list[tuple[str, str]], expected_reason: str
+) -> None:
+    # Arrange
+    throttle = _throttle()
+    before = login_throttle.LOGIN_ATTEMPTS_REJECTED.values.get((expected_reason,), 0.0)
+
+    # Act
+    async def main() -> None:
+        for username, client_ip in attempts:
+            await throttle.acquire(username, client_ip)
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(main())
+
+    # Assert
+    assert error.value.status_code == 429
+    assert error.value.headers == {"Retry-After": "1"}
+    assert login_throttle.LOGIN_ATTEMPTS_REJECTED.values[(expected_reason,)] == before + 1
+
+
+def test_acquire_without_limits_allows_every_attempt() -> None:
+    # Arrange
+    throttle = _throttle(username_rate=None, ip_rate=None)
+
+    # Act
+    async def main() -> None:
+        for _ in range(10):
+            await throttle.acquire("alice", "1.1.1.1")
+
+    asyncio.run(main())
+
+    # Assert
+    assert len(throttle.backend) == 0  # type: ignore[arg-type]
+
+
+def test_check_password_rejects_above_concurrency_cap() -> None:
+    # Arrange
+    throttle = _throttle(max_concurrent_checks=1)
+    release = asyncio.Event()
+
+    async def slow_check(password: str, hashed: str) -> bool:
+        await release.wait()
+        return password == hashed
+
+    # Act
+    async def main() -> tuple[bool, int]:
+        first = asyncio.create_task(throttle.check_password("secret", "secret"))
+        await asyncio.sleep(0)
+        with pytest.raises(HTTPException) as error:
+            await throttle.check_password("secret", "secret")
+        release.set()
+        return await first, error.value.status_code
+
+    with patch.object(login_throttle, "check_password_async", slow_check):
+        result, status_code = asyncio.run(main())
+
+    # Assert
+    assert result is True
+    assert status_code == 503
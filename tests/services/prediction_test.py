@@ -0,0 +1,85 @@
+import math
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pytest
+
+from backend.services.prediction import FixtureHistory, PoissonModel, load_history, poisson_pmf
+
+DEVDATA = Path(__file__).parents[2] / "devdata" / "result.json"
+
+
+def _simulated_history(fixtures: int = 20_000, teams: int = 20) -> tuple[FixtureHistory, np.ndarray, np.ndarray]:
+    rng = np.random.default_rng(0)
+    attack = rng.uniform(0.6, 1.6, teams)
+    attack /= attack.mean()
+    defence = rng.uniform(0.6, 1.6, teams)
+    defence /= defence.mean()
+    home = rng.integers(0, teams, fixtures)
+    away = (home + rng.integers(1, teams, fixtures)) % teams
+    home_goals = rng.poisson(1.2 * 1.3 * attack[home] * defence[away]).astype(float)
+    away_goals = rng.poisson(1.2 * attack[away] * defence[home]).astype(float)
+    history = FixtureHistory(home + 100, away + 100, home_goals, away_goals, np.zeros(fixtures))
+    return history, attack, defence
+
+
+def test_fit_recovers_simulated_strengths() -> None:
+    # Arrange
+    history, attack, defence = _simulated_history()
+
+    # Act
+    model = PoissonModel().fit(history)
+
+    # Assert
+    assert np.allclose(model.attack, attack, atol=0.1)
+    assert np.allclose(model.defence, defence, atol=0.1)
+    assert model.home_advantage == pytest.approx(1.3, abs=0.05)
+    assert model.base_rate == pytest.approx(1.2, abs=0.05)
+
+
+def test_predict_returns_normalized_probabilities() -> None:
+    # Arrange
+    with DEVDATA.open("rb") as file:
+        model = PoissonModel().fit(load_history(file))
+    home = np.array([50, 44, 123456])
+    away = np.array([44, 50, 50])
+
+    # Act
+    predicted = model.predict(home, away)
+
+    # Assert
+    total = predicted["home_win"] + predicted["draw"] + predicted["away_win"]
+    assert np.allclose(total, 1.0)
+    assert predicted["home_win"][0] > predicted["away_win"][0]  # Manchester City at home against Burnley
+    assert predicted["away_win"][1] > predicted["home_win"][1]
+
+
+def test_unknown_teams_get_average_strengths() -> None:
+    # Arrange
+    model = PoissonModel().fit(_simulated_history(fixtures=1000)[0])
+
+    # Act
+    expected_home, expected_away = model.expected_goals(np.array([-1]), np.array([-2]))
+
+    # Assert
+    assert expected_home[0] == pytest.approx(model.base_rate * model.home_advantage)
+    assert expected_away[0] == pytest.approx(model.base_rate)
+
+
+def test_unfitted_model_predicts_with_default_rates() -> None:
+    # Act
+    predicted = PoissonModel().fit(FixtureHistory.from_rows([])).predict(np.array([1]), np.array([2]))
+
+    # Assert
+    assert predicted["home_win"][0] == pytest.approx(predicted["away_win"][0])
+
+
+@pytest.mark.parametrize("rate, test_id", [(0.5, "HP1"), (1.4, "HP2"), (3.0, "HP3")])
+def test_poisson_pmf_matches_closed_form(rate: float, test_id: Any) -> None:
+    # Act
+    pmf = poisson_pmf(np.array([rate]), 10)[0]
+
+    # Assert
+    expected = [rate**goals * math.exp(-rate) / math.factorial(goals) for goals in range(11)]
+    assert np.allclose(pmf, expected), f"Test ID: {test_id}"
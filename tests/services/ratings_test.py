@@ -0,0 +1,133 @@
+import asyncio
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+from sqlalchemy import Engine, create_engine, select
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from backend.models.fixture import Fixture
+from backend.models.rating import RatingCheckpoint, TeamRatingRead
+from backend.services.ingestion import FixtureIngestor, iter_fixtures
+from backend.services.ratings import RatingState, ratings_as_of, replay_ratings
+from backend.services.standings import FINISHED_STATUSES
+
+DEVDATA = Path(__file__).parents[2] / "devdata" / "result.json"
+
+
+@pytest.fixture
+def engine(tmp_path: Path) -> Engine:
+    engine = create_engine(f"sqlite:///{tmp_path / 'ratings.db'}")
+    ingestor = FixtureIngestor(engine, batch_size=500)
+    ingestor.create_tables()
+    ingestor.ingest_file(str(DEVDATA))
+    return engine
+
+
+def _naive_ratings(engine: Engine, when: datetime = datetime.max) -> dict[int, float]:
+    state = RatingState()
+    with Session(engine) as session:
+        fixtures = session.scalars(
+            select(Fixture)
+            .where(Fixture.status.in_(FINISHED_STATUSES), Fixture.date <= when)  # type: ignore[attr-defined]
+            .order_by(Fixture.date, Fixture.id)
+        )
+        for f in fixtures:
+            if f.home_score is not None and f.away_score is not None:
+                state.apply(f.id, f.date, f.home_team_id, f.away_team_id, f.home_score, f.away_score)
+    return state.ratings
+
+
+def _ratings_as_of(engine: Engine, when: datetime, team_id: int | None = None) -> list[TeamRatingRead]:
+    async_engine = create_async_engine(str(engine.url).replace("sqlite://", "sqlite+aiosqlite://"))
+
+    async def main() -> list[TeamRatingRead]:
+        async with AsyncSession(async_engine) as session:
+            ratings = await ratings_as_of(session, when, team_id=team_id)
+        await async_engine.dispose()
+        return ratings
+
+    return asyncio.run(main())
+
+
+def _checkpoints(engine: Engine) -> list[tuple[int, datetime, int]]:
+    with Session(engine) as session:
+        return [
+            (c.id, c.last_date, c.last_fixture_id)  # type: ignore[misc]
+            for c in session.scalars(select(RatingCheckpoint).order_by(RatingCheckpoint.id))
+        ]
+
+
+def _as_dict(ratings: list[TeamRatingRead]) -> dict[int, float]:
+    return {rating.team_id: rating.rating for rating in ratings}
+
+
+@pytest.mark.parametrize(
+    "when, test_id",
+    [
+        (datetime.max, "latest"),
+        (datetime(2023, 12, 26, 12), "mid_season"),
+        (datetime(2023, 8, 1), "before_any_fixture"),
+    ],
+)
+def test_ratings_as_of_match_naive_computation(engine: Engine, when: datetime, test_id: str) -> None:
+    # Act
+    ratings = _ratings_as_of(engine, when)
+
+    # Assert
+    assert _as_dict(ratings) == pytest.approx(_naive_ratings(engine, when))
+    assert [rating.rating for rating in ratings] == sorted((rating.rating for rating in ratings), reverse=True)
+
+
+def test_ingestion_writes_checkpoints_between_matchdays(engine: Engine) -> None:
+    # Act
+    checkpoints = _checkpoints(engine)
+
+    # Assert
+    assert len(checkpoints) > 1
+    with Session(engine) as session:
+        for _, last_date, last_fixture_id in checkpoints[:-1]:
+            later_same_day = session.scalars(
+                select(Fixture.id).where(
+                    Fixture.status.in_(FINISHED_STATUSES),  # type: ignore[attr-defined]
+                    Fixture.date > last_date,
+                    Fixture.date < datetime.combine(last_date.date(), datetime.max.time()),
+                )
+            ).first()
+            assert later_same_day is None, last_fixture_id
+
+
+def test_correction_replays_from_nearest_checkpoint(engine: Engine) -> None:
+    # Arrange
+    with open(DEVDATA, "rb") as file:
+        context, fixture = next(
+            (context, fixture)
+            for context, fixture in iter_fixtures(file)
+            if fixture["status"] == "FT" and fixture["date"] >= "2024-01-20"
+        )
+    before = _checkpoints(engine)
+    position = (datetime.fromisoformat(fixture["date"]).replace(tzinfo=None), fixture["id"])
+
+    # Act
+    report = FixtureIngestor(engine).ingest(iter([(context, fixture | {"home_score": fixture["home_score"] + 3})]))
+
+    # Assert
+    kept = [checkpoint for checkpoint in before if checkpoint[1:] < position]
+    assert 0 < len(kept) < len(before)
+    assert _checkpoints(engine)[: len(kept)] == kept
+    assert 0 < report.rated < 1384
+    latest = _as_dict(_ratings_as_of(engine, datetime.max))
+    assert latest == pytest.approx(_naive_ratings(engine))
+    replay_ratings(engine)
+    assert _as_dict(_ratings_as_of(engine, datetime.max)) == pytest.approx(latest)
+
+
+def test_ratings_of_one_team(engine: Engine) -> None:
+    # Act
+    ratings = _ratings_as_of(engine, datetime(2024, 1, 15), team_id=50)
+
+    # Assert
+    assert [rating.team_id for rating in ratings] == [50]
+    assert ratings[0].rating == pytest.approx(_naive_ratings(engine, datetime(2024, 1, 15))[50])
@@ -0,0 +1,131 @@
+import io
+import json
+import time
+from pathlib import Path
+from typing import Any
+
+import pytest
+from sqlalchemy import create_engine
+
+from backend.services import search
+from backend.services.fixture_store import FixtureStore
+from backend.services.ingestion import FixtureIngestor, iter_fixtures
+from backend.services.search import SearchIndex, fold
+
+
+DEVDATA = Path(__file__).parents[2] / "devdata" / "result.json"
+
+
+def _dump() -> bytes:
+    fixture = {
+        "id": 1,
+        "date": "2023-08-11T19:00:00+00:00",
+        "status": "NS",
+        "venue": {"id": 110, "name": "Stadium 10", "city": "City"},
+        "home": {"id": 10, "name": "Team 10"},
+        "away": {"id": 20, "name": "Team 20"},
+    }
+    league = {"id": 1, "name": "League", "seasons": [{"year": 2023, "fixtures": [fixture]}]}
+    return json.dumps({"sports": [{"name": "football", "countries": [{"name": "x", "leagues": [league]}]}]}).encode()
+
+
+INDEX = SearchIndex(
+    [
+        ("team", 1, "Bayern München", None),
+        ("team", 2, "Manchester City", None),
+        ("team", 3, "Manchester United", None),
+        ("team", 4, "Atlético Madrid", None),
+        ("venue", 10, "Etihad Stadium", "Manchester"),
+        ("league", 39, "Premier League", None),
+    ]
+)
+
+
+def test_fold_removes_accents_and_case() -> None:
+    # Assert
+    assert fold("Atlético MÜNCHEN Straße") == "atletico munchen strasse"
+
+
+@pytest.mark.parametrize(
+    "query, expected, test_id",
+    [
+        ("munchen", [("team", 1)], "HP1"),  # Accents are ignored
+        ("ATLE", [("team", 4)], "HP2"),  # Case is ignored
+        ("manch", [("team", 2), ("team", 3), ("venue", 10)], "HP3"),  # Names starting with the query first
+        ("man un", [("team", 3)], "HP4"),  # Every word must match
+        ("city man", [("team", 2)], "HP5"),  # In any order
+        ("league", [("league", 39)], "HP6"),  # Any word of the name
+        ("etihad manchester", [("venue", 10)], "HP7"),  # The city of a venue
+        ("liverpool", [], "EC1"),  # No match
+        ("  ", [], "EC2"),  # No word
+    ],
+)
+def test_search_matches_word_prefixes(query: str, expected: list[tuple[str, int]], test_id: Any) -> None:
+    # Act
+    results = INDEX.search(query)
+
+    # Assert
+    assert [(result.kind, result.id) for result in results] == expected, f"Test ID: {test_id}"
+
+
+def test_search_returns_top_results() -> None:
+    # Act
+    results = INDEX.search("m", limit=2)
+
+    # Assert
+    assert [result.name for result in results] == ["Manchester City", "Manchester United"]
+
+
+def test_update_renames_entries() -> None:
+    # Arrange
+    index = SearchIndex([("team", 1, "Old Name", None), ("team", 2, "Other", None)])
+
+    # Act
+    index.update([("team", 1, "New Name", None)])
+
+    # Assert
+    assert index.search("old") == []
+    assert [result.name for result in index.search("name")] == ["New Name"]
+    assert len(index) == 2
+
+
+def test_from_store_indexes_teams_venues_and_leagues() -> None:
+    # Arrange
+    store = FixtureStore.from_fixtures(iter_fixtures(io.BytesIO(_dump())))
+
+    # Act
+    index = SearchIndex.from_store(store)
+
+    # Assert
+    assert sorted(index.entries) == [("league", 1), ("team", 10), ("team", 20), ("venue", 110)]
+
+
+def test_ingestion_updates_built_index(monkeypatch: pytest.MonkeyPatch, tmp_path: Any) -> None:
+    # Arrange
+    index = SearchIndex()
+    monkeypatch.setattr(search, "_search_index", index)
+    ingestor = FixtureIngestor(create_engine(f"sqlite:///{tmp_path / 'fixtures.db'}"))
+    ingestor.create_tables()
+
+    # Act
+    ingestor.ingest(iter_fixtures(io.BytesIO(_dump())))
+
+    # Assert
+    assert [(result.kind, result.id) for result in index.search("team 2")] == [("team", 20)]
+    assert [(result.kind, result.id) for result in index.search("stadium")] == [("venue", 110)]
+
+
+def test_search_takes_microseconds() -> None:
+    # Arrange
+    with open(DEVDATA, "rb") as file:
+        index = SearchIndex.from_store(FixtureStore.from_dumps([file]))
+    queries = ["man", "manchester c", "stadium", "l", "premier", "zz"] * 200
+
+    # Act
+    start = time.perf_counter()
+    for query in queries:
+        index.search(query)
+    average = (time.perf_counter() - start) / len(queries)
+
+    # Assert
+    assert average < 0.001
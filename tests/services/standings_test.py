@@ -0,0 +1,133 @@
+import asyncio
+from collections import defaultdict
+from pathlib import Path
+from typing import Any
+
+import pytest
+import sqlmodel
+from sqlalchemy import Engine, create_engine, select, update
+from sqlmodel import Session
+from sqlmodel.ext.asyncio.session import AsyncSession
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from backend.models.fixture import Fixture
+from backend.models.standing import Standing
+from backend.services.ingestion import FixtureIngestor
+from backend.services.standings import FINISHED_STATUSES, apply_fixtures, read_standings, rebuild_standings
+
+DEVDATA = Path(__file__).parents[2] / "devdata" / "result.json"
+
+
+@pytest.fixture
+def engine(tmp_path: Path) -> Engine:
+    engine = create_engine(f"sqlite:///{tmp_path / 'standings.db'}")
+    ingestor = FixtureIngestor(engine, batch_size=500)
+    ingestor.create_tables()
+    ingestor.ingest_file(str(DEVDATA))
+    return engine
+
+
+def _naive_standings(engine: Engine) -> dict[tuple[int, int], tuple[int, int, int, int]]:
+    table: dict[tuple[int, int], list[int]] = defaultdict(lambda: [0, 0, 0, 0])
+    with Session(engine) as session:
+        for fixture in session.scalars(select(Fixture).where(Fixture.status.in_(FINISHED_STATUSES))):  # type: ignore
+            if fixture.home_score is None or fixture.away_score is None:
+                continue
+            for team_id, scored, conceded in (
+                (fixture.home_team_id, fixture.home_score, fixture.away_score),
+                (fixture.away_team_id, fixture.away_score, fixture.home_score),
+            ):
+                row = table[(fixture.season_id, team_id)]
+                row[0] += 1
+                row[1] += 3 if scored > conceded else 1 if scored == conceded else 0
+                row[2] += scored
+                row[3] += conceded
+    return {key: (row[0], row[1], row[2], row[3]) for key, row in table.items()}
+
+
+def _stored_standings(engine: Engine) -> dict[tuple[int, int], tuple[int, int, int, int]]:
+    with Session(engine) as session:
+        return {
+            (s.season_id, s.team_id): (s.played, s.points, s.goals_for, s.goals_against)
+            for s in session.scalars(select(Standing))
+        }
+
+
+def _fixture_row(engine: Engine, fixture_id: int) -> dict[str, Any]:
+    with Session(engine) as session:
+        fixture = session.get(Fixture, fixture_id)
+        assert fixture is not None
+        return fixture.model_dump()
+
+
+def _change_fixture(engine: Engine, fixture_id: int, **values: Any) -> None:
+    with engine.begin() as connection:
+        connection.execute(update(Fixture).where(Fixture.id == fixture_id).values(**values))  # type: ignore[arg-type]
+        apply_fixtures(connection, [_fixture_row(engine, fixture_id) | values])
+
+
+def test_incremental_standings_match_naive_computation(engine: Engine) -> None:
+    assert _stored_standings(engine) == _naive_standings(engine)
+
+
+def test_rebuild_matches_incremental_standings(engine: Engine) -> None:
+    # Arrange
+    incremental = _stored_standings(engine)
+
+    # Act
+    read = rebuild_standings(engine, batch_size=100)
+
+    # Assert
+    assert read == 1384
+    assert _stored_standings(engine) == incremental
+
+
+def test_fixture_finishing_and_score_correction(engine: Engine) -> None:
+    # Arrange
+    not_started = 1035334  # Bournemouth - Luton, TBD
+    season_id = _fixture_row(engine, not_started)["season_id"]
+    before = _stored_standings(engine)[(season_id, 35)]
+
+    # Act / Assert
+    _change_fixture(engine, not_started, status="FT", home_score=2, away_score=0)
+    assert _stored_standings(engine)[(season_id, 35)] == (before[0] + 1, before[1] + 3, before[2] + 2, before[3])
+
+    _change_fixture(engine, not_started, status="FT", home_score=0, away_score=1)
+    assert _stored_standings(engine)[(season_id, 35)] == (before[0] + 1, before[1], before[2], before[3] + 1)
+
+    _change_fixture(engine, not_started, status="PST", home_score=None, away_score=None)
+    assert _stored_standings(engine)[(season_id, 35)] == before
+    assert _stored_standings(engine) == _naive_standings(engine)
+
+
+def test_reingesting_does_not_double_count(engine: Engine) -> None:
+    # Arrange
+    before = _stored_standings(engine)
+
+    # Act
+    FixtureIngestor(engine).ingest_file(str(DEVDATA))
+
+    # Assert
+    assert _stored_standings(engine) == before
+
+
+def test_read_standings_ranks_teams(engine: Engine) -> None:
+    # Arrange
+    async_engine = create_async_engine(str(engine.url).replace("sqlite://", "sqlite+aiosqlite://"))
+
+    async def main() -> list:
+        async with AsyncSession(async_engine) as session:
+            season_id = (await session.exec(sqlmodel.select(Fixture.season_id).where(Fixture.league_id == 39))).first()
+            rows = await read_standings(session, season_id)  # type: ignore[arg-type]
+        await async_engine.dispose()
+        return rows
+
+    # Act
+    rows = asyncio.run(main())
+
+    # Assert
+    assert len(rows) == 20
+    assert [row.rank for row in rows] == list(range(1, 21))
+    assert [row.points for row in rows] == sorted((row.points for row in rows), reverse=True)
+    assert all(row.played == row.home_played + row.away_played for row in rows)
+    assert all(len(row.form) == 5 and set(row.form) <= set("WDL") for row in rows)
@@ -0,0 +1,114 @@
+import time
+from typing import Any
+
+import pytest
+
+from backend.services.token_cache import TokenCache
+
+
+def _payload(ttl: float = 60) -> dict[str, Any]:
+    return {"user": "alice", "role": "user", "exp": time.time() + ttl}
+
+
+def test_get_counts_hits_and_misses() -> None:
+    # Arrange
+    cache = TokenCache(max_size=2)
+    payload = _payload()
+
+    # Act
+    first = cache.get("token")
+    cache.put("token", payload)
+    second = cache.get("token")
+
+    # Assert
+    assert first is None
+    assert second == payload
+    assert cache.stats() == {"hits": 1, "misses": 1, "size": 1, "max_size": 2}
+
+
+def test_expired_entries_are_evicted() -> None:
+    # Arrange
+    cache = TokenCache()
+    cache.put("token", _payload(ttl=0.05))
+
+    # Act
+    time.sleep(0.1)
+
+    # Assert
+    assert cache.get("token") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted() -> None:
+    # Arrange
+    cache = TokenCache(max_size=2)
+    cache.put("a", _payload())
+    cache.put("b", _payload())
+    cache.get("a")
+
+    # Act
+    cache.put("c", _payload())
+
+    # Assert
+    assert cache.get("a") is not None
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+
+
+def test_returned_payload_is_a_copy() -> None:
+    # Arrange
+    cache = TokenCache()
+    cache.put("token", _payload())
+
+    # Act
+    cache.get("token")["role"] = "admin"  # type: ignore[index]
+
+    # Assert
+    assert cache.get("token")["role"] == "user"  # type: ignore[index]
+
+
+@pytest.mark.parametrize(
+    "payload, test_id",
+    [
+        ({"user": "alice"}, "EC1"),  # No expiration
+        ({"user": "alice", "exp": 0}, "EC2"),  # Already expired
+    ],
+)
+def test_payloads_without_future_expiration_are_not_cached(payload: dict, test_id: Any) -> None:
+    # Arrange
+    cache = TokenCache()
+
+    # Act
+    cache.put("token", payload)
+
+    # Assert
+    assert len(cache) == 0, f"Test ID: {test_id}"
+
+
+def test_revoke_evicts_and_rejects_until_expiration() -> None:
+    # Arrange
+    cache = TokenCache()
+    cache.put("token", _payload())
+
+    # Act
+    cache.revoke("token", time.time() + 60)
+    cache.revoke("expired", time.time() - 1)
+
+    # Assert
+    assert cache.get("token") is None
+    assert cache.is_revoked("token")
+    assert not cache.is_revoked("expired")
+
+
+def test_clear_keeps_revocations() -> None:
+    # Arrange
+    cache = TokenCache()
+    cache.put("token", _payload())
+    cache.revoke("revoked", time.time() + 60)
+
+    # Act
+    cache.clear()
+
+    # Assert
+    assert len(cache) == 0
+    assert cache.is_revoked("revoked")
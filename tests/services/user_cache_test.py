@@ -0,0 +1,120 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from backend.models import user
+from backend.services import user_cache
+from backend.services.user_cache import InMemoryUserCacheBackend, UserCache
+
+ALICE = user.UserRead.trusted(id=1, username="alice", is_admin=False)
+
+
+def test_put_caches_user_by_id_and_username() -> None:
+    # Arrange
+    cache = UserCache(InMemoryUserCacheBackend(), ttl=60)
+
+    # Act
+    async def main() -> tuple[user.UserRead | None, user.UserRead | None, user.UserRead | None]:
+        await cache.put(ALICE)
+        return await cache.get_by_id(1), await cache.get_by_username("alice"), await cache.get_by_username("bob")
+
+    by_id, by_username, missing = asyncio.run(main())
+
+    # Assert
+    assert by_id == by_username == ALICE
+    assert by_id is not ALICE
+    assert missing is None
+
+
+def test_entries_expire_after_ttl() -> None:
+    # Arrange
+    cache = UserCache(InMemoryUserCacheBackend(), ttl=60)
+
+    # Act
+    async def main() -> user.UserRead | None:
+        await cache.put(ALICE)
+        return await cache.get_by_id(1)
+
+    with patch.object(user_cache, "time") as clock:
+        clock.monotonic.side_effect = [0.0, 61.0]
+        cached = asyncio.run(main())
+
+    # Assert
+    assert cached is None
+    assert len(cache.backend) == 1  # type: ignore[arg-type]
+
+
+def test_least_recently_used_entries_are_evicted() -> None:
+    # Arrange
+    backend = InMemoryUserCacheBackend(max_size=4)
+    cache = UserCache(backend, ttl=60)
+    bob = user.UserRead.trusted(id=2, username="bob", is_admin=False)
+    carol = user.UserRead.trusted(id=3, username="carol", is_admin=True)
+
+    # Act
+    async def main() -> list[user.UserRead | None]:
+        await cache.put(ALICE)
+        await cache.put(bob)
+        await cache.get_by_id(1)
+        await cache.get_by_username("alice")
+        await cache.put(carol)
+        return [await cache.get_by_id(1), await cache.get_by_id(2), await cache.get_by_id(3)]
+
+    cached = asyncio.run(main())
+
+    # Assert
+    assert cached == [ALICE, None, carol]
+    assert len(backend) == 4
+
+
+@pytest.mark.parametrize(
+    "test_id, user_id, username",
+    [
+        ("by_id_and_username", 1, "alice"),
+        ("by_username", None, "alice"),
+    ],
+)
+def test_invalidate_evicts_given_keys(test_id: str, user_id: int | None, username: str) -> None:
+    # Arrange
+    cache = UserCache(InMemoryUserCacheBackend(), ttl=60)
+
+    # Act
+    async def main() -> tuple[user.UserRead | None, user.UserRead | None]:
+        await cache.put(ALICE)
+        await cache.invalidate(user_id=user_id, username=username)
+        return await cache.get_by_id(1), await cache.get_by_username("alice")
+
+    by_id, by_username = asyncio.run(main())
+
+    # Assert
+    assert by_id == (None if user_id is not None else ALICE)
+    assert by_username is None
+
+
+def test_put_after_invalidation_is_skipped() -> None:
+    # Arrange
+    cache = UserCache(InMemoryUserCacheBackend(), ttl=60)
+
+    # Act
+    async def main() -> user.UserRead | None:
+        generation = cache.generation
+        await cache.invalidate(username="alice")
+        await cache.put(ALICE, generation)
+        return await cache.get_by_username("alice")
+
+    cached = asyncio.run(main())
+
+    # Assert
+    assert cached is None
+
+
+def test_incomplete_backend_fails_on_instantiation() -> None:
+    # Arrange
+    class GetOnlyBackend(user_cache.UserCacheBackend):
+        async def get(self, key: str) -> user.UserRead | None:
+            return None
+
+    # Assert
+    with pytest.raises(TypeError):
+        GetOnlyBackend()  # type: ignore[abstract]
@@ -0,0 +1,75 @@
+import io
+import json
+from pathlib import Path
+from unittest.mock import Mock
+
+import pytest
+from sqlalchemy import Engine, create_engine
+from sqlmodel import SQLModel
+
+from backend.services import prediction
+from backend.services.ingestion import FixtureIngestor, iter_fixtures
+from backend.services.prediction import PoissonModel, set_model
+from backend.services.versions import VERSION_TABLES, VersionWatcher, bump_version, read_versions
+
+DEVDATA = Path(__file__).parents[2] / "devdata" / "result.json"
+
+
+@pytest.fixture
+def engine(tmp_path: Path) -> Engine:
+    engine = create_engine(f"sqlite:///{tmp_path / 'versions.db'}")
+    SQLModel.metadata.create_all(engine, tables=VERSION_TABLES)
+    return engine
+
+
+def test_bump_version_creates_then_increments(engine: Engine) -> None:
+    # Act
+    for name in ("fixtures", "fixtures", "other"):
+        with engine.begin() as connection:
+            bump_version(connection, name)
+
+    # Assert
+    assert read_versions(engine) == {"fixtures": 2, "other": 1}
+
+
+def test_watcher_calls_subscribers_of_changed_versions(engine: Engine) -> None:
+    # Arrange
+    watcher = VersionWatcher(engine)
+    fixtures, other = Mock(), Mock()
+    watcher.subscribe("fixtures", fixtures)
+    watcher.subscribe("other", other)
+
+    # Act
+    baseline = watcher.check()
+    with engine.begin() as connection:
+        bump_version(connection, "fixtures")
+    changed = watcher.check()
+    unchanged = watcher.check()
+
+    # Assert
+    assert (baseline, changed, unchanged) == (set(), {"fixtures"}, set())
+    fixtures.assert_called_once_with()
+    other.assert_not_called()
+
+
+def test_ingestion_drops_model_of_watching_workers(tmp_path: Path) -> None:
+    # Arrange
+    engine = create_engine(f"sqlite:///{tmp_path / 'ingestion.db'}")
+    ingestor = FixtureIngestor(engine)
+    ingestor.create_tables()
+    watcher = VersionWatcher(engine)
+    watcher.subscribe("fixtures", lambda: set_model(None))
+    watcher.check()
+    set_model(PoissonModel())
+    empty = json.dumps({"sports": []}).encode()
+
+    # Act
+    ingestor.ingest(iter_fixtures(io.BytesIO(empty)))
+    kept = prediction._model is not None
+    ingestor.ingest_file(str(DEVDATA))
+    changed = watcher.check()
+
+    # Assert
+    assert kept  # Nothing was ingested, the version is unchanged
+    assert changed == {"fixtures"}
+    assert prediction._model is None
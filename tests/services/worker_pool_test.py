@@ -0,0 +1,90 @@
+import asyncio
+import threading
+import time
+from typing import Any
+
+import pytest
+
+from backend.services.worker_pool import BoundedExecutor, PoolSaturatedError
+
+
+def _sleep_and_return(value: Any, delay: float = 0.05) -> Any:
+    time.sleep(delay)
+    return value
+
+
+def test_run_returns_result_off_event_loop() -> None:
+    # Arrange
+    pool = BoundedExecutor(max_workers=2, max_pending=2)
+
+    # Act
+    async def main() -> str | None:
+        return await pool.run(lambda: threading.current_thread().name)
+
+    thread_name = asyncio.run(main())
+    pool.shutdown()
+
+    # Assert
+    assert thread_name is not None and thread_name.startswith("bounded-pool")
+
+
+def test_run_executes_jobs_concurrently() -> None:
+    # Arrange
+    pool = BoundedExecutor(max_workers=4, max_pending=4)
+
+    # Act
+    async def main() -> list[int]:
+        return await asyncio.gather(*(pool.run(_sleep_and_return, i, 0.2) for i in range(4)))
+
+    start = time.perf_counter()
+    results = asyncio.run(main())
+    elapsed = time.perf_counter() - start
+    pool.shutdown()
+
+    # Assert
+    assert results == [0, 1, 2, 3]
+    assert elapsed < 0.6
+
+
+def test_run_raises_when_saturated() -> None:
+    # Arrange
+    pool = BoundedExecutor(max_workers=1, max_pending=1, queue_timeout=0.01)
+
+    # Act
+    async def main() -> list[Any]:
+        return await asyncio.gather(
+            pool.run(_sleep_and_return, 1, 0.2), pool.run(_sleep_and_return, 2, 0.2), return_exceptions=True
+        )
+
+    results = asyncio.run(main())
+    pool.shutdown()
+
+    # Assert
+    assert results[0] == 1
+    assert isinstance(results[1], PoolSaturatedError)
+    assert pool.pending == 0
+
+
+def test_pool_can_be_reused_across_event_loops() -> None:
+    # Arrange
+    pool = BoundedExecutor(max_workers=1, max_pending=1)
+
+    # Act
+    first = asyncio.run(pool.run(_sleep_and_return, "a", 0))
+    second = asyncio.run(pool.run(_sleep_and_return, "b", 0))
+    pool.shutdown()
+
+    # Assert
+    assert (first, second) == ("a", "b")
+
+
+@pytest.mark.parametrize(
+    "kwargs, test_id",
+    [
+        ({"kind": "fork"}, "EC1"),
+        ({"max_workers": 4, "max_pending": 2}, "EC2"),
+    ],
+)
+def test_invalid_configuration(kwargs: dict, test_id: Any) -> None:
+    with pytest.raises(ValueError):
+        BoundedExecutor(**kwargs)